@@ -8,6 +8,8 @@ from bubus import BaseEvent
 from pydantic import Field, field_validator
 from uuid_extensions import uuid7str
 
+from browser_use.screenshots.encoding import screenshot_data_url
+
 MAX_STRING_LENGTH = 100000  # 100K chars ~ 25k tokens should be enough
 MAX_URL_LENGTH = 100000
 MAX_TASK_LENGTH = 100000
@@ -155,7 +157,7 @@ class CreateAgentStepEvent(BaseEvent):
 		# Capture screenshot as base64 data URL if available
 		screenshot_url = None
 		if browser_state_summary.screenshot:
-			screenshot_url = f'data:image/png;base64,{browser_state_summary.screenshot}'
+			screenshot_url = screenshot_data_url(browser_state_summary.screenshot)
 			import logging
 
 			logger = logging.getLogger(__name__)
@@ -12,6 +12,7 @@ from browser_use.llm.messages import (
 	SystemMessage,
 	UserMessage,
 )
+from browser_use.screenshots.encoding import screenshot_data_url, screenshot_media_type
 
 logger = logging.getLogger(__name__)
 
@@ -77,8 +78,8 @@ def construct_judge_messages(
 			encoded_images.append(
 				ContentPartImageParam(
 					image_url=ImageURL(
-						url=f'data:image/png;base64,{encoded}',
-						media_type='image/png',
+						url=screenshot_data_url(encoded),
+						media_type=screenshot_media_type(encoded),
 					)
 				)
 			)
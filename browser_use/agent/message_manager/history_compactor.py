@@ -0,0 +1,162 @@
+"""
+Token-budgeted compaction of the agent history.
+
+Every step appends a `HistoryItem`, and the whole history is sent to the LLM again on every step. `HistoryCompactor`
+keeps it under a token budget: once the rendered history is over `max_tokens`, all items but the first one and the
+most recent `keep_recent_steps` are folded into a running summary, stored in `MessageManagerState` so it survives
+pausing and resuming. Folded items get a one-line extractive summary right away. With a `summary_llm`, the summary is
+rewritten by that (cheap) model in the background and swapped in on a later step, so compaction never blocks a step.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from collections.abc import Callable
+from typing import TYPE_CHECKING
+
+from browser_use.agent.message_manager.views import HistoryItem
+from browser_use.llm.messages import SystemMessage, UserMessage
+
+if TYPE_CHECKING:
+	from browser_use.agent.views import MessageManagerState
+	from browser_use.llm.base import BaseChatModel
+
+logger = logging.getLogger(__name__)
+
+# Characters of each part (memory, error, action results...) of a history item kept in its extractive summary line
+MAX_SUMMARY_PART_CHARS = 200
+
+SUMMARY_SYSTEM_PROMPT = """You compress the history of a browser automation agent.
+You get notes about the steps the agent already took. Rewrite them into a concise summary of at most {max_words} words.
+Keep everything the agent still needs to finish its task: progress made, data collected so far (exact values, URLs, file names), pages visited, what failed and should not be retried, and any changes to the task.
+Drop routine details. Answer with the summary only."""
+
+
+def estimate_tokens(text: str) -> int:
+	"""Fast token count estimate, about 4 characters per token for English text and markup"""
+	return (len(text) + 3) // 4
+
+
+def summarize_history_item(item: HistoryItem) -> str:
+	"""One line summary of a history item: its memory (or next goal), error and action results, each truncated"""
+	parts = []
+	for part in (item.system_message, item.memory or item.next_goal, item.error, item.action_results):
+		text = ' '.join((part or '').split())
+		if len(text) > MAX_SUMMARY_PART_CHARS:
+			text = text[: MAX_SUMMARY_PART_CHARS - 3] + '...'
+		if text:
+			parts.append(text)
+	text = ' | '.join(parts)
+	if item.step_number is None:
+		return text
+	return f'Step {item.step_number}: {text}'
+
+
+class HistoryCompactor:
+	"""Folds old agent history items into a summary once the history is over its token budget."""
+
+	def __init__(
+		self,
+		max_tokens: int,
+		keep_recent_steps: int = 5,
+		summary_llm: BaseChatModel | None = None,
+		token_counter: Callable[[str], int] | None = None,
+	):
+		"""
+		Args:
+			max_tokens: Token budget of the rendered agent history
+			keep_recent_steps: Number of most recent history items that are always kept verbatim
+			summary_llm: Optional LLM that rewrites the summary in the background, extractive summaries only if None
+			token_counter: Counts the tokens of a text, e.g. with the provider's tokenizer. Defaults to `estimate_tokens`
+		"""
+		assert max_tokens > 0, 'max_tokens must be positive'
+		assert keep_recent_steps >= 1, 'keep_recent_steps must be at least 1'
+		self.max_tokens = max_tokens
+		self.keep_recent_steps = keep_recent_steps
+		self.summary_llm = summary_llm
+		self.count_tokens = token_counter or estimate_tokens
+		self._refresh: asyncio.Task[str] | None = None
+		self._refresh_item_count = 0
+		"""`history_summary_item_count` when the running refresh started"""
+
+	def compact(self, state: MessageManagerState, history_text: str) -> bool:
+		"""Fold old history items into `state.history_summary` if `history_text` is over the token budget.
+
+		Args:
+			state: Message manager state holding the history items and the summary
+			history_text: The agent history as it is currently rendered for the LLM
+
+		Returns:
+			Whether items were folded
+		"""
+		self._apply_refreshed_summary(state)
+
+		if self.count_tokens(history_text) <= self.max_tokens:
+			return False
+
+		items = state.agent_history_items
+		start = 1 + state.history_summary_item_count
+		end = len(items) - self.keep_recent_steps
+		if end <= start:
+			return False
+
+		lines = [summarize_history_item(item) for item in items[start:end]]
+		state.history_summary = self._trim_summary('\n'.join([state.history_summary, *lines]).strip('\n'))
+		state.history_summary_item_count = end - 1
+		logger.debug(f'🗜️ Folded {end - start} agent history items into the summary ({end - 1} items summarized in total)')
+
+		self._start_refresh(state)
+		return True
+
+	def _trim_summary(self, summary: str) -> str:
+		"""Drop the oldest summary lines while the summary takes more than half of the budget"""
+		lines = summary.split('\n')
+		while len(lines) > 1 and self.count_tokens('\n'.join(lines)) > self.max_tokens // 2:
+			lines.pop(0)
+		return '\n'.join(lines)
+
+	def _start_refresh(self, state: MessageManagerState) -> None:
+		if self.summary_llm is None or (self._refresh is not None and not self._refresh.done()):
+			return
+		try:
+			asyncio.get_running_loop()
+		except RuntimeError:
+			return
+		self._refresh_item_count = state.history_summary_item_count
+		self._refresh = asyncio.create_task(self._summarize(state.history_summary))
+
+	async def _summarize(self, summary: str) -> str:
+		assert self.summary_llm is not None
+		# Words are about 0.75 tokens, aim for a quarter of the budget
+		max_words = max(int(self.max_tokens // 4 * 0.75), 50)
+		response = await self.summary_llm.ainvoke(
+			[SystemMessage(content=SUMMARY_SYSTEM_PROMPT.format(max_words=max_words)), UserMessage(content=summary)]
+		)
+		return response.completion.strip()
+
+	def _apply_refreshed_summary(self, state: MessageManagerState) -> None:
+		"""Swap in a finished LLM summary, keeping lines that were folded in while it was being generated"""
+		task = self._refresh
+		if task is None or not task.done():
+			return
+		self._refresh = None
+		if task.cancelled():
+			return
+		if task.exception() is not None:
+			logger.debug(f'Failed to summarize the agent history: {type(task.exception()).__name__}: {task.exception()}')
+			return
+		summary = task.result()
+		new_item_count = state.history_summary_item_count - self._refresh_item_count
+		if not summary or new_item_count < 0:
+			# Empty answer, or the state was replaced (e.g. loaded from a file) in the meantime
+			return
+		# Every item folded in since the refresh started added one line at the end
+		new_lines = state.history_summary.split('\n')[-new_item_count:] if new_item_count else []
+		state.history_summary = self._trim_summary('\n'.join([summary, *new_lines]))
+
+	def cancel(self) -> None:
+		"""Cancel a running background summary, e.g. when the agent is closed."""
+		if self._refresh is not None and not self._refresh.done():
+			self._refresh.cancel()
+		self._refresh = None
@@ -3,10 +3,12 @@ from __future__ import annotations
 import logging
 from typing import Literal
 
+from browser_use.agent.message_manager.history_compactor import HistoryCompactor
 from browser_use.agent.message_manager.views import (
 	HistoryItem,
 )
 from browser_use.agent.prompts import AgentMessagePrompt
+from browser_use.agent.url_interning import URLInterner
 from browser_use.agent.views import (
 	ActionResult,
 	AgentOutput,
@@ -111,6 +113,10 @@ class MessageManager:
 		include_recent_events: bool = False,
 		sample_images: list[ContentPartTextParam | ContentPartImageParam] | None = None,
 		llm_screenshot_size: tuple[int, int] | None = None,
+		screenshot_quality: int | None = None,
+		stable_prompt_prefix: bool = False,
+		history_compactor: HistoryCompactor | None = None,
+		url_interner: URLInterner | None = None,
 	):
 		self.task = task
 		self.state = state
@@ -124,6 +130,12 @@ class MessageManager:
 		self.include_recent_events = include_recent_events
 		self.sample_images = sample_images
 		self.llm_screenshot_size = llm_screenshot_size
+		self.screenshot_quality = screenshot_quality
+		self.stable_prompt_prefix = stable_prompt_prefix
+		self.history_compactor = history_compactor
+		# Shortens long URLs in the messages, they are restored in the LLM's actions by the agent
+		self.url_interner = url_interner
+		self._shortened_state_texts: dict[str, str] = {}
 
 		assert max_history_items is None or max_history_items > 5, 'max_history_items must be None or greater than 5'
 
@@ -139,31 +151,35 @@ class MessageManager:
 	@property
 	def agent_history_description(self) -> str:
 		"""Build agent history description from list of items, respecting max_history_items limit"""
-		if self.max_history_items is None:
-			# Include all items
-			return '\n'.join(item.to_string() for item in self.state.agent_history_items)
+		return '\n'.join(self.agent_history_blocks)
 
-		total_items = len(self.state.agent_history_items)
-
-		# If we have fewer items than the limit, just return all items
-		if total_items <= self.max_history_items:
-			return '\n'.join(item.to_string() for item in self.state.agent_history_items)
-
-		# We have more items than the limit, so we need to omit some
-		omitted_count = total_items - self.max_history_items
-
-		# Show first item + omitted message + most recent (max_history_items - 1) items
-		# The omitted message doesn't count against the limit, only real history items do
-		recent_items_count = self.max_history_items - 1  # -1 for first item
-
-		items_to_include = [
-			self.state.agent_history_items[0].to_string(),  # Keep first item (initialization)
-			f'<sys>[... {omitted_count} previous steps omitted...]</sys>',
-		]
-		# Add most recent items
-		items_to_include.extend([item.to_string() for item in self.state.agent_history_items[-recent_items_count:]])
-
-		return '\n'.join(items_to_include)
+	@property
+	def agent_history_blocks(self) -> list[str]:
+		"""Rendered agent history items, respecting max_history_items limit"""
+		items = self.state.agent_history_items
+		items_to_include = [items[0].to_string()]  # Keep first item (initialization)
+
+		# Items folded into the summary by the history compactor
+		summarized_count = self.state.history_summary_item_count
+		if summarized_count:
+			items_to_include.append(
+				f'<history_summary steps="{summarized_count}">\n{self.state.history_summary}\n</history_summary>'
+			)
+		recent_items = items[1 + summarized_count :]
+
+		# The first item + most recent items, up to max_history_items
+		# The omitted message and the summary don't count against the limit, only real history items do
+		if self.max_history_items is not None and len(recent_items) > self.max_history_items - 1:
+			omitted_count = len(recent_items) - (self.max_history_items - 1)
+			if self.stable_prompt_prefix:
+				# Move the window in chunks, so the history prefix stays the same (and cached) for several steps
+				chunk = max(self.max_history_items // 2, 1)
+				omitted_count = -(-omitted_count // chunk) * chunk
+			items_to_include.append(f'<sys>[... {omitted_count} previous steps omitted...]</sys>')
+			recent_items = recent_items[omitted_count:]
+
+		items_to_include.extend(item.to_string() for item in recent_items)
+		return items_to_include
 
 	def add_new_task(self, new_task: str) -> None:
 		new_task = '<follow_up_user_request> ' + new_task.strip() + ' </follow_up_user_request>'
@@ -306,6 +322,8 @@ class MessageManager:
 
 		# First, update the agent history items with the latest step results
 		self._update_agent_history_description(model_output, result, step_info)
+		if self.history_compactor is not None:
+			self.history_compactor.compact(self.state, self.agent_history_description)
 
 		# Use the passed sensitive_data parameter, falling back to instance variable
 		effective_sensitive_data = sensitive_data if sensitive_data is not None else self.sensitive_data
@@ -364,8 +382,13 @@ class MessageManager:
 			sample_images=self.sample_images,
 			read_state_images=self.state.read_state_images,
 			llm_screenshot_size=self.llm_screenshot_size,
+			screenshot_quality=self.screenshot_quality,
+			agent_history_blocks=self.agent_history_blocks if self.stable_prompt_prefix else None,
 		).get_user_message(effective_use_vision)
 
+		if self.url_interner is not None:
+			self._shortened_state_texts = self.url_interner.shorten_message(state_message, self._shortened_state_texts)
+
 		# Store state message text for history
 		self.last_state_message_text = state_message.text
 
@@ -431,6 +454,8 @@ class MessageManager:
 	def _add_context_message(self, message: BaseMessage) -> None:
 		"""Add a contextual message specific to this step (e.g., validation errors, retry instructions, timeout warnings)"""
 		# Don't filter context messages - they should contain normal conversation or error messages
+		if self.url_interner is not None:
+			self.url_interner.shorten_message(message)
 		self.state.history.context_messages.append(message)
 
 	@time_execution_sync('--filter_sensitive_data')
@@ -91,6 +91,9 @@ class MessageManagerState(BaseModel):
 	agent_history_items: list[HistoryItem] = Field(
 		default_factory=lambda: [HistoryItem(step_number=0, system_message='Agent initialized')]
 	)
+	# Summary of old history items, folded away by the history compactor (agent_history_items[1 : 1 + count])
+	history_summary: str = ''
+	history_summary_item_count: int = 0
 	read_state_description: str = ''
 	# Images to include in the next state message (cleared after each step)
 	read_state_images: list[dict[str, Any]] = Field(default_factory=list)
@@ -1,10 +1,12 @@
 import importlib.resources
+import logging
 from datetime import datetime
 from typing import TYPE_CHECKING, Literal, Optional
 
 from browser_use.dom.views import NodeType, SimplifiedNode
 from browser_use.llm.messages import ContentPartImageParam, ContentPartTextParam, ImageURL, SystemMessage, UserMessage
 from browser_use.observability import observe_debug
+from browser_use.screenshots.encoding import resize_screenshot, screenshot_data_url, screenshot_media_type
 from browser_use.utils import is_new_tab_page, sanitize_surrogates
 
 if TYPE_CHECKING:
@@ -90,6 +92,8 @@ class AgentMessagePrompt:
 		sample_images: list[ContentPartTextParam | ContentPartImageParam] | None = None,
 		read_state_images: list[dict] | None = None,
 		llm_screenshot_size: tuple[int, int] | None = None,
+		screenshot_quality: int | None = None,
+		agent_history_blocks: list[str] | None = None,
 	):
 		self.browser_state: 'BrowserStateSummary' = browser_state_summary
 		self.file_system: 'FileSystem | None' = file_system
@@ -108,6 +112,10 @@ class AgentMessagePrompt:
 		self.sample_images = sample_images or []
 		self.read_state_images = read_state_images or []
 		self.llm_screenshot_size = llm_screenshot_size
+		# Quality the screenshots were captured with, kept if they have to be resized here
+		self.screenshot_quality = screenshot_quality
+		# Stable prefix layout: history items as separate, byte-identical parts ahead of the changing state
+		self.agent_history_blocks = agent_history_blocks
 		assert self.browser_state
 
 	def _extract_page_statistics(self) -> dict[str, int]:
@@ -225,6 +233,17 @@ class AgentMessagePrompt:
 			page_info_text += '</page_info>\n'
 			# , at {current_page_position:.0%} of page
 		if elements_text != '':
+			# Viewport-scoped DOM extraction: elements far from the viewport were skipped, only their count is known
+			dom_state = self.browser_state.dom_state
+			if dom_state.elements_above_scope:
+				elements_text = (
+					f'... {dom_state.elements_above_scope} more elements above (scroll up to see them) ...\n{elements_text}'
+				)
+			if dom_state.elements_below_scope:
+				elements_text = (
+					f'{elements_text}\n... {dom_state.elements_below_scope} more elements below (scroll down to see them) ...'
+				)
+
 			if has_content_above:
 				if self.browser_state.page_info:
 					pi = self.browser_state.page_info
@@ -299,10 +318,9 @@ Available tabs:
 		if not len(_todo_contents):
 			_todo_contents = '[empty todo.md, fill it when applicable]'
 
-		agent_state = f"""
-<user_request>
-{self.task}
-</user_request>
+		# With the stable prefix layout the request is part of the prefix instead
+		user_request = f'\n<user_request>\n{self.task}\n</user_request>' if self.agent_history_blocks is None else ''
+		agent_state = f"""{user_request}
 <file_system>
 {self.file_system.describe() if self.file_system else 'No file system available'}
 </file_system>
@@ -325,24 +343,8 @@ Available tabs:
 			return screenshot_b64
 
 		try:
-			import base64
-			import logging
-			from io import BytesIO
-
-			from PIL import Image
-
-			img = Image.open(BytesIO(base64.b64decode(screenshot_b64)))
-			if img.size == self.llm_screenshot_size:
-				return screenshot_b64
-
-			logging.getLogger(__name__).info(
-				f'🔄 Resizing screenshot from {img.size[0]}x{img.size[1]} to {self.llm_screenshot_size[0]}x{self.llm_screenshot_size[1]} for LLM'
-			)
-
-			img_resized = img.resize(self.llm_screenshot_size, Image.Resampling.LANCZOS)
-			buffer = BytesIO()
-			img_resized.save(buffer, format='PNG')
-			return base64.b64encode(buffer.getvalue()).decode('utf-8')
+			# Usually a no-op, the browser already downscales the screenshot while capturing it
+			return resize_screenshot(screenshot_b64, self.llm_screenshot_size, self.screenshot_quality)
 		except Exception as e:
 			logging.getLogger(__name__).warning(f'Failed to resize screenshot: {e}, using original')
 			return screenshot_b64
@@ -360,11 +362,16 @@ Available tabs:
 			use_vision = False
 
 		# Build complete state description
-		state_description = (
-			'<agent_history>\n'
-			+ (self.agent_history_description.strip('\n') if self.agent_history_description else '')
-			+ '\n</agent_history>\n\n'
-		)
+		stable_prefix = self.agent_history_blocks is not None
+		if stable_prefix:
+			# The history was opened in the prefix parts
+			state_description = '</agent_history>\n\n'
+		else:
+			state_description = (
+				'<agent_history>\n'
+				+ (self.agent_history_description.strip('\n') if self.agent_history_description else '')
+				+ '\n</agent_history>\n\n'
+			)
 		state_description += '<agent_state>\n' + self._get_agent_state_description().strip('\n') + '\n</agent_state>\n'
 		state_description += '<browser_state>\n' + self._get_browser_state_description().strip('\n') + '\n</browser_state>\n'
 		# Only add read_state if it has content
@@ -383,15 +390,23 @@ Available tabs:
 		# Check if we have images to include (from read_file action)
 		has_images = bool(self.read_state_images)
 
-		if (use_vision is True and self.screenshots) or has_images:
-			# Start with text description
-			content_parts: list[ContentPartTextParam | ContentPartImageParam] = [ContentPartTextParam(text=state_description)]
+		include_images = (use_vision is True and self.screenshots) or has_images
+
+		if include_images or stable_prefix:
+			content_parts: list[ContentPartTextParam | ContentPartImageParam]
+			if stable_prefix:
+				# Most stable content first (task, sample images, history), then the changing state
+				content_parts = self._get_stable_prefix_parts()
+				content_parts.append(ContentPartTextParam(text=state_description))
+			else:
+				# Start with text description
+				content_parts = [ContentPartTextParam(text=state_description)]
 
-			# Add sample images
-			content_parts.extend(self.sample_images)
+				# Add sample images
+				content_parts.extend(self.sample_images)
 
 			# Add screenshots with labels
-			for i, screenshot in enumerate(self.screenshots):
+			for i, screenshot in enumerate(self.screenshots if include_images else []):
 				if i == len(self.screenshots) - 1:
 					label = 'Current screenshot:'
 				else:
@@ -408,8 +423,8 @@ Available tabs:
 				content_parts.append(
 					ContentPartImageParam(
 						image_url=ImageURL(
-							url=f'data:image/png;base64,{processed_screenshot}',
-							media_type='image/png',
+							url=screenshot_data_url(processed_screenshot),
+							media_type=screenshot_media_type(processed_screenshot),
 							detail=self.vision_detail_level,
 						),
 					)
@@ -443,10 +458,29 @@ Available tabs:
 					)
 				)
 
-			return UserMessage(content=content_parts, cache=True)
+			# With the stable prefix layout the breakpoint sits on the prefix, caching the changing state is wasted
+			return UserMessage(content=content_parts, cache=not stable_prefix)
 
 		return UserMessage(content=state_description, cache=True)
 
+	def _get_stable_prefix_parts(self) -> list[ContentPartTextParam | ContentPartImageParam]:
+		"""Task, sample images and one part per agent history item, marked as cache breakpoint at the end.
+
+		History items are only appended between steps and render to the same text every time, so this prefix is
+		byte-identical to the previous step's plus the new items, and the provider's prompt cache covers all of it.
+		"""
+		parts: list[ContentPartTextParam | ContentPartImageParam] = [
+			ContentPartTextParam(text=sanitize_surrogates(f'<user_request>\n{self.task}\n</user_request>\n'))
+		]
+		parts.extend(self.sample_images)
+
+		history_blocks = self.agent_history_blocks or ['']
+		history_blocks = ['<agent_history>\n' + history_blocks[0], *history_blocks[1:]]
+		history_parts = [ContentPartTextParam(text=sanitize_surrogates(block.strip('\n') + '\n')) for block in history_blocks]
+		history_parts[-1].cache = True
+		parts.extend(history_parts)
+		return parts
+
 
 def get_rerun_summary_prompt(original_task: str, total_steps: int, success_count: int, error_count: int) -> str:
 	return f'''You are analyzing the completion of a rerun task. Based on the screenshot and execution info, provide a summary.
@@ -486,7 +520,7 @@ def get_rerun_summary_message(prompt: str, screenshot_b64: str | None = None) ->
 			ContentPartTextParam(type='text', text=prompt),
 			ContentPartImageParam(
 				type='image_url',
-				image_url=ImageURL(url=f'data:image/png;base64,{screenshot_b64}'),
+				image_url=ImageURL(url=screenshot_data_url(screenshot_b64), media_type=screenshot_media_type(screenshot_b64)),
 			),
 		]
 		return UserMessage(content=content_parts)
@@ -6,7 +6,7 @@ import logging
 import re
 import tempfile
 import time
-from collections.abc import Awaitable, Callable
+from collections.abc import AsyncIterable, AsyncIterator, Awaitable, Callable
 from pathlib import Path
 from typing import Any, Generic, Literal, TypeVar
 from urllib.parse import urlparse
@@ -22,14 +22,16 @@ from browser_use.agent.cloud_events import (
 )
 from browser_use.agent.message_manager.utils import save_conversation
 from browser_use.llm.base import BaseChatModel
+from browser_use.llm.client_pool import acquire_shared_clients, release_shared_clients
 from browser_use.llm.exceptions import ModelProviderError, ModelRateLimitError
 from browser_use.llm.messages import BaseMessage, ContentPartImageParam, ContentPartTextParam, UserMessage
+from browser_use.llm.streaming import StreamingJSONArrayParser, supports_streaming
 from browser_use.tokens.service import TokenCost
 
 load_dotenv()
 
 from bubus import EventBus
-from pydantic import BaseModel, ValidationError
+from pydantic import ValidationError
 from uuid_extensions import uuid7str
 
 from browser_use import Browser, BrowserProfile, BrowserSession
@@ -37,10 +39,13 @@ from browser_use.agent.judge import construct_judge_messages
 
 # Lazy import for gif to avoid heavy agent.views import at startup
 # from browser_use.agent.gif import create_history_gif
+from browser_use.agent.message_manager.history_compactor import HistoryCompactor
 from browser_use.agent.message_manager.service import (
 	MessageManager,
 )
 from browser_use.agent.prompts import SystemPrompt
+from browser_use.agent.state_prefetch import BrowserStatePrefetcher
+from browser_use.agent.url_interning import URLInterner
 from browser_use.agent.views import (
 	ActionResult,
 	AgentError,
@@ -59,7 +64,7 @@ from browser_use.agent.views import (
 from browser_use.browser.session import DEFAULT_BROWSER_PROFILE
 from browser_use.browser.views import BrowserStateSummary
 from browser_use.config import CONFIG
-from browser_use.dom.views import DOMInteractedElement
+from browser_use.dom.views import DOMInteractedElement, SerializedDOMState, compute_element_hashes
 from browser_use.filesystem.file_system import FileSystem
 from browser_use.observability import observe, observe_debug
 from browser_use.telemetry.service import ProductTelemetry
@@ -67,7 +72,6 @@ from browser_use.telemetry.views import AgentTelemetryEvent
 from browser_use.tools.registry.views import ActionModel
 from browser_use.tools.service import Tools
 from browser_use.utils import (
-	URL_PATTERN,
 	_log_pretty_path,
 	check_latest_browser_use_version,
 	get_browser_use_version,
@@ -116,6 +120,23 @@ def log_response(response: AgentOutput, registry=None, logger=None) -> None:
 		logger.info(f'  \033[34m🎯 Next goal: {next_goal}\033[0m')
 
 
+async def _aenumerate(actions: list[ActionModel] | AsyncIterable[ActionModel]) -> AsyncIterator[tuple[int, ActionModel]]:
+	if isinstance(actions, list):
+		for item in enumerate(actions):
+			yield item
+		return
+	i = 0
+	async for action in actions:
+		yield i, action
+		i += 1
+
+
+async def _iter_queue(queue: 'asyncio.Queue[ActionModel | None]') -> AsyncIterator[ActionModel]:
+	"""Yield actions from the queue until the None sentinel"""
+	while (action := await queue.get()) is not None:
+		yield action
+
+
 Context = TypeVar('Context')
 
 
@@ -166,6 +187,9 @@ class Agent(Generic[Context, AgentStructuredOutput]):
 		flash_mode: bool = False,
 		demo_mode: bool | None = None,
 		max_history_items: int | None = None,
+		max_history_tokens: int | None = None,
+		history_keep_recent_steps: int = 5,
+		history_summary_llm: BaseChatModel | None = None,
 		page_extraction_llm: BaseChatModel | None = None,
 		fallback_llm: BaseChatModel | None = None,
 		use_judge: bool = True,
@@ -185,6 +209,10 @@ class Agent(Generic[Context, AgentStructuredOutput]):
 		include_recent_events: bool = False,
 		sample_images: list[ContentPartTextParam | ContentPartImageParam] | None = None,
 		final_response_after_failure: bool = True,
+		save_dom_archives: bool = False,
+		stream_actions: bool = False,
+		prefetch_browser_state: bool = True,
+		stable_prompt_prefix: bool = False,
 		llm_screenshot_size: tuple[int, int] | None = None,
 		_url_shortening_limit: int = 25,
 		**kwargs,
@@ -293,6 +321,8 @@ class Agent(Generic[Context, AgentStructuredOutput]):
 		self.directly_open_url = directly_open_url
 		self.include_recent_events = include_recent_events
 		self._url_shortening_limit = _url_shortening_limit
+		# Long URLs are shortened in the messages and restored in the actions, with one table for the whole session
+		self._url_interner = URLInterner(limit=_url_shortening_limit)
 		if tools is not None:
 			self.tools = tools
 		elif controller is not None:
@@ -329,21 +359,39 @@ class Agent(Generic[Context, AgentStructuredOutput]):
 			use_thinking=use_thinking,
 			flash_mode=flash_mode,
 			max_history_items=max_history_items,
+			max_history_tokens=max_history_tokens,
+			history_keep_recent_steps=history_keep_recent_steps,
+			history_summary_llm=history_summary_llm,
 			page_extraction_llm=page_extraction_llm,
 			calculate_cost=calculate_cost,
 			include_tool_call_examples=include_tool_call_examples,
 			llm_timeout=llm_timeout,
 			step_timeout=step_timeout,
 			final_response_after_failure=final_response_after_failure,
+			save_dom_archives=save_dom_archives,
+			stream_actions=stream_actions,
+			prefetch_browser_state=prefetch_browser_state,
+			stable_prompt_prefix=stable_prompt_prefix,
 			use_judge=use_judge,
 			ground_truth=ground_truth,
 		)
 
+		# Speculative capture of the next step's browser state while the LLM is thinking
+		self._state_prefetcher: BrowserStatePrefetcher | None = (
+			BrowserStatePrefetcher(self.browser_session, self.tools.registry.action_mutates_page, logger=self.logger)
+			if self.settings.prefetch_browser_state
+			else None
+		)
+		# Whether this agent holds a reference on the pooled LLM clients of its event loop, see run() and close()
+		self._holds_shared_llm_clients = False
+
 		# Token cost service
 		self.token_cost_service = TokenCost(include_cost=calculate_cost)
 		self.token_cost_service.register_llm(llm)
 		self.token_cost_service.register_llm(page_extraction_llm)
 		self.token_cost_service.register_llm(judge_llm)
+		if history_summary_llm is not None:
+			self.token_cost_service.register_llm(history_summary_llm)
 
 		# Initialize state
 		self.state = injected_agent_state or AgentState()
@@ -430,6 +478,16 @@ class Agent(Generic[Context, AgentStructuredOutput]):
 			include_recent_events=self.include_recent_events,
 			sample_images=self.sample_images,
 			llm_screenshot_size=llm_screenshot_size,
+			screenshot_quality=self.browser_session.browser_profile.screenshot_quality,
+			stable_prompt_prefix=self.settings.stable_prompt_prefix,
+			url_interner=self._url_interner,
+			history_compactor=HistoryCompactor(
+				max_tokens=self.settings.max_history_tokens,
+				keep_recent_steps=self.settings.history_keep_recent_steps,
+				summary_llm=self.settings.history_summary_llm,
+			)
+			if self.settings.max_history_tokens is not None
+			else None,
 		)
 
 		if self.sensitive_data:
@@ -676,24 +734,30 @@ class Agent(Generic[Context, AgentStructuredOutput]):
 
 	def _setup_action_models(self) -> None:
 		"""Setup dynamic action models from tools registry"""
+		# Output models per action model, the registry returns the same action model for the same set of actions
+		self._agent_output_types: dict[type[ActionModel], type[AgentOutput]] = {}
+
 		# Initially only include actions with no filters
 		self.ActionModel = self.tools.registry.create_action_model()
 		# Create output model with the dynamic actions
-		if self.settings.flash_mode:
-			self.AgentOutput = AgentOutput.type_with_custom_actions_flash_mode(self.ActionModel)
-		elif self.settings.use_thinking:
-			self.AgentOutput = AgentOutput.type_with_custom_actions(self.ActionModel)
-		else:
-			self.AgentOutput = AgentOutput.type_with_custom_actions_no_thinking(self.ActionModel)
+		self.AgentOutput = self._get_agent_output_type(self.ActionModel)
 
 		# used to force the done action when max_steps is reached
 		self.DoneActionModel = self.tools.registry.create_action_model(include_actions=['done'])
-		if self.settings.flash_mode:
-			self.DoneAgentOutput = AgentOutput.type_with_custom_actions_flash_mode(self.DoneActionModel)
-		elif self.settings.use_thinking:
-			self.DoneAgentOutput = AgentOutput.type_with_custom_actions(self.DoneActionModel)
-		else:
-			self.DoneAgentOutput = AgentOutput.type_with_custom_actions_no_thinking(self.DoneActionModel)
+		self.DoneAgentOutput = self._get_agent_output_type(self.DoneActionModel)
+
+	def _get_agent_output_type(self, action_model: type[ActionModel]) -> type[AgentOutput]:
+		"""The output model for `action_model`, built once per action model"""
+		agent_output = self._agent_output_types.get(action_model)
+		if agent_output is None:
+			if self.settings.flash_mode:
+				agent_output = AgentOutput.type_with_custom_actions_flash_mode(action_model)
+			elif self.settings.use_thinking:
+				agent_output = AgentOutput.type_with_custom_actions(action_model)
+			else:
+				agent_output = AgentOutput.type_with_custom_actions_no_thinking(action_model)
+			self._agent_output_types[action_model] = agent_output
+		return agent_output
 
 	def add_new_task(self, new_task: str) -> None:
 		"""Add a new task to the agent, keeping the same task_id as tasks are continuous"""
@@ -746,13 +810,21 @@ class Agent(Generic[Context, AgentStructuredOutput]):
 			browser_state_summary = await self._prepare_context(step_info)
 
 			# Phase 2: Get model output and execute actions
-			await self._get_next_action(browser_state_summary)
-			await self._execute_actions()
+			if self.settings.stream_actions and supports_streaming(self.llm):
+				await self._stream_next_action_and_execute(browser_state_summary)
+			else:
+				self._start_state_prefetch()
+				await self._get_next_action(browser_state_summary)
+				if self._state_prefetcher is not None:
+					await self._state_prefetcher.settle(browser_state_summary)
+				await self._execute_actions()
 
 			# Phase 3: Post-processing
 			await self._post_process()
 
 		except Exception as e:
+			if self._state_prefetcher is not None:
+				self._state_prefetcher.discard()
 			# Handle ALL exceptions in one place
 			await self._handle_step_error(e)
 
@@ -767,11 +839,15 @@ class Agent(Generic[Context, AgentStructuredOutput]):
 
 		self.logger.debug(f'🌐 Step {self.state.n_steps}: Getting browser state...')
 		# Always take screenshots for all steps
-		self.logger.debug('📸 Requesting browser state with include_screenshot=True')
-		browser_state_summary = await self.browser_session.get_browser_state_summary(
-			include_screenshot=True,  # always capture even if use_vision=False so that cloud sync is useful (it's fast now anyway)
-			include_recent_events=self.include_recent_events,
-		)
+		browser_state_summary = None
+		if self._state_prefetcher is not None:
+			browser_state_summary = await self._state_prefetcher.take(self._last_executed_actions())
+		if browser_state_summary is None:
+			self.logger.debug('📸 Requesting browser state with include_screenshot=True')
+			browser_state_summary = await self.browser_session.get_browser_state_summary(
+				include_screenshot=True,  # always capture even if use_vision=False so that cloud sync is useful (it's fast now anyway)
+				include_recent_events=self.include_recent_events,
+			)
 		if browser_state_summary.screenshot:
 			self.logger.debug(f'📸 Got browser state WITH screenshot, length: {len(browser_state_summary.screenshot)}')
 		else:
@@ -808,6 +884,24 @@ class Agent(Generic[Context, AgentStructuredOutput]):
 		await self._force_done_after_failure()
 		return browser_state_summary
 
+	def _last_executed_actions(self) -> list[ActionModel]:
+		"""Actions of the last model output that actually ran"""
+		if self.state.last_model_output is None or not self.state.last_result:
+			return []
+		return self.state.last_model_output.action[: len(self.state.last_result)]
+
+	def _start_state_prefetch(self) -> None:
+		"""Capture the next step's browser state in the background while the LLM is thinking (`prefetch_browser_state`)
+
+		Not used with `stream_actions`, where actions start while the LLM is still generating.
+		"""
+		if self._state_prefetcher is None:
+			return
+		try:
+			self._state_prefetcher.start(self._last_executed_actions(), include_recent_events=self.include_recent_events)
+		except Exception as e:
+			self.logger.debug(f'Failed to start browser state prefetch: {type(e).__name__}: {e}')
+
 	@observe_debug(ignore_input=True, name='get_next_action')
 	async def _get_next_action(self, browser_state_summary: BrowserStateSummary) -> None:
 		"""Execute LLM interaction with retry logic and handle callbacks"""
@@ -852,6 +946,118 @@ class Agent(Generic[Context, AgentStructuredOutput]):
 		result = await self.multi_act(self.state.last_model_output.action)
 		self.state.last_result = result
 
+	@observe_debug(ignore_input=True, name='stream_next_action')
+	async def _stream_next_action_and_execute(self, browser_state_summary: BrowserStateSummary) -> None:
+		"""Stream the LLM response and execute each action as soon as it is fully generated (`stream_actions`).
+
+		Actions are validated one by one while the rest of the response is still streaming and handed to `multi_act`
+		through a queue. The complete response is validated as usual and becomes the step's model output. Step callbacks
+		and conversation saving see the complete response before any action runs, like without streaming, so actions
+		only start early when neither is configured. If the stream fails before any action was started, the step falls
+		back to a regular LLM call. If it fails afterwards, the response is salvaged up to the last complete action.
+		"""
+		llm = self.llm
+		assert supports_streaming(llm), 'stream_actions needs a chat model with astream'
+		dispatch_early = not self.register_new_step_callback and not self.settings.save_conversation_path
+		input_messages = self._message_manager.get_messages()
+		self.logger.debug(
+			f'🤖 Step {self.state.n_steps}: Streaming LLM response with {len(input_messages)} messages (model: {self.llm.model})...'
+		)
+		parser = StreamingJSONArrayParser('action')
+		action_queue: asyncio.Queue[ActionModel | None] = asyncio.Queue()
+		dispatched_actions: list[ActionModel] = []
+		act_task: asyncio.Task[list[ActionResult]] | None = None
+
+		def dispatch(action: ActionModel) -> None:
+			nonlocal act_task
+			# Replace any shortened URLs in the action back to original URLs
+			self._url_interner.restore_action(action)
+			dispatched_actions.append(action)
+			action_queue.put_nowait(action)
+			if act_task is None:
+				act_task = asyncio.create_task(self.multi_act(_iter_queue(action_queue)))
+
+		async def stream_model_output() -> AgentOutput:
+			dispatching = dispatch_early
+			completion = None
+			async for chunk in llm.astream(input_messages, output_format=self.AgentOutput):
+				if chunk.delta and dispatching:
+					for item in parser.feed(chunk.delta):
+						if len(dispatched_actions) >= self.settings.max_actions_per_step:
+							break
+						try:
+							action = self.ActionModel.model_validate(item)
+						except ValidationError as e:
+							# leave the rest to the validation of the complete response
+							self.logger.debug(f'Streamed action failed validation, not dispatching early: {e}')
+							dispatching = False
+							break
+						await self._check_stop_or_pause()
+						dispatch(action)
+				if chunk.completion is not None:
+					completion = chunk.completion
+			if completion is None:
+				raise ModelProviderError(message='Stream ended without a final response', model=self.llm.name)
+			return completion.completion  # type: ignore[return-value]
+
+		try:
+			try:
+				model_output = await asyncio.wait_for(stream_model_output(), timeout=self.settings.llm_timeout)
+				model_output = await self._process_model_output(model_output)
+			except Exception as e:
+				if isinstance(e, InterruptedError):
+					raise
+				if act_task is None and isinstance(e, TimeoutError):
+					raise TimeoutError(
+						f'LLM call timed out after {self.settings.llm_timeout} seconds. Keep your thinking and output short.'
+					)
+				if act_task is None:
+					self.logger.warning(f'⚠️ Streaming LLM response failed ({type(e).__name__}: {e}), retrying without streaming')
+					model_output = await asyncio.wait_for(
+						self._get_model_output_with_retry(input_messages), timeout=self.settings.llm_timeout
+					)
+				else:
+					# actions were already started, keep the response up to the last complete action
+					repaired_text = parser.repaired_text()
+					if repaired_text is None:
+						raise
+					try:
+						model_output = self.AgentOutput.model_validate_json(repaired_text)
+					except ValidationError:
+						raise e
+					self.logger.warning(
+						f'⚠️ Streaming LLM response failed after {len(dispatched_actions)} action(s) started '
+						f'({type(e).__name__}: {e}), keeping the response up to the last complete action'
+					)
+					model_output = await self._process_model_output(model_output)
+					model_output.action = model_output.action[: len(dispatched_actions)]
+
+			if act_task is None and self._is_empty_model_output(model_output):
+				model_output = await self._retry_empty_action(input_messages)
+
+			# the complete response is authoritative for the actions that were not started yet
+			started = len(dispatched_actions)
+			model_output.action = dispatched_actions + model_output.action[started:]
+
+			self.state.last_model_output = model_output
+			await self._handle_post_llm_processing(browser_state_summary, input_messages)
+
+			for action in model_output.action[started:]:
+				await self._check_stop_or_pause()
+				dispatch(action)
+			action_queue.put_nowait(None)
+
+			assert act_task is not None
+			self.state.last_result = await act_task
+		finally:
+			if act_task is not None:
+				if not act_task.done():
+					act_task.cancel()
+				await asyncio.gather(act_task, return_exceptions=True)
+
+		# check again if Ctrl+C was pressed before we commit the output to history
+		await self._check_stop_or_pause()
+
 	async def _post_process(self) -> None:
 		"""Handle post-action processing like download tracking and result logging"""
 		assert self.browser_session is not None, 'BrowserSession is not set up'
@@ -1076,32 +1282,42 @@ class Agent(Generic[Context, AgentStructuredOutput]):
 			f'✅ Step {self.state.n_steps}: Got LLM response with {len(model_output.action) if model_output.action else 0} actions'
 		)
 
-		if (
+		if self._is_empty_model_output(model_output):
+			model_output = await self._retry_empty_action(input_messages)
+
+		return model_output
+
+	@staticmethod
+	def _is_empty_model_output(model_output: AgentOutput) -> bool:
+		return (
 			not model_output.action
 			or not isinstance(model_output.action, list)
 			or all(action.model_dump() == {} for action in model_output.action)
-		):
-			self.logger.warning('Model returned empty action. Retrying...')
+		)
 
-			clarification_message = UserMessage(
-				content='You forgot to return an action. Please respond with a valid JSON action according to the expected schema with your assessment and next actions.'
-			)
+	async def _retry_empty_action(self, input_messages: list[BaseMessage]) -> AgentOutput:
+		"""Ask the model again after it returned no action, falls back to a failed `done` action"""
+		self.logger.warning('Model returned empty action. Retrying...')
 
-			retry_messages = input_messages + [clarification_message]
-			model_output = await self.get_model_output(retry_messages)
-
-			if not model_output.action or all(action.model_dump() == {} for action in model_output.action):
-				self.logger.warning('Model still returned empty after retry. Inserting safe noop action.')
-				action_instance = self.ActionModel()
-				setattr(
-					action_instance,
-					'done',
-					{
-						'success': False,
-						'text': 'No next action returned by LLM!',
-					},
-				)
-				model_output.action = [action_instance]
+		clarification_message = UserMessage(
+			content='You forgot to return an action. Please respond with a valid JSON action according to the expected schema with your assessment and next actions.'
+		)
+
+		retry_messages = input_messages + [clarification_message]
+		model_output = await self.get_model_output(retry_messages)
+
+		if not model_output.action or all(action.model_dump() == {} for action in model_output.action):
+			self.logger.warning('Model still returned empty after retry. Inserting safe noop action.')
+			action_instance = self.ActionModel()
+			setattr(
+				action_instance,
+				'done',
+				{
+					'success': False,
+					'text': 'No next action returned by LLM!',
+				},
+			)
+			model_output.action = [action_instance]
 
 		return model_output
 
@@ -1137,6 +1353,20 @@ class Agent(Generic[Context, AgentStructuredOutput]):
 				self.settings.save_conversation_path_encoding,
 			)
 
+	def _store_dom_archive(
+		self, dom_state: SerializedDOMState, interacted_elements: list[DOMInteractedElement | None], step_number: int
+	) -> str:
+		"""Write the step's DOM state as a binary DOM archive and point the interacted elements into it"""
+		from browser_use.dom.binary_format import DOMArchiveWriter
+
+		writer = DOMArchiveWriter.from_serialized_dom_state(dom_state)
+		for element in interacted_elements:
+			if element is not None and element.backend_node_id in dom_state.selector_map:
+				element.archive_node_index = writer.index_of(dom_state.selector_map[element.backend_node_id])
+		path = writer.write(self.agent_directory / 'dom_archives' / f'step_{step_number}.budom')
+		self.logger.debug(f'🗜️ DOM archive stored at: {path}')
+		return str(path)
+
 	async def _make_history_item(
 		self,
 		model_output: AgentOutput | None,
@@ -1147,6 +1377,7 @@ class Agent(Generic[Context, AgentStructuredOutput]):
 	) -> None:
 		"""Create and store history item"""
 
+		interacted_elements: list[DOMInteractedElement | None]
 		if model_output:
 			interacted_elements = AgentHistory.get_interacted_element(model_output, browser_state_summary.dom_state.selector_map)
 		else:
@@ -1163,12 +1394,22 @@ class Agent(Generic[Context, AgentStructuredOutput]):
 		else:
 			self.logger.debug(f'📸 No screenshot in browser_state_summary for step {self.state.n_steps}')
 
+		dom_archive_path = None
+		if self.settings.save_dom_archives and browser_state_summary.dom_state._root is not None:
+			try:
+				dom_archive_path = await asyncio.to_thread(
+					self._store_dom_archive, browser_state_summary.dom_state, interacted_elements, self.state.n_steps
+				)
+			except Exception as e:
+				self.logger.warning(f'Failed to store DOM archive for step {self.state.n_steps}: {type(e).__name__}: {e}')
+
 		state_history = BrowserStateHistory(
 			url=browser_state_summary.url,
 			title=browser_state_summary.title,
 			tabs=browser_state_summary.tabs,
 			interacted_element=interacted_elements,
 			screenshot_path=screenshot_path,
+			dom_archive_path=dom_archive_path,
 		)
 
 		history_item = AgentHistory(
@@ -1191,164 +1432,11 @@ class Agent(Generic[Context, AgentStructuredOutput]):
 		text = re.sub(STRAY_CLOSE_TAG, '', text)
 		return text.strip()
 
-	# region - URL replacement
-	def _replace_urls_in_text(self, text: str) -> tuple[str, dict[str, str]]:
-		"""Replace URLs in a text string"""
-
-		replaced_urls: dict[str, str] = {}
-
-		def replace_url(match: re.Match) -> str:
-			"""Url can only have 1 query and 1 fragment"""
-			import hashlib
-
-			original_url = match.group(0)
-
-			# Find where the query/fragment starts
-			query_start = original_url.find('?')
-			fragment_start = original_url.find('#')
-
-			# Find the earliest position of query or fragment
-			after_path_start = len(original_url)  # Default: no query/fragment
-			if query_start != -1:
-				after_path_start = min(after_path_start, query_start)
-			if fragment_start != -1:
-				after_path_start = min(after_path_start, fragment_start)
-
-			# Split URL into base (up to path) and after_path (query + fragment)
-			base_url = original_url[:after_path_start]
-			after_path = original_url[after_path_start:]
-
-			# If after_path is within the limit, don't shorten
-			if len(after_path) <= self._url_shortening_limit:
-				return original_url
-
-			# If after_path is too long, truncate and add hash
-			if after_path:
-				truncated_after_path = after_path[: self._url_shortening_limit]
-				# Create a short hash of the full after_path content
-				hash_obj = hashlib.md5(after_path.encode('utf-8'))
-				short_hash = hash_obj.hexdigest()[:7]
-				# Create shortened URL
-				shortened = f'{base_url}{truncated_after_path}...{short_hash}'
-				# Only use shortened URL if it's actually shorter than the original
-				if len(shortened) < len(original_url):
-					replaced_urls[shortened] = original_url
-					return shortened
-
-			return original_url
-
-		return URL_PATTERN.sub(replace_url, text), replaced_urls
-
-	def _process_messsages_and_replace_long_urls_shorter_ones(self, input_messages: list[BaseMessage]) -> dict[str, str]:
-		"""Replace long URLs with shorter ones
-		? @dev edits input_messages in place
-
-		returns:
-			tuple[filtered_input_messages, urls we replaced {shorter_url: original_url}]
-		"""
-		from browser_use.llm.messages import AssistantMessage, UserMessage
-
-		urls_replaced: dict[str, str] = {}
-
-		# Process each message, in place
-		for message in input_messages:
-			# no need to process SystemMessage, we have control over that anyway
-			if isinstance(message, (UserMessage, AssistantMessage)):
-				if isinstance(message.content, str):
-					# Simple string content
-					message.content, replaced_urls = self._replace_urls_in_text(message.content)
-					urls_replaced.update(replaced_urls)
-
-				elif isinstance(message.content, list):
-					# List of content parts
-					for part in message.content:
-						if isinstance(part, ContentPartTextParam):
-							part.text, replaced_urls = self._replace_urls_in_text(part.text)
-							urls_replaced.update(replaced_urls)
-
-		return urls_replaced
-
-	@staticmethod
-	def _recursive_process_all_strings_inside_pydantic_model(model: BaseModel, url_replacements: dict[str, str]) -> None:
-		"""Recursively process all strings inside a Pydantic model, replacing shortened URLs with originals in place."""
-		for field_name, field_value in model.__dict__.items():
-			if isinstance(field_value, str):
-				# Replace shortened URLs with original URLs in string
-				processed_string = Agent._replace_shortened_urls_in_string(field_value, url_replacements)
-				setattr(model, field_name, processed_string)
-			elif isinstance(field_value, BaseModel):
-				# Recursively process nested Pydantic models
-				Agent._recursive_process_all_strings_inside_pydantic_model(field_value, url_replacements)
-			elif isinstance(field_value, dict):
-				# Process dictionary values in place
-				Agent._recursive_process_dict(field_value, url_replacements)
-			elif isinstance(field_value, (list, tuple)):
-				processed_value = Agent._recursive_process_list_or_tuple(field_value, url_replacements)
-				setattr(model, field_name, processed_value)
-
-	@staticmethod
-	def _recursive_process_dict(dictionary: dict, url_replacements: dict[str, str]) -> None:
-		"""Helper method to process dictionaries."""
-		for k, v in dictionary.items():
-			if isinstance(v, str):
-				dictionary[k] = Agent._replace_shortened_urls_in_string(v, url_replacements)
-			elif isinstance(v, BaseModel):
-				Agent._recursive_process_all_strings_inside_pydantic_model(v, url_replacements)
-			elif isinstance(v, dict):
-				Agent._recursive_process_dict(v, url_replacements)
-			elif isinstance(v, (list, tuple)):
-				dictionary[k] = Agent._recursive_process_list_or_tuple(v, url_replacements)
-
-	@staticmethod
-	def _recursive_process_list_or_tuple(container: list | tuple, url_replacements: dict[str, str]) -> list | tuple:
-		"""Helper method to process lists and tuples."""
-		if isinstance(container, tuple):
-			# For tuples, create a new tuple with processed items
-			processed_items = []
-			for item in container:
-				if isinstance(item, str):
-					processed_items.append(Agent._replace_shortened_urls_in_string(item, url_replacements))
-				elif isinstance(item, BaseModel):
-					Agent._recursive_process_all_strings_inside_pydantic_model(item, url_replacements)
-					processed_items.append(item)
-				elif isinstance(item, dict):
-					Agent._recursive_process_dict(item, url_replacements)
-					processed_items.append(item)
-				elif isinstance(item, (list, tuple)):
-					processed_items.append(Agent._recursive_process_list_or_tuple(item, url_replacements))
-				else:
-					processed_items.append(item)
-			return tuple(processed_items)
-		else:
-			# For lists, modify in place
-			for i, item in enumerate(container):
-				if isinstance(item, str):
-					container[i] = Agent._replace_shortened_urls_in_string(item, url_replacements)
-				elif isinstance(item, BaseModel):
-					Agent._recursive_process_all_strings_inside_pydantic_model(item, url_replacements)
-				elif isinstance(item, dict):
-					Agent._recursive_process_dict(item, url_replacements)
-				elif isinstance(item, (list, tuple)):
-					container[i] = Agent._recursive_process_list_or_tuple(item, url_replacements)
-			return container
-
-	@staticmethod
-	def _replace_shortened_urls_in_string(text: str, url_replacements: dict[str, str]) -> str:
-		"""Replace all shortened URLs in a string with their original URLs."""
-		result = text
-		for shortened_url, original_url in url_replacements.items():
-			result = result.replace(shortened_url, original_url)
-		return result
-
-	# endregion - URL replacement
-
 	@time_execution_async('--get_next_action')
 	@observe_debug(ignore_input=True, ignore_output=True, name='get_model_output')
 	async def get_model_output(self, input_messages: list[BaseMessage]) -> AgentOutput:
 		"""Get next action from LLM based on current state"""
 
-		urls_replaced = self._process_messsages_and_replace_long_urls_shorter_ones(input_messages)
-
 		# Build kwargs for ainvoke
 		# Note: ChatBrowserUse will automatically generate action descriptions from output_format schema
 		kwargs: dict = {'output_format': self.AgentOutput}
@@ -1356,21 +1444,7 @@ class Agent(Generic[Context, AgentStructuredOutput]):
 		try:
 			response = await self.llm.ainvoke(input_messages, **kwargs)
 			parsed: AgentOutput = response.completion  # type: ignore[assignment]
-
-			# Replace any shortened URLs in the LLM response back to original URLs
-			if urls_replaced:
-				self._recursive_process_all_strings_inside_pydantic_model(parsed, urls_replaced)
-
-			# cut the number of actions to max_actions_per_step if needed
-			if len(parsed.action) > self.settings.max_actions_per_step:
-				parsed.action = parsed.action[: self.settings.max_actions_per_step]
-
-			if not (hasattr(self.state, 'paused') and (self.state.paused or self.state.stopped)):
-				log_response(parsed, self.tools.registry.registry, self.logger)
-				await self._broadcast_model_state(parsed)
-
-			self._log_next_action_summary(parsed)
-			return parsed
+			return await self._process_model_output(parsed)
 		except ValidationError:
 			# Just re-raise - Pydantic's validation errors are already descriptive
 			raise
@@ -1382,6 +1456,23 @@ class Agent(Generic[Context, AgentStructuredOutput]):
 			# Retry with the fallback LLM
 			return await self.get_model_output(input_messages)
 
+	async def _process_model_output(self, parsed: AgentOutput) -> AgentOutput:
+		"""Restore shortened URLs, limit the number of actions and log the parsed model output"""
+		# Replace shortened URLs in the actions back to original URLs, the rest of the response stays shortened
+		for action in parsed.action:
+			self._url_interner.restore_action(action)
+
+		# cut the number of actions to max_actions_per_step if needed
+		if len(parsed.action) > self.settings.max_actions_per_step:
+			parsed.action = parsed.action[: self.settings.max_actions_per_step]
+
+		if not (hasattr(self.state, 'paused') and (self.state.paused or self.state.stopped)):
+			log_response(parsed, self.tools.registry.registry, self.logger)
+			await self._broadcast_model_state(parsed)
+
+		self._log_next_action_summary(parsed)
+		return parsed
+
 	def _try_switch_to_fallback_llm(self, error: ModelRateLimitError | ModelProviderError) -> bool:
 		"""
 		Attempt to switch to a fallback LLM after a rate limit or provider error.
@@ -1927,6 +2018,10 @@ class Agent(Generic[Context, AgentStructuredOutput]):
 		)
 		signal_handler.register()
 
+		if not self._holds_shared_llm_clients:
+			acquire_shared_clients()
+			self._holds_shared_llm_clients = True
+
 		try:
 			await self._log_agent_run()
 
@@ -2103,11 +2198,16 @@ class Agent(Generic[Context, AgentStructuredOutput]):
 
 	@observe_debug(ignore_input=True, ignore_output=True)
 	@time_execution_async('--multi_act')
-	async def multi_act(self, actions: list[ActionModel]) -> list[ActionResult]:
-		"""Execute multiple actions"""
+	async def multi_act(self, actions: list[ActionModel] | AsyncIterable[ActionModel]) -> list[ActionResult]:
+		"""Execute multiple actions, `actions` can also be a stream of actions that are still being generated
+
+		Actions registered with `mutates_page=False` (e.g. `extract` or the file actions) run concurrently with each
+		other, actions on the same file stay in order. An action that can change the page first waits for all earlier
+		actions, and `wait_between_actions` is only slept after actions that can have changed the page. Results are
+		returned in action order, no action is started once an earlier one ended with an error or `done`.
+		"""
 		results: list[ActionResult] = []
-		time_elapsed = 0
-		total_actions = len(actions)
+		total_actions = len(actions) if isinstance(actions, list) else None
 
 		assert self.browser_session is not None, 'BrowserSession is not set up'
 		try:
@@ -2116,6 +2216,7 @@ class Agent(Generic[Context, AgentStructuredOutput]):
 				and self.browser_session._cached_browser_state_summary.dom_state is not None
 			):
 				cached_selector_map = dict(self.browser_session._cached_browser_state_summary.dom_state.selector_map)
+				compute_element_hashes(cached_selector_map.values())
 				cached_element_hashes = {e.parent_branch_hash() for e in cached_selector_map.values()}
 			else:
 				cached_selector_map = {}
@@ -2125,20 +2226,58 @@ class Agent(Generic[Context, AgentStructuredOutput]):
 			cached_selector_map = {}
 			cached_element_hashes = set()
 
-		for i, action in enumerate(actions):
-			if i > 0:
-				# ONLY ALLOW TO CALL `done` IF IT IS A SINGLE ACTION
-				if action.model_dump(exclude_unset=True).get('done') is not None:
-					msg = f'Done action is allowed only as a single action - stopped after action {i} / {total_actions}.'
-					self.logger.debug(msg)
+		# Page-inert actions that are still running, in action order
+		running: list[asyncio.Task[ActionResult]] = []
+		last_task_by_file: dict[str, asyncio.Task[ActionResult]] = {}
+
+		async def collect_running() -> bool:
+			"""Add the results of the running actions in order, returns whether one of them ended the step"""
+			try:
+				for task in running:
+					results.append(await task)
+			finally:
+				await cancel_running()
+			return any(result.is_done or result.error for result in results)
+
+		async def cancel_running() -> None:
+			for task in running:
+				task.cancel()
+			await asyncio.gather(*running, return_exceptions=True)
+			running.clear()
+			last_task_by_file.clear()
+
+		def running_action_ended_step() -> bool:
+			"""Whether one of the running actions already finished with an error or `done`"""
+			for task in running:
+				if task.done() and not task.cancelled() and task.exception() is None:
+					result = task.result()
+					if result.is_done or result.error:
+						return True
+			return False
+
+		try:
+			previous_mutated_page = False
+			async for i, action in _aenumerate(actions):
+				if i > 0:
+					# ONLY ALLOW TO CALL `done` IF IT IS A SINGLE ACTION
+					if action.model_dump(exclude_unset=True).get('done') is not None:
+						msg = (
+							f'Done action is allowed only as a single action - stopped after action {i} / {total_actions or "?"}.'
+						)
+						self.logger.debug(msg)
+						break
+
+				mutates_page = self.tools.registry.action_mutates_page(action)
+				# Page-changing actions only run once everything before them is done, page-inert ones only while no
+				# earlier action has ended the step
+				if running and (mutates_page or running_action_ended_step()) and await collect_running():
 					break
 
-			# wait between actions (only after first action)
-			if i > 0:
-				self.logger.debug(f'Waiting {self.browser_profile.wait_between_actions} seconds between actions')
-				await asyncio.sleep(self.browser_profile.wait_between_actions)
+				# wait between actions, only after actions that can have changed the page
+				if i > 0 and previous_mutated_page:
+					self.logger.debug(f'Waiting {self.browser_profile.wait_between_actions} seconds between actions')
+					await asyncio.sleep(self.browser_profile.wait_between_actions)
 
-			try:
 				await self._check_stop_or_pause()
 				# Get action name from the action model
 				action_data = action.model_dump(exclude_unset=True)
@@ -2147,61 +2286,86 @@ class Agent(Generic[Context, AgentStructuredOutput]):
 				# Log action before execution
 				await self._log_action(action, action_name, i + 1, total_actions)
 
-				time_start = time.time()
-
-				result = await self.tools.act(
-					action=action,
-					browser_session=self.browser_session,
-					file_system=self.file_system,
-					page_extraction_llm=self.settings.page_extraction_llm,
-					sensitive_data=self.sensitive_data,
-					available_file_paths=self.available_file_paths,
-				)
-
-				time_end = time.time()
-				time_elapsed = time_end - time_start
-
-				if result.error:
-					await self._demo_mode_log(
-						f'Action "{action_name}" failed: {result.error}',
-						'error',
-						{'action': action_name, 'step': self.state.n_steps},
-					)
-				elif result.is_done:
-					completion_text = result.long_term_memory or result.extracted_content or 'Task marked as done.'
-					level = 'success' if result.success is not False else 'warning'
-					await self._demo_mode_log(
-						completion_text,
-						level,
-						{'action': action_name, 'step': self.state.n_steps},
+				if mutates_page:
+					result = await self._execute_action(action, action_name, i)
+					results.append(result)
+					if result.is_done or result.error:
+						break
+				else:
+					params = action_data.get(action_name)
+					file_name = params.get('file_name') if isinstance(params, dict) else None
+					task = asyncio.create_task(
+						self._execute_action(action, action_name, i, after=last_task_by_file.get(file_name or ''))
 					)
+					running.append(task)
+					if file_name:
+						last_task_by_file[file_name] = task
 
-				results.append(result)
-
-				if results[-1].is_done or results[-1].error or i == total_actions - 1:
+				if total_actions is not None and i == total_actions - 1:
 					break
+				previous_mutated_page = mutates_page
 
-			except Exception as e:
-				# Handle any exceptions during action execution
-				self.logger.error(f'❌ Executing action {i + 1} failed -> {type(e).__name__}: {e}')
-				await self._demo_mode_log(
-					f'Action "{action_name}" raised {type(e).__name__}: {e}',
-					'error',
-					{'action': action_name, 'step': self.state.n_steps},
-				)
-				raise e
+			if running:
+				await collect_running()
+		finally:
+			await cancel_running()
 
 		return results
 
-	async def _log_action(self, action, action_name: str, action_num: int, total_actions: int) -> None:
-		"""Log the action before execution with colored formatting"""
+	async def _execute_action(
+		self, action: ActionModel, action_name: str, index: int, after: asyncio.Task | None = None
+	) -> ActionResult:
+		"""Execute a single action of `multi_act`, after the `after` task finished"""
+		if after is not None:
+			await asyncio.wait([after])
+
+		try:
+			result = await self.tools.act(
+				action=action,
+				browser_session=self.browser_session,
+				file_system=self.file_system,
+				page_extraction_llm=self.settings.page_extraction_llm,
+				sensitive_data=self.sensitive_data,
+				available_file_paths=self.available_file_paths,
+			)
+		except Exception as e:
+			# Handle any exceptions during action execution
+			self.logger.error(f'❌ Executing action {index + 1} failed -> {type(e).__name__}: {e}')
+			await self._demo_mode_log(
+				f'Action "{action_name}" raised {type(e).__name__}: {e}',
+				'error',
+				{'action': action_name, 'step': self.state.n_steps},
+			)
+			raise e
+
+		if result.error:
+			await self._demo_mode_log(
+				f'Action "{action_name}" failed: {result.error}',
+				'error',
+				{'action': action_name, 'step': self.state.n_steps},
+			)
+		elif result.is_done:
+			completion_text = result.long_term_memory or result.extracted_content or 'Task marked as done.'
+			level = 'success' if result.success is not False else 'warning'
+			await self._demo_mode_log(
+				completion_text,
+				level,
+				{'action': action_name, 'step': self.state.n_steps},
+			)
+		return result
+
+	async def _log_action(self, action, action_name: str, action_num: int, total_actions: int | None) -> None:
+		"""Log the action before execution with colored formatting, `total_actions` is None while still streaming"""
 		# Color definitions
 		blue = '\033[34m'  # Action name
 		magenta = '\033[35m'  # Parameter names
 		reset = '\033[0m'
 
 		# Format action number and name
-		if total_actions > 1:
+		if total_actions is None:
+			action_header = f'▶️  [{action_num}] {blue}{action_name}{reset}:'
+			plain_header = f'▶️  [{action_num}] {action_name}:'
+		elif total_actions > 1:
 			action_header = f'▶️  [{action_num}/{total_actions}] {blue}{action_name}{reset}:'
 			plain_header = f'▶️  [{action_num}/{total_actions}] {action_name}:'
 		else:
@@ -2660,7 +2824,7 @@ class Agent(Generic[Context, AgentStructuredOutput]):
 		if not historical_element or not browser_state_summary.dom_state.selector_map:
 			return action
 
-		# selector_hash_map = {hash(e): e for e in browser_state_summary.dom_state.selector_map.values()}
+		compute_element_hashes(browser_state_summary.dom_state.selector_map.values())
 
 		highlight_index, current_element = next(
 			(
@@ -2775,6 +2939,15 @@ class Agent(Generic[Context, AgentStructuredOutput]):
 	async def close(self):
 		"""Close all resources"""
 		try:
+			if self._state_prefetcher is not None:
+				self._state_prefetcher.discard()
+			if self._message_manager.history_compactor is not None:
+				self._message_manager.history_compactor.cancel()
+			if self._holds_shared_llm_clients:
+				# Closes the pooled LLM connections once no other agent on this loop uses them
+				self._holds_shared_llm_clients = False
+				await release_shared_clients()
+
 			# Only close browser if keep_alive is False (or not set)
 			if self.browser_session is not None:
 				if not self.browser_session.browser_profile.keep_alive:
@@ -2805,24 +2978,14 @@ class Agent(Generic[Context, AgentStructuredOutput]):
 
 	async def _update_action_models_for_page(self, page_url: str) -> None:
 		"""Update action models with page-specific actions"""
-		# Create new action model with current page's filtered actions
+		# Action model with current page's filtered actions, cached by the registry per set of actions
 		self.ActionModel = self.tools.registry.create_action_model(page_url=page_url)
 		# Update output model with the new actions
-		if self.settings.flash_mode:
-			self.AgentOutput = AgentOutput.type_with_custom_actions_flash_mode(self.ActionModel)
-		elif self.settings.use_thinking:
-			self.AgentOutput = AgentOutput.type_with_custom_actions(self.ActionModel)
-		else:
-			self.AgentOutput = AgentOutput.type_with_custom_actions_no_thinking(self.ActionModel)
+		self.AgentOutput = self._get_agent_output_type(self.ActionModel)
 
 		# Update done action model too
 		self.DoneActionModel = self.tools.registry.create_action_model(include_actions=['done'], page_url=page_url)
-		if self.settings.flash_mode:
-			self.DoneAgentOutput = AgentOutput.type_with_custom_actions_flash_mode(self.DoneActionModel)
-		elif self.settings.use_thinking:
-			self.DoneAgentOutput = AgentOutput.type_with_custom_actions(self.DoneActionModel)
-		else:
-			self.DoneAgentOutput = AgentOutput.type_with_custom_actions_no_thinking(self.DoneActionModel)
+		self.DoneAgentOutput = self._get_agent_output_type(self.DoneActionModel)
 
 	async def authenticate_cloud_sync(self, show_instructions: bool = True) -> bool:
 		"""
@@ -0,0 +1,182 @@
+"""
+Speculative browser state prefetch.
+
+While the LLM is thinking about step N, the browser is idle. `BrowserStatePrefetcher` uses that time to capture the
+browser state for step N+1 in the background. After the actions of step N ran, the prefetched state is only reused if
+none of them could have changed the page (see `mutates_page` of registered actions) and a few cheap checks confirm the
+page is still the one that was captured: same focused target and URL, same DOM mutation counter, no page-affecting
+browser event since the capture started. Otherwise it is dropped and the next step captures the state as usual.
+
+Without the DOM mutation counter (`incremental_dom_snapshots` disabled) a page changed by its own scripts cannot be told
+apart from an unchanged one, so nothing is prefetched then.
+"""
+
+import asyncio
+import logging
+import time
+from collections.abc import Callable, Sequence
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+	from browser_use.browser.session import BrowserSession
+	from browser_use.browser.views import BrowserStateSummary
+	from browser_use.tools.registry.views import ActionModel
+
+
+@dataclass
+class _Prefetch:
+	task: 'asyncio.Task[BrowserStateSummary]'
+	target_id: str
+	url: str
+	dom_version: int
+	"""DOM mutation counter when the capture started"""
+	started_at: float
+	"""time.time() when the capture started"""
+
+
+class BrowserStatePrefetcher:
+	"""Captures the next step's browser state while the LLM is thinking, and hands it out if it is still valid."""
+
+	def __init__(
+		self,
+		browser_session: 'BrowserSession',
+		action_mutates_page: Callable[['ActionModel'], bool],
+		logger: logging.Logger | None = None,
+	):
+		self.browser_session = browser_session
+		self.action_mutates_page = action_mutates_page
+		self.logger = logger or logging.getLogger(__name__)
+		self._prefetch: _Prefetch | None = None
+		self.hits = 0
+		self.misses = 0
+
+	def start(self, previous_actions: Sequence['ActionModel'] = (), include_recent_events: bool = False) -> bool:
+		"""Start capturing the next browser state in the background.
+
+		Only starts if DOM mutations are tracked and the page is idle or the previous step's actions could not change
+		the page, a page that is still loading would be stale by the time the next step starts.
+
+		Returns:
+			Whether a capture was started
+		"""
+		self.discard()
+
+		dom_watchdog = self.browser_session._dom_watchdog
+		target_id = self.browser_session.agent_focus_target_id
+		if dom_watchdog is None or target_id is None or self.browser_session.session_manager is None:
+			return False
+		target = self.browser_session.session_manager.get_target(target_id)
+		if target is None or target.url.lower().split(':', 1)[0] not in ('http', 'https'):
+			return False
+
+		dom_version = dom_watchdog.get_dom_version(target_id)
+		if dom_version is None:
+			return False
+
+		previous_actions_inert = bool(previous_actions) and not any(map(self.action_mutates_page, previous_actions))
+		if not previous_actions_inert and not dom_watchdog.is_page_idle(target_id):
+			return False
+
+		self._prefetch = _Prefetch(
+			task=asyncio.create_task(
+				self.browser_session.get_browser_state_summary(
+					include_screenshot=True, include_recent_events=include_recent_events
+				)
+			),
+			target_id=target_id,
+			url=target.url,
+			dom_version=dom_version,
+			started_at=time.time(),
+		)
+		self.logger.debug(f'🔮 Prefetching next browser state for {target.url}')
+		return True
+
+	async def settle(self, current_state: 'BrowserStateSummary') -> None:
+		"""Wait for a running capture, then make `current_state` the session's cached state again.
+
+		Call this before executing the step's actions: they refer to element indices of the state the LLM saw, and new
+		elements in the next state are marked relative to it.
+		"""
+		prefetch = self._prefetch
+		if prefetch is None:
+			return
+		await asyncio.gather(prefetch.task, return_exceptions=True)
+		dom_watchdog = self.browser_session._dom_watchdog
+		if dom_watchdog is not None and self.browser_session._cached_browser_state_summary is not current_state:
+			dom_watchdog.restore_cached_state(current_state)
+
+	async def take(self, executed_actions: Sequence['ActionModel']) -> 'BrowserStateSummary | None':
+		"""The prefetched state if it is still valid after `executed_actions` ran, None otherwise.
+
+		The prefetch is consumed either way.
+		"""
+		prefetch = self._prefetch
+		if prefetch is None:
+			return None
+		self._prefetch = None
+
+		reason = self._invalid_reason(prefetch, executed_actions)
+		state = None
+		if reason is None:
+			try:
+				state = await prefetch.task
+			except Exception as e:
+				reason = f'capture failed ({type(e).__name__}: {e})'
+		if reason is None and state is not None:
+			# The page may have changed while the capture was still running
+			reason = self._invalid_reason(prefetch, executed_actions)
+
+		if reason is not None or state is None:
+			self.misses += 1
+			self.logger.debug(f'🔮 Dropping prefetched browser state: {reason}')
+			await self._drop(prefetch)
+			return None
+
+		self.hits += 1
+		self.logger.debug(f'🔮 Reusing browser state prefetched {time.time() - prefetch.started_at:.1f}s ago')
+		dom_watchdog = self.browser_session._dom_watchdog
+		if dom_watchdog is not None:
+			dom_watchdog.restore_cached_state(state)
+		return state
+
+	def _invalid_reason(self, prefetch: _Prefetch, executed_actions: Sequence['ActionModel']) -> str | None:
+		if any(map(self.action_mutates_page, executed_actions)):
+			return 'page-changing actions ran'
+		if self.browser_session.agent_focus_target_id != prefetch.target_id:
+			return 'focused tab changed'
+
+		session_manager = self.browser_session.session_manager
+		target = session_manager.get_target(prefetch.target_id) if session_manager else None
+		if target is None or target.url != prefetch.url:
+			return 'URL changed'
+
+		dom_watchdog = self.browser_session._dom_watchdog
+		if dom_watchdog is None:
+			return 'DOM watchdog is gone'
+		if dom_watchdog.get_dom_version(prefetch.target_id) != prefetch.dom_version:
+			return 'DOM mutated'
+		event_type = dom_watchdog.get_page_affecting_event_since(prefetch.started_at)
+		if event_type is not None:
+			return f'{event_type} ran'
+		return None
+
+	async def _drop(self, prefetch: _Prefetch) -> None:
+		if not prefetch.task.done():
+			prefetch.task.cancel()
+		await asyncio.gather(prefetch.task, return_exceptions=True)
+
+	def discard(self) -> None:
+		"""Drop a pending prefetch, e.g. when the step failed or the run ended."""
+		prefetch = self._prefetch
+		if prefetch is None:
+			return
+		self._prefetch = None
+		if not prefetch.task.done():
+			prefetch.task.cancel()
+		prefetch.task.add_done_callback(_consume_result)
+
+
+def _consume_result(task: asyncio.Task) -> None:
+	if not task.cancelled():
+		task.exception()
@@ -0,0 +1,158 @@
+"""
+Shortening of long URLs in LLM messages.
+
+URLs with long queries or fragments cost a lot of tokens and are easy for the LLM to garble. `URLInterner` replaces
+them with a truncated form ending in a short hash, e.g. `https://example.com/search?q=shoes&sor...1a2b3c4`, and keeps a
+bidirectional table for the whole agent session. Messages are shortened once when they are built, and only the string
+parameters of the LLM's actions are restored, so the cost per step scales with the new content instead of the whole
+prompt and response.
+"""
+
+import hashlib
+import re
+from typing import Any
+
+from pydantic import BaseModel
+
+from browser_use.llm.messages import AssistantMessage, BaseMessage, ContentPartTextParam, UserMessage
+from browser_use.tools.registry.views import ActionModel
+from browser_use.utils import URL_PATTERN
+
+# The end of a shortened URL: '...' and the first 7 hex digits of the md5 of its query and fragment
+_SHORTENED_URL_END = re.compile(r'\.\.\.([0-9a-f]{7})')
+
+
+class URLInterner:
+	"""Per-session table of shortened URLs, see the module docstring."""
+
+	def __init__(self, limit: int = 25):
+		"""
+		Args:
+			limit: Number of characters of a URL's query and fragment that are kept, longer ones are shortened
+		"""
+		self.limit = limit
+		self._short_by_url: dict[str, str] = {}
+		self._urls_by_hash: dict[str, list[tuple[str, str]]] = {}
+		"""hash -> [(shortened, original)], almost always a single entry"""
+
+	def shorten_url(self, url: str) -> str:
+		"""The shortened form of `url`, or `url` itself if its query and fragment are short enough"""
+		shortened = self._short_by_url.get(url)
+		if shortened is not None:
+			return shortened
+
+		# Url can only have 1 query and 1 fragment, shorten everything from the first of them
+		after_path_start = min((i for i in (url.find('?'), url.find('#')) if i != -1), default=len(url))
+		after_path = url[after_path_start:]
+		shortened = url
+		if len(after_path) > self.limit:
+			url_hash = hashlib.md5(after_path.encode('utf-8')).hexdigest()[:7]
+			candidate = f'{url[:after_path_start]}{after_path[: self.limit]}...{url_hash}'
+			# Only use the shortened URL if it's actually shorter than the original
+			if len(candidate) < len(url):
+				shortened = candidate
+				self._urls_by_hash.setdefault(url_hash, []).append((shortened, url))
+		self._short_by_url[url] = shortened
+		return shortened
+
+	def shorten(self, text: str, replaced: dict[str, str] | None = None) -> str:
+		"""Shorten all long URLs in `text`.
+
+		Args:
+			text: Text to shorten
+			replaced: If given, every replacement is added to it as {shortened: original}
+		"""
+		# Only URLs with a query or fragment are shortened
+		if '?' not in text and '#' not in text:
+			return text
+
+		def replace_url(match: re.Match) -> str:
+			url = match.group(0)
+			shortened = self.shorten_url(url)
+			if replaced is not None and shortened != url:
+				replaced[shortened] = url
+			return shortened
+
+		return URL_PATTERN.sub(replace_url, text)
+
+	def shorten_message(self, message: BaseMessage, previous: dict[str, str] | None = None) -> dict[str, str]:
+		"""Shorten the URLs in a user or assistant message in place.
+
+		Args:
+			message: Message to shorten
+			previous: What this returned for the previous version of the message, its unchanged text parts are reused
+
+		Returns:
+			The shortened text of every text part, {text: shortened}
+		"""
+		shortened_texts: dict[str, str] = {}
+		if not isinstance(message, (UserMessage, AssistantMessage)):
+			return shortened_texts
+
+		def shorten(text: str) -> str:
+			shortened = previous.get(text) if previous else None
+			if shortened is None:
+				shortened = self.shorten(text)
+			shortened_texts[text] = shortened
+			return shortened
+
+		if isinstance(message.content, str):
+			message.content = shorten(message.content)
+		elif isinstance(message.content, list):
+			for part in message.content:
+				if isinstance(part, ContentPartTextParam):
+					part.text = shorten(part.text)
+		return shortened_texts
+
+	def restore(self, text: str) -> str:
+		"""Replace shortened URLs in `text` with their originals"""
+		if '...' not in text or not self._urls_by_hash:
+			return text
+
+		restored: list[str] = []
+		position = 0
+		for match in _SHORTENED_URL_END.finditer(text):
+			for shortened, url in self._urls_by_hash.get(match.group(1), ()):
+				start = match.end() - len(shortened)
+				if start >= position and text.startswith(shortened, start):
+					restored.append(text[position:start])
+					restored.append(url)
+					position = match.end()
+					break
+		if not restored:
+			return text
+		restored.append(text[position:])
+		return ''.join(restored)
+
+	def restore_action(self, action: ActionModel) -> None:
+		"""Restore the shortened URLs in the string parameters of `action`, in place
+
+		Nested parameters (e.g. the structured output of `done`) are restored too.
+		"""
+		# Action models with several actions are a RootModel union of single action models
+		action = getattr(action, 'root', action)
+		for action_name in action.model_dump(exclude_unset=True):
+			params = getattr(action, action_name, None)
+			if params is not None:
+				self._restore_value(params)
+
+	def _restore_value(self, value: Any) -> Any:
+		"""`value` with its shortened URLs restored, models, dicts and lists are updated in place"""
+		if isinstance(value, str):
+			return self.restore(value)
+		if isinstance(value, BaseModel):
+			for field_name, field_value in list(value.__dict__.items()):
+				restored = self._restore_value(field_value)
+				if restored is not field_value:
+					setattr(value, field_name, restored)
+		elif isinstance(value, dict):
+			for key, item in value.items():
+				restored = self._restore_value(item)
+				if restored is not item:
+					value[key] = restored
+		elif isinstance(value, list):
+			for index, item in enumerate(value):
+				restored = self._restore_value(item)
+				if restored is not item:
+					value[index] = restored
+		return value
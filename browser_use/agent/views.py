@@ -48,6 +48,9 @@ class AgentSettings(BaseModel):
 	use_judge: bool = True
 	ground_truth: str | None = None  # Ground truth answer or criteria for judge validation
 	max_history_items: int | None = None
+	max_history_tokens: int | None = None  # Token budget of the agent history, older steps are summarized beyond it
+	history_keep_recent_steps: int = 5  # Most recent steps kept verbatim when the history is summarized
+	history_summary_llm: BaseChatModel | None = None  # Optional cheap LLM that rewrites the history summary
 
 	page_extraction_llm: BaseChatModel | None = None
 	calculate_cost: bool = False
@@ -55,6 +58,10 @@ class AgentSettings(BaseModel):
 	llm_timeout: int = 60  # Timeout in seconds for LLM calls (auto-detected: 30s for gemini, 90s for o3, 60s default)
 	step_timeout: int = 180  # Timeout in seconds for each step
 	final_response_after_failure: bool = True  # If True, attempt one final recovery call after max_failures
+	save_dom_archives: bool = False  # If True, store a binary DOM archive per step next to the screenshots
+	stream_actions: bool = False  # If True and the LLM supports `astream`, start actions while the response streams
+	prefetch_browser_state: bool = True  # Capture the next browser state while the LLM thinks (needs incremental_dom_snapshots)
+	stable_prompt_prefix: bool = False  # If True, lay out the state message so providers can cache its prefix
 
 
 class AgentState(BaseModel):
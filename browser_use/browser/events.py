@@ -186,7 +186,9 @@ class ScreenshotEvent(BaseEvent[str]):
 	"""Request to take a screenshot."""
 
 	full_page: bool = False
-	clip: dict[str, float] | None = None  # {x, y, width, height}
+	clip: dict[str, float] | None = None  # {x, y, width, height, scale?} in CSS pixels
+	format: Literal['png', 'jpeg', 'webp'] | None = None  # None: BrowserProfile.screenshot_format
+	quality: int | None = None  # jpeg/webp only, None: BrowserProfile.screenshot_quality
 
 	event_timeout: float | None = Field(default_factory=lambda: _get_timeout('TIMEOUT_ScreenshotEvent', 15.0))  # seconds
 
@@ -0,0 +1,243 @@
+"""
+Consolidated page-metadata probe.
+
+Building the browser state used to need several sequential CDP round trips per target: `document.readyState` and an
+iframe scroll probe before the DOM snapshot, `Page.getLayoutMetrics` for the device pixel ratio, again for the viewport
+key / viewport scope, and again for `PageInfo`, plus a performance API evaluation for pending requests.
+`PageMetadataProbe` collects all of it with a single `Runtime.evaluate` sent together with one `Page.getLayoutMetrics`
+(one round trip) and caches the result per target, so every consumer within a state request shares it.
+
+Device pixel ratio, viewport sizes, scroll offsets and page size keep coming from `Page.getLayoutMetrics`: the JS
+equivalents (`window.devicePixelRatio`, `document.scrollWidth/Height`) differ under browser zoom or device emulation
+and when the scrolling element is not the document. The JS values are only used when the metrics are unavailable.
+
+The owner (DOMWatchdog) is responsible for invalidation, it drops the cache at the start of every state request and
+whenever it waited for the page to settle after probing it.
+"""
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any, cast
+
+from cdp_use.cdp.target import TargetID
+
+if TYPE_CHECKING:
+	from browser_use.browser.session import BrowserSession
+
+PAGE_METADATA_JS = """
+(() => {
+	const doc = document.documentElement;
+	const body = document.body;
+	const vv = window.visualViewport;
+
+	const iframeScroll = {};
+	document.querySelectorAll('iframe').forEach((iframe, index) => {
+		try {
+			const frameDoc = iframe.contentDocument || iframe.contentWindow.document;
+			if (frameDoc) {
+				iframeScroll[index] = {
+					scrollTop: frameDoc.documentElement.scrollTop || frameDoc.body.scrollTop || 0,
+					scrollLeft: frameDoc.documentElement.scrollLeft || frameDoc.body.scrollLeft || 0
+				};
+			}
+		} catch (e) {
+			// Cross-origin iframe, can't access
+		}
+	});
+
+	const now = performance.now();
+	const pendingResources = [];
+	for (const entry of performance.getEntriesByType('resource')) {
+		if (entry.responseEnd === 0 && pendingResources.length < 100) {
+			pendingResources.push({
+				url: entry.name,
+				loading_duration_ms: Math.round(now - entry.startTime),
+				resource_type: entry.initiatorType || 'unknown'
+			});
+		}
+	}
+
+	return {
+		url: location.href,
+		title: document.title,
+		ready_state: document.readyState,
+		device_pixel_ratio: window.devicePixelRatio || 1,
+		layout_width: doc ? doc.clientWidth : window.innerWidth,
+		layout_height: doc ? doc.clientHeight : window.innerHeight,
+		visual_width: vv ? vv.width : window.innerWidth,
+		visual_height: vv ? vv.height : window.innerHeight,
+		window_width: window.innerWidth,
+		window_height: window.innerHeight,
+		visual_scale: vv ? vv.scale : 1,
+		scroll_x: vv ? vv.pageLeft : window.scrollX,
+		scroll_y: vv ? vv.pageTop : window.scrollY,
+		page_width: Math.max(doc ? doc.scrollWidth : 0, body ? body.scrollWidth : 0),
+		page_height: Math.max(doc ? doc.scrollHeight : 0, body ? body.scrollHeight : 0),
+		iframe_scroll_positions: iframeScroll,
+		pending_resources: pendingResources
+	};
+})()
+"""
+
+
+@dataclass
+class PageMetadata:
+	"""Everything about a page the browser state needs besides the DOM itself, all sizes in CSS pixels."""
+
+	url: str
+	title: str
+	ready_state: str
+	device_pixel_ratio: float
+	layout_width: float
+	"""Layout viewport (cssLayoutViewport, excludes scrollbars)"""
+	layout_height: float
+	visual_width: float
+	"""Visual viewport (cssVisualViewport), differs from the layout viewport when pinch-zoomed"""
+	visual_height: float
+	window_width: float
+	"""window.innerWidth/Height, the area a viewport screenshot covers (includes scrollbars)"""
+	window_height: float
+	visual_scale: float
+	"""Pinch-zoom factor of the visual viewport, 1 when not zoomed"""
+	scroll_x: float
+	scroll_y: float
+	page_width: float
+	"""Content size (cssContentSize)"""
+	page_height: float
+	iframe_scroll_positions: dict[str, dict[str, float]] = field(default_factory=dict)
+	"""Scroll offsets of same-origin iframes, keyed by their index in document.querySelectorAll('iframe')"""
+	pending_resources: list[dict[str, Any]] = field(default_factory=list)
+	"""Performance API resource entries that have not finished loading (url, loading_duration_ms, resource_type)"""
+	captured_at: float = field(default_factory=time.time)
+	"""time.time() when the probe was sent, activity after this makes the metadata stale"""
+
+	@classmethod
+	def from_js(cls, data: dict[str, Any], captured_at: float, layout_metrics: dict[str, Any] | None = None) -> 'PageMetadata':
+		"""Build the metadata from the probe result, preferring `Page.getLayoutMetrics` values for all sizes."""
+		metadata = cls(
+			url=data.get('url', ''),
+			title=data.get('title', ''),
+			ready_state=data.get('ready_state', 'unknown'),
+			device_pixel_ratio=float(data.get('device_pixel_ratio') or 1.0),
+			layout_width=float(data.get('layout_width') or 0),
+			layout_height=float(data.get('layout_height') or 0),
+			visual_width=float(data.get('visual_width') or 0),
+			visual_height=float(data.get('visual_height') or 0),
+			window_width=float(data.get('window_width') or 0),
+			window_height=float(data.get('window_height') or 0),
+			visual_scale=float(data.get('visual_scale') or 1.0),
+			scroll_x=float(data.get('scroll_x') or 0),
+			scroll_y=float(data.get('scroll_y') or 0),
+			page_width=float(data.get('page_width') or 0),
+			page_height=float(data.get('page_height') or 0),
+			iframe_scroll_positions=data.get('iframe_scroll_positions') or {},
+			pending_resources=data.get('pending_resources') or [],
+			captured_at=captured_at,
+		)
+		if layout_metrics:
+			metadata._apply_layout_metrics(layout_metrics)
+		return metadata
+
+	def _apply_layout_metrics(self, metrics: dict[str, Any]) -> None:
+		# Same derivations as the getLayoutMetrics calls this probe replaces (DomService, PageInfo)
+		visual_viewport = metrics.get('visualViewport', {})
+		css_visual_viewport = metrics.get('cssVisualViewport', {})
+		css_layout_viewport = metrics.get('cssLayoutViewport', {})
+		css_content_size = metrics.get('cssContentSize', {})
+
+		css_width = css_visual_viewport.get('clientWidth', css_layout_viewport.get('clientWidth', 0))
+		device_width = visual_viewport.get('clientWidth', css_width)
+		if css_width > 0:
+			self.device_pixel_ratio = float(device_width / css_width)
+			self.visual_width = float(css_width)
+			self.visual_height = float(css_visual_viewport.get('clientHeight', self.visual_height))
+		if css_layout_viewport.get('clientWidth'):
+			self.layout_width = float(css_layout_viewport['clientWidth'])
+			self.layout_height = float(css_layout_viewport.get('clientHeight', self.layout_height))
+		if 'pageX' in css_visual_viewport or 'pageY' in css_visual_viewport:
+			self.scroll_x = float(css_visual_viewport.get('pageX', 0))
+			self.scroll_y = float(css_visual_viewport.get('pageY', 0))
+		if css_content_size:
+			self.page_width = float(css_content_size.get('width', self.page_width))
+			self.page_height = float(css_content_size.get('height', self.page_height))
+
+	@property
+	def viewport_key(self) -> tuple[float, float, float, float]:
+		"""Scroll offset and visual viewport size, same layout as DomService's viewport key."""
+		return (self.scroll_x, self.scroll_y, self.visual_width, self.visual_height)
+
+
+class PageMetadataProbe:
+	"""Fetches `PageMetadata` with one `Runtime.evaluate` and one `Page.getLayoutMetrics` (sent concurrently) per
+	target and caches it until invalidated.
+
+	Concurrent `get()` calls for the same target share a single evaluation.
+	"""
+
+	def __init__(self, browser_session: 'BrowserSession', logger: logging.Logger | None = None):
+		self.browser_session = browser_session
+		self.logger = logger or browser_session.logger
+		self._cache: dict[TargetID, PageMetadata] = {}
+		self._inflight: dict[TargetID, asyncio.Task[PageMetadata]] = {}
+		self.probes = 0
+		self.cache_hits = 0
+
+	def cached(self, target_id: TargetID) -> PageMetadata | None:
+		return self._cache.get(target_id)
+
+	def cached_targets(self) -> list[TargetID]:
+		return list(self._cache)
+
+	def invalidate(self, target_id: TargetID | None = None) -> None:
+		"""Drop the cached metadata of a target (or of all targets)."""
+		# Probes already running started before the invalidation, their results must not be cached
+		if target_id is None:
+			self._cache.clear()
+			self._inflight.clear()
+		else:
+			self._cache.pop(target_id, None)
+			self._inflight.pop(target_id, None)
+
+	async def get(self, target_id: TargetID) -> PageMetadata:
+		"""Cached metadata of a target, probing the page if there is none."""
+		metadata = self._cache.get(target_id)
+		if metadata is not None:
+			self.cache_hits += 1
+			return metadata
+
+		task = self._inflight.get(target_id)
+		if task is None:
+			task = asyncio.create_task(self._probe(target_id), name=f'probe_page_metadata_{target_id[-4:]}')
+			self._inflight[target_id] = task
+			task.add_done_callback(lambda done: self._inflight.pop(target_id) if self._inflight.get(target_id) is done else None)
+		return await asyncio.shield(task)
+
+	async def _probe(self, target_id: TargetID) -> PageMetadata:
+		started_at = time.time()
+		cdp_session = await self.browser_session.get_or_create_cdp_session(target_id=target_id, focus=False)
+		result, layout_metrics = await asyncio.gather(
+			cdp_session.cdp_client.send.Runtime.evaluate(
+				params={'expression': PAGE_METADATA_JS, 'returnByValue': True}, session_id=cdp_session.session_id
+			),
+			cdp_session.cdp_client.send.Page.getLayoutMetrics(session_id=cdp_session.session_id),
+			return_exceptions=True,
+		)
+		if isinstance(result, BaseException):
+			raise result
+		if result.get('exceptionDetails') or result.get('result', {}).get('type') != 'object':
+			raise RuntimeError(f'Page metadata probe failed for target {target_id[-4:]}: {result.get("exceptionDetails")}')
+		if isinstance(layout_metrics, BaseException):
+			self.logger.debug(f'Layout metrics unavailable for target {target_id[-4:]}, using JS sizes: {layout_metrics}')
+			layout_metrics = None
+
+		metadata = PageMetadata.from_js(
+			result['result'].get('value', {}),
+			captured_at=started_at,
+			layout_metrics=cast(dict[str, Any], layout_metrics) if layout_metrics else None,
+		)
+		self.probes += 1
+		if self._inflight.get(target_id) is asyncio.current_task():
+			self._cache[target_id] = metadata
+		return metadata
@@ -0,0 +1,300 @@
+"""
+Event-driven page stability detection.
+
+Tracks in-flight network requests per target from CDP `Network.*` events, and combines them with the
+`Page.lifecycleEvent` log SessionManager keeps on every CDP session and (when incremental DOM snapshots are enabled)
+the DOMMutationTracker's last mutation time. DOMWatchdog uses it to capture page state as soon as the page went quiet,
+instead of sleeping a fixed amount of time whenever something is still loading.
+"""
+
+import asyncio
+import logging
+import time
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any
+from urllib.parse import urlsplit
+
+from cdp_use.cdp.target import SessionID, TargetID
+
+if TYPE_CHECKING:
+	from browser_use.browser.session import BrowserSession, CDPSession
+	from browser_use.dom.mutation_tracker import DOMMutationTracker
+
+# Connections that stay open by design and would keep the page "busy" forever
+IGNORED_RESOURCE_TYPES = frozenset({'WebSocket', 'EventSource', 'Media', 'Ping', 'CSPViolationReport'})
+
+# Ad/tracking/telemetry services, requests to these hosts (or their subdomains) never block a capture
+IGNORED_DOMAINS = (
+	'doubleclick.net',
+	'googlesyndication.com',
+	'googletagmanager.com',
+	'google-analytics.com',
+	'facebook.net',
+	'hotjar.com',
+	'clarity.ms',
+	'mixpanel.com',
+	'segment.com',
+	'demdex.net',
+	'omtrdc.net',
+	'adobedtm.com',
+	'ensighten.com',
+	'newrelic.com',
+	'nr-data.net',
+	'platform.twitter.com',
+	'platform.linkedin.com',
+)
+# Hosts starting with one of these labels (e.g. ads.example.com) serve ads and tracking
+IGNORED_HOST_LABELS = frozenset({'ads', 'analytics', 'tracking', 'pixel'})
+# Path segments (e.g. /api/telemetry/ or /analytics.js) of tracking and telemetry endpoints
+IGNORED_PATH_SEGMENTS = frozenset(
+	{
+		'ads',
+		'analytics',
+		'tracking',
+		'pixel',
+		'tracker',
+		'track',
+		'collector',
+		'beacon',
+		'telemetry',
+		'log',
+		'events',
+		'eventbatch',
+		'metrics',
+	}
+)
+
+# Requests older than this are treated as stuck or long-polling and stop blocking
+MAX_BLOCKING_REQUEST_AGE = 10.0
+# Images and fonts only block for this long
+MAX_BLOCKING_NON_CRITICAL_AGE = 3.0
+NON_CRITICAL_RESOURCE_TYPES = frozenset({'Image', 'Font'})
+
+# How often to re-check conditions that don't wake the waiter (lifecycle log, DOM mutations)
+POLL_INTERVAL = 0.05
+
+
+@dataclass(slots=True)
+class InflightRequest:
+	url: str
+	method: str
+	resource_type: str | None
+	started_at: float
+	"""time.monotonic() when the request was sent"""
+
+	def blocking_until(self) -> float:
+		"""Time after which this request no longer prevents the page from counting as idle."""
+		max_age = MAX_BLOCKING_NON_CRITICAL_AGE if self.resource_type in NON_CRITICAL_RESOURCE_TYPES else MAX_BLOCKING_REQUEST_AGE
+		return self.started_at + max_age
+
+
+@dataclass
+class _TargetNetworkState:
+	inflight: dict[str, InflightRequest] = field(default_factory=dict)
+	last_activity: float = 0.0
+	waiters: set[asyncio.Event] = field(default_factory=set)
+
+	def notify(self) -> None:
+		for waiter in self.waiters:
+			waiter.set()
+
+
+@dataclass(slots=True)
+class PageStabilityResult:
+	stable: bool
+	"""False if the timeout was hit before the page became stable"""
+	waited_ms: float
+	pending_requests: list[InflightRequest]
+	"""Requests still blocking when the wait ended (empty if stable)"""
+
+
+def is_ignored_request(url: str, resource_type: str | None) -> bool:
+	if resource_type in IGNORED_RESOURCE_TYPES:
+		return True
+	if url.startswith('data:') or url.startswith('blob:') or len(url) > 500:
+		return True
+	try:
+		parts = urlsplit(url)
+		host = (parts.hostname or '').lower()
+	except ValueError:
+		return False
+	if any(host == domain or host.endswith('.' + domain) for domain in IGNORED_DOMAINS):
+		return True
+	if host.split('.', 1)[0] in IGNORED_HOST_LABELS:
+		return True
+	# Match whole segments and file names without extension, so /uploads/ or /downloads/ don't count as /ads/
+	return any(segment.split('.', 1)[0].lower() in IGNORED_PATH_SEGMENTS for segment in parts.path.split('/') if segment)
+
+
+def is_document_loading(lifecycle_events: Iterable[dict[str, Any]] | None, max_age: float = MAX_BLOCKING_REQUEST_AGE) -> bool:
+	"""Whether the most recently started document has not reached DOMContentLoaded yet, per the lifecycle log.
+
+	A document that started loading more than `max_age` seconds ago (an aborted navigation or a lost event) no
+	longer counts as loading, like stuck requests.
+	"""
+	if not lifecycle_events:
+		return False
+	last_init: dict[str, Any] | None = None
+	loaded: set[str] = set()
+	for event in lifecycle_events:
+		if event.get('name') == 'init':
+			last_init = event
+		elif event.get('name') == 'DOMContentLoaded':
+			loaded.add(event.get('loaderId', ''))
+	if last_init is None or last_init.get('loaderId') in loaded:
+		return False
+	started_at = last_init.get('timestamp')
+	if started_at is not None:
+		try:
+			return asyncio.get_running_loop().time() - started_at < max_age
+		except RuntimeError:
+			pass
+	return True
+
+
+class PageStabilityTracker:
+	"""Network activity tracker of the focused target, built on CDP Network events.
+
+	Only one target is tracked at a time, attaching another one drops the state of the previous one. Handlers are
+	registered once per CDP client (cdp_use allows a single handler per event), `Network.enable` is called once per
+	session.
+	"""
+
+	def __init__(self, browser_session: 'BrowserSession', logger: logging.Logger | None = None):
+		self.browser_session = browser_session
+		self.logger = logger or browser_session.logger
+		self._targets: dict[TargetID, _TargetNetworkState] = {}
+		self._enabled_sessions: set[SessionID] = set()
+		self._registered_clients: set[int] = set()
+
+	def is_attached(self, target_id: TargetID) -> bool:
+		return target_id in self._targets
+
+	async def attach(self, cdp_session: 'CDPSession') -> None:
+		"""Start tracking network activity of a target instead of the previously tracked one.
+
+		Requests started before this call are not seen.
+		"""
+		client_key = id(cdp_session.cdp_client)
+		if client_key not in self._registered_clients:
+			self._registered_clients.add(client_key)
+			cdp_session.cdp_client.register.Network.requestWillBeSent(self._on_request_will_be_sent)
+			cdp_session.cdp_client.register.Network.loadingFinished(self._on_loading_done)
+			cdp_session.cdp_client.register.Network.loadingFailed(self._on_loading_done)
+
+		for target_id in [target_id for target_id in self._targets if target_id != cdp_session.target_id]:
+			self.detach(target_id)
+		self._targets.setdefault(cdp_session.target_id, _TargetNetworkState(last_activity=time.monotonic()))
+		if cdp_session.session_id in self._enabled_sessions:
+			return
+		try:
+			await cdp_session.cdp_client.send.Network.enable(session_id=cdp_session.session_id)
+			self._enabled_sessions.add(cdp_session.session_id)
+		except Exception as e:
+			self.logger.debug(f'Failed to enable network events for target {cdp_session.target_id[-4:]}: {e}')
+			self._targets.pop(cdp_session.target_id, None)
+
+	def detach(self, target_id: TargetID) -> None:
+		state = self._targets.pop(target_id, None)
+		if state is not None:
+			state.notify()  # let waiters of the target return instead of sleeping until their timeout
+
+	def _state_for_session(self, session_id: SessionID | None) -> _TargetNetworkState | None:
+		if not session_id or not self.browser_session.session_manager:
+			return None
+		target_id = self.browser_session.session_manager.get_target_id_from_session_id(session_id)
+		return self._targets.get(target_id) if target_id else None
+
+	def _on_request_will_be_sent(self, event: Any, session_id: SessionID | None = None) -> None:
+		state = self._state_for_session(session_id)
+		if state is None:
+			return
+		request = event.get('request', {})
+		url = request.get('url', '')
+		resource_type = event.get('type')
+		if is_ignored_request(url, resource_type):
+			return
+		state.inflight[event['requestId']] = InflightRequest(
+			url=url, method=request.get('method', 'GET'), resource_type=resource_type, started_at=time.monotonic()
+		)
+		state.last_activity = time.monotonic()
+		state.notify()
+
+	def _on_loading_done(self, event: Any, session_id: SessionID | None = None) -> None:
+		state = self._state_for_session(session_id)
+		if state is None or state.inflight.pop(event['requestId'], None) is None:
+			return
+		state.last_activity = time.monotonic()
+		state.notify()
+
+	def pending_requests(self, target_id: TargetID) -> list[InflightRequest]:
+		"""In-flight requests of a target that currently prevent it from counting as idle."""
+		state = self._targets.get(target_id)
+		if state is None:
+			return []
+		now = time.monotonic()
+		return [request for request in state.inflight.values() if request.blocking_until() > now]
+
+	async def wait_until_stable(
+		self,
+		target_id: TargetID,
+		network_idle: float,
+		dom_idle: float,
+		timeout: float,
+		mutation_tracker: 'DOMMutationTracker | None' = None,
+		lifecycle_events: Iterable[dict[str, Any]] | None = None,
+	) -> PageStabilityResult:
+		"""Wait until the target had no blocking requests for `network_idle` seconds, no DOM mutations for `dom_idle`
+		seconds and its document reached DOMContentLoaded, or until `timeout` seconds passed.
+
+		Returns immediately on pages that are already quiet. Wakes up on every network event instead of polling. A
+		document that started loading before the wait only counts as loading until it becomes stale, see
+		`is_document_loading`.
+		"""
+		start = time.monotonic()
+		deadline = start + timeout
+		state = self._targets.get(target_id)
+		if state is None:
+			return PageStabilityResult(stable=True, waited_ms=0.0, pending_requests=[])
+
+		activity = asyncio.Event()  # one per waiter, concurrent waits on a target must not clear each other
+		state.waiters.add(activity)
+		try:
+			while True:
+				now = time.monotonic()
+				blocking = []
+				for request_id, request in list(state.inflight.items()):
+					if request.blocking_until() > now:
+						blocking.append(request)
+					else:
+						del state.inflight[request_id]  # stuck or long-polling, stop tracking it
+				if blocking:
+					# Woken up by loadingFinished/loadingFailed, or when the oldest request stops counting
+					wait_for = min(request.blocking_until() for request in blocking) - now
+				else:
+					wait_for = network_idle - (now - state.last_activity)
+
+				if mutation_tracker is not None:
+					last_mutation = mutation_tracker.get_last_mutation_time(target_id)
+					if last_mutation is not None:
+						wait_for = max(wait_for, min(dom_idle - (now - last_mutation), POLL_INTERVAL))
+
+				if is_document_loading(lifecycle_events):
+					wait_for = max(wait_for, POLL_INTERVAL)
+
+				if wait_for <= 0:
+					return PageStabilityResult(stable=True, waited_ms=(now - start) * 1000, pending_requests=[])
+				if now >= deadline:
+					return PageStabilityResult(stable=False, waited_ms=(now - start) * 1000, pending_requests=blocking)
+
+				if self._targets.get(target_id) is not state:
+					# Detached while waiting, e.g. because another tab got focus
+					return PageStabilityResult(stable=True, waited_ms=(now - start) * 1000, pending_requests=[])
+				activity.clear()
+				try:
+					await asyncio.wait_for(activity.wait(), timeout=min(wait_for, deadline - now))
+				except TimeoutError:
+					pass
+		finally:
+			state.waiters.discard(activity)
@@ -627,7 +627,17 @@ class BrowserProfile(BrowserConnectArgs, BrowserLaunchPersistentContextArgs, Bro
 	# --- Page load/wait timings ---
 
 	minimum_wait_page_load_time: float = Field(default=0.25, description='Minimum time to wait before capturing page state.')
-	wait_for_network_idle_page_load_time: float = Field(default=0.5, description='Time to wait for network idle.')
+	wait_for_network_idle_page_load_time: float = Field(
+		default=0.5,
+		description='Maximum time to wait for the page to become stable (network idle, DOM quiet) before capturing its state.',
+	)
+	network_idle_threshold: float = Field(
+		default=0.1, description='Seconds without in-flight network requests after which the page network counts as idle.'
+	)
+	dom_idle_threshold: float = Field(
+		default=0.1,
+		description='Seconds without DOM mutations after which the page DOM counts as quiet (only checked with incremental_dom_snapshots).',
+	)
 
 	wait_between_actions: float = Field(default=0.1, description='Time to wait between actions.')
 
@@ -640,6 +650,23 @@ class BrowserProfile(BrowserConnectArgs, BrowserLaunchPersistentContextArgs, Bro
 		default=True, description='Only show element IDs in highlights if llm_representation is less than 10 characters.'
 	)
 	paint_order_filtering: bool = Field(default=True, description='Enable paint order filtering. Slightly experimental.')
+	incremental_dom_snapshots: bool = Field(
+		default=False,
+		description='Reuse the previous DOM capture (and screenshot) when CDP DOM mutation events show the page did not change since the last step, and patch it by re-fetching only the mutated nodes when few changed. Experimental.',
+	)
+	dom_viewport_margin: float | None = Field(
+		default=None,
+		description='Viewport-scoped DOM extraction: only extract elements within this many viewport heights above and below the visible viewport (None extracts the whole page). Experimental.',
+	)
+	screenshot_format: Literal['png', 'jpeg', 'webp'] = Field(
+		default='png', description='Image format of the screenshots taken for the LLM, jpeg and webp are several times smaller.'
+	)
+	screenshot_quality: int | None = Field(
+		default=None,
+		ge=0,
+		le=100,
+		description='Compression quality (0-100) of jpeg and webp screenshots, None for the browser default.',
+	)
 	interaction_highlight_color: str = Field(
 		default='rgb(255, 127, 39)',
 		description='Color to use for highlighting elements during interactions (CSS color string).',
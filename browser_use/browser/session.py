@@ -143,6 +143,8 @@ class BrowserSession(BaseModel):
 		keep_alive: bool | None = None,
 		minimum_wait_page_load_time: float | None = None,
 		wait_for_network_idle_page_load_time: float | None = None,
+		network_idle_threshold: float | None = None,
+		dom_idle_threshold: float | None = None,
 		wait_between_actions: float | None = None,
 		auto_download_pdfs: bool | None = None,
 		cookie_whitelist_domains: list[str] | None = None,
@@ -150,6 +152,8 @@ class BrowserSession(BaseModel):
 		highlight_elements: bool | None = None,
 		dom_highlight_elements: bool | None = None,
 		paint_order_filtering: bool | None = None,
+		incremental_dom_snapshots: bool | None = None,
+		dom_viewport_margin: float | None = None,
 		max_iframes: int | None = None,
 		max_iframe_depth: int | None = None,
 	) -> None: ...
@@ -175,6 +179,8 @@ class BrowserSession(BaseModel):
 		keep_alive: bool | None = None,
 		minimum_wait_page_load_time: float | None = None,
 		wait_for_network_idle_page_load_time: float | None = None,
+		network_idle_threshold: float | None = None,
+		dom_idle_threshold: float | None = None,
 		wait_between_actions: float | None = None,
 		auto_download_pdfs: bool | None = None,
 		cookie_whitelist_domains: list[str] | None = None,
@@ -182,6 +188,8 @@ class BrowserSession(BaseModel):
 		highlight_elements: bool | None = None,
 		dom_highlight_elements: bool | None = None,
 		paint_order_filtering: bool | None = None,
+		incremental_dom_snapshots: bool | None = None,
+		dom_viewport_margin: float | None = None,
 		max_iframes: int | None = None,
 		max_iframe_depth: int | None = None,
 		# All other local params
@@ -278,6 +286,8 @@ class BrowserSession(BaseModel):
 		window_position: dict | None = None,
 		minimum_wait_page_load_time: float | None = None,
 		wait_for_network_idle_page_load_time: float | None = None,
+		network_idle_threshold: float | None = None,
+		dom_idle_threshold: float | None = None,
 		wait_between_actions: float | None = None,
 		filter_highlight_ids: bool | None = None,
 		auto_download_pdfs: bool | None = None,
@@ -288,6 +298,8 @@ class BrowserSession(BaseModel):
 		highlight_elements: bool | None = None,
 		dom_highlight_elements: bool | None = None,
 		paint_order_filtering: bool | None = None,
+		incremental_dom_snapshots: bool | None = None,
+		dom_viewport_margin: float | None = None,
 		# Iframe processing limits
 		max_iframes: int | None = None,
 		max_iframe_depth: int | None = None,
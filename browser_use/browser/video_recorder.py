@@ -1,17 +1,20 @@
 """Video Recording Service for Browser Use Sessions."""
 
 import base64
+import io
 import logging
 import math
-import subprocess
+import queue
+import threading
 from pathlib import Path
 from typing import Optional
 
+from PIL import Image
+
 from browser_use.browser.profile import ViewportSize
 
 try:
 	import imageio.v2 as iio  # type: ignore[import-not-found]
-	import imageio_ffmpeg  # type: ignore[import-not-found]
 	import numpy as np  # type: ignore[import-not-found]
 	from imageio.core.format import Format  # type: ignore[import-not-found]
 
@@ -29,16 +32,31 @@ def _get_padded_size(size: ViewportSize, macro_block_size: int = 16) -> Viewport
 	return ViewportSize(width=width, height=height)
 
 
+def _fit_frame(frame_bytes: bytes, size: ViewportSize, padded_size: ViewportSize) -> 'np.ndarray':
+	"""Decodes an encoded frame, resizes it to `size` and pads it with black bars, centered, to `padded_size`."""
+	with Image.open(io.BytesIO(frame_bytes)) as decoded:
+		image = decoded.convert('RGB')
+	if image.size != (size['width'], size['height']):
+		image = image.resize((size['width'], size['height']), Image.Resampling.BILINEAR)
+	if (size['width'], size['height']) != (padded_size['width'], padded_size['height']):
+		canvas = Image.new('RGB', (padded_size['width'], padded_size['height']), (0, 0, 0))
+		canvas.paste(image, ((padded_size['width'] - size['width']) // 2, (padded_size['height'] - size['height']) // 2))
+		image = canvas
+	return np.asarray(image, dtype=np.uint8)
+
+
 class VideoRecorderService:
 	"""
 	Handles the video encoding process for a browser session using imageio.
 
-	This service captures individual frames from the CDP screencast, decodes them,
-	and appends them to a video file using a pip-installable ffmpeg backend.
-	It automatically resizes frames to match the target video dimensions.
+	This service captures individual frames from the CDP screencast and streams them
+	into a single long-lived ffmpeg encoder process (pip-installable ffmpeg backend).
+	Frames are queued and decoded, resized and padded in-process on a worker thread,
+	so add_frame never blocks the caller. When the encoder falls behind, the oldest
+	queued frames are dropped.
 	"""
 
-	def __init__(self, output_path: Path, size: ViewportSize, framerate: int):
+	def __init__(self, output_path: Path, size: ViewportSize, framerate: int, max_queued_frames: int = 30):
 		"""
 		Initializes the video recorder.
 
@@ -46,6 +64,7 @@ class VideoRecorderService:
 		    output_path: The full path where the video will be saved.
 		    size: A ViewportSize object specifying the width and height of the video.
 		    framerate: The desired framerate for the output video.
+		    max_queued_frames: Frames waiting for the encoder before the oldest ones are dropped.
 		"""
 		self.output_path = output_path
 		self.size = size
@@ -53,10 +72,14 @@ class VideoRecorderService:
 		self._writer: Optional['Format.Writer'] = None
 		self._is_active = False
 		self.padded_size = _get_padded_size(self.size)
+		self._frames: queue.Queue[str | None] = queue.Queue(maxsize=max_queued_frames)
+		self._worker: threading.Thread | None = None
+		self.frames_written = 0
+		self.frames_dropped = 0
 
 	def start(self) -> None:
 		"""
-		Prepares and starts the video writer.
+		Prepares and starts the video writer and the encoding worker thread.
 
 		If the required optional dependencies are not installed, this method will
 		log an error and do nothing.
@@ -79,6 +102,8 @@ class VideoRecorderService:
 				macro_block_size=None,
 			)
 			self._is_active = True
+			self._worker = threading.Thread(target=self._encode_frames, name='video_recorder', daemon=True)
+			self._worker.start()
 			logger.debug(f'Video recorder started. Output will be saved to {self.output_path}')
 		except Exception as e:
 			logger.error(f'Failed to initialize video writer: {e}')
@@ -86,8 +111,9 @@ class VideoRecorderService:
 
 	def add_frame(self, frame_data_b64: str) -> None:
 		"""
-		Decodes a base64-encoded PNG frame, resizes it, pads it to be codec-compatible,
-		and appends it to the video.
+		Queues a base64-encoded PNG frame for the encoding worker without blocking.
+
+		If the queue is full, the oldest queued frame is dropped to make room.
 
 		Args:
 		    frame_data_b64: A base64-encoded string of the PNG frame data.
@@ -95,68 +121,55 @@ class VideoRecorderService:
 		if not self._is_active or not self._writer:
 			return
 
-		try:
-			frame_bytes = base64.b64decode(frame_data_b64)
-
-			# Build a filter chain for ffmpeg:
-			# 1. scale: Resizes the frame to the user-specified dimensions.
-			# 2. pad: Adds black bars to meet codec's macro-block requirements,
-			#    centering the original content.
-			vf_chain = (
-				f'scale={self.size["width"]}:{self.size["height"]},'
-				f'pad={self.padded_size["width"]}:{self.padded_size["height"]}:(ow-iw)/2:(oh-ih)/2:color=black'
-			)
-
-			output_pix_fmt = 'rgb24'
-			command = [
-				imageio_ffmpeg.get_ffmpeg_exe(),
-				'-f',
-				'image2pipe',  # Input format from a pipe
-				'-c:v',
-				'png',  # Specify input codec is PNG
-				'-i',
-				'-',  # Input from stdin
-				'-vf',
-				vf_chain,  # Video filter for resizing and padding
-				'-f',
-				'rawvideo',  # Output format is raw video
-				'-pix_fmt',
-				output_pix_fmt,  # Output pixel format
-				'-',  # Output to stdout
-			]
-
-			# Execute ffmpeg as a subprocess
-			proc = subprocess.Popen(command, stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
-			out, err = proc.communicate(input=frame_bytes)
-
-			if proc.returncode != 0:
-				err_msg = err.decode(errors='ignore').strip()
-				if 'deprecated pixel format used' not in err_msg.lower():
-					raise OSError(f'ffmpeg error during resizing/padding: {err_msg}')
-				else:
-					logger.debug(f'ffmpeg warning during resizing/padding: {err_msg}')
-
-			# Convert the raw output bytes to a numpy array with the padded dimensions
-			img_array = np.frombuffer(out, dtype=np.uint8).reshape((self.padded_size['height'], self.padded_size['width'], 3))
-
-			self._writer.append_data(img_array)
-		except Exception as e:
-			logger.warning(f'Could not process and add video frame: {e}')
+		while True:
+			try:
+				self._frames.put_nowait(frame_data_b64)
+				return
+			except queue.Full:
+				try:
+					self._frames.get_nowait()
+					self.frames_dropped += 1
+				except queue.Empty:
+					pass
+
+	def _encode_frames(self) -> None:
+		"""Worker thread: decodes, resizes and pads queued frames and appends them to the video."""
+		while True:
+			frame_data_b64 = self._frames.get()
+			if frame_data_b64 is None:
+				return
+			writer = self._writer
+			if writer is None:
+				return
+
+			try:
+				frame = _fit_frame(base64.b64decode(frame_data_b64), self.size, self.padded_size)
+				writer.append_data(frame)
+				self.frames_written += 1
+			except Exception as e:
+				logger.warning(f'Could not process and add video frame: {e}')
 
 	def stop_and_save(self) -> None:
 		"""
-		Finalizes the video file by closing the writer.
+		Finalizes the video file by encoding the remaining queued frames and closing the writer.
 
 		This method should be called when the recording session is complete.
 		"""
 		if not self._is_active or not self._writer:
 			return
 
+		self._is_active = False
 		try:
+			if self._worker is not None:
+				# The sentinel goes after all queued frames, so they are still written
+				self._frames.put(None)
+				self._worker.join()
 			self._writer.close()
+			if self.frames_dropped:
+				logger.debug(f'Video recorder dropped {self.frames_dropped} frames because encoding fell behind')
 			logger.info(f'📹 Video recording saved successfully to: {self.output_path}')
 		except Exception as e:
 			logger.error(f'Failed to finalize and save video: {e}')
 		finally:
-			self._is_active = False
+			self._worker = None
 			self._writer = None
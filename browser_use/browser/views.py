@@ -1,5 +1,5 @@
 from dataclasses import dataclass, field
-from typing import Any
+from typing import TYPE_CHECKING, Any
 
 from bubus import BaseEvent
 from cdp_use.cdp.target import TargetID
@@ -7,6 +7,9 @@ from pydantic import AliasChoices, BaseModel, ConfigDict, Field, field_serialize
 
 from browser_use.dom.views import DOMInteractedElement, SerializedDOMState
 
+if TYPE_CHECKING:
+	from browser_use.dom.binary_format import DOMArchive
+
 # Known placeholder image data for about:blank pages - a 4x4 white PNG
 PLACEHOLDER_4PX_SCREENSHOT = (
 	'iVBORw0KGgoAAAANSUhEUgAAAAQAAAAECAIAAAAmkwkpAAAAFElEQVR4nGP8//8/AwwwMSAB3BwAlm4DBfIlvvkAAAAASUVORK5CYII='
@@ -119,6 +122,7 @@ class BrowserStateHistory:
 	tabs: list[TabInfo]
 	interacted_element: list[DOMInteractedElement | None] | list[None]
 	screenshot_path: str | None = None
+	dom_archive_path: str | None = None  # Binary DOM archive of this step, see browser_use/dom/binary_format.py
 
 	def get_screenshot(self) -> str | None:
 		"""Load screenshot from disk and return as base64 string"""
@@ -139,10 +143,24 @@ class BrowserStateHistory:
 		except Exception:
 			return None
 
+	def load_dom_archive(self) -> 'DOMArchive | None':
+		"""Memory-map the DOM archive of this step, `interacted_element[i].archive_node_index` indexes into it"""
+		if not self.dom_archive_path:
+			return None
+
+		from pathlib import Path
+
+		from browser_use.dom.binary_format import DOMArchive
+
+		if not Path(self.dom_archive_path).exists():
+			return None
+		return DOMArchive.open(self.dom_archive_path)
+
 	def to_dict(self) -> dict[str, Any]:
 		data = {}
 		data['tabs'] = [tab.model_dump() for tab in self.tabs]
 		data['screenshot_path'] = self.screenshot_path
+		data['dom_archive_path'] = self.dom_archive_path
 		data['interacted_element'] = [el.to_dict() if el else None for el in self.interacted_element]
 		data['url'] = self.url
 		data['title'] = self.title
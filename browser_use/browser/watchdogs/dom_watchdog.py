@@ -1,8 +1,12 @@
 """DOM watchdog for browser DOM tree management using CDP."""
 
 import asyncio
+import re
 import time
-from typing import TYPE_CHECKING
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, ClassVar
+
+from cdp_use.cdp.target import TargetID
 
 from browser_use.browser.events import (
 	BrowserErrorEvent,
@@ -10,6 +14,8 @@ from browser_use.browser.events import (
 	ScreenshotEvent,
 	TabCreatedEvent,
 )
+from browser_use.browser.page_metadata import PageMetadata, PageMetadataProbe
+from browser_use.browser.page_stability import PageStabilityTracker, is_document_loading, is_ignored_request
 from browser_use.browser.watchdog_base import BaseWatchdog
 from browser_use.dom.service import DomService
 from browser_use.dom.views import (
@@ -20,9 +26,21 @@ from browser_use.observability import observe_debug
 from browser_use.utils import create_task_with_error_handling, time_execution_async
 
 if TYPE_CHECKING:
+	from browser_use.browser.session import CDPSession
 	from browser_use.browser.views import BrowserStateSummary, NetworkRequest, PageInfo, PaginationButton
 
 
+@dataclass
+class _ScreenshotFrame:
+	"""The last clean screenshot and what it showed, reused while none of it changed."""
+
+	key: tuple
+	"""Target, URL, DOM version, viewport key and capture parameters"""
+	captured_at: float
+	"""time.time() when the capture started"""
+	data: str
+
+
 class DOMWatchdog(BaseWatchdog):
 	"""Handles DOM tree building, serialization, and element access via CDP.
 
@@ -42,13 +60,109 @@ class DOMWatchdog(BaseWatchdog):
 	# Internal DOM service
 	_dom_service: DomService | None = None
 
-	# Network tracking - maps request_id to (url, start_time, method, resource_type)
-	_pending_requests: dict[str, tuple[str, float, str, str | None]] = {}
+	# Network/DOM activity tracking per target, replaces fixed sleeps before capturing page state
+	_stability_tracker: PageStabilityTracker | None = None
+	# How long the last state request waited for the page to become stable
+	last_stability_wait_ms: float | None = None
+
+	# URL, viewport, scroll and pending-resource info per target, fetched in one evaluation and shared with DomService
+	_page_metadata: PageMetadataProbe | None = None
+
+	# Incremental DOM snapshots: when the last DOM capture started (compared against event_bus history)
+	_last_dom_capture_at: float | None = None
+	# Incremental DOM snapshots: the last clean screenshot, reused if the page did not change since
+	_last_screenshot: _ScreenshotFrame | None = None
+
+	# Page markdown of enhanced_dom_tree by extract_links (see dom/markdown_extractor.py), only for that tree object
+	_markdown_cache: tuple[EnhancedDOMTreeNode, dict[bool, tuple[str, dict[str, Any]]]] | None = None
+
+	# Browser actions that can change page state without firing a CDP DOM mutation (input values, focus, scroll offsets)
+	INCREMENTAL_DOM_INVALIDATING_EVENTS: ClassVar[frozenset[str]] = frozenset(
+		{
+			'ClickElementEvent',
+			'ClickCoordinateEvent',
+			'TypeTextEvent',
+			'ScrollEvent',
+			'ScrollToTextEvent',
+			'SendKeysEvent',
+			'SelectDropdownOptionEvent',
+			'UploadFileEvent',
+			'NavigateToUrlEvent',
+			'GoBackEvent',
+			'GoForwardEvent',
+			'RefreshEvent',
+			'SwitchTabEvent',
+		}
+	)
+
+	# Of those, actions that only change the state of their element (its value), which the next incremental DOM capture
+	# re-fetches instead of capturing the whole page
+	INCREMENTAL_DOM_ELEMENT_EVENTS: ClassVar[frozenset[str]] = frozenset(
+		{'TypeTextEvent', 'SelectDropdownOptionEvent', 'UploadFileEvent'}
+	)
+
+	# Performance API initiator types (and URLs) of resources that only count as pending for their first 3 seconds
+	NON_CRITICAL_INITIATOR_TYPES: ClassVar[frozenset[str]] = frozenset({'img', 'image', 'icon', 'font'})
+	IMAGE_URL_RE: ClassVar[re.Pattern[str]] = re.compile(r'\.(jpg|jpeg|png|gif|webp|svg|ico)(\?|$)', re.IGNORECASE)
 
 	async def on_TabCreatedEvent(self, event: TabCreatedEvent) -> None:
 		# self.logger.debug('Setting up init scripts in browser')
 		return None
 
+	def _get_stability_tracker(self) -> PageStabilityTracker:
+		if self._stability_tracker is None:
+			self._stability_tracker = PageStabilityTracker(self.browser_session, logger=self.logger)
+		return self._stability_tracker
+
+	def _get_page_metadata(self) -> PageMetadataProbe:
+		if self._page_metadata is None:
+			self._page_metadata = PageMetadataProbe(self.browser_session, logger=self.logger)
+		return self._page_metadata
+
+	async def _wait_for_page_stability(self) -> list['NetworkRequest']:
+		"""Wait until the focused page is stable and return the requests still pending afterwards."""
+		from browser_use.browser.views import NetworkRequest
+
+		profile = self.browser_session.browser_profile
+		cdp_session = await self.browser_session.get_or_create_cdp_session(focus=True)
+		tracker = self._get_stability_tracker()
+
+		if not tracker.is_attached(cdp_session.target_id):
+			# Only the focused tab is tracked. Requests started before attaching (e.g. while the tab was in the
+			# background) are invisible to the tracker, so use the performance API probe once
+			await tracker.attach(cdp_session)
+			pending_requests = await self._get_pending_network_requests()
+			if pending_requests:
+				self.logger.debug(f'🔍 Found {len(pending_requests)} pending requests before stability wait')
+				await asyncio.sleep(0.3)
+				self._get_page_metadata().invalidate(cdp_session.target_id)
+			return pending_requests
+
+		result = await tracker.wait_until_stable(
+			cdp_session.target_id,
+			network_idle=profile.network_idle_threshold,
+			dom_idle=profile.dom_idle_threshold,
+			timeout=profile.wait_for_network_idle_page_load_time,
+			mutation_tracker=self._dom_service.mutation_tracker if self._dom_service else None,
+			lifecycle_events=cdp_session._lifecycle_events,
+		)
+		self.last_stability_wait_ms = result.waited_ms
+		self.logger.debug(
+			f'🔍 Page {"stable" if result.stable else "still loading"} after waiting {result.waited_ms:.0f}ms'
+			+ (f', {len(result.pending_requests)} requests pending' if result.pending_requests else '')
+		)
+
+		now = time.monotonic()
+		return [
+			NetworkRequest(
+				url=request.url,
+				method=request.method,
+				loading_duration_ms=round((now - request.started_at) * 1000),
+				resource_type=request.resource_type,
+			)
+			for request in result.pending_requests[:20]  # Limit to 20 to avoid overwhelming the context
+		]
+
 	def _get_recent_events_str(self, limit: int = 10) -> str | None:
 		"""Get the most recent events from the event bus as JSON.
 
@@ -91,7 +205,7 @@ class DOMWatchdog(BaseWatchdog):
 	async def _get_pending_network_requests(self) -> list['NetworkRequest']:
 		"""Get list of currently pending network requests.
 
-		Uses document.readyState and performance API to detect pending requests.
+		Uses the performance API resource entries from the page metadata probe to detect pending requests.
 		Filters out ads, tracking, and other noise.
 
 		Returns:
@@ -102,141 +216,37 @@ class DOMWatchdog(BaseWatchdog):
 		try:
 			# get_or_create_cdp_session() now handles focus validation automatically
 			cdp_session = await self.browser_session.get_or_create_cdp_session(focus=True)
-
-			# Use performance API to get pending requests
-			js_code = """
-(function() {
-	const now = performance.now();
-	const resources = performance.getEntriesByType('resource');
-	const pending = [];
-
-	// Check document readyState
-	const docLoading = document.readyState !== 'complete';
-
-	// Common ad/tracking domains and patterns to filter out
-	const adDomains = [
-		// Standard ad/tracking networks
-		'doubleclick.net', 'googlesyndication.com', 'googletagmanager.com',
-		'facebook.net', 'analytics', 'ads', 'tracking', 'pixel',
-		'hotjar.com', 'clarity.ms', 'mixpanel.com', 'segment.com',
-		// Analytics platforms
-		'demdex.net', 'omtrdc.net', 'adobedtm.com', 'ensighten.com',
-		'newrelic.com', 'nr-data.net', 'google-analytics.com',
-		// Social media trackers
-		'connect.facebook.net', 'platform.twitter.com', 'platform.linkedin.com',
-		// CDN/image hosts (usually not critical for functionality)
-		'.cloudfront.net/image/', '.akamaized.net/image/',
-		// Common tracking paths
-		'/tracker/', '/collector/', '/beacon/', '/telemetry/', '/log/',
-		'/events/', '/eventBatch', '/track.', '/metrics/'
-	];
-
-	// Get resources that are still loading (responseEnd is 0)
-	let totalResourcesChecked = 0;
-	let filteredByResponseEnd = 0;
-	const allDomains = new Set();
-
-	for (const entry of resources) {
-		totalResourcesChecked++;
-
-		// Track all domains from recent resources (for logging)
-		try {
-			const hostname = new URL(entry.name).hostname;
-			if (hostname) allDomains.add(hostname);
-		} catch (e) {}
-
-		if (entry.responseEnd === 0) {
-			filteredByResponseEnd++;
-			const url = entry.name;
-
-			// Filter out ads and tracking
-			const isAd = adDomains.some(domain => url.includes(domain));
-			if (isAd) continue;
-
-			// Filter out data: URLs and very long URLs (often inline resources)
-			if (url.startsWith('data:') || url.length > 500) continue;
-
-			const loadingDuration = now - entry.startTime;
-
-			// Skip requests that have been loading for >10 seconds (likely stuck/polling)
-			if (loadingDuration > 10000) continue;
-
-			const resourceType = entry.initiatorType || 'unknown';
-
-			// Filter out non-critical resources (images, fonts, icons) if loading >3 seconds
-			const nonCriticalTypes = ['img', 'image', 'icon', 'font'];
-			if (nonCriticalTypes.includes(resourceType) && loadingDuration > 3000) continue;
-
-			// Filter out image URLs even if type is unknown
-			const isImageUrl = /\\.(jpg|jpeg|png|gif|webp|svg|ico)(\\?|$)/i.test(url);
-			if (isImageUrl && loadingDuration > 3000) continue;
-
-			pending.push({
-				url: url,
-				method: 'GET',
-				loading_duration_ms: Math.round(loadingDuration),
-				resource_type: resourceType
-			});
-		}
-	}
-
-	return {
-		pending_requests: pending,
-		document_loading: docLoading,
-		document_ready_state: document.readyState,
-		debug: {
-			total_resources: totalResourcesChecked,
-			with_response_end_zero: filteredByResponseEnd,
-			after_all_filters: pending.length,
-			all_domains: Array.from(allDomains)
-		}
-	};
-})()
-"""
-
-			result = await cdp_session.cdp_client.send.Runtime.evaluate(
-				params={'expression': js_code, 'returnByValue': True}, session_id=cdp_session.session_id
-			)
-
-			if result.get('result', {}).get('type') == 'object':
-				data = result['result'].get('value', {})
-				pending = data.get('pending_requests', [])
-				doc_state = data.get('document_ready_state', 'unknown')
-				doc_loading = data.get('document_loading', False)
-				debug_info = data.get('debug', {})
-
-				# Get all domains that had recent activity (from JS)
-				all_domains = debug_info.get('all_domains', [])
-				all_domains_str = ', '.join(sorted(all_domains)[:5]) if all_domains else 'none'
-				if len(all_domains) > 5:
-					all_domains_str += f' +{len(all_domains) - 5} more'
-
-				# Debug logging
-				self.logger.debug(
-					f'🔍 Network check: document.readyState={doc_state}, loading={doc_loading}, '
-					f'total_resources={debug_info.get("total_resources", 0)}, '
-					f'responseEnd=0: {debug_info.get("with_response_end_zero", 0)}, '
-					f'after_filters={len(pending)}, domains=[{all_domains_str}]'
-				)
-
-				# Convert to NetworkRequest objects
-				network_requests = []
-				for req in pending[:20]:  # Limit to 20 to avoid overwhelming the context
-					network_requests.append(
-						NetworkRequest(
-							url=req['url'],
-							method=req.get('method', 'GET'),
-							loading_duration_ms=req.get('loading_duration_ms', 0.0),
-							resource_type=req.get('resource_type'),
-						)
-					)
-
-				return network_requests
-
+			metadata = await self._get_page_metadata().get(cdp_session.target_id)
 		except Exception as e:
 			self.logger.debug(f'Failed to get pending network requests: {e}')
+			return []
+
+		network_requests = []
+		for resource in metadata.pending_resources:
+			url = resource.get('url', '')
+			loading_duration = resource.get('loading_duration_ms', 0)
+			resource_type = resource.get('resource_type') or 'unknown'
+
+			# Filter out ads, tracking, data: URLs and very long URLs (often inline resources)
+			if is_ignored_request(url, None):
+				continue
+			# Skip requests that have been loading for >10 seconds (likely stuck/polling)
+			if loading_duration > 10000:
+				continue
+			# Filter out non-critical resources (images, fonts, icons) if loading >3 seconds
+			is_non_critical = resource_type in self.NON_CRITICAL_INITIATOR_TYPES or self.IMAGE_URL_RE.search(url)
+			if is_non_critical and loading_duration > 3000:
+				continue
+
+			network_requests.append(
+				NetworkRequest(url=url, method='GET', loading_duration_ms=loading_duration, resource_type=resource_type)
+			)
 
-		return []
+		self.logger.debug(
+			f'🔍 Network check: document.readyState={metadata.ready_state}, '
+			f'responseEnd=0: {len(metadata.pending_resources)}, after_filters={len(network_requests)}'
+		)
+		return network_requests[:20]  # Limit to 20 to avoid overwhelming the context
 
 	@observe_debug(ignore_input=True, ignore_output=True, name='browser_state_request_event')
 	async def on_BrowserStateRequestEvent(self, event: BrowserStateRequestEvent) -> 'BrowserStateSummary':
@@ -260,26 +270,19 @@ class DOMWatchdog(BaseWatchdog):
 		if self.browser_session.agent_focus_target_id:
 			self.logger.debug(f'Current page URL: {page_url}, target_id: {self.browser_session.agent_focus_target_id}')
 
+		# Page metadata is shared by everything below but never reused across requests: scrolling by the page itself
+		# or by the user fires no event we could invalidate on, and the incremental DOM check relies on the scroll offset
+		self._get_page_metadata().invalidate()
+
 		# check if we should skip DOM tree build for pointless pages
 		not_a_meaningful_website = page_url.lower().split(':', 1)[0] not in ('http', 'https')
 
-		# Check for pending network requests BEFORE waiting (so we can see what's loading)
-		pending_requests_before_wait = []
-		if not not_a_meaningful_website:
-			try:
-				pending_requests_before_wait = await self._get_pending_network_requests()
-				if pending_requests_before_wait:
-					self.logger.debug(f'🔍 Found {len(pending_requests_before_wait)} pending requests before stability wait')
-			except Exception as e:
-				self.logger.debug(f'Failed to get pending requests before wait: {e}')
-		pending_requests = pending_requests_before_wait
-		# Wait for page stability using browser profile settings (main branch pattern)
+		# Wait until the page is stable (network idle, DOM quiet), returns immediately on pages that already are
+		pending_requests = []
 		if not not_a_meaningful_website:
 			self.logger.debug('🔍 DOMWatchdog.on_BrowserStateRequestEvent: ⏳ Waiting for page stability...')
 			try:
-				if pending_requests_before_wait:
-					# Reduced from 1s to 0.3s for faster DOM builds while still allowing critical resources to load
-					await asyncio.sleep(0.3)
+				pending_requests = await self._wait_for_page_stability()
 				self.logger.debug('🔍 DOMWatchdog.on_BrowserStateRequestEvent: ✅ Page stability complete')
 			except Exception as e:
 				self.logger.warning(
@@ -547,13 +550,19 @@ class DOMWatchdog(BaseWatchdog):
 					paint_order_filtering=self.browser_session.browser_profile.paint_order_filtering,
 					max_iframes=self.browser_session.browser_profile.max_iframes,
 					max_iframe_depth=self.browser_session.browser_profile.max_iframe_depth,
+					incremental_snapshots=self.browser_session.browser_profile.incremental_dom_snapshots,
+					page_metadata=self._get_page_metadata(),
 				)
 
+			if self._dom_service.mutation_tracker is not None:
+				self._invalidate_incremental_dom_after_actions()
+
 			# Get serialized DOM tree using the service
 			self.logger.debug('🔍 DOMWatchdog._build_dom_tree_without_highlights: Calling DomService.get_serialized_dom_tree...')
 			start = time.time()
 			self.current_dom_state, self.enhanced_dom_tree, timing_info = await self._dom_service.get_serialized_dom_tree(
 				previous_cached_state=previous_state,
+				viewport_margin=self.browser_session.browser_profile.dom_viewport_margin,
 			)
 			end = time.time()
 			total_time_ms = (end - start) * 1000
@@ -564,6 +573,17 @@ class DOMWatchdog(BaseWatchdog):
 			# Build hierarchical timing breakdown as single multi-line string
 			timing_lines = [f'⏱️ Total DOM tree time: {total_time_ms:.2f}ms', '📊 Timing breakdown:']
 
+			# incremental mode: cheap check whether the previous capture can be reused
+			reuse_check_ms = timing_info.get('incremental_reuse_check_ms', 0)
+			if reuse_check_ms > 0.01:
+				if 'get_all_trees_total_ms' in timing_info:
+					outcome = 'full capture'
+				elif 'incremental_patch_ms' in timing_info:
+					outcome = f'patched in {timing_info["incremental_patch_ms"]:.2f}ms'
+				else:
+					outcome = 'reused'
+				timing_lines.append(f'  ├─ incremental_reuse_check: {reuse_check_ms:.2f}ms ({outcome})')
+
 			# get_all_trees breakdown
 			get_all_trees_ms = timing_info.get('get_all_trees_total_ms', 0)
 			if get_all_trees_ms > 0:
@@ -592,6 +612,18 @@ class DOMWatchdog(BaseWatchdog):
 			construct_tree_ms = timing_info.get('construct_enhanced_tree_ms', 0)
 			if construct_tree_ms > 0.01:
 				timing_lines.append(f'  ├─ construct_enhanced_tree: {construct_tree_ms:.2f}ms')
+				# cross-origin iframe targets captured in parallel while constructing the tree
+				frame_captures = int(timing_info.get('frame_captures', 0))
+				if frame_captures:
+					frame_capture_max_ms = timing_info.get('frame_capture_max_ms', 0)
+					timing_lines.append(
+						f'  │  └─ cross_origin_frames: {frame_captures} captured in parallel (slowest {frame_capture_max_ms:.2f}ms)'
+					)
+					for key, value in timing_info.items():
+						if key.startswith('frame_capture_') and key != 'frame_capture_max_ms':
+							timing_lines.append(
+								f'  │     ├─ {key.removeprefix("frame_capture_").removesuffix("_ms")}: {value:.2f}ms'
+							)
 
 			# serialize_accessible_elements breakdown
 			serialize_total_ms = timing_info.get('serialize_accessible_elements_total_ms', 0)
@@ -631,7 +663,8 @@ class DOMWatchdog(BaseWatchdog):
 
 			# Calculate total tracked time for validation
 			main_operations_ms = (
-				get_all_trees_ms
+				reuse_check_ms
+				+ get_all_trees_ms
 				+ build_ax_ms
 				+ build_snapshot_ms
 				+ construct_tree_ms
@@ -672,6 +705,36 @@ class DOMWatchdog(BaseWatchdog):
 			)
 			raise
 
+	def _invalidate_incremental_dom_after_actions(self) -> None:
+		"""Prepare the next incremental DOM capture for the browser actions that ran since the last capture.
+
+		Typing, scrolling inner containers or focusing elements does not always fire a CDP DOM mutation event,
+		so the mutation tracker alone cannot tell that the previously captured tree is stale. Elements that were
+		typed into, selected or uploaded to are re-fetched, any other page-affecting action forces a full capture.
+		"""
+		assert self._dom_service is not None
+		last_capture_at = self._last_dom_capture_at
+		self._last_dom_capture_at = time.time()
+		if last_capture_at is None:
+			return
+
+		try:
+			changed_backend_node_ids: list[int] = []
+			for event in reversed(self.browser_session.event_bus.event_history.values()):
+				if event.event_created_at.timestamp() < last_capture_at:
+					break
+				if event.event_type in self.INCREMENTAL_DOM_ELEMENT_EVENTS:
+					changed_backend_node_ids.append(getattr(event, 'node').backend_node_id)
+				elif event.event_type in self.INCREMENTAL_DOM_INVALIDATING_EVENTS:
+					self.logger.debug(f'🔍 Incremental DOM: {event.event_type} ran since last capture, invalidating')
+					self._dom_service.invalidate_incremental_cache()
+					return
+			if changed_backend_node_ids:
+				self._dom_service.mark_nodes_changed(changed_backend_node_ids)
+		except Exception as e:
+			self.logger.debug(f'Failed to inspect event history for incremental DOM: {e}')
+			self._dom_service.invalidate_incremental_cache()
+
 	@time_execution_async('capture_clean_screenshot')
 	@observe_debug(ignore_input=True, ignore_output=True, name='capture_clean_screenshot')
 	async def _capture_clean_screenshot(self) -> str:
@@ -679,14 +742,36 @@ class DOMWatchdog(BaseWatchdog):
 		try:
 			self.logger.debug('🔍 DOMWatchdog._capture_clean_screenshot: Capturing clean screenshot...')
 
-			await self.browser_session.get_or_create_cdp_session(target_id=self.browser_session.agent_focus_target_id, focus=True)
+			cdp_session = await self.browser_session.get_or_create_cdp_session(
+				target_id=self.browser_session.agent_focus_target_id, focus=True
+			)
+
+			started_at = time.time()
+			clip = None
+			frame_key = None
+			try:
+				metadata = await self._get_page_metadata().get(cdp_session.target_id)
+				clip = self._get_llm_screenshot_clip(metadata)
+				frame_key = self._get_screenshot_frame_key(cdp_session.target_id, metadata, clip)
+			except Exception as e:
+				self.logger.debug(f'📸 Page metadata unavailable, capturing full-size screenshot: {type(e).__name__}: {e}')
+
+			last_frame = self._last_screenshot
+			if (
+				frame_key is not None
+				and last_frame is not None
+				and last_frame.key == frame_key
+				and self.get_page_affecting_event_since(last_frame.captured_at) is None
+			):
+				self.logger.debug('🔍 DOMWatchdog._capture_clean_screenshot: ♻️ Page unchanged, reusing last screenshot')
+				return last_frame.data
 
 			# Check if handler is registered
 			handlers = self.event_bus.handlers.get('ScreenshotEvent', [])
 			handler_names = [getattr(h, '__name__', str(h)) for h in handlers]
 			self.logger.debug(f'📸 ScreenshotEvent handlers registered: {len(handlers)} - {handler_names}')
 
-			screenshot_event = self.event_bus.dispatch(ScreenshotEvent(full_page=False))
+			screenshot_event = self.event_bus.dispatch(ScreenshotEvent(full_page=False, clip=clip))
 			self.logger.debug('📸 Dispatched ScreenshotEvent, waiting for event to complete...')
 
 			# Wait for the event itself to complete (this waits for all handlers)
@@ -697,6 +782,9 @@ class DOMWatchdog(BaseWatchdog):
 			if screenshot_b64 is None:
 				raise RuntimeError('Screenshot handler returned None')
 			self.logger.debug('🔍 DOMWatchdog._capture_clean_screenshot: ✅ Clean screenshot captured successfully')
+			self._last_screenshot = (
+				_ScreenshotFrame(key=frame_key, captured_at=started_at, data=str(screenshot_b64)) if frame_key else None
+			)
 			return str(screenshot_b64)
 
 		except TimeoutError:
@@ -706,6 +794,49 @@ class DOMWatchdog(BaseWatchdog):
 			self.logger.warning(f'📸 Clean screenshot failed: {type(e).__name__}: {e}')
 			raise
 
+	def _get_llm_screenshot_clip(self, metadata: PageMetadata) -> dict[str, float] | None:
+		"""Clip of the visible viewport scaled down to about `llm_screenshot_size`, so Chrome does the resizing.
+
+		The scale keeps the aspect ratio and covers the target size in both dimensions, the prompt only resizes the
+		image further if the aspect ratios differ. None if no downscaling is needed or the page is pinch-zoomed.
+		"""
+		llm_screenshot_size = self.browser_session.llm_screenshot_size
+		if not llm_screenshot_size or metadata.window_width <= 0 or metadata.window_height <= 0:
+			return None
+		if metadata.visual_scale != 1:
+			return None
+
+		dpr = metadata.device_pixel_ratio
+		target_width, target_height = llm_screenshot_size
+		scale = max(target_width / (metadata.window_width * dpr), target_height / (metadata.window_height * dpr))
+		if scale >= 1:
+			return None
+		return {
+			'x': metadata.scroll_x,
+			'y': metadata.scroll_y,
+			'width': metadata.window_width,
+			'height': metadata.window_height,
+			'scale': scale,
+		}
+
+	def _get_screenshot_frame_key(
+		self, target_id: TargetID, metadata: PageMetadata, clip: dict[str, float] | None
+	) -> tuple | None:
+		"""What a screenshot depends on, None if DOM mutations of the target are not tracked (no reuse)."""
+		mutation_tracker = self._dom_service.mutation_tracker if self._dom_service else None
+		if mutation_tracker is None or not mutation_tracker.is_tracked(target_id):
+			return None
+		profile = self.browser_session.browser_profile
+		return (
+			target_id,
+			metadata.url,
+			mutation_tracker.get_version(target_id),
+			metadata.viewport_key,
+			tuple(sorted(clip.items())) if clip else None,
+			profile.screenshot_format,
+			profile.screenshot_quality,
+		)
+
 	def _detect_pagination_buttons(self, selector_map: dict[int, EnhancedDOMTreeNode]) -> list['PaginationButton']:
 		"""Detect pagination buttons from the DOM selector map.
 
@@ -757,6 +888,44 @@ class DOMWatchdog(BaseWatchdog):
 			target_id=self.browser_session.agent_focus_target_id, focus=True
 		)
 
+		try:
+			# Usually already probed (and cached) by the DOM capture of this state request
+			metadata = await self._get_page_metadata().get(cdp_session.target_id)
+			viewport_width = int(metadata.layout_width)
+			viewport_height = int(metadata.layout_height)
+			page_width = int(metadata.page_width)
+			page_height = int(metadata.page_height)
+			scroll_x = int(metadata.scroll_x)
+			scroll_y = int(metadata.scroll_y)
+		except Exception as e:
+			self.logger.debug(f'Page metadata probe failed, falling back to layout metrics: {e}')
+			viewport_width, viewport_height, page_width, page_height, scroll_x, scroll_y = await self._get_layout_metrics(
+				cdp_session
+			)
+
+		# Calculate scroll information - pixels that are above/below/left/right of current viewport
+		pixels_above = scroll_y
+		pixels_below = max(0, page_height - viewport_height - scroll_y)
+		pixels_left = scroll_x
+		pixels_right = max(0, page_width - viewport_width - scroll_x)
+
+		page_info = PageInfo(
+			viewport_width=viewport_width,
+			viewport_height=viewport_height,
+			page_width=page_width,
+			page_height=page_height,
+			scroll_x=scroll_x,
+			scroll_y=scroll_y,
+			pixels_above=pixels_above,
+			pixels_below=pixels_below,
+			pixels_left=pixels_left,
+			pixels_right=pixels_right,
+		)
+
+		return page_info
+
+	async def _get_layout_metrics(self, cdp_session: 'CDPSession') -> tuple[int, int, int, int, int, int]:
+		"""Viewport size, page size and scroll offset in CSS pixels from Page.getLayoutMetrics."""
 		# Get layout metrics which includes all the information we need
 		metrics = await asyncio.wait_for(
 			cdp_session.cdp_client.send.Page.getLayoutMetrics(session_id=cdp_session.session_id), timeout=10.0
@@ -792,26 +961,7 @@ class DOMWatchdog(BaseWatchdog):
 		scroll_x = int(css_visual_viewport.get('pageX') or css_layout_viewport.get('pageX', 0))
 		scroll_y = int(css_visual_viewport.get('pageY') or css_layout_viewport.get('pageY', 0))
 
-		# Calculate scroll information - pixels that are above/below/left/right of current viewport
-		pixels_above = scroll_y
-		pixels_below = max(0, page_height - viewport_height - scroll_y)
-		pixels_left = scroll_x
-		pixels_right = max(0, page_width - viewport_width - scroll_x)
-
-		page_info = PageInfo(
-			viewport_width=viewport_width,
-			viewport_height=viewport_height,
-			page_width=page_width,
-			page_height=page_height,
-			scroll_x=scroll_x,
-			scroll_y=scroll_y,
-			pixels_above=pixels_above,
-			pixels_below=pixels_below,
-			pixels_left=pixels_left,
-			pixels_right=pixels_right,
-		)
-
-		return page_info
+		return viewport_width, viewport_height, page_width, page_height, scroll_x, scroll_y
 
 	# ========== Public Helper Methods ==========
 
@@ -834,7 +984,67 @@ class DOMWatchdog(BaseWatchdog):
 		self.selector_map = None
 		self.current_dom_state = None
 		self.enhanced_dom_tree = None
+		self._last_screenshot = None
+		self._markdown_cache = None
 		# Keep the DOM service instance to reuse its CDP client connection
+		self.invalidate_page_caches()
+
+	def invalidate_page_caches(self) -> None:
+		"""Make the next capture a full one, for page changes made outside of browser action events (e.g. by scripts)."""
+		if self._dom_service is not None:
+			self._dom_service.invalidate_incremental_cache()
+		if self._page_metadata is not None:
+			self._page_metadata.invalidate()
+
+	def restore_cached_state(self, browser_state: 'BrowserStateSummary') -> None:
+		"""Make an earlier capture the cached state again, element indices are resolved against its selector map."""
+		self.browser_session._cached_browser_state_summary = browser_state
+		if browser_state.dom_state is not None:
+			self.current_dom_state = browser_state.dom_state
+			self.selector_map = browser_state.dom_state.selector_map
+			self.browser_session.update_cached_selector_map(self.selector_map)
+
+	def get_dom_version(self, target_id: TargetID) -> int | None:
+		"""DOM mutation counter of a target, None if mutations are not tracked (`incremental_dom_snapshots` disabled)."""
+		if self._dom_service is None or self._dom_service.mutation_tracker is None:
+			return None
+		return self._dom_service.mutation_tracker.get_version(target_id)
+
+	def get_page_affecting_event_since(self, since: float) -> str | None:
+		"""Type of the latest browser action event that may have changed the page since `since` (a `time.time()`)."""
+		for event in reversed(self.browser_session.event_bus.event_history.values()):
+			if event.event_created_at.timestamp() < since:
+				break
+			if event.event_type in self.INCREMENTAL_DOM_INVALIDATING_EVENTS:
+				return event.event_type
+		return None
+
+	def is_page_idle(self, target_id: TargetID) -> bool:
+		"""Whether the page is settled right now, without waiting.
+
+		Idle means no blocking network request in flight, the document finished loading and, when DOM mutations are
+		tracked, no mutation within `dom_idle_threshold`. Targets that are not tracked yet never count as idle.
+		"""
+		tracker = self._stability_tracker
+		if tracker is None or not tracker.is_attached(target_id) or tracker.pending_requests(target_id):
+			return False
+
+		mutation_tracker = self._dom_service.mutation_tracker if self._dom_service else None
+		if mutation_tracker is not None:
+			last_mutation = mutation_tracker.get_last_mutation_time(target_id)
+			if (
+				last_mutation is not None
+				and time.monotonic() - last_mutation < self.browser_session.browser_profile.dom_idle_threshold
+			):
+				return False
+
+		session_manager = self.browser_session.session_manager
+		if session_manager is None:
+			return False
+		return not any(
+			is_document_loading(cdp_session._lifecycle_events)
+			for cdp_session in session_manager.get_all_sessions_for_target(target_id)
+		)
 
 	def is_file_input(self, element: EnhancedDOMTreeNode) -> bool:
 		"""Check if element is a file input."""
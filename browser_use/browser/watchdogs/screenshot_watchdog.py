@@ -31,7 +31,7 @@ class ScreenshotWatchdog(BaseWatchdog):
 			event: ScreenshotEvent with optional full_page and clip parameters
 
 		Returns:
-			Dict with 'screenshot' key containing base64-encoded screenshot or None
+			Base64-encoded screenshot in the requested format (BrowserProfile.screenshot_format by default)
 		"""
 		self.logger.debug('[ScreenshotWatchdog] Handler START - on_ScreenshotEvent called')
 		try:
@@ -53,7 +53,21 @@ class ScreenshotWatchdog(BaseWatchdog):
 			cdp_session = await self.browser_session.get_or_create_cdp_session(target_id, focus=True)
 
 			# Prepare screenshot parameters
-			params = CaptureScreenshotParameters(format='png', captureBeyondViewport=False)
+			profile = self.browser_session.browser_profile
+			image_format = event.format or profile.screenshot_format
+			quality = event.quality if event.quality is not None else profile.screenshot_quality
+			params = CaptureScreenshotParameters(format=image_format, captureBeyondViewport=False)
+			if image_format != 'png' and quality is not None:
+				params['quality'] = quality
+			if event.clip:
+				# Chrome crops and scales the image, cheaper than resizing it in Python afterwards
+				params['clip'] = {
+					'x': event.clip['x'],
+					'y': event.clip['y'],
+					'width': event.clip['width'],
+					'height': event.clip['height'],
+					'scale': event.clip.get('scale', 1.0),
+				}
 
 			# Take screenshot using CDP
 			self.logger.debug(f'[ScreenshotWatchdog] Taking screenshot with params: {params}')
@@ -1807,6 +1807,7 @@ async def run_auth_command():
 			},
 		)
 		await sync_service.handle_event(session_event)
+		await sync_service.flush(timeout=10.0)
 
 		# Brief delay to ensure session is created in backend before sending task
 		await asyncio.sleep(0.5)
@@ -1825,6 +1826,7 @@ async def run_auth_command():
 			gif_url=None,
 		)
 		await sync_service.handle_event(task_event)
+		await sync_service.flush(timeout=10.0)
 
 		# Longer delay to ensure task is created in backend before sending step event
 		await asyncio.sleep(1.0)
@@ -1925,6 +1927,7 @@ async def run_auth_command():
 			)
 			print('📤 Sending dummy step event...')
 			await sync_service.handle_event(step_event)
+			await sync_service.flush(timeout=10.0)
 
 			# Small delay to ensure step is processed before completion
 			await asyncio.sleep(0.5)
@@ -1979,6 +1982,10 @@ async def run_auth_command():
 			except Exception:
 				pass  # Don't fail if we can't send the error event
 		sys.exit(1)
+	finally:
+		# Upload the queued events before exiting
+		if sync_service:
+			await sync_service.close()
 
 
 @click.group(invoke_without_command=True)
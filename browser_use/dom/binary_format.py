@@ -0,0 +1,663 @@
+"""
+Compact binary format for captured DOM state (EnhancedDOMTreeNode trees and SerializedDOMState).
+
+`EnhancedDOMTreeNode.__json__` / `SimplifiedNode.__json__` produce nested dicts where most of the bytes are the
+same tag names, attribute keys and style strings over and over. A DOM archive instead stores:
+
+- a string table (every distinct string once, referenced by id)
+- the nodes flattened in pre-order, with a fixed-width parent-index array and record-offset array
+- one varint-encoded record per node (ids, string ids, flags, rects, snapshot and AX data)
+- optionally the selector map and the simplified tree of a SerializedDOMState, as node indices
+
+The fixed-width arrays are read straight out of a memory-mapped file (no parsing on open), strings and node
+records are only decoded when accessed. `DOMInteractedElement.archive_node_index` and
+`BrowserStateHistory.dom_archive_path` point into archives written by the agent.
+
+Layout (little-endian, every section 8-byte aligned):
+
+	header | string offsets (u32 * n_strings+1) | string data (utf-8) | parents (i32 * n_nodes)
+	| record offsets (u32 * n_nodes+1) | node records | selector map | simplified tree
+"""
+
+import json
+import mmap
+import struct
+import sys
+from array import array
+from pathlib import Path
+from typing import Any, Literal
+
+from browser_use.dom.views import (
+	DOMRect,
+	DOMSelectorMap,
+	EnhancedAXNode,
+	EnhancedAXProperty,
+	EnhancedDOMTreeNode,
+	EnhancedSnapshotNode,
+	NodeType,
+	SerializedDOMState,
+	SimplifiedNode,
+)
+
+MAGIC = b'BUDOM\x00'
+FORMAT_VERSION = 1
+
+# magic, version, n_strings, n_nodes, then the offsets of the 7 sections and the end of the file
+_HEADER = struct.Struct('<6sHII8Q')
+_RECT = struct.Struct('<4d')
+
+# How a node hangs off its parent
+RELATION_CHILD = 0
+RELATION_SHADOW_ROOT = 1
+RELATION_CONTENT_DOCUMENT = 2
+
+# Node record flags
+_F_VISIBLE_KNOWN = 1 << 0
+_F_VISIBLE = 1 << 1
+_F_SCROLLABLE_KNOWN = 1 << 2
+_F_SCROLLABLE = 1 << 3
+_F_ABSOLUTE_POSITION = 1 << 4
+_F_SNAPSHOT = 1 << 5
+_F_AX = 1 << 6
+_F_COMPOUND = 1 << 7
+
+# Snapshot record flags
+_S_CLICKABLE_KNOWN = 1 << 0
+_S_CLICKABLE = 1 << 1
+_S_BOUNDS = 1 << 2
+_S_CLIENT_RECTS = 1 << 3
+_S_SCROLL_RECTS = 1 << 4
+_S_STYLES = 1 << 5
+_S_PAINT_ORDER = 1 << 6
+_S_STACKING_CONTEXTS = 1 << 7
+
+# SimplifiedNode flags, in bit order
+_SIMPLIFIED_FLAGS = (
+	'should_display',
+	'is_interactive',
+	'is_new',
+	'ignored_by_paint_order',
+	'excluded_by_parent',
+	'is_shadow_host',
+	'is_compound_component',
+)
+
+
+class DOMArchiveError(ValueError):
+	"""Raised when a buffer is not a valid DOM archive."""
+
+
+def _write_varint(out: bytearray, value: int) -> None:
+	while value > 0x7F:
+		out.append((value & 0x7F) | 0x80)
+		value >>= 7
+	out.append(value)
+
+
+def _write_zigzag(out: bytearray, value: int) -> None:
+	_write_varint(out, (value << 1) ^ (value >> 63))
+
+
+def _read_varint(buf: Any, pos: int) -> tuple[int, int]:
+	result = 0
+	shift = 0
+	while True:
+		byte = buf[pos]
+		pos += 1
+		result |= (byte & 0x7F) << shift
+		if byte < 0x80:
+			return result, pos
+		shift += 7
+
+
+def _read_zigzag(buf: Any, pos: int) -> tuple[int, int]:
+	value, pos = _read_varint(buf, pos)
+	return (value >> 1) ^ -(value & 1), pos
+
+
+def _pad(out: bytearray) -> int:
+	out.extend(b'\x00' * (-len(out) % 8))
+	return len(out)
+
+
+class DOMArchiveWriter:
+	"""Flattens an EnhancedDOMTreeNode tree (plus optional selector map / simplified tree) into a DOM archive.
+
+	Example:
+		writer = DOMArchiveWriter.from_serialized_dom_state(dom_state)
+		writer.write(path)
+		index = writer.index_of(dom_state.selector_map[42])
+	"""
+
+	def __init__(self, root: EnhancedDOMTreeNode):
+		self._strings: dict[str, int] = {}
+		self._nodes: list[EnhancedDOMTreeNode] = []
+		self._parents: list[int] = []
+		self._relations: list[int] = []
+		self._node_indices: dict[int, int] = {}  # id(node) -> index
+		self._selector_map: list[tuple[int, int]] = []
+		self._simplified: list[tuple[int, int, int]] = []  # (node index, parent simplified index, flags)
+		self._add_tree(root, -1, RELATION_CHILD)
+
+	@classmethod
+	def from_serialized_dom_state(cls, dom_state: SerializedDOMState) -> 'DOMArchiveWriter':
+		"""Archive the whole enhanced tree behind a SerializedDOMState, plus its selector map and simplified tree."""
+		if dom_state._root is None:
+			raise ValueError('Cannot archive an empty SerializedDOMState')
+
+		root = dom_state._root.original_node
+		while root.parent_node is not None:
+			root = root.parent_node
+
+		writer = cls(root)
+		writer.add_simplified_tree(dom_state._root)
+		writer.add_selector_map(dom_state.selector_map)
+		return writer
+
+	def _add_tree(self, root: EnhancedDOMTreeNode, parent_index: int, relation: int) -> None:
+		stack: list[tuple[EnhancedDOMTreeNode, int, int]] = [(root, parent_index, relation)]
+		while stack:
+			node, parent, rel = stack.pop()
+			if id(node) in self._node_indices:
+				continue
+			index = len(self._nodes)
+			self._node_indices[id(node)] = index
+			self._nodes.append(node)
+			self._parents.append(parent)
+			self._relations.append(rel)
+
+			# Pushed in reverse so children come first, then shadow roots, then the iframe document
+			if node.content_document is not None:
+				stack.append((node.content_document, index, RELATION_CONTENT_DOCUMENT))
+			for shadow_root in reversed(node.shadow_roots or []):
+				stack.append((shadow_root, index, RELATION_SHADOW_ROOT))
+			for child in reversed(node.children_nodes or []):
+				stack.append((child, index, RELATION_CHILD))
+
+	def _index_of_or_add(self, node: EnhancedDOMTreeNode) -> int:
+		index = self._node_indices.get(id(node))
+		if index is None:
+			# Not reachable from the root: archive it as a separate detached subtree
+			self._add_tree(node, -1, RELATION_CHILD)
+			index = self._node_indices[id(node)]
+		return index
+
+	def index_of(self, node: EnhancedDOMTreeNode) -> int | None:
+		"""Archive node index of an enhanced node, e.g. to store in `DOMInteractedElement.archive_node_index`."""
+		return self._node_indices.get(id(node))
+
+	def add_selector_map(self, selector_map: DOMSelectorMap) -> None:
+		for key, node in selector_map.items():
+			self._selector_map.append((key, self._index_of_or_add(node)))
+
+	def add_simplified_tree(self, root: SimplifiedNode) -> None:
+		stack: list[tuple[SimplifiedNode, int]] = [(root, -1)]
+		while stack:
+			simplified, parent = stack.pop()
+			flags = 0
+			for bit, name in enumerate(_SIMPLIFIED_FLAGS):
+				if getattr(simplified, name):
+					flags |= 1 << bit
+			index = len(self._simplified)
+			self._simplified.append((self._index_of_or_add(simplified.original_node), parent, flags))
+			for child in reversed(simplified.children):
+				stack.append((child, index))
+
+	def _sid(self, value: str | None) -> int:
+		"""String id + 1, 0 encodes None."""
+		if value is None:
+			return 0
+		sid = self._strings.get(value)
+		if sid is None:
+			sid = self._strings[value] = len(self._strings)
+		return sid + 1
+
+	def _encode_node(self, out: bytearray, node: EnhancedDOMTreeNode, relation: int) -> None:
+		flags = 0
+		if node.is_visible is not None:
+			flags |= _F_VISIBLE_KNOWN | (_F_VISIBLE if node.is_visible else 0)
+		if node.is_scrollable is not None:
+			flags |= _F_SCROLLABLE_KNOWN | (_F_SCROLLABLE if node.is_scrollable else 0)
+		if node.absolute_position is not None:
+			flags |= _F_ABSOLUTE_POSITION
+		if node.snapshot_node is not None:
+			flags |= _F_SNAPSHOT
+		if node.ax_node is not None:
+			flags |= _F_AX
+		if node._compound_children:
+			flags |= _F_COMPOUND
+
+		_write_varint(out, relation)
+		_write_varint(out, node.node_id)
+		_write_varint(out, node.backend_node_id)
+		_write_varint(out, node.node_type.value)
+		_write_varint(out, self._sid(node.node_name))
+		_write_varint(out, self._sid(node.node_value))
+		_write_varint(out, flags)
+		_write_varint(out, self._sid(node.target_id))
+		_write_varint(out, self._sid(node.frame_id))
+		_write_varint(out, self._sid(node.session_id))
+		_write_varint(out, self._sid(node.shadow_root_type))
+		_write_varint(out, len(node.attributes))
+		for key, value in node.attributes.items():
+			_write_varint(out, self._sid(key))
+			_write_varint(out, self._sid(value))
+
+		if node.absolute_position is not None:
+			self._encode_rect(out, node.absolute_position)
+		if node.snapshot_node is not None:
+			self._encode_snapshot(out, node.snapshot_node)
+		if node.ax_node is not None:
+			self._encode_ax(out, node.ax_node)
+		if node._compound_children:
+			_write_varint(out, self._sid(json.dumps(node._compound_children)))
+
+	@staticmethod
+	def _encode_rect(out: bytearray, rect: DOMRect) -> None:
+		out.extend(_RECT.pack(rect.x, rect.y, rect.width, rect.height))
+
+	def _encode_snapshot(self, out: bytearray, snapshot: EnhancedSnapshotNode) -> None:
+		flags = 0
+		if snapshot.is_clickable is not None:
+			flags |= _S_CLICKABLE_KNOWN | (_S_CLICKABLE if snapshot.is_clickable else 0)
+		if snapshot.bounds is not None:
+			flags |= _S_BOUNDS
+		if snapshot.clientRects is not None:
+			flags |= _S_CLIENT_RECTS
+		if snapshot.scrollRects is not None:
+			flags |= _S_SCROLL_RECTS
+		if snapshot.computed_styles is not None:
+			flags |= _S_STYLES
+		if snapshot.paint_order is not None:
+			flags |= _S_PAINT_ORDER
+		if snapshot.stacking_contexts is not None:
+			flags |= _S_STACKING_CONTEXTS
+
+		_write_varint(out, flags)
+		_write_varint(out, self._sid(snapshot.cursor_style))
+		for rect in (snapshot.bounds, snapshot.clientRects, snapshot.scrollRects):
+			if rect is not None:
+				self._encode_rect(out, rect)
+		if snapshot.computed_styles is not None:
+			_write_varint(out, len(snapshot.computed_styles))
+			for key, value in snapshot.computed_styles.items():
+				_write_varint(out, self._sid(key))
+				_write_varint(out, self._sid(value))
+		if snapshot.paint_order is not None:
+			_write_zigzag(out, snapshot.paint_order)
+		if snapshot.stacking_contexts is not None:
+			_write_zigzag(out, snapshot.stacking_contexts)
+
+	def _encode_ax(self, out: bytearray, ax_node: EnhancedAXNode) -> None:
+		_write_varint(out, self._sid(ax_node.ax_node_id))
+		_write_varint(out, int(ax_node.ignored))
+		_write_varint(out, self._sid(ax_node.role))
+		_write_varint(out, self._sid(ax_node.name))
+		_write_varint(out, self._sid(ax_node.description))
+		# Lists are stored as length + 1, 0 encodes None
+		if ax_node.properties is None:
+			_write_varint(out, 0)
+		else:
+			_write_varint(out, len(ax_node.properties) + 1)
+			for prop in ax_node.properties:
+				_write_varint(out, self._sid(prop.name))
+				_write_varint(out, self._sid(json.dumps(prop.value)))
+		if ax_node.child_ids is None:
+			_write_varint(out, 0)
+		else:
+			_write_varint(out, len(ax_node.child_ids) + 1)
+			for child_id in ax_node.child_ids:
+				_write_varint(out, self._sid(child_id))
+
+	def to_bytes(self) -> bytes:
+		# Node records first: they populate the string table
+		records = bytearray()
+		record_offsets = array('I')
+		for node, relation in zip(self._nodes, self._relations):
+			record_offsets.append(len(records))
+			self._encode_node(records, node, relation)
+		record_offsets.append(len(records))
+
+		strings = [s.encode() for s in self._strings]
+		string_offsets = array('I', [0])
+		for encoded in strings:
+			string_offsets.append(string_offsets[-1] + len(encoded))
+
+		parents = array('i', self._parents)
+		if sys.byteorder != 'little':
+			string_offsets.byteswap()
+			parents.byteswap()
+			record_offsets.byteswap()
+
+		out = bytearray(_HEADER.size)
+		offsets = [_pad(out)]
+		out.extend(string_offsets.tobytes())
+		offsets.append(_pad(out))
+		out.extend(b''.join(strings))
+		offsets.append(_pad(out))
+		out.extend(parents.tobytes())
+		offsets.append(_pad(out))
+		out.extend(record_offsets.tobytes())
+		offsets.append(_pad(out))
+		out.extend(records)
+		offsets.append(_pad(out))
+		_write_varint(out, len(self._selector_map))
+		for key, index in self._selector_map:
+			_write_varint(out, key)
+			_write_varint(out, index)
+		offsets.append(_pad(out))
+		_write_varint(out, len(self._simplified))
+		for index, parent, flags in self._simplified:
+			_write_varint(out, index)
+			_write_varint(out, parent + 1)
+			_write_varint(out, flags)
+		offsets.append(len(out))
+
+		_HEADER.pack_into(out, 0, MAGIC, FORMAT_VERSION, len(strings), len(self._nodes), *offsets)
+		return bytes(out)
+
+	def write(self, path: str | Path) -> Path:
+		path = Path(path)
+		path.parent.mkdir(parents=True, exist_ok=True)
+		path.write_bytes(self.to_bytes())
+		return path
+
+
+class DOMArchive:
+	"""Read-only view over a DOM archive, memory-mapped from disk or backed by an in-memory buffer.
+
+	Opening an archive only reads the header: the parent and offset arrays are zero-copy views into the buffer,
+	and strings / node records are decoded on access.
+
+	Example:
+		with DOMArchive.open(history_item.state.dom_archive_path) as archive:
+			element = archive.load_node(interacted_element.archive_node_index)
+			dom_state = archive.to_serialized_dom_state()
+	"""
+
+	def __init__(self, buffer: Any, _mmap: mmap.mmap | None = None):
+		self._mmap = _mmap
+		self._buf = memoryview(buffer)
+		if len(self._buf) < _HEADER.size:
+			raise DOMArchiveError('Buffer too small to be a DOM archive')
+
+		magic, version, self._n_strings, self._n_nodes, *self._offsets = _HEADER.unpack_from(self._buf, 0)
+		if magic != MAGIC:
+			raise DOMArchiveError('Not a DOM archive (bad magic)')
+		if version != FORMAT_VERSION:
+			raise DOMArchiveError(f'Unsupported DOM archive version {version}')
+		if self._offsets[-1] > len(self._buf):
+			raise DOMArchiveError('Truncated DOM archive')
+
+		self._string_offsets = self._int_array(0, 'I', self._n_strings + 1)
+		self._parents = self._int_array(2, 'i', self._n_nodes)
+		self._record_offsets = self._int_array(3, 'I', self._n_nodes + 1)
+		self._string_cache: dict[int, str] = {}
+		self._children: list[list[int]] | None = None
+		self._backend_node_index: dict[int, int] | None = None
+
+	@classmethod
+	def open(cls, path: str | Path) -> 'DOMArchive':
+		"""Memory-map an archive file."""
+		with open(path, 'rb') as f:
+			mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+		return cls(mapped, _mmap=mapped)
+
+	@classmethod
+	def from_bytes(cls, data: bytes) -> 'DOMArchive':
+		return cls(data)
+
+	def close(self) -> None:
+		# Views into the mmap must be released before it can be closed
+		for view in (self._string_offsets, self._parents, self._record_offsets):
+			if isinstance(view, memoryview):
+				view.release()
+		self._buf.release()
+		if self._mmap is not None:
+			self._mmap.close()
+			self._mmap = None
+
+	def __enter__(self) -> 'DOMArchive':
+		return self
+
+	def __exit__(self, *exc_info: Any) -> None:
+		self.close()
+
+	def __len__(self) -> int:
+		return self._n_nodes
+
+	def _int_array(self, section: int, typecode: Literal['i', 'I'], count: int) -> Any:
+		start = self._offsets[section]
+		raw = self._buf[start : start + 4 * count]
+		if sys.byteorder == 'little':
+			return raw.cast(typecode)
+		swapped = array(typecode, raw.tobytes())
+		swapped.byteswap()
+		return swapped
+
+	def string(self, string_id: int) -> str:
+		cached = self._string_cache.get(string_id)
+		if cached is None:
+			base = self._offsets[1]
+			start, end = self._string_offsets[string_id], self._string_offsets[string_id + 1]
+			cached = self._string_cache[string_id] = str(self._buf[base + start : base + end], 'utf-8')
+		return cached
+
+	def _read_sid(self, pos: int) -> tuple[str | None, int]:
+		sid, pos = _read_varint(self._buf, pos)
+		return (self.string(sid - 1) if sid else None), pos
+
+	def _read_rect(self, pos: int) -> tuple[DOMRect, int]:
+		x, y, width, height = _RECT.unpack_from(self._buf, pos)
+		return DOMRect(x=x, y=y, width=width, height=height), pos + _RECT.size
+
+	def parent_index(self, index: int) -> int | None:
+		parent = self._parents[index]
+		return None if parent < 0 else parent
+
+	def children_indices(self, index: int) -> list[int]:
+		"""Indices of all nodes hanging off `index` (children, shadow roots and iframe content document)."""
+		if self._children is None:
+			self._children = [[] for _ in range(self._n_nodes)]
+			for child, parent in enumerate(self._parents):
+				if parent >= 0:
+					self._children[parent].append(child)
+		return self._children[index]
+
+	def find_backend_node_id(self, backend_node_id: int) -> int | None:
+		"""Archive index of the first node with the given backend node id."""
+		if self._backend_node_index is None:
+			self._backend_node_index = {}
+			for index in range(self._n_nodes):
+				pos = self._record_offsets[index] + self._offsets[4]
+				_, pos = _read_varint(self._buf, pos)  # relation
+				_, pos = _read_varint(self._buf, pos)  # node_id
+				backend_id, _ = _read_varint(self._buf, pos)
+				self._backend_node_index.setdefault(backend_id, index)
+		return self._backend_node_index.get(backend_node_id)
+
+	def relation(self, index: int) -> int:
+		return self._buf[self._offsets[4] + self._record_offsets[index]]
+
+	def load_node(self, index: int) -> EnhancedDOMTreeNode:
+		"""Decode a single node. The returned node is detached: parent/children/shadow roots/content document are unset."""
+		buf = self._buf
+		pos = self._offsets[4] + self._record_offsets[index]
+		_, pos = _read_varint(buf, pos)  # relation
+		node_id, pos = _read_varint(buf, pos)
+		backend_node_id, pos = _read_varint(buf, pos)
+		node_type, pos = _read_varint(buf, pos)
+		node_name, pos = self._read_sid(pos)
+		node_value, pos = self._read_sid(pos)
+		flags, pos = _read_varint(buf, pos)
+		target_id, pos = self._read_sid(pos)
+		frame_id, pos = self._read_sid(pos)
+		session_id, pos = self._read_sid(pos)
+		shadow_root_type, pos = self._read_sid(pos)
+
+		attributes: dict[str, str] = {}
+		n_attributes, pos = _read_varint(buf, pos)
+		for _ in range(n_attributes):
+			key, pos = self._read_sid(pos)
+			value, pos = self._read_sid(pos)
+			attributes[key or ''] = value or ''
+
+		absolute_position = snapshot_node = ax_node = None
+		if flags & _F_ABSOLUTE_POSITION:
+			absolute_position, pos = self._read_rect(pos)
+		if flags & _F_SNAPSHOT:
+			snapshot_node, pos = self._decode_snapshot(pos)
+		if flags & _F_AX:
+			ax_node, pos = self._decode_ax(pos)
+		compound_children: list[dict[str, Any]] = []
+		if flags & _F_COMPOUND:
+			compound_json, pos = self._read_sid(pos)
+			compound_children = json.loads(compound_json or '[]')
+
+		return EnhancedDOMTreeNode(
+			node_id=node_id,
+			backend_node_id=backend_node_id,
+			node_type=NodeType(node_type),
+			node_name=node_name or '',
+			node_value=node_value or '',
+			attributes=attributes,
+			is_scrollable=bool(flags & _F_SCROLLABLE) if flags & _F_SCROLLABLE_KNOWN else None,
+			is_visible=bool(flags & _F_VISIBLE) if flags & _F_VISIBLE_KNOWN else None,
+			absolute_position=absolute_position,
+			target_id=target_id or '',
+			frame_id=frame_id,
+			session_id=session_id,
+			content_document=None,
+			shadow_root_type=shadow_root_type,  # type: ignore[arg-type]
+			shadow_roots=None,
+			parent_node=None,
+			children_nodes=None,
+			ax_node=ax_node,
+			snapshot_node=snapshot_node,
+			_compound_children=compound_children,
+		)
+
+	def _decode_snapshot(self, pos: int) -> tuple[EnhancedSnapshotNode, int]:
+		flags, pos = _read_varint(self._buf, pos)
+		cursor_style, pos = self._read_sid(pos)
+		rects: list[DOMRect | None] = []
+		for flag in (_S_BOUNDS, _S_CLIENT_RECTS, _S_SCROLL_RECTS):
+			rect = None
+			if flags & flag:
+				rect, pos = self._read_rect(pos)
+			rects.append(rect)
+		computed_styles = paint_order = stacking_contexts = None
+		if flags & _S_STYLES:
+			computed_styles = {}
+			n_styles, pos = _read_varint(self._buf, pos)
+			for _ in range(n_styles):
+				key, pos = self._read_sid(pos)
+				value, pos = self._read_sid(pos)
+				computed_styles[key or ''] = value or ''
+		if flags & _S_PAINT_ORDER:
+			paint_order, pos = _read_zigzag(self._buf, pos)
+		if flags & _S_STACKING_CONTEXTS:
+			stacking_contexts, pos = _read_zigzag(self._buf, pos)
+
+		snapshot_node = EnhancedSnapshotNode(
+			is_clickable=bool(flags & _S_CLICKABLE) if flags & _S_CLICKABLE_KNOWN else None,
+			cursor_style=cursor_style,
+			bounds=rects[0],
+			clientRects=rects[1],
+			scrollRects=rects[2],
+			computed_styles=computed_styles,
+			paint_order=paint_order,
+			stacking_contexts=stacking_contexts,
+		)
+		return snapshot_node, pos
+
+	def _decode_ax(self, pos: int) -> tuple[EnhancedAXNode, int]:
+		ax_node_id, pos = self._read_sid(pos)
+		ignored, pos = _read_varint(self._buf, pos)
+		role, pos = self._read_sid(pos)
+		name, pos = self._read_sid(pos)
+		description, pos = self._read_sid(pos)
+
+		properties = None
+		n_properties, pos = _read_varint(self._buf, pos)
+		if n_properties:
+			properties = []
+			for _ in range(n_properties - 1):
+				prop_name, pos = self._read_sid(pos)
+				prop_value, pos = self._read_sid(pos)
+				properties.append(EnhancedAXProperty(name=prop_name, value=json.loads(prop_value or 'null')))  # type: ignore[arg-type]
+
+		child_ids = None
+		n_child_ids, pos = _read_varint(self._buf, pos)
+		if n_child_ids:
+			child_ids = []
+			for _ in range(n_child_ids - 1):
+				child_id, pos = self._read_sid(pos)
+				child_ids.append(child_id or '')
+
+		ax_node = EnhancedAXNode(
+			ax_node_id=ax_node_id or '',
+			ignored=bool(ignored),
+			role=role,
+			name=name,
+			description=description,
+			properties=properties,
+			child_ids=child_ids,
+		)
+		return ax_node, pos
+
+	def load_nodes(self) -> list[EnhancedDOMTreeNode]:
+		"""Decode every node and re-link the tree. Index 0 is the root; detached subtrees have no parent."""
+		nodes = [self.load_node(index) for index in range(self._n_nodes)]
+		for index, node in enumerate(nodes):
+			parent_index = self._parents[index]
+			if parent_index < 0:
+				continue
+			parent = nodes[parent_index]
+			node.parent_node = parent
+			relation = self.relation(index)
+			if relation == RELATION_CONTENT_DOCUMENT:
+				parent.content_document = node
+			elif relation == RELATION_SHADOW_ROOT:
+				parent.shadow_roots = (parent.shadow_roots or []) + [node]
+			else:
+				if parent.children_nodes is None:
+					parent.children_nodes = []
+				parent.children_nodes.append(node)
+		return nodes
+
+	def to_enhanced_tree(self) -> EnhancedDOMTreeNode:
+		return self.load_nodes()[0]
+
+	def selector_map_indices(self) -> dict[int, int]:
+		"""Selector map key (backend node id) -> archive node index."""
+		pos = self._offsets[5]
+		count, pos = _read_varint(self._buf, pos)
+		indices = {}
+		for _ in range(count):
+			key, pos = _read_varint(self._buf, pos)
+			indices[key], pos = _read_varint(self._buf, pos)
+		return indices
+
+	def to_serialized_dom_state(self) -> SerializedDOMState:
+		"""Rebuild the SerializedDOMState (simplified tree + selector map) the archive was written from."""
+		nodes = self.load_nodes()
+		selector_map = {key: nodes[index] for key, index in self.selector_map_indices().items()}
+
+		pos = self._offsets[6]
+		count, pos = _read_varint(self._buf, pos)
+		simplified_nodes: list[SimplifiedNode] = []
+		for _ in range(count):
+			index, pos = _read_varint(self._buf, pos)
+			parent, pos = _read_varint(self._buf, pos)
+			flags, pos = _read_varint(self._buf, pos)
+			simplified = SimplifiedNode(
+				original_node=nodes[index],
+				children=[],
+				**{name: bool(flags & (1 << bit)) for bit, name in enumerate(_SIMPLIFIED_FLAGS)},
+			)
+			if parent:
+				simplified_nodes[parent - 1].children.append(simplified)
+			simplified_nodes.append(simplified)
+
+		return SerializedDOMState(_root=simplified_nodes[0] if simplified_nodes else None, selector_map=selector_map)
@@ -3,8 +3,16 @@ Enhanced snapshot processing for browser-use DOM tree extraction.
 
 This module provides stateless functions for parsing Chrome DevTools Protocol (CDP) DOMSnapshot data
 to extract visibility, clickability, cursor styles, and other layout information.
+
+The snapshot is kept in a columnar form (one set of flat arrays per document) and per-node
+EnhancedSnapshotNode views are only materialized when a node is actually looked up.
 """
 
+import math
+from array import array
+from collections.abc import Iterator, Mapping
+from dataclasses import dataclass
+
 from cdp_use.cdp.domsnapshot.commands import CaptureSnapshotReturns
 from cdp_use.cdp.domsnapshot.types import (
 	LayoutTreeSnapshot,
@@ -30,11 +38,6 @@ REQUIRED_COMPUTED_STYLES = [
 ]
 
 
-def _parse_rare_boolean_data(rare_data: RareBooleanData, index: int) -> bool | None:
-	"""Parse rare boolean data from snapshot - returns True if index is in the rare data."""
-	return index in rare_data['index']
-
-
 def _parse_computed_styles(strings: list[str], style_indices: list[int]) -> dict[str, str]:
 	"""Parse computed styles from layout tree using string indices."""
 	styles = {}
@@ -44,118 +47,203 @@ def _parse_computed_styles(strings: list[str], style_indices: list[int]) -> dict
 	return styles
 
 
+def _parse_rect(rect_data: list[float] | None) -> DOMRect | None:
+	if rect_data and len(rect_data) >= 4:
+		return DOMRect(x=rect_data[0], y=rect_data[1], width=rect_data[2], height=rect_data[3])
+	return None
+
+
+@dataclass(slots=True)
+class SnapshotDocumentColumns:
+	"""Columnar layout data of one snapshot document, indexed by snapshot node index / layout index."""
+
+	layout_index_map: dict[int, int]
+	"""Snapshot node index -> FIRST layout index for that node"""
+	clickable_indices: frozenset[int] | None
+	"""Snapshot node indices flagged in the isClickable rare boolean data"""
+	bounds: array
+	"""Flat float64 array, 4 entries (x, y, width, height) per layout node in device pixels, NaN when missing"""
+	paint_orders: array | None
+	"""int64 paint order per layout node (None when the snapshot has no paint orders)"""
+	style_ids: array
+	"""Per layout node index into SnapshotLookup.interned_styles, -1 when missing"""
+	client_rects: list[list[float]]
+	scroll_rects: list[list[float]]
+	stacking_contexts: RareBooleanData | dict
+	"""Raw stackingContexts rare boolean data, empty when missing"""
+
+
+class SnapshotLookup(Mapping[int, EnhancedSnapshotNode]):
+	"""Backend node id -> EnhancedSnapshotNode mapping backed by per-document columns.
+
+	Views are created lazily on first access and memoized, so repeated lookups return the same object.
+	Computed style dicts are interned and SHARED between nodes with identical styles: treat them as read-only.
+	"""
+
+	def __init__(self, device_pixel_ratio: float = 1.0):
+		self.device_pixel_ratio = device_pixel_ratio
+		self.documents: list[SnapshotDocumentColumns] = []
+		self.interned_styles: list[dict[str, str]] = []
+		# backend node id -> (document index, snapshot node index)
+		self._locations: dict[int, tuple[int, int]] = {}
+		self._views: dict[int, EnhancedSnapshotNode] = {}
+
+	def __getitem__(self, backend_node_id: int) -> EnhancedSnapshotNode:
+		view = self._views.get(backend_node_id)
+		if view is None:
+			document_index, snapshot_index = self._locations[backend_node_id]
+			view = self._build_view(self.documents[document_index], snapshot_index)
+			self._views[backend_node_id] = view
+		return view
+
+	def __contains__(self, backend_node_id: object) -> bool:
+		return backend_node_id in self._locations
+
+	def __iter__(self) -> Iterator[int]:
+		return iter(self._locations)
+
+	def __len__(self) -> int:
+		return len(self._locations)
+
+	def computed_styles_of(self, backend_node_id: int) -> dict[str, str] | None:
+		"""Computed styles of a node without building its view (shared, read-only)"""
+		location = self._locations.get(backend_node_id)
+		if location is None:
+			return None
+		document = self.documents[location[0]]
+		layout_idx = document.layout_index_map.get(location[1])
+		if layout_idx is None or layout_idx >= len(document.style_ids):
+			return None
+		style_id = document.style_ids[layout_idx]
+		return (self.interned_styles[style_id] or None) if style_id >= 0 else None
+
+	def _build_view(self, document: SnapshotDocumentColumns, snapshot_index: int) -> EnhancedSnapshotNode:
+		is_clickable = None
+		if document.clickable_indices is not None:
+			is_clickable = snapshot_index in document.clickable_indices
+
+		cursor_style = None
+		bounding_box = None
+		computed_styles = None
+		paint_order = None
+		client_rects = None
+		scroll_rects = None
+		stacking_contexts = None
+
+		layout_idx = document.layout_index_map.get(snapshot_index)
+		if layout_idx is not None and layout_idx < len(document.style_ids):
+			offset = layout_idx * 4
+			raw_x = document.bounds[offset]
+			if not math.isnan(raw_x):
+				# IMPORTANT: CDP coordinates are in device pixels, convert to CSS pixels
+				# by dividing by the device pixel ratio
+				ratio = self.device_pixel_ratio
+				bounding_box = DOMRect(
+					x=raw_x / ratio,
+					y=document.bounds[offset + 1] / ratio,
+					width=document.bounds[offset + 2] / ratio,
+					height=document.bounds[offset + 3] / ratio,
+				)
+
+			style_id = document.style_ids[layout_idx]
+			if style_id >= 0:
+				computed_styles = self.interned_styles[style_id] or None
+				cursor_style = self.interned_styles[style_id].get('cursor')
+
+			if document.paint_orders is not None and layout_idx < len(document.paint_orders):
+				paint_order = document.paint_orders[layout_idx]
+
+			if layout_idx < len(document.client_rects):
+				client_rects = _parse_rect(document.client_rects[layout_idx])
+			if layout_idx < len(document.scroll_rects):
+				scroll_rects = _parse_rect(document.scroll_rects[layout_idx])
+
+			# Extract stacking contexts if available
+			if layout_idx < len(document.stacking_contexts):
+				stacking_contexts = document.stacking_contexts.get('index', [])[layout_idx]
+
+		return EnhancedSnapshotNode(
+			is_clickable=is_clickable,
+			cursor_style=cursor_style,
+			bounds=bounding_box,
+			clientRects=client_rects,
+			scrollRects=scroll_rects,
+			computed_styles=computed_styles,
+			paint_order=paint_order,
+			stacking_contexts=stacking_contexts,
+		)
+
+
 def build_snapshot_lookup(
 	snapshot: CaptureSnapshotReturns,
 	device_pixel_ratio: float = 1.0,
-) -> dict[int, EnhancedSnapshotNode]:
-	"""Build a lookup table of backend node ID to enhanced snapshot data with everything calculated upfront."""
-	snapshot_lookup: dict[int, EnhancedSnapshotNode] = {}
+) -> SnapshotLookup:
+	"""Build a lookup table of backend node ID to enhanced snapshot data backed by columnar per-document arrays."""
+	snapshot_lookup = SnapshotLookup(device_pixel_ratio)
 
 	if not snapshot['documents']:
 		return snapshot_lookup
 
 	strings = snapshot['strings']
+	# style index tuple -> position in snapshot_lookup.interned_styles (shared across documents, same string table)
+	style_table: dict[tuple[int, ...], int] = {}
 
 	for document in snapshot['documents']:
 		nodes: NodeTreeSnapshot = document['nodes']
 		layout: LayoutTreeSnapshot = document['layout']
 
-		# Build backend node id to snapshot index lookup
-		backend_node_to_snapshot_index = {}
-		if 'backendNodeId' in nodes:
-			for i, backend_node_id in enumerate(nodes['backendNodeId']):
-				backend_node_to_snapshot_index[backend_node_id] = i
-
 		# PERFORMANCE: Pre-build layout index map to eliminate O(n²) double lookups
 		# Preserve original behavior: use FIRST occurrence for duplicates
-		layout_index_map = {}
+		layout_index_map: dict[int, int] = {}
 		if layout and 'nodeIndex' in layout:
 			for layout_idx, node_index in enumerate(layout['nodeIndex']):
 				if node_index not in layout_index_map:  # Only store first occurrence
 					layout_index_map[node_index] = layout_idx
 
-		# Build snapshot lookup for each backend node id
-		for backend_node_id, snapshot_index in backend_node_to_snapshot_index.items():
-			is_clickable = None
-			if 'isClickable' in nodes:
-				is_clickable = _parse_rare_boolean_data(nodes['isClickable'], snapshot_index)
-
-			# Find corresponding layout node
-			cursor_style = None
-			is_visible = None
-			bounding_box = None
-			computed_styles = {}
-
-			# Look for layout tree node that corresponds to this snapshot node
-			paint_order = None
-			client_rects = None
-			scroll_rects = None
-			stacking_contexts = None
-			if snapshot_index in layout_index_map:
-				layout_idx = layout_index_map[snapshot_index]
-				if layout_idx < len(layout.get('bounds', [])):
-					# Parse bounding box
-					bounds = layout['bounds'][layout_idx]
-					if len(bounds) >= 4:
-						# IMPORTANT: CDP coordinates are in device pixels, convert to CSS pixels
-						# by dividing by the device pixel ratio
-						raw_x, raw_y, raw_width, raw_height = bounds[0], bounds[1], bounds[2], bounds[3]
-
-						# Apply device pixel ratio scaling to convert device pixels to CSS pixels
-						bounding_box = DOMRect(
-							x=raw_x / device_pixel_ratio,
-							y=raw_y / device_pixel_ratio,
-							width=raw_width / device_pixel_ratio,
-							height=raw_height / device_pixel_ratio,
-						)
-
-					# Parse computed styles for this layout node
-					if layout_idx < len(layout.get('styles', [])):
-						style_indices = layout['styles'][layout_idx]
-						computed_styles = _parse_computed_styles(strings, style_indices)
-						cursor_style = computed_styles.get('cursor')
-
-					# Extract paint order if available
-					if layout_idx < len(layout.get('paintOrders', [])):
-						paint_order = layout.get('paintOrders', [])[layout_idx]
-
-					# Extract client rects if available
-					client_rects_data = layout.get('clientRects', [])
-					if layout_idx < len(client_rects_data):
-						client_rect_data = client_rects_data[layout_idx]
-						if client_rect_data and len(client_rect_data) >= 4:
-							client_rects = DOMRect(
-								x=client_rect_data[0],
-								y=client_rect_data[1],
-								width=client_rect_data[2],
-								height=client_rect_data[3],
-							)
-
-					# Extract scroll rects if available
-					scroll_rects_data = layout.get('scrollRects', [])
-					if layout_idx < len(scroll_rects_data):
-						scroll_rect_data = scroll_rects_data[layout_idx]
-						if scroll_rect_data and len(scroll_rect_data) >= 4:
-							scroll_rects = DOMRect(
-								x=scroll_rect_data[0],
-								y=scroll_rect_data[1],
-								width=scroll_rect_data[2],
-								height=scroll_rect_data[3],
-							)
-
-					# Extract stacking contexts if available
-					if layout_idx < len(layout.get('stackingContexts', [])):
-						stacking_contexts = layout.get('stackingContexts', {}).get('index', [])[layout_idx]
-
-			snapshot_lookup[backend_node_id] = EnhancedSnapshotNode(
-				is_clickable=is_clickable,
-				cursor_style=cursor_style,
-				bounds=bounding_box,
-				clientRects=client_rects,
-				scrollRects=scroll_rects,
-				computed_styles=computed_styles if computed_styles else None,
-				paint_order=paint_order,
-				stacking_contexts=stacking_contexts,
+		# Flatten bounds into a typed array (NaN marks malformed entries)
+		raw_bounds = layout.get('bounds', []) if layout else []
+		layout_count = len(raw_bounds)
+		bounds = array('d', [math.nan]) * (layout_count * 4)
+		for layout_idx, rect in enumerate(raw_bounds):
+			if len(rect) >= 4:
+				offset = layout_idx * 4
+				bounds[offset : offset + 4] = array('d', rect[:4])
+
+		# Intern computed styles: most layout nodes share one of a few hundred distinct style combinations
+		raw_styles = layout.get('styles', []) if layout else []
+		style_ids = array('q', [-1]) * layout_count
+		for layout_idx, style_indices in enumerate(raw_styles[:layout_count]):
+			key = tuple(style_indices)
+			style_id = style_table.get(key)
+			if style_id is None:
+				style_id = len(snapshot_lookup.interned_styles)
+				style_table[key] = style_id
+				snapshot_lookup.interned_styles.append(_parse_computed_styles(strings, style_indices))
+			style_ids[layout_idx] = style_id
+
+		raw_paint_orders = layout.get('paintOrders') if layout else None
+		paint_orders = array('q', raw_paint_orders) if raw_paint_orders is not None else None
+
+		# PERFORMANCE: set-backed rare boolean lookup instead of a linear `in list` scan per node
+		clickable_indices = frozenset(nodes['isClickable']['index']) if 'isClickable' in nodes else None
+
+		document_index = len(snapshot_lookup.documents)
+		snapshot_lookup.documents.append(
+			SnapshotDocumentColumns(
+				layout_index_map=layout_index_map,
+				clickable_indices=clickable_indices,
+				bounds=bounds,
+				paint_orders=paint_orders,
+				style_ids=style_ids,
+				client_rects=layout.get('clientRects', []) if layout else [],
+				scroll_rects=layout.get('scrollRects', []) if layout else [],
+				stacking_contexts=layout.get('stackingContexts', {}) if layout else {},
 			)
+		)
+
+		# Backend node id -> location (later snapshot indices / documents win, as before)
+		if 'backendNodeId' in nodes:
+			for snapshot_index, backend_node_id in enumerate(nodes['backendNodeId']):
+				snapshot_lookup._locations[backend_node_id] = (document_index, snapshot_index)
 
 	return snapshot_lookup
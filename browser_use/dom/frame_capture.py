@@ -0,0 +1,105 @@
+"""
+Frame-parallel capture of cross-origin (out-of-process) iframe targets.
+
+Without it, `DomService.get_dom_tree` only starts the CDP round trips for an OOPIF target once tree construction
+reaches the iframe element, one frame after another. The scheduler lets the parent frame start the capture of
+every OOPIF it contains as soon as its own DOM is known, with a bounded number of captures in flight, and
+records how long each frame took.
+"""
+
+import asyncio
+import logging
+import time
+from collections.abc import Awaitable, Callable
+
+from cdp_use.cdp.dom.types import Node
+from cdp_use.cdp.target import TargetID
+
+from browser_use.dom.enhanced_snapshot import SnapshotLookup
+from browser_use.dom.views import NodeType, TargetAllTrees
+
+# Same threshold DomService uses to decide whether a cross-origin iframe is worth processing
+MIN_IFRAME_SIZE = 50
+
+
+class FrameCaptureScheduler:
+	"""Runs `capture(target_id)` for frame targets concurrently, at most `max_concurrency` at a time.
+
+	Each target is captured at most once, `get()` returns the (possibly already finished) result.
+	"""
+
+	def __init__(
+		self,
+		capture: Callable[[TargetID], Awaitable[TargetAllTrees]],
+		max_concurrency: int = 4,
+		logger: logging.Logger | None = None,
+	):
+		self._capture = capture
+		self._semaphore = asyncio.Semaphore(max(1, max_concurrency))
+		self._tasks: dict[TargetID, asyncio.Task[TargetAllTrees]] = {}
+		self.logger = logger or logging.getLogger(__name__)
+		self.timings_ms: dict[TargetID, float] = {}
+		"""Per-frame capture time (excluding time spent waiting for a concurrency slot)"""
+
+	async def _run(self, target_id: TargetID) -> TargetAllTrees:
+		async with self._semaphore:
+			start = time.time()
+			try:
+				return await self._capture(target_id)
+			finally:
+				self.timings_ms[target_id] = (time.time() - start) * 1000
+
+	def schedule(self, target_id: TargetID) -> None:
+		"""Start capturing a frame target in the background (no-op if already scheduled)."""
+		if target_id not in self._tasks:
+			self.logger.debug(f'Scheduling parallel capture of frame target {target_id[-4:]}')
+			self._tasks[target_id] = asyncio.create_task(self._run(target_id), name=f'capture_frame_{target_id[-4:]}')
+
+	async def get(self, target_id: TargetID) -> TargetAllTrees:
+		"""Result of a frame capture, scheduling it first if nobody did."""
+		self.schedule(target_id)
+		return await self._tasks[target_id]
+
+	def cancel_pending(self) -> None:
+		"""Cancel captures that were scheduled but never consumed (e.g. the iframe turned out to be invisible)."""
+		for task in self._tasks.values():
+			if not task.done():
+				task.cancel()
+			elif not task.cancelled():
+				task.exception()  # mark exceptions of unconsumed captures as retrieved
+
+	def timing_info(self) -> dict[str, float]:
+		"""Per-frame timings in the `timing_info` format used by DomService."""
+		timings = {f'frame_capture_{target_id[-4:]}_ms': ms for target_id, ms in self.timings_ms.items()}
+		if self.timings_ms:
+			timings['frame_captures'] = float(len(self.timings_ms))
+			timings['frame_capture_max_ms'] = max(self.timings_ms.values())
+		return timings
+
+
+def find_cross_origin_iframe_frame_ids(root: Node, snapshot_lookup: SnapshotLookup, limit: int) -> list[str]:
+	"""Frame ids of iframes without an inlined content document (out-of-process) that are large enough to be captured.
+
+	Works on the raw CDP DOM tree, so candidates are known before the enhanced tree is constructed.
+	"""
+	frame_ids: list[str] = []
+	stack = [root]
+	while stack and len(frame_ids) < limit:
+		node = stack.pop()
+		content_document = node.get('contentDocument')
+		frame_id = node.get('frameId')
+		if (
+			node['nodeType'] == NodeType.ELEMENT_NODE.value
+			and node['nodeName'].upper() == 'IFRAME'
+			and not content_document
+			and frame_id
+		):
+			snapshot_node = snapshot_lookup.get(node['backendNodeId'])
+			bounds = snapshot_node.bounds if snapshot_node else None
+			if bounds is not None and bounds.width >= MIN_IFRAME_SIZE and bounds.height >= MIN_IFRAME_SIZE:
+				frame_ids.append(frame_id)
+		stack.extend(node.get('children') or ())
+		stack.extend(node.get('shadowRoots') or ())
+		if content_document:
+			stack.append(content_document)
+	return frame_ids
@@ -14,6 +14,7 @@ from browser_use.dom.service import DomService
 if TYPE_CHECKING:
 	from browser_use.browser.session import BrowserSession
 	from browser_use.browser.watchdogs.dom_watchdog import DOMWatchdog
+	from browser_use.dom.views import EnhancedDOMTreeNode
 
 
 async def extract_clean_markdown(
@@ -47,6 +48,13 @@ async def extract_clean_markdown(
 		enhanced_dom_tree = await _get_enhanced_dom_tree_from_browser_session(browser_session)
 		current_url = await browser_session.get_current_page_url()
 		method = 'enhanced_dom_tree'
+
+		# Later extractions on the same page version skip the serialization and markdown conversion
+		markdown_cache = _markdown_cache_of(browser_session, enhanced_dom_tree)
+		cached = markdown_cache.get(extract_links)
+		if cached is not None:
+			stats = {**cached[1], 'url': current_url} if current_url else dict(cached[1])
+			return cached[0], stats
 	elif dom_service is not None and target_id is not None:
 		# DOM service path (page actor)
 		# Lazy fetch all_frames inside get_dom_tree if needed (for cross-origin iframes)
@@ -98,6 +106,9 @@ async def extract_clean_markdown(
 		'final_filtered_chars': final_filtered_length,
 	}
 
+	if browser_session is not None:
+		_markdown_cache_of(browser_session, enhanced_dom_tree)[extract_links] = (content, dict(stats))
+
 	# Add URL to stats if available
 	if current_url:
 		stats['url'] = current_url
@@ -105,6 +116,21 @@ async def extract_clean_markdown(
 	return content, stats
 
 
+def _markdown_cache_of(
+	browser_session: 'BrowserSession', enhanced_dom_tree: 'EnhancedDOMTreeNode'
+) -> dict[bool, tuple[str, dict[str, Any]]]:
+	"""Markdown (and stats) of the session's DOM tree by extract_links.
+
+	Kept on the session's DOM watchdog for its current tree only. The watchdog builds a new tree whenever the page may
+	have changed, so the same tree object is the same page version.
+	"""
+	dom_watchdog: DOMWatchdog | None = browser_session._dom_watchdog
+	assert dom_watchdog is not None, 'DOMWatchdog not available'
+	if dom_watchdog._markdown_cache is None or dom_watchdog._markdown_cache[0] is not enhanced_dom_tree:
+		dom_watchdog._markdown_cache = (enhanced_dom_tree, {})
+	return dom_watchdog._markdown_cache[1]
+
+
 async def _get_enhanced_dom_tree_from_browser_session(browser_session: 'BrowserSession'):
 	"""Get enhanced DOM tree from browser session via DOMWatchdog."""
 	# Get the enhanced DOM tree from DOMWatchdog
@@ -168,3 +194,32 @@ def _preprocess_markdown_content(content: str, max_newlines: int = 3) -> tuple[s
 
 	chars_filtered = original_length - len(content)
 	return content, chars_filtered
+
+
+def split_markdown(content: str, max_chars: int, cut_before_headings: bool = True) -> list[str]:
+	"""Split markdown into consecutive chunks of at most max_chars characters at structural boundaries.
+
+	Chunks end before a heading in the last quarter of the window if there is one (unless `cut_before_headings` is
+	False), otherwise at the last paragraph break, line break or sentence end shortly before the limit, and only as a
+	last resort in the middle of a line. Joining the chunks gives back the content.
+	"""
+	chunks: list[str] = []
+	start = 0
+	while len(content) - start > max_chars:
+		end = start + max_chars
+		cut = end
+		heading = content.rfind('\n#', end - max_chars // 4, end) if cut_before_headings else -1
+		if heading > start:
+			# The heading starts the next chunk
+			cut = heading + 1
+		else:
+			for separator, window in (('\n\n', 500), ('\n', 500), ('.', 200)):
+				position = content.rfind(separator, max(start + 1, end - window), end)
+				if position > start:
+					cut = position + (1 if separator == '.' else 0)
+					break
+		chunks.append(content[start:cut])
+		start = cut
+	if start < len(content) or not chunks:
+		chunks.append(content[start:])
+	return chunks
@@ -0,0 +1,181 @@
+"""
+DOM mutation tracking for incremental DOM snapshots.
+
+Subscribes to CDP DOM mutation events (childNodeInserted, childNodeRemoved, attributeModified, ...) and keeps a
+per-target version counter plus the mutation events recorded since the last capture. DomService uses this to reuse the
+enhanced DOM tree captured on a previous step as it is when a target did not change, or to apply the recorded
+mutations to it (see dom/tree_patcher.py).
+"""
+
+import logging
+import time
+from collections import deque
+from typing import TYPE_CHECKING, Any
+
+from cdp_use.cdp.target import SessionID, TargetID
+
+if TYPE_CHECKING:
+	from browser_use.browser.session import BrowserSession, CDPSession
+
+# CDP DOM events that indicate the structure, attributes or text of the document changed
+DOM_MUTATION_EVENTS = [
+	'childNodeInserted',
+	'childNodeRemoved',
+	'childNodeCountUpdated',
+	'attributeModified',
+	'attributeRemoved',
+	'inlineStyleInvalidated',
+	'characterDataModified',
+	'shadowRootPushed',
+	'shadowRootPopped',
+	'pseudoElementAdded',
+	'pseudoElementRemoved',
+]
+
+# Mutation events kept per target, a target with more unconsumed mutations gets a full capture
+MAX_RECORDED_MUTATIONS = 1000
+
+
+class DOMMutationTracker:
+	"""Tracks DOM mutations per target using CDP DOM domain events.
+
+	Every mutation bumps the target's version counter, marks it dirty and is recorded with that version. A target is
+	clean again once `mark_captured()` is called after a capture. `documentUpdated` (navigation, document replaced)
+	and explicit `invalidate()` calls force the next capture to be a full one.
+
+	Note: CDP only reports mutations for nodes the client has already requested, which is always the case
+	after `DOM.getDocument(depth=-1, pierce=True)` in `DomService._get_all_trees`, and for inserted nodes once
+	`request_child_nodes()` fetched their children. Another `DOM.getDocument` call on the same session re-assigns all
+	node ids without any event, callers reusing a tree have to check that its node ids are still bound.
+	"""
+
+	def __init__(self, browser_session: 'BrowserSession', logger: logging.Logger | None = None):
+		self.browser_session = browser_session
+		self.logger = logger or browser_session.logger
+
+		# target_id -> monotonically increasing mutation counter
+		self._versions: dict[TargetID, int] = {}
+		# target_id -> version at the time of the last full capture
+		self._captured_versions: dict[TargetID, int] = {}
+		# target_id -> (version, event name, event) of the mutations since the last capture
+		self._mutations: dict[TargetID, deque[tuple[int, str, Any]]] = {}
+		# target_id -> version up to which mutations were not recorded (invalidated or dropped)
+		self._lost_through: dict[TargetID, int] = {}
+		# target_id -> time.monotonic() of the last observed mutation (used for DOM quiescence checks)
+		self._mutated_at: dict[TargetID, float] = {}
+		# (session_id, parent node id) -> children pushed by the last DOM.setChildNodes event for it
+		self._pushed_children: dict[tuple[SessionID, int], list[Any]] = {}
+		# session ids we already called DOM.enable on
+		self._enabled_sessions: set[SessionID] = set()
+		# ids of CDP clients we already registered our (single, shared) handlers on
+		self._registered_clients: set[int] = set()
+
+	async def attach(self, cdp_session: 'CDPSession') -> None:
+		"""Enable DOM events for a CDP session and register mutation handlers on its client (once per client)."""
+		client_key = id(cdp_session.cdp_client)
+		if client_key not in self._registered_clients:
+			self._registered_clients.add(client_key)
+			for event_name in DOM_MUTATION_EVENTS:
+				getattr(cdp_session.cdp_client.register.DOM, event_name)(self._make_mutation_handler(event_name))
+			cdp_session.cdp_client.register.DOM.documentUpdated(self._on_document_updated)
+			cdp_session.cdp_client.register.DOM.setChildNodes(self._on_set_child_nodes)
+
+		if cdp_session.session_id in self._enabled_sessions:
+			return
+		try:
+			await cdp_session.cdp_client.send.DOM.enable(session_id=cdp_session.session_id)
+			self._enabled_sessions.add(cdp_session.session_id)
+		except Exception as e:
+			self.logger.debug(f'Failed to enable DOM mutation events for target {cdp_session.target_id[-4:]}: {e}')
+			self.invalidate(cdp_session.target_id)
+
+	def _target_for_session(self, session_id: SessionID | None) -> TargetID | None:
+		if not session_id or not self.browser_session.session_manager:
+			return None
+		return self.browser_session.session_manager.get_target_id_from_session_id(session_id)
+
+	def _make_mutation_handler(self, event_name: str):
+		def on_mutation(event: Any, session_id: SessionID | None = None) -> None:
+			target_id = self._target_for_session(session_id)
+			if target_id is None:
+				return
+			version = self._versions[target_id] = self._versions.get(target_id, 0) + 1
+			self._mutated_at[target_id] = time.monotonic()
+			mutations = self._mutations.setdefault(target_id, deque())
+			mutations.append((version, event_name, event))
+			if len(mutations) > MAX_RECORDED_MUTATIONS:
+				self._lost_through[target_id] = mutations.popleft()[0]
+
+		on_mutation.__name__ = f'on_{event_name}'
+		return on_mutation
+
+	def _on_document_updated(self, event: Any, session_id: SessionID | None = None) -> None:
+		target_id = self._target_for_session(session_id)
+		if target_id is not None:
+			self.invalidate(target_id)
+
+	def _on_set_child_nodes(self, event: Any, session_id: SessionID | None = None) -> None:
+		if session_id:
+			self._pushed_children[(session_id, event['parentId'])] = event['nodes']
+
+	async def request_child_nodes(self, cdp_session: 'CDPSession', node_id: int) -> list[Any] | None:
+		"""Whole subtree of a node whose children were not sent to us yet, None if it could not be fetched.
+
+		Nodes are only reported in mutation events once their parent's children were requested, DOM.requestChildNodes
+		does that and sends the children in a DOM.setChildNodes event, which arrives before the command's response.
+		"""
+		key = (cdp_session.session_id, node_id)
+		self._pushed_children.pop(key, None)
+		try:
+			await cdp_session.cdp_client.send.DOM.requestChildNodes(
+				params={'nodeId': node_id, 'depth': -1, 'pierce': True}, session_id=cdp_session.session_id
+			)
+		except Exception as e:
+			self.logger.debug(f'Failed to request the children of node {node_id}: {e}')
+			return None
+		return self._pushed_children.pop(key, None)
+
+	def get_version(self, target_id: TargetID) -> int:
+		"""Current DOM version counter for a target (increments on every observed mutation)."""
+		return self._versions.get(target_id, 0)
+
+	def is_tracked(self, target_id: TargetID) -> bool:
+		"""Whether mutations of a target are observed, i.e. it had a full capture since DOM events were enabled."""
+		return target_id in self._captured_versions
+
+	def get_last_mutation_time(self, target_id: TargetID) -> float | None:
+		"""`time.monotonic()` of the last mutation observed on a target, None if none was observed."""
+		return self._mutated_at.get(target_id)
+
+	def is_dirty(self, target_id: TargetID) -> bool:
+		"""Whether the target changed (or was never captured) since the last `mark_captured()`."""
+		if target_id not in self._captured_versions:
+			return True
+		return self._versions.get(target_id, 0) != self._captured_versions[target_id]
+
+	def get_mutations(self, target_id: TargetID, version: int) -> list[tuple[str, Any]] | None:
+		"""(event name, event) of the mutations of a target after `version`, in order.
+
+		None if some of them were not recorded (too many, or the target was invalidated since).
+		"""
+		if self._lost_through.get(target_id, -1) > version:
+			return None
+		return [(event_name, event) for v, event_name, event in self._mutations.get(target_id, ()) if v > version]
+
+	def mark_captured(self, target_id: TargetID, version: int) -> None:
+		"""Record that a capture of the target reflects all mutations up to `version`."""
+		self._captured_versions[target_id] = version
+		mutations = self._mutations.get(target_id)
+		while mutations and mutations[0][0] <= version:
+			mutations.popleft()
+
+	def invalidate(self, target_id: TargetID | None = None) -> None:
+		"""Force the next capture of a target (or of all targets) to be a full one."""
+		if target_id is None:
+			for tracked_target_id in set(self._versions) | set(self._captured_versions):
+				self.invalidate(tracked_target_id)
+			return
+		version = self._versions[target_id] = self._versions.get(target_id, 0) + 1
+		self._captured_versions.pop(target_id, None)
+		self._lost_through[target_id] = version
+		self._mutations.pop(target_id, None)
@@ -0,0 +1,166 @@
+"""
+Benchmark the paint order occlusion engines (RectUnionPure vs RectUnionGrid vs RectUnionNumpy).
+
+Runs synthetic layouts and, optionally, layouts recorded from real pages, checks that every engine
+produces identical `ignored_by_paint_order` results and prints the timings.
+
+Usage:
+	python -m browser_use.dom.playground.paint_order_benchmark [--record URL ...] [layout.json ...]
+
+Recorded layout files are JSON lists of {"paint_order", "x", "y", "width", "height", "occludes"} objects,
+`--record URL` captures one from a live page (saved next to this file under ./paint_order_layouts/).
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import time
+from pathlib import Path
+
+from browser_use.dom.serializer.paint_order import (
+	NUMPY_AVAILABLE,
+	PaintedRect,
+	Rect,
+	RectUnionGrid,
+	RectUnionNumpy,
+	RectUnionPure,
+	compute_paint_order_occlusion,
+)
+
+LAYOUTS_DIR = Path(__file__).parent / 'paint_order_layouts'
+
+
+def synthetic_feed(n: int, seed: int = 0) -> list[PaintedRect]:
+	"""Long scrolling feed: many small cards/text runs, ~30% with opaque backgrounds."""
+	rng = random.Random(seed)
+	rects = []
+	for i in range(n):
+		x, y = rng.random() * 1200, rng.random() * n * 3
+		w, h = rng.random() * 200 + 5, rng.random() * 40 + 5
+		rects.append(PaintedRect(paint_order=i // 3, rect=Rect(x, y, x + w, y + h), occludes=rng.random() < 0.3))
+	return rects
+
+
+def synthetic_overlays(n: int, seed: int = 0) -> list[PaintedRect]:
+	"""Dashboard-like page: a grid of tiles plus a few full-page modals/backdrops painted on top."""
+	rng = random.Random(seed)
+	rects = []
+	columns = 8
+	for i in range(n):
+		x, y = (i % columns) * 160, (i // columns) * 48
+		rects.append(PaintedRect(paint_order=rng.randrange(n), rect=Rect(x, y, x + 150, y + 40), occludes=rng.random() < 0.5))
+	page_height = (n // columns + 1) * 48
+	for _ in range(3):
+		rects.append(PaintedRect(paint_order=n + rng.randrange(10), rect=Rect(0, 0, 1280, page_height), occludes=True))
+	return rects
+
+
+def load_layout(path: Path) -> list[PaintedRect]:
+	data = json.loads(path.read_text())
+	return [
+		PaintedRect(
+			paint_order=item['paint_order'],
+			rect=Rect(item['x'], item['y'], item['x'] + item['width'], item['y'] + item['height']),
+			occludes=item['occludes'],
+		)
+		for item in data
+	]
+
+
+async def record_layout(url: str) -> Path:
+	"""Capture the painted rects of a live page the same way DOMTreeSerializer feeds PaintOrderRemover."""
+	from browser_use.browser import BrowserProfile, BrowserSession
+	from browser_use.browser.events import NavigateToUrlEvent
+	from browser_use.dom.serializer.serializer import DOMTreeSerializer
+	from browser_use.dom.service import DomService
+
+	browser_session = BrowserSession(browser_profile=BrowserProfile(headless=True))
+	await browser_session.start()
+	try:
+		await browser_session.event_bus.dispatch(NavigateToUrlEvent(url=url))
+		await asyncio.sleep(2)
+		async with DomService(browser_session) as dom_service:
+			assert browser_session.agent_focus_target_id is not None
+			enhanced_tree, _ = await dom_service.get_dom_tree(target_id=browser_session.agent_focus_target_id)
+
+		serializer = DOMTreeSerializer(enhanced_tree, paint_order_filtering=False)
+		simplified_root = serializer._create_simplified_tree(enhanced_tree)
+
+		items = []
+		stack = [simplified_root] if simplified_root else []
+		while stack:
+			node = stack.pop()
+			stack.extend(reversed(node.children))
+			snapshot_node = node.original_node.snapshot_node
+			if not snapshot_node or snapshot_node.paint_order is None or snapshot_node.bounds is None:
+				continue
+			styles = snapshot_node.computed_styles or {}
+			transparent = styles.get('background-color', 'rgba(0, 0, 0, 0)') == 'rgba(0, 0, 0, 0)' or (
+				float(styles.get('opacity', '1')) < 0.8
+			)
+			bounds = snapshot_node.bounds
+			items.append(
+				{
+					'paint_order': snapshot_node.paint_order,
+					'x': bounds.x,
+					'y': bounds.y,
+					'width': bounds.width,
+					'height': bounds.height,
+					'occludes': not (transparent and bool(styles)),
+				}
+			)
+	finally:
+		await browser_session.kill()
+
+	LAYOUTS_DIR.mkdir(exist_ok=True)
+	out_path = LAYOUTS_DIR / (url.split('://', 1)[-1].replace('/', '_')[:80] + '.json')
+	out_path.write_text(json.dumps(items))
+	print(f'Recorded {len(items)} painted rects from {url} -> {out_path}')
+	return out_path
+
+
+def run_benchmark(name: str, painted_rects: list[PaintedRect], repeat: int = 3) -> None:
+	engines: list[type[RectUnionPure]] = [RectUnionPure, RectUnionGrid]
+	if NUMPY_AVAILABLE:
+		engines.append(RectUnionNumpy)
+
+	reference = None
+	timings = []
+	for engine in engines:
+		best = float('inf')
+		for _ in range(repeat):
+			start = time.perf_counter()
+			result = compute_paint_order_occlusion(painted_rects, engine)
+			best = min(best, time.perf_counter() - start)
+		if reference is None:
+			reference = result
+		assert result == reference, f'{engine.__name__} disagrees with {engines[0].__name__} on {name}'
+		timings.append(f'{engine.__name__}={best * 1000:.1f}ms')
+
+	hidden = sum(reference or [])
+	print(f'{name:<40} rects={len(painted_rects):<6} hidden={hidden:<6} ' + '  '.join(timings))
+
+
+def main() -> None:
+	parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+	parser.add_argument('layouts', nargs='*', type=Path, help='Recorded layout JSON files')
+	parser.add_argument('--record', action='append', default=[], metavar='URL', help='Record a layout from a live page first')
+	parser.add_argument('--repeat', type=int, default=3)
+	args = parser.parse_args()
+
+	layouts: list[Path] = list(args.layouts)
+	for url in args.record:
+		layouts.append(asyncio.run(record_layout(url)))
+	if not layouts and LAYOUTS_DIR.exists():
+		layouts = sorted(LAYOUTS_DIR.glob('*.json'))
+
+	for n in (500, 2000, 5000):
+		run_benchmark(f'synthetic_feed[{n}]', synthetic_feed(n), repeat=args.repeat)
+		run_benchmark(f'synthetic_overlays[{n}]', synthetic_overlays(n), repeat=args.repeat)
+	for path in layouts:
+		run_benchmark(path.name, load_layout(path), repeat=args.repeat)
+
+
+if __name__ == '__main__':
+	main()
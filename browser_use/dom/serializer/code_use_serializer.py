@@ -1,6 +1,7 @@
 # @file purpose: Ultra-compact serializer optimized for code-use agents
 # Focuses on minimal token usage while preserving essential interactive context
 
+from browser_use.dom.serializer.subtree_cache import SubtreeRenderPass, SubtreeTextCache
 from browser_use.dom.utils import cap_text_length
 from browser_use.dom.views import (
 	EnhancedDOMTreeNode,
@@ -59,7 +60,12 @@ class DOMCodeAgentSerializer:
 	"""Optimized DOM serializer for code-use agents - balances token efficiency with context."""
 
 	@staticmethod
-	def serialize_tree(node: SimplifiedNode | None, include_attributes: list[str], depth: int = 0) -> str:
+	def serialize_tree(
+		node: SimplifiedNode | None,
+		include_attributes: list[str],
+		depth: int = 0,
+		subtree_cache: SubtreeTextCache | None = None,
+	) -> str:
 		"""
 		Serialize DOM tree with smart token optimization.
 
@@ -71,13 +77,19 @@ class DOMCodeAgentSerializer:
 		"""
 		if not node:
 			return ''
+		return SubtreeRenderPass(node, include_attributes, DOMCodeAgentSerializer._serialize_node, subtree_cache).run(depth)
+
+	@staticmethod
+	def _serialize_node(node: SimplifiedNode, depth: int, render_pass: SubtreeRenderPass) -> str:
+		"""Serialize one node, children go through the render pass which memoizes unchanged subtrees."""
+		include_attributes = render_pass.include_attributes
 
 		# Skip excluded/hidden nodes
 		if hasattr(node, 'excluded_by_parent') and node.excluded_by_parent:
-			return DOMCodeAgentSerializer._serialize_children(node, include_attributes, depth)
+			return DOMCodeAgentSerializer._serialize_children(node, depth, render_pass)
 
 		if not node.should_display:
-			return DOMCodeAgentSerializer._serialize_children(node, include_attributes, depth)
+			return DOMCodeAgentSerializer._serialize_children(node, depth, render_pass)
 
 		formatted_text = []
 		depth_str = '  ' * depth  # Use 2 spaces instead of tabs for compactness
@@ -88,7 +100,7 @@ class DOMCodeAgentSerializer:
 
 			# Skip invisible (except iframes)
 			if not is_visible and tag not in ['iframe', 'frame']:
-				return DOMCodeAgentSerializer._serialize_children(node, include_attributes, depth)
+				return DOMCodeAgentSerializer._serialize_children(node, depth, render_pass)
 
 			# Special handling for iframes
 			if tag in ['iframe', 'frame']:
@@ -105,11 +117,11 @@ class DOMCodeAgentSerializer:
 
 			# Skip non-semantic, non-interactive containers without attributes
 			if not is_interactive and not is_semantic and not has_useful_attrs and not has_text:
-				return DOMCodeAgentSerializer._serialize_children(node, include_attributes, depth)
+				return DOMCodeAgentSerializer._serialize_children(node, depth, render_pass)
 
 			# Collapse pointless wrappers
 			if tag in {'div', 'span'} and not has_useful_attrs and not has_text and len(node.children) == 1:
-				return DOMCodeAgentSerializer._serialize_children(node, include_attributes, depth)
+				return DOMCodeAgentSerializer._serialize_children(node, depth, render_pass)
 
 			# Build element
 			line = f'{depth_str}<{tag}'
@@ -128,7 +140,7 @@ class DOMCodeAgentSerializer:
 
 			# Children (only if no inline text)
 			if node.children and not inline_text:
-				children_text = DOMCodeAgentSerializer._serialize_children(node, include_attributes, depth + 1)
+				children_text = DOMCodeAgentSerializer._serialize_children(node, depth + 1, render_pass)
 				if children_text:
 					formatted_text.append(children_text)
 
@@ -140,18 +152,18 @@ class DOMCodeAgentSerializer:
 			# Shadow DOM - minimal marker
 			if node.children:
 				formatted_text.append(f'{depth_str}#shadow')
-				children_text = DOMCodeAgentSerializer._serialize_children(node, include_attributes, depth + 1)
+				children_text = DOMCodeAgentSerializer._serialize_children(node, depth + 1, render_pass)
 				if children_text:
 					formatted_text.append(children_text)
 
 		return '\n'.join(formatted_text)
 
 	@staticmethod
-	def _serialize_children(node: SimplifiedNode, include_attributes: list[str], depth: int) -> str:
+	def _serialize_children(node: SimplifiedNode, depth: int, render_pass: SubtreeRenderPass) -> str:
 		"""Serialize children."""
 		children_output = []
 		for child in node.children:
-			child_text = DOMCodeAgentSerializer.serialize_tree(child, include_attributes, depth)
+			child_text = render_pass.serialize(child, depth)
 			if child_text:
 				children_output.append(child_text)
 		return '\n'.join(children_output)
@@ -1,6 +1,7 @@
 # @file purpose: Concise evaluation serializer for DOM trees - optimized for LLM query writing
 
 
+from browser_use.dom.serializer.subtree_cache import SubtreeRenderPass, SubtreeTextCache
 from browser_use.dom.utils import cap_text_length
 from browser_use.dom.views import (
 	EnhancedDOMTreeNode,
@@ -113,7 +114,12 @@ class DOMEvalSerializer:
 	"""Ultra-concise DOM serializer for quick LLM query writing."""
 
 	@staticmethod
-	def serialize_tree(node: SimplifiedNode | None, include_attributes: list[str], depth: int = 0) -> str:
+	def serialize_tree(
+		node: SimplifiedNode | None,
+		include_attributes: list[str],
+		depth: int = 0,
+		subtree_cache: SubtreeTextCache | None = None,
+	) -> str:
 		"""
 		Serialize complete DOM tree structure for LLM understanding.
 
@@ -125,14 +131,20 @@ class DOMEvalSerializer:
 		"""
 		if not node:
 			return ''
+		return SubtreeRenderPass(node, include_attributes, DOMEvalSerializer._serialize_node, subtree_cache).run(depth)
+
+	@staticmethod
+	def _serialize_node(node: SimplifiedNode, depth: int, render_pass: SubtreeRenderPass) -> str:
+		"""Serialize one node, children go through the render pass which memoizes unchanged subtrees."""
+		include_attributes = render_pass.include_attributes
 
 		# Skip excluded nodes but process children
 		if hasattr(node, 'excluded_by_parent') and node.excluded_by_parent:
-			return DOMEvalSerializer._serialize_children(node, include_attributes, depth)
+			return DOMEvalSerializer._serialize_children(node, depth, render_pass)
 
 		# Skip nodes marked as should_display=False
 		if not node.should_display:
-			return DOMEvalSerializer._serialize_children(node, include_attributes, depth)
+			return DOMEvalSerializer._serialize_children(node, depth, render_pass)
 
 		formatted_text = []
 		depth_str = depth * '\t'
@@ -146,7 +158,7 @@ class DOMEvalSerializer:
 
 			# Skip invisible elements UNLESS they're containers or iframes (which might have visible children)
 			if not is_visible and tag not in container_tags and tag not in ['iframe', 'frame']:
-				return DOMEvalSerializer._serialize_children(node, include_attributes, depth)
+				return DOMEvalSerializer._serialize_children(node, depth, render_pass)
 
 			# Special handling for iframes - show them with their content
 			if tag in ['iframe', 'frame']:
@@ -158,7 +170,7 @@ class DOMEvalSerializer:
 				line = f'{depth_str}'
 				# Add [i_X] for interactive SVG elements only
 				if node.is_interactive:
-					line += f'[i_{node.original_node.backend_node_id}] '
+					line += f'[i_{render_pass.index_marker(node)}] '
 				line += '<svg'
 				attributes_str = DOMEvalSerializer._build_compact_attributes(node.original_node)
 				if attributes_str:
@@ -183,7 +195,7 @@ class DOMEvalSerializer:
 			line = f'{depth_str}'
 			# Add backend node ID notation - [i_X] for interactive elements only
 			if node.is_interactive:
-				line += f'[i_{node.original_node.backend_node_id}] '
+				line += f'[i_{render_pass.index_marker(node)}] '
 			# Non-interactive elements don't get an index notation
 			line += f'<{tag}'
 
@@ -212,7 +224,7 @@ class DOMEvalSerializer:
 
 			# Process children (always for containers, only if no inline_text for others)
 			if has_children and (is_container or not inline_text):
-				children_text = DOMEvalSerializer._serialize_children(node, include_attributes, depth + 1)
+				children_text = DOMEvalSerializer._serialize_children(node, depth + 1, render_pass)
 				if children_text:
 					formatted_text.append(children_text)
 
@@ -224,14 +236,14 @@ class DOMEvalSerializer:
 			# Shadow DOM - just show children directly with minimal marker
 			if node.children:
 				formatted_text.append(f'{depth_str}#shadow')
-				children_text = DOMEvalSerializer._serialize_children(node, include_attributes, depth + 1)
+				children_text = DOMEvalSerializer._serialize_children(node, depth + 1, render_pass)
 				if children_text:
 					formatted_text.append(children_text)
 
 		return '\n'.join(formatted_text)
 
 	@staticmethod
-	def _serialize_children(node: SimplifiedNode, include_attributes: list[str], depth: int) -> str:
+	def _serialize_children(node: SimplifiedNode, depth: int, render_pass: SubtreeRenderPass) -> str:
 		"""Helper to serialize all children of a node."""
 		children_output = []
 
@@ -277,7 +289,7 @@ class DOMEvalSerializer:
 					total_links_skipped = 0
 				consecutive_link_count = 0
 
-			child_text = DOMEvalSerializer.serialize_tree(child, include_attributes, depth)
+			child_text = render_pass.serialize(child, depth)
 			if child_text:
 				children_output.append(child_text)
 
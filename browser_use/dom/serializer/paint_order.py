@@ -1,8 +1,17 @@
+import math
 from collections import defaultdict
+from collections.abc import Iterable, Sequence
 from dataclasses import dataclass
 
 from browser_use.dom.views import SimplifiedNode
 
+try:
+	import numpy as np  # type: ignore[import-not-found]
+
+	NUMPY_AVAILABLE = True
+except ImportError:
+	NUMPY_AVAILABLE = False
+
 """
 Helper class for maintaining a union of rectangles (used for order of elements calculation)
 """
@@ -31,6 +40,10 @@ class Rect:
 	def contains(self, other: 'Rect') -> bool:
 		return self.x1 <= other.x1 and self.y1 <= other.y1 and self.x2 >= other.x2 and self.y2 >= other.y2
 
+	def touches(self, other: 'Rect') -> bool:
+		"""Closed overlap test (shared edges count), superset of intersects() and contains()."""
+		return self.x1 <= other.x2 and other.x1 <= self.x2 and self.y1 <= other.y2 and other.y1 <= self.y2
+
 
 class RectUnionPure:
 	"""
@@ -80,7 +93,7 @@ class RectUnionPure:
 			return False
 
 		stack = [r]
-		for s in self._rects:
+		for s in self._candidates(r):
 			new_stack = []
 			for piece in stack:
 				if s.contains(piece):
@@ -105,36 +118,159 @@ class RectUnionPure:
 			return False
 
 		pending = [r]
-		i = 0
-		while i < len(self._rects):
-			s = self._rects[i]
+		for s in self._candidates(r):
 			new_pending = []
-			changed = False
 			for piece in pending:
 				if piece.intersects(s):
 					new_pending.extend(self._split_diff(piece, s))
-					changed = True
 				else:
 					new_pending.append(piece)
 			pending = new_pending
-			if changed:
-				# s unchanged; proceed with next existing rectangle
-				i += 1
-			else:
-				i += 1
 
 		# Any left‑over pieces are new, non‑overlapping areas
-		self._rects.extend(pending)
+		self._store(pending)
 		return True
 
+	# -----------------------------------------------------------------
+	def _candidates(self, r: Rect) -> Iterable[Rect]:
+		"""
+		Stored rectangles that may touch r, in insertion order.
+		Subclasses narrow this down with a spatial index; the order must be preserved so that
+		the resulting disjoint decomposition is identical to the plain list scan.
+		"""
+		return self._rects
+
+	def _store(self, pieces: list[Rect]) -> None:
+		self._rects.extend(pieces)
+
+
+class RectUnionGrid(RectUnionPure):
+	"""
+	RectUnionPure with a uniform-grid spatial index over the stored rectangles.
+
+	contains()/add() only visit rectangles sharing a grid cell with the query instead of scanning
+	all of them, which keeps paint order filtering near-linear on pages with thousands of painted nodes.
+	"""
+
+	__slots__ = ('_cell_size', '_cells')
+
+	def __init__(self, cell_size: float = 256.0):
+		super().__init__()
+		self._cell_size = cell_size
+		self._cells: dict[tuple[int, int], list[int]] = defaultdict(list)
+
+	def _cell_range(self, r: Rect) -> tuple[range, range]:
+		size = self._cell_size
+		return (
+			range(math.floor(r.x1 / size), math.floor(r.x2 / size) + 1),
+			range(math.floor(r.y1 / size), math.floor(r.y2 / size) + 1),
+		)
+
+	def _candidates(self, r: Rect) -> Iterable[Rect]:
+		cells = self._cells
+		xs, ys = self._cell_range(r)
+		ids: set[int] = set()
+		for cx in xs:
+			for cy in ys:
+				bucket = cells.get((cx, cy))
+				if bucket:
+					ids.update(bucket)
+		rects = self._rects
+		return [rects[i] for i in sorted(ids) if rects[i].touches(r)]
+
+	def _store(self, pieces: list[Rect]) -> None:
+		for piece in pieces:
+			rect_id = len(self._rects)
+			self._rects.append(piece)
+			xs, ys = self._cell_range(piece)
+			for cx in xs:
+				for cy in ys:
+					self._cells[(cx, cy)].append(rect_id)
+
+
+class RectUnionNumpy(RectUnionPure):
+	"""
+	RectUnionPure with vectorized NumPy candidate filtering (requires the optional numpy dependency).
+
+	Stored rectangle coordinates live in preallocated column arrays, and one boolean mask per query selects
+	the rectangles touching it. Useful for pages with very large, heavily overlapping layers.
+	"""
+
+	__slots__ = ('_coords', '_count')
+
+	def __init__(self, initial_capacity: int = 1024):
+		if not NUMPY_AVAILABLE:
+			raise ImportError('RectUnionNumpy requires numpy, install it with `pip install numpy`')
+		super().__init__()
+		self._coords = np.empty((4, initial_capacity), dtype=np.float64)
+		self._count = 0
+
+	def _candidates(self, r: Rect) -> Iterable[Rect]:
+		n = self._count
+		x1, y1, x2, y2 = self._coords[:, :n]
+		mask = (x1 <= r.x2) & (r.x1 <= x2) & (y1 <= r.y2) & (r.y1 <= y2)
+		rects = self._rects
+		return [rects[i] for i in np.flatnonzero(mask)]
+
+	def _store(self, pieces: list[Rect]) -> None:
+		needed = self._count + len(pieces)
+		if needed > self._coords.shape[1]:
+			grown = np.empty((4, max(needed, self._coords.shape[1] * 2)), dtype=np.float64)
+			grown[:, : self._count] = self._coords[:, : self._count]
+			self._coords = grown
+		for piece in pieces:
+			self._coords[:, self._count] = (piece.x1, piece.y1, piece.x2, piece.y2)
+			self._count += 1
+		self._rects.extend(pieces)
+
+
+@dataclass(slots=True)
+class PaintedRect:
+	"""Plain input for compute_paint_order_occlusion (decoupled from SimplifiedNode for benchmarking)."""
+
+	paint_order: int
+	rect: Rect
+	occludes: bool
+	"""Whether this rect hides what is painted below it (opaque background, opacity >= 0.8)"""
+
+
+def compute_paint_order_occlusion(
+	painted_rects: Sequence[PaintedRect], rect_union_cls: type[RectUnionPure] = RectUnionGrid
+) -> list[bool]:
+	"""
+	Return, for every input rect, whether it is fully covered by occluding rects painted above it.
+	Rects with the same paint order don't occlude each other.
+	"""
+	grouped_by_paint_order: defaultdict[int, list[int]] = defaultdict(list)
+	for i, painted in enumerate(painted_rects):
+		grouped_by_paint_order[painted.paint_order].append(i)
+
+	covered = [False] * len(painted_rects)
+	rect_union = rect_union_cls()
+
+	for paint_order in sorted(grouped_by_paint_order, reverse=True):
+		rects_to_add = []
+		for i in grouped_by_paint_order[paint_order]:
+			painted = painted_rects[i]
+			if rect_union.contains(painted.rect):
+				covered[i] = True
+			if painted.occludes:
+				rects_to_add.append(painted.rect)
+
+		for rect in rects_to_add:
+			rect_union.add(rect)
+
+	return covered
+
 
 class PaintOrderRemover:
 	"""
 	Calculates which elements should be removed based on the paint order parameter.
 	"""
 
-	def __init__(self, root: SimplifiedNode):
+	def __init__(self, root: SimplifiedNode, rect_union_cls: type[RectUnionPure] = RectUnionGrid):
 		self.root = root
+		self.rect_union_cls = rect_union_cls
 
 	def calculate_paint_order(self) -> None:
 		all_simplified_nodes_with_paint_order: list[SimplifiedNode] = []
@@ -152,46 +288,30 @@ class PaintOrderRemover:
 
 		collect_paint_order(self.root)
 
-		grouped_by_paint_order: defaultdict[int, list[SimplifiedNode]] = defaultdict(list)
-
+		painted_rects: list[PaintedRect] = []
 		for node in all_simplified_nodes_with_paint_order:
-			if node.original_node.snapshot_node and node.original_node.snapshot_node.paint_order is not None:
-				grouped_by_paint_order[node.original_node.snapshot_node.paint_order].append(node)
-
-		rect_union = RectUnionPure()
-
-		for paint_order, nodes in sorted(grouped_by_paint_order.items(), key=lambda x: -x[0]):
-			rects_to_add = []
-
-			for node in nodes:
-				if not node.original_node.snapshot_node or not node.original_node.snapshot_node.bounds:
-					continue  # shouldn't happen by how we filter them out in the first place
-
-				rect = Rect(
-					x1=node.original_node.snapshot_node.bounds.x,
-					y1=node.original_node.snapshot_node.bounds.y,
-					x2=node.original_node.snapshot_node.bounds.x + node.original_node.snapshot_node.bounds.width,
-					y2=node.original_node.snapshot_node.bounds.y + node.original_node.snapshot_node.bounds.height,
+			snapshot_node = node.original_node.snapshot_node
+			assert snapshot_node is not None and snapshot_node.bounds is not None and snapshot_node.paint_order is not None
+			bounds = snapshot_node.bounds
+
+			# don't add to the nodes if opacity is less then 0.95 or background-color is transparent
+			computed_styles = snapshot_node.computed_styles
+			transparent = bool(
+				(computed_styles and computed_styles.get('background-color', 'rgba(0, 0, 0, 0)') == 'rgba(0, 0, 0, 0)')
+				or (computed_styles and float(computed_styles.get('opacity', '1')) < 0.8)  # this is highly vibes based number
+			)
+
+			painted_rects.append(
+				PaintedRect(
+					paint_order=snapshot_node.paint_order,
+					rect=Rect(x1=bounds.x, y1=bounds.y, x2=bounds.x + bounds.width, y2=bounds.y + bounds.height),
+					occludes=not transparent,
 				)
+			)
 
-				if rect_union.contains(rect):
-					node.ignored_by_paint_order = True
-
-				# don't add to the nodes if opacity is less then 0.95 or background-color is transparent
-				if (
-					node.original_node.snapshot_node.computed_styles
-					and node.original_node.snapshot_node.computed_styles.get('background-color', 'rgba(0, 0, 0, 0)')
-					== 'rgba(0, 0, 0, 0)'
-				) or (
-					node.original_node.snapshot_node.computed_styles
-					and float(node.original_node.snapshot_node.computed_styles.get('opacity', '1'))
-					< 0.8  # this is highly vibes based number
-				):
-					continue
-
-				rects_to_add.append(rect)
-
-			for rect in rects_to_add:
-				rect_union.add(rect)
+		covered = compute_paint_order_occlusion(painted_rects, self.rect_union_cls)
+		for node, is_covered in zip(all_simplified_nodes_with_paint_order, covered):
+			if is_covered:
+				node.ignored_by_paint_order = True
 
 		return None
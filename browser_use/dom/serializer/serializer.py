@@ -4,6 +4,7 @@ from typing import Any
 
 from browser_use.dom.serializer.clickable_elements import ClickableElementDetector
 from browser_use.dom.serializer.paint_order import PaintOrderRemover
+from browser_use.dom.serializer.subtree_cache import SubtreeRenderPass, SubtreeTextCache
 from browser_use.dom.utils import cap_text_length
 from browser_use.dom.views import (
 	DOMRect,
@@ -13,6 +14,7 @@ from browser_use.dom.views import (
 	PropagatingBounds,
 	SerializedDOMState,
 	SimplifiedNode,
+	ViewportScope,
 )
 
 DISABLED_ELEMENTS = {'style', 'script', 'head', 'meta', 'link', 'title'}
@@ -64,11 +66,18 @@ class DOMTreeSerializer:
 		containment_threshold: float | None = None,
 		paint_order_filtering: bool = True,
 		session_id: str | None = None,
+		viewport_scope: ViewportScope | None = None,
 	):
 		self.root_node = root_node
 		self._interactive_counter = 1
 		self._selector_map: DOMSelectorMap = {}
 		self._previous_cached_selector_map = previous_cached_state.selector_map if previous_cached_state else None
+		# Built once instead of per interactive node when marking new elements
+		self._previous_backend_node_ids = (
+			{node.backend_node_id for node in self._previous_cached_selector_map.values()}
+			if self._previous_cached_selector_map
+			else set()
+		)
 		# Add timing tracking
 		self.timing_info: dict[str, float] = {}
 		# Cache for clickable element detection to avoid redundant calls
@@ -80,6 +89,10 @@ class DOMTreeSerializer:
 		self.paint_order_filtering = paint_order_filtering
 		# Session ID for session-specific exclude attribute
 		self.session_id = session_id
+		# Viewport-scoped mode: skip element subtrees laid out entirely outside this band
+		self.viewport_scope = viewport_scope
+		# ids of nodes with a descendant painting outside of them, never skipped by the viewport scope
+		self._out_of_flow_containers: set[int] = set()
 
 	def _safe_parse_number(self, value_str: str, default: float) -> float:
 		"""Parse string to float, handling negatives and decimals."""
@@ -107,6 +120,9 @@ class DOMTreeSerializer:
 		self._selector_map = {}
 		self._semantic_groups = []
 		self._clickable_cache = {}  # Clear cache for new serialization
+		self._out_of_flow_containers = set()
+		if self.viewport_scope is not None:
+			self._collect_out_of_flow_containers(self.root_node, self._out_of_flow_containers)
 
 		# Step 1: Create simplified tree (includes clickable element detection)
 		start_step1 = time.time()
@@ -145,7 +161,11 @@ class DOMTreeSerializer:
 		end_total = time.time()
 		self.timing_info['serialize_accessible_elements_total'] = end_total - start_total
 
-		return SerializedDOMState(_root=filtered_tree, selector_map=self._selector_map), self.timing_info
+		serialized_dom_state = SerializedDOMState(_root=filtered_tree, selector_map=self._selector_map)
+		if self.viewport_scope is not None:
+			serialized_dom_state.elements_above_scope = self.viewport_scope.elements_above
+			serialized_dom_state.elements_below_scope = self.viewport_scope.elements_below
+		return serialized_dom_state, self.timing_info
 
 	def _add_compound_components(self, simplified: SimplifiedNode, node: EnhancedDOMTreeNode) -> None:
 		"""Enhance compound controls with information from their child components."""
@@ -465,6 +485,15 @@ class DOMTreeSerializer:
 			if node.node_name.lower() in SVG_ELEMENTS:
 				return None
 
+			# Viewport-scoped mode: skip (and only count) subtrees laid out entirely above/below the band
+			if self.viewport_scope is not None:
+				side = self.viewport_scope.side_of(
+					node.absolute_position, node.snapshot_node.computed_styles if node.snapshot_node else None
+				)
+				if side and id(node) not in self._out_of_flow_containers:
+					self.viewport_scope.record_skipped(side, self._count_elements(node))
+					return None
+
 			attributes = node.attributes or {}
 			# Check for session-specific exclude attribute first, then fall back to legacy attribute
 			exclude_attr = None
@@ -539,6 +568,49 @@ class DOMTreeSerializer:
 
 		return None
 
+	@classmethod
+	def _collect_out_of_flow_containers(
+		cls, node: EnhancedDOMTreeNode, containers: set[int], depth: int = 0, containing_block_depth: int = -1
+	) -> int | None:
+		"""Add the ids of nodes with a descendant in the same document that can paint outside their box to `containers`.
+
+		That is a fixed/sticky descendant, or an absolutely positioned one whose containing block is further up (see
+		`ViewportScope.escape_depth`).
+
+		Returns:
+			The depth of the shallowest ancestor `node` or one of its descendants can't escape, None if none escapes
+		"""
+		node_escape, containing_block_depth = ViewportScope.escape_depth(
+			node.snapshot_node.computed_styles if node.snapshot_node else None, depth, containing_block_depth
+		)
+		descendants_escape: int | None = None
+		for child in node.children_and_shadow_roots:
+			child_escape = cls._collect_out_of_flow_containers(child, containers, depth + 1, containing_block_depth)
+			if child_escape is not None and (descendants_escape is None or child_escape < descendants_escape):
+				descendants_escape = child_escape
+		if node.content_document:
+			# Iframe content paints inside the iframe's box, it doesn't keep the iframe's ancestors
+			cls._collect_out_of_flow_containers(node.content_document, containers)
+		if descendants_escape is None:
+			return node_escape
+		if descendants_escape < depth:
+			containers.add(id(node))
+		return descendants_escape if node_escape is None else min(node_escape, descendants_escape)
+
+	@staticmethod
+	def _count_elements(node: EnhancedDOMTreeNode) -> int:
+		"""Number of element nodes in a subtree (including shadow roots and iframe documents)."""
+		count = 0
+		stack = [node]
+		while stack:
+			current = stack.pop()
+			if current.node_type == NodeType.ELEMENT_NODE:
+				count += 1
+			stack.extend(current.children_and_shadow_roots)
+			if current.content_document:
+				stack.append(current.content_document)
+		return count
+
 	def _optimize_tree(self, node: SimplifiedNode | None) -> SimplifiedNode | None:
 		"""Step 2: Optimize tree structure."""
 		if not node:
@@ -648,8 +720,7 @@ class DOMTreeSerializer:
 					node.is_new = True
 				elif self._previous_cached_selector_map:
 					# Check if node is new for regular elements
-					previous_backend_node_ids = {node.backend_node_id for node in self._previous_cached_selector_map.values()}
-					if node.original_node.backend_node_id not in previous_backend_node_ids:
+					if node.original_node.backend_node_id not in self._previous_backend_node_ids:
 						node.is_new = True
 
 		# Process children
@@ -810,16 +881,27 @@ class DOMTreeSerializer:
 		return False
 
 	@staticmethod
-	def serialize_tree(node: SimplifiedNode | None, include_attributes: list[str], depth: int = 0) -> str:
+	def serialize_tree(
+		node: SimplifiedNode | None,
+		include_attributes: list[str],
+		depth: int = 0,
+		subtree_cache: SubtreeTextCache | None = None,
+	) -> str:
 		"""Serialize the optimized tree to string format."""
 		if not node:
 			return ''
+		return SubtreeRenderPass(node, include_attributes, DOMTreeSerializer._serialize_node, subtree_cache).run(depth)
+
+	@staticmethod
+	def _serialize_node(node: SimplifiedNode, depth: int, render_pass: SubtreeRenderPass) -> str:
+		"""Serialize one node and (through the render pass, which memoizes unchanged subtrees) its children."""
+		include_attributes = render_pass.include_attributes
 
 		# Skip rendering excluded nodes, but process their children
 		if hasattr(node, 'excluded_by_parent') and node.excluded_by_parent:
 			formatted_text = []
 			for child in node.children:
-				child_text = DOMTreeSerializer.serialize_tree(child, include_attributes, depth)
+				child_text = render_pass.serialize(child, depth)
 				if child_text:
 					formatted_text.append(child_text)
 			return '\n'.join(formatted_text)
@@ -832,7 +914,7 @@ class DOMTreeSerializer:
 			# Skip displaying nodes marked as should_display=False
 			if not node.should_display:
 				for child in node.children:
-					child_text = DOMTreeSerializer.serialize_tree(child, include_attributes, depth)
+					child_text = render_pass.serialize(child, depth)
 					if child_text:
 						formatted_text.append(child_text)
 				return '\n'.join(formatted_text)
@@ -852,8 +934,7 @@ class DOMTreeSerializer:
 				line = f'{depth_str}{shadow_prefix}'
 				# Add interactive marker if clickable
 				if node.is_interactive:
-					new_prefix = '*' if node.is_new else ''
-					line += f'{new_prefix}[{node.original_node.backend_node_id}]'
+					line += f'{render_pass.new_marker(node)}[{render_pass.index_marker(node)}]'
 				line += '<svg'
 				attributes_html_str = DOMTreeSerializer._build_attributes_string(node.original_node, include_attributes, '')
 				if attributes_html_str:
@@ -932,9 +1013,9 @@ class DOMTreeSerializer:
 					line = f'{depth_str}{shadow_prefix}|SCROLL|<{node.original_node.tag_name}'
 				elif node.is_interactive:
 					# Clickable (and possibly scrollable) - show backend_node_id
-					new_prefix = '*' if node.is_new else ''
+					new_prefix = render_pass.new_marker(node)
 					scroll_prefix = '|SCROLL[' if should_show_scroll else '['
-					line = f'{depth_str}{shadow_prefix}{new_prefix}{scroll_prefix}{node.original_node.backend_node_id}]<{node.original_node.tag_name}'
+					line = f'{depth_str}{shadow_prefix}{new_prefix}{scroll_prefix}{render_pass.index_marker(node)}]<{node.original_node.tag_name}'
 				elif node.original_node.tag_name.upper() == 'IFRAME':
 					# Iframe element (not interactive)
 					line = f'{depth_str}{shadow_prefix}|IFRAME|<{node.original_node.tag_name}'
@@ -968,7 +1049,7 @@ class DOMTreeSerializer:
 
 			# Process shadow DOM children
 			for child in node.children:
-				child_text = DOMTreeSerializer.serialize_tree(child, include_attributes, next_depth)
+				child_text = render_pass.serialize(child, next_depth)
 				if child_text:
 					formatted_text.append(child_text)
 
@@ -991,7 +1072,7 @@ class DOMTreeSerializer:
 		# Process children (for non-shadow elements)
 		if node.original_node.node_type != NodeType.DOCUMENT_FRAGMENT_NODE:
 			for child in node.children:
-				child_text = DOMTreeSerializer.serialize_tree(child, include_attributes, next_depth)
+				child_text = render_pass.serialize(child, next_depth)
 				if child_text:
 					formatted_text.append(child_text)
 
@@ -0,0 +1,233 @@
+# @file purpose: Memoizes serialized text of unchanged SimplifiedNode subtrees across serialization calls
+
+"""
+Subtree-level memo cache for the text serializers (DOMTreeSerializer, DOMEvalSerializer, DOMCodeAgentSerializer).
+
+Between agent steps most of a page is unchanged, yet every step re-renders the whole simplified tree. Each render pass
+fingerprints every subtree bottom-up (tag, attributes, text, visibility, scroll and AX data, serializer flags and the
+fingerprints of its children) and reuses the rendered text of any subtree whose fingerprint, depth, include_attributes
+and serializer were seen before. Fingerprints are 128-bit blake2b digests, so a hit is never another subtree's text.
+
+Each DomService (i.e. browser session) owns one cache, passed to the serializers through SerializedDOMState. Without a
+cache the serializers render everything.
+
+Interactive indices are the only per-element values that differ between otherwise identical subtrees (a re-mounted list
+gets new backend node ids), so they are not part of the fingerprint: serializers emit placeholders for them through
+`index_marker()` / `new_marker()`, cached templates remember which node (by pre-order position inside the subtree) each
+placeholder belongs to, and `finish()` patches in the current values.
+"""
+
+import hashlib
+import re
+from collections import OrderedDict
+from collections.abc import Callable
+
+from browser_use.dom.views import NodeType, SimplifiedNode
+
+_INDEX_PLACEHOLDER = '\x00'
+_NEW_PLACEHOLDER = '\x01'
+_PLACEHOLDER_RE = re.compile('[\x00\x01]')
+
+# (fingerprint, pre-order position of the subtree root, pre-order position after the subtree)
+_SubtreeInfo = tuple[bytes | None, int, int]
+
+
+def _node_signature(node: SimplifiedNode) -> bytes | None:
+	"""Digest of everything the serializers read from a single node, or None if the node can't be cached."""
+	original = node.original_node
+	if original.content_document is not None:
+		# Iframe serializers read the content document directly, outside of the simplified tree
+		return None
+
+	ax_signature = None
+	if original.ax_node is not None:
+		ax_signature = (
+			original.ax_node.role,
+			tuple((prop.name, str(prop.value)) for prop in original.ax_node.properties or ()),
+		)
+
+	scroll_signature = None
+	if original.node_type == NodeType.ELEMENT_NODE:
+		scroll_text = original.get_scroll_info_text() if original.should_show_scroll_info else ''
+		scroll_signature = (original.is_scrollable, original.is_actually_scrollable, scroll_text)
+
+	signature = repr(
+		(
+			original.node_type,
+			original.node_name,
+			original.node_value,
+			original.shadow_root_type,
+			tuple(original.attributes.items()) if original.attributes else None,
+			original.snapshot_node is not None,
+			original.is_visible,
+			scroll_signature,
+			ax_signature,
+			repr(original._compound_children) if original._compound_children else None,
+			node.should_display,
+			node.is_interactive,
+			node.excluded_by_parent,
+			node.is_shadow_host,
+		)
+	)
+	return hashlib.blake2b(signature.encode(), digest_size=16).digest()
+
+
+class SubtreeTextCache:
+	"""LRU cache of rendered subtree templates, shared by all render passes of one browser session."""
+
+	def __init__(self, max_entries: int = 20_000, max_chars: int = 8_000_000):
+		self.max_entries = max_entries
+		self.max_chars = max_chars
+		self._entries: OrderedDict[tuple, tuple[str, tuple[int, ...]]] = OrderedDict()
+		self._chars = 0
+		self.hits = 0
+		self.misses = 0
+
+	@property
+	def hit_rate(self) -> float:
+		lookups = self.hits + self.misses
+		return self.hits / lookups if lookups else 0.0
+
+	def stats(self) -> dict[str, float]:
+		return {
+			'hits': self.hits,
+			'misses': self.misses,
+			'hit_rate': self.hit_rate,
+			'entries': len(self._entries),
+			'chars': self._chars,
+		}
+
+	def clear(self) -> None:
+		self._entries.clear()
+		self._chars = 0
+		self.hits = 0
+		self.misses = 0
+
+	def get(self, key: tuple) -> tuple[str, tuple[int, ...]] | None:
+		entry = self._entries.get(key)
+		if entry is None:
+			self.misses += 1
+			return None
+		self.hits += 1
+		self._entries.move_to_end(key)
+		return entry
+
+	def put(self, key: tuple, template: str, slot_positions: tuple[int, ...]) -> None:
+		if len(template) > self.max_chars:
+			return
+		previous = self._entries.pop(key, None)
+		if previous is not None:
+			self._chars -= len(previous[0])
+		self._entries[key] = (template, slot_positions)
+		self._chars += len(template)
+		while len(self._entries) > self.max_entries or self._chars > self.max_chars:
+			_, (evicted, _) = self._entries.popitem(last=False)
+			self._chars -= len(evicted)
+
+
+class SubtreeRenderPass:
+	"""State of one serialize_tree() call: subtree fingerprints and the interactive nodes behind each placeholder.
+
+	`render(node, depth, render_pass)` is the serializer's per-node function, it recurses through `serialize()`.
+	Without a cache the pass renders the literal index values and nothing is memoized.
+	"""
+
+	def __init__(
+		self,
+		root: SimplifiedNode,
+		include_attributes: list[str],
+		render: Callable[[SimplifiedNode, int, 'SubtreeRenderPass'], str],
+		cache: SubtreeTextCache | None = None,
+	):
+		self.root = root
+		self.include_attributes = include_attributes
+		self._render = render
+		self.cache = cache
+		# Templates of different serializers must not mix
+		self._render_key = (getattr(render, '__qualname__', repr(render)), tuple(include_attributes))
+		self._subtrees: dict[int, _SubtreeInfo] = {}
+		self._preorder: list[SimplifiedNode] = []
+		self._slots: list[SimplifiedNode] = []
+		self._depth = 0
+		if cache is not None:
+			self._fingerprint(root)
+
+	def _fingerprint(self, node: SimplifiedNode) -> bytes | None:
+		start = len(self._preorder)
+		self._preorder.append(node)
+		signature = _node_signature(node)
+		hasher = hashlib.blake2b(signature, digest_size=16) if signature is not None else None
+		for child in node.children:
+			child_fingerprint = self._fingerprint(child)
+			if child_fingerprint is None:
+				hasher = None
+			elif hasher is not None:
+				hasher.update(child_fingerprint)
+		fingerprint = hasher.digest() if hasher is not None else None
+		self._subtrees[id(node)] = (fingerprint, start, len(self._preorder))
+		return fingerprint
+
+	def index_marker(self, node: SimplifiedNode) -> str:
+		"""Interactive index of the node (backend_node_id)."""
+		if self.cache is None:
+			return str(node.original_node.backend_node_id)
+		self._slots.append(node)
+		return _INDEX_PLACEHOLDER
+
+	def new_marker(self, node: SimplifiedNode) -> str:
+		"""'*' if the element is new since the last step."""
+		if self.cache is None:
+			return '*' if node.is_new else ''
+		self._slots.append(node)
+		return _NEW_PLACEHOLDER
+
+	def serialize(self, node: SimplifiedNode, depth: int) -> str:
+		"""Rendered text of a subtree, reused from the cache if an identical subtree was rendered at this depth."""
+		info = self._subtrees.get(id(node)) if self.cache is not None else None
+		if info is None or info[0] is None:
+			return self._render(node, depth, self)
+
+		assert self.cache is not None
+		fingerprint, start, end = info
+		key = (self._render_key, depth, end - start, fingerprint)
+		cached = self.cache.get(key)
+		if cached is not None:
+			template, slot_positions = cached
+			self._slots.extend(self._preorder[start + position] for position in slot_positions)
+			return template
+
+		first_slot = len(self._slots)
+		template = self._render(node, depth, self)
+		positions = []
+		for slot_node in self._slots[first_slot:]:
+			slot_info = self._subtrees.get(id(slot_node))
+			if slot_info is None or not start <= slot_info[1] < end:
+				return template  # a placeholder for a node outside the subtree, don't memoize
+			positions.append(slot_info[1] - start)
+		self.cache.put(key, template, tuple(positions))
+		return template
+
+	def finish(self, text: str) -> str:
+		"""Replace placeholders with the current interactive indices."""
+		if self.cache is None or not self._slots and _PLACEHOLDER_RE.search(text) is None:
+			return text
+
+		placeholders = _PLACEHOLDER_RE.findall(text)
+		if len(placeholders) != len(self._slots):
+			# The page text itself contains placeholder characters, render again without the cache
+			return SubtreeRenderPass(self.root, self.include_attributes, self._render).run(depth=self._depth)
+
+		slots = iter(self._slots)
+
+		def patch(match: re.Match[str]) -> str:
+			node = next(slots)
+			if match.group() == _INDEX_PLACEHOLDER:
+				return str(node.original_node.backend_node_id)
+			return '*' if node.is_new else ''
+
+		return _PLACEHOLDER_RE.sub(patch, text)
+
+	def run(self, depth: int = 0) -> str:
+		"""Serialize the whole tree starting at `depth`."""
+		self._depth = depth
+		return self.finish(self.serialize(self.root, depth))
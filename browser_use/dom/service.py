@@ -1,6 +1,7 @@
 import asyncio
 import logging
 import time
+from collections.abc import Iterable
 from typing import TYPE_CHECKING
 
 from cdp_use.cdp.accessibility.commands import GetFullAXTreeReturns
@@ -10,9 +11,14 @@ from cdp_use.cdp.target import TargetID
 
 from browser_use.dom.enhanced_snapshot import (
 	REQUIRED_COMPUTED_STYLES,
+	SnapshotLookup,
 	build_snapshot_lookup,
 )
+from browser_use.dom.frame_capture import FrameCaptureScheduler, find_cross_origin_iframe_frame_ids
+from browser_use.dom.mutation_tracker import DOMMutationTracker
 from browser_use.dom.serializer.serializer import DOMTreeSerializer
+from browser_use.dom.serializer.subtree_cache import SubtreeTextCache
+from browser_use.dom.tree_patcher import DOMTreePatcher
 from browser_use.dom.views import (
 	DOMRect,
 	EnhancedAXNode,
@@ -21,16 +27,60 @@ from browser_use.dom.views import (
 	NodeType,
 	SerializedDOMState,
 	TargetAllTrees,
+	ViewportScope,
 )
 from browser_use.observability import observe_debug
 from browser_use.utils import create_task_with_error_handling
 
 if TYPE_CHECKING:
-	from browser_use.browser.session import BrowserSession
+	from browser_use.browser.page_metadata import PageMetadataProbe
+	from browser_use.browser.session import BrowserSession, CDPSession
 
 # Note: iframe limits are now configurable via BrowserProfile.max_iframes and BrowserProfile.max_iframe_depth
 
 
+def _count_raw_elements(node: Node) -> int:
+	"""Number of element nodes in a raw CDP DOM subtree (including shadow roots and iframe documents)."""
+	count = 0
+	stack = [node]
+	while stack:
+		current = stack.pop()
+		if current['nodeType'] == NodeType.ELEMENT_NODE.value:
+			count += 1
+		stack.extend(current.get('children') or ())
+		stack.extend(current.get('shadowRoots') or ())
+		content_document = current.get('contentDocument')
+		if content_document:
+			stack.append(content_document)
+	return count
+
+
+def _collect_out_of_flow_containers(
+	node: Node, snapshot_lookup: SnapshotLookup, containers: set[int], depth: int = 0, containing_block_depth: int = -1
+) -> int | None:
+	"""Add the nodeIds of raw CDP nodes with a descendant that can paint outside their box to `containers`.
+
+	That is a fixed/sticky descendant, or an absolutely positioned one whose containing block is further up (see
+	`ViewportScope.escape_depth`). Iframe documents are not followed, their content paints inside the iframe's box.
+
+	Returns:
+		The depth of the shallowest ancestor `node` or one of its descendants can't escape, None if none escapes
+	"""
+	node_escape, containing_block_depth = ViewportScope.escape_depth(
+		snapshot_lookup.computed_styles_of(node['backendNodeId']), depth, containing_block_depth
+	)
+	descendants_escape: int | None = None
+	for child in (*(node.get('children') or ()), *(node.get('shadowRoots') or ())):
+		child_escape = _collect_out_of_flow_containers(child, snapshot_lookup, containers, depth + 1, containing_block_depth)
+		if child_escape is not None and (descendants_escape is None or child_escape < descendants_escape):
+			descendants_escape = child_escape
+	if descendants_escape is None:
+		return node_escape
+	if descendants_escape < depth:
+		containers.add(node['nodeId'])
+	return descendants_escape if node_escape is None else min(node_escape, descendants_escape)
+
+
 class DomService:
 	"""
 	Service for getting the DOM tree and other DOM-related information.
@@ -50,6 +100,9 @@ class DomService:
 		paint_order_filtering: bool = True,
 		max_iframes: int = 100,
 		max_iframe_depth: int = 5,
+		incremental_snapshots: bool = False,
+		max_concurrent_frame_captures: int = 4,
+		page_metadata: 'PageMetadataProbe | None' = None,
 	):
 		self.browser_session = browser_session
 		self.logger = logger or browser_session.logger
@@ -57,6 +110,27 @@ class DomService:
 		self.paint_order_filtering = paint_order_filtering
 		self.max_iframes = max_iframes
 		self.max_iframe_depth = max_iframe_depth
+		# Bound on concurrent per-frame CDP captures (cross-origin iframe targets, per-frame AX trees)
+		self.max_concurrent_frame_captures = max_concurrent_frame_captures
+		# Shared per-target page metadata (viewport, scroll, iframe scroll offsets), replaces separate CDP round trips
+		self.page_metadata = page_metadata
+
+		# Incremental mode: reuse the last enhanced tree while no DOM mutation was observed on any captured target, or
+		# patch it with the mutations of the focused target (see tree_patcher.py)
+		self.mutation_tracker: DOMMutationTracker | None = (
+			DOMMutationTracker(browser_session, logger=self.logger) if incremental_snapshots else None
+		)
+		self._captured_target_versions: dict[TargetID, int] = {}
+		self._cached_enhanced_tree: EnhancedDOMTreeNode | None = None
+		self._cached_viewport_key: tuple[float, ...] | None = None
+		# nodeId -> node of the focused target's part of the cached tree, kept up to date by the patcher
+		self._cached_nodes_by_id: dict[int, EnhancedDOMTreeNode] | None = None
+		# Elements whose state may have changed without a DOM mutation event, re-fetched by the next patch
+		self._changed_backend_node_ids: set[int] = set()
+		# Viewport-scoped mode: band the cached tree was pruned to and how many elements were skipped while building it
+		self._cached_viewport_scope: ViewportScope | None = None
+		# Rendered text of unchanged subtrees, reused across the steps of this session (see subtree_cache.py)
+		self.subtree_cache = SubtreeTextCache()
 
 	async def __aenter__(self):
 		return self
@@ -94,6 +168,12 @@ class DomService:
 
 	async def _get_viewport_ratio(self, target_id: TargetID) -> float:
 		"""Get viewport dimensions, device pixel ratio, and scroll position using CDP."""
+		if self.page_metadata is not None:
+			try:
+				return (await self.page_metadata.get(target_id)).device_pixel_ratio
+			except Exception as e:
+				self.logger.debug(f'Page metadata probe failed, falling back to layout metrics: {e}')
+
 		cdp_session = await self.browser_session.get_or_create_cdp_session(target_id=target_id, focus=False)
 
 		try:
@@ -227,16 +307,17 @@ class DomService:
 		# Collect all frame IDs recursively
 		all_frame_ids = collect_all_frame_ids(frame_tree['frameTree'])
 
-		# Get accessibility tree for each frame
-		ax_tree_requests = []
-		for frame_id in all_frame_ids:
-			ax_tree_request = cdp_session.cdp_client.send.Accessibility.getFullAXTree(
-				params={'frameId': frame_id}, session_id=cdp_session.session_id
-			)
-			ax_tree_requests.append(ax_tree_request)
+		# Get accessibility tree for each frame, with a bounded number of requests in flight
+		semaphore = asyncio.Semaphore(max(1, self.max_concurrent_frame_captures))
+
+		async def get_frame_ax_tree(frame_id: str) -> GetFullAXTreeReturns:
+			async with semaphore:
+				return await cdp_session.cdp_client.send.Accessibility.getFullAXTree(
+					params={'frameId': frame_id}, session_id=cdp_session.session_id
+				)
 
 		# Wait for all requests to complete
-		ax_trees = await asyncio.gather(*ax_tree_requests)
+		ax_trees = await asyncio.gather(*(get_frame_ax_tree(frame_id) for frame_id in all_frame_ids))
 
 		# Merge all AX nodes into a single array
 		merged_nodes: list[AXNode] = []
@@ -245,22 +326,25 @@ class DomService:
 
 		return {'nodes': merged_nodes}
 
-	async def _get_all_trees(self, target_id: TargetID) -> TargetAllTrees:
-		cdp_session = await self.browser_session.get_or_create_cdp_session(target_id=target_id, focus=False)
-
+	async def _capture_frame_trees(self, target_id: TargetID) -> TargetAllTrees:
+		"""`_get_all_trees` for one target, arming mutation tracking first in incremental mode."""
+		# Arm mutation tracking before capturing, so changes racing with the capture keep the target dirty
+		if self.mutation_tracker is not None:
+			cdp_session = await self.browser_session.get_or_create_cdp_session(target_id=target_id, focus=False)
+			await self.mutation_tracker.attach(cdp_session)
+			self._captured_target_versions[target_id] = self.mutation_tracker.get_version(target_id)
+		return await self._get_all_trees(target_id)
+
+	async def _probe_iframe_scroll_positions(self, cdp_session: 'CDPSession') -> dict:
+		"""Scroll offsets of same-origin iframes (two round trips, used without a shared page metadata probe)."""
 		# Wait for the page to be ready first
 		try:
-			ready_state = await cdp_session.cdp_client.send.Runtime.evaluate(
+			await cdp_session.cdp_client.send.Runtime.evaluate(
 				params={'expression': 'document.readyState'}, session_id=cdp_session.session_id
 			)
-		except Exception as e:
+		except Exception:
 			pass  # Page might not be ready yet
-		# DEBUG: Log before capturing snapshot
-		self.logger.debug(f'🔍 DEBUG: Capturing DOM snapshot for target {target_id}')
 
-		# Get actual scroll positions for all iframes before capturing snapshot
-		start_iframe_scroll = time.time()
-		iframe_scroll_positions = {}
 		try:
 			scroll_result = await cdp_session.cdp_client.send.Runtime.evaluate(
 				params={
@@ -289,13 +373,31 @@ class DomService:
 				session_id=cdp_session.session_id,
 			)
 			if scroll_result and 'result' in scroll_result and 'value' in scroll_result['result']:
-				iframe_scroll_positions = scroll_result['result']['value']
-				for idx, scroll_data in iframe_scroll_positions.items():
-					self.logger.debug(
-						f'🔍 DEBUG: Iframe {idx} actual scroll position - scrollTop={scroll_data.get("scrollTop", 0)}, scrollLeft={scroll_data.get("scrollLeft", 0)}'
-					)
+				return scroll_result['result']['value']
 		except Exception as e:
 			self.logger.debug(f'Failed to get iframe scroll positions: {e}')
+		return {}
+
+	async def _get_all_trees(self, target_id: TargetID) -> TargetAllTrees:
+		cdp_session = await self.browser_session.get_or_create_cdp_session(target_id=target_id, focus=False)
+
+		# DEBUG: Log before capturing snapshot
+		self.logger.debug(f'🔍 DEBUG: Capturing DOM snapshot for target {target_id}')
+
+		# Get actual scroll positions for all iframes before capturing snapshot
+		start_iframe_scroll = time.time()
+		iframe_scroll_positions = {}
+		if self.page_metadata is not None:
+			try:
+				iframe_scroll_positions = (await self.page_metadata.get(target_id)).iframe_scroll_positions
+			except Exception as e:
+				self.logger.debug(f'Failed to get iframe scroll positions: {e}')
+		else:
+			iframe_scroll_positions = await self._probe_iframe_scroll_positions(cdp_session)
+		for idx, scroll_data in iframe_scroll_positions.items():
+			self.logger.debug(
+				f'🔍 DEBUG: Iframe {idx} actual scroll position - scrollTop={scroll_data.get("scrollTop", 0)}, scrollLeft={scroll_data.get("scrollLeft", 0)}'
+			)
 		iframe_scroll_ms = (time.time() - start_iframe_scroll) * 1000
 
 		# Define CDP request factories to avoid duplication
@@ -428,6 +530,9 @@ class DomService:
 		initial_html_frames: list[EnhancedDOMTreeNode] | None = None,
 		initial_total_frame_offset: DOMRect | None = None,
 		iframe_depth: int = 0,
+		viewport_scope: ViewportScope | None = None,
+		frame_scheduler: FrameCaptureScheduler | None = None,
+		node_lookup: dict[int, EnhancedDOMTreeNode] | None = None,
 	) -> tuple[EnhancedDOMTreeNode, dict[str, float]]:
 		"""Get the DOM tree for a specific target.
 
@@ -437,6 +542,11 @@ class DomService:
 			initial_html_frames: List of HTML frame nodes encountered so far
 			initial_total_frame_offset: Accumulated coordinate offset
 			iframe_depth: Current depth of iframe nesting to prevent infinite recursion
+			viewport_scope: If set, element subtrees of the main frame laid out entirely outside this band are
+				skipped without being constructed (skipped elements are counted on the scope)
+			frame_scheduler: Shared scheduler capturing cross-origin iframe targets in parallel (created by the
+				top-level call when cross-origin iframes are enabled)
+			node_lookup: If set, filled with nodeId -> node of this target's nodes (not those of cross-origin iframes)
 
 		Returns:
 			Tuple of (enhanced_dom_tree_node, timing_info)
@@ -444,9 +554,52 @@ class DomService:
 		timing_info: dict[str, float] = {}
 		timing_start_total = time.time()
 
-		# Get all trees from CDP (snapshot, DOM, AX, viewport ratio)
+		# The top-level call owns the scheduler for all (nested) cross-origin iframe targets
+		owns_frame_scheduler = False
+		if frame_scheduler is None and self.cross_origin_iframes:
+			frame_scheduler = FrameCaptureScheduler(
+				self._capture_frame_trees, max_concurrency=self.max_concurrent_frame_captures, logger=self.logger
+			)
+			owns_frame_scheduler = True
+
+		try:
+			return await self._get_dom_tree(
+				target_id,
+				timing_info,
+				timing_start_total,
+				all_frames,
+				initial_html_frames,
+				initial_total_frame_offset,
+				iframe_depth,
+				viewport_scope,
+				frame_scheduler,
+				node_lookup,
+			)
+		finally:
+			if owns_frame_scheduler:
+				assert frame_scheduler is not None
+				frame_scheduler.cancel_pending()
+
+	async def _get_dom_tree(
+		self,
+		target_id: TargetID,
+		timing_info: dict[str, float],
+		timing_start_total: float,
+		all_frames: dict | None,
+		initial_html_frames: list[EnhancedDOMTreeNode] | None,
+		initial_total_frame_offset: DOMRect | None,
+		iframe_depth: int,
+		viewport_scope: ViewportScope | None,
+		frame_scheduler: FrameCaptureScheduler | None,
+		node_lookup: dict[int, EnhancedDOMTreeNode] | None = None,
+	) -> tuple[EnhancedDOMTreeNode, dict[str, float]]:
+		# Get all trees from CDP (snapshot, DOM, AX, viewport ratio), cross-origin iframe targets were usually
+		# already scheduled by their parent frame
 		start_get_trees = time.time()
-		trees = await self._get_all_trees(target_id)
+		if frame_scheduler is not None and iframe_depth > 0:
+			trees = await frame_scheduler.get(target_id)
+		else:
+			trees = await self._capture_frame_trees(target_id)
 		get_trees_ms = (time.time() - start_get_trees) * 1000
 		timing_info.update(trees.cdp_timing)
 		timing_info['get_all_trees_total_ms'] = get_trees_ms
@@ -463,7 +616,7 @@ class DomService:
 		}
 		timing_info['build_ax_lookup_ms'] = (time.time() - start_ax) * 1000
 
-		enhanced_dom_tree_node_lookup: dict[int, EnhancedDOMTreeNode] = {}
+		enhanced_dom_tree_node_lookup: dict[int, EnhancedDOMTreeNode] = node_lookup if node_lookup is not None else {}
 		""" NodeId (NOT backend node id) -> enhanced dom tree node"""  # way to get the parent/content node
 
 		# Parse snapshot data with everything calculated upfront
@@ -471,6 +624,22 @@ class DomService:
 		snapshot_lookup = build_snapshot_lookup(snapshot, device_pixel_ratio)
 		timing_info['build_snapshot_lookup_ms'] = (time.time() - start_snapshot) * 1000
 
+		# Viewport-scoped mode: subtrees with a descendant painting outside of them are never skipped as a whole
+		out_of_flow_containers: set[int] = set()
+		if viewport_scope is not None and iframe_depth == 0:
+			_collect_out_of_flow_containers(dom_tree['root'], snapshot_lookup, out_of_flow_containers)
+
+		# Fan out the captures of all cross-origin iframes of this frame before constructing the tree
+		if frame_scheduler is not None and iframe_depth < self.max_iframe_depth:
+			oopif_frame_ids = find_cross_origin_iframe_frame_ids(dom_tree['root'], snapshot_lookup, limit=self.max_iframes)
+			if oopif_frame_ids:
+				if all_frames is None:
+					all_frames, _ = await self.browser_session.get_all_frames()
+				for frame_id in oopif_frame_ids:
+					frame_info = all_frames.get(frame_id)
+					if frame_info and frame_info.get('frameTargetId'):
+						frame_scheduler.schedule(frame_info['frameTargetId'])
+
 		async def _construct_enhanced_node(
 			node: Node,
 			html_frames: list[EnhancedDOMTreeNode] | None,
@@ -621,10 +790,22 @@ class DomService:
 					for shadow_root in node['shadowRoots']:
 						shadow_root_node_ids.add(shadow_root['nodeId'])
 
+				# Viewport-scoped mode: snapshot bounds are in main frame document coordinates
+				prune_children = viewport_scope is not None and iframe_depth == 0 and len(updated_html_frames) <= 1
+
 				for child in node['children']:
 					# Skip shadow roots - they should only be in shadow_roots list
 					if child['nodeId'] in shadow_root_node_ids:
 						continue
+					if prune_children and child['nodeType'] == NodeType.ELEMENT_NODE.value:
+						assert viewport_scope is not None
+						child_snapshot = snapshot_lookup.get(child['backendNodeId'])
+						side = (
+							viewport_scope.side_of(child_snapshot.bounds, child_snapshot.computed_styles) if child_snapshot else 0
+						)
+						if side and child['nodeId'] not in out_of_flow_containers:
+							viewport_scope.record_skipped(side, _count_raw_elements(child))
+							continue
 					dom_tree_node.children_nodes.append(
 						await _construct_enhanced_node(child, updated_html_frames, total_frame_offset, all_frames)
 					)
@@ -721,6 +902,7 @@ class DomService:
 								# initial_html_frames=updated_html_frames,
 								initial_total_frame_offset=total_frame_offset,
 								iframe_depth=iframe_depth + 1,
+								frame_scheduler=frame_scheduler,
 							)
 
 							dom_tree_node.content_document = content_document
@@ -736,6 +918,8 @@ class DomService:
 			dom_tree['root'], initial_html_frames, initial_total_frame_offset, all_frames
 		)
 		timing_info['construct_enhanced_tree_ms'] = (time.time() - start_construct) * 1000
+		if frame_scheduler is not None and iframe_depth == 0:
+			timing_info.update(frame_scheduler.timing_info())
 
 		# Calculate total time for get_dom_tree
 		total_get_dom_tree_ms = (time.time() - timing_start_total) * 1000
@@ -754,12 +938,120 @@ class DomService:
 
 		return enhanced_dom_tree_node, timing_info
 
+	async def _get_viewport_key(self, target_id: TargetID) -> tuple[float, ...] | None:
+		"""Scroll offset and viewport size of a target, used to detect layout changes that fire no DOM mutation."""
+		if self.page_metadata is not None:
+			try:
+				return (await self.page_metadata.get(target_id)).viewport_key
+			except Exception as e:
+				self.logger.debug(f'Page metadata probe failed, falling back to layout metrics: {e}')
+		try:
+			cdp_session = await self.browser_session.get_or_create_cdp_session(target_id=target_id, focus=False)
+			metrics = await cdp_session.cdp_client.send.Page.getLayoutMetrics(session_id=cdp_session.session_id)
+		except Exception as e:
+			self.logger.debug(f'Failed to get layout metrics for incremental DOM check: {e}')
+			return None
+		css_visual_viewport = metrics.get('cssVisualViewport', {})
+		return (
+			float(css_visual_viewport.get('pageX', 0)),
+			float(css_visual_viewport.get('pageY', 0)),
+			float(css_visual_viewport.get('clientWidth', 0)),
+			float(css_visual_viewport.get('clientHeight', 0)),
+		)
+
+	async def _is_tree_bound(self, tree: EnhancedDOMTreeNode) -> bool:
+		"""Whether the node ids of a cached tree are still valid, another DOM.getDocument call on its session re-assigns them."""
+		try:
+			cdp_session = await self.browser_session.get_or_create_cdp_session(target_id=tree.target_id, focus=False)
+			result = await cdp_session.cdp_client.send.DOM.describeNode(
+				params={'nodeId': tree.node_id}, session_id=cdp_session.session_id
+			)
+		except Exception:
+			return False
+		return result['node']['backendNodeId'] == tree.backend_node_id
+
+	async def _get_reusable_dom_tree(
+		self, target_id: TargetID, timing_info: dict[str, float], allow_patch: bool = True
+	) -> tuple[EnhancedDOMTreeNode | None, tuple[float, ...] | None]:
+		"""Return the previously captured enhanced tree if the viewport did not move: as it is if no captured target
+		mutated, else patched with the recorded mutations of the focused target (see tree_patcher.py).
+
+		Args:
+			target_id: Focused target
+			timing_info: Receives the patch duration
+			allow_patch: Whether the cached tree may be patched (not when it was pruned to a viewport band)
+
+		Returns:
+			Tuple of (reusable_enhanced_tree_or_None, current_viewport_key)
+		"""
+		assert self.mutation_tracker is not None
+		viewport_key = await self._get_viewport_key(target_id)
+
+		cached_tree = self._cached_enhanced_tree
+		if cached_tree is None or cached_tree.target_id != target_id:
+			return None, viewport_key
+		if viewport_key is None or viewport_key != self._cached_viewport_key:
+			return None, viewport_key
+		if not await self._is_tree_bound(cached_tree):
+			self.logger.debug('🔍 Incremental DOM: node ids of the cached tree were re-assigned, doing a full capture')
+			return None, viewport_key
+		dirty_targets = [t for t in self._captured_target_versions if self.mutation_tracker.is_dirty(t)]
+		if not dirty_targets and not self._changed_backend_node_ids:
+			return cached_tree, viewport_key
+
+		captured_version = self._captured_target_versions.get(target_id)
+		other_dirty_targets = [t for t in dirty_targets if t != target_id]
+		if not allow_patch or self._cached_nodes_by_id is None or captured_version is None or other_dirty_targets:
+			self.logger.debug(f'🔍 Incremental DOM: {len(dirty_targets)} dirty target(s), doing a full capture')
+			return None, viewport_key
+		version = self.mutation_tracker.get_version(target_id)
+		mutations = self.mutation_tracker.get_mutations(target_id, captured_version)
+		if mutations is None:
+			self.logger.debug('🔍 Incremental DOM: not all mutations since the last capture were recorded, doing a full capture')
+			return None, viewport_key
+
+		start_patch = time.time()
+		cdp_session = await self.browser_session.get_or_create_cdp_session(target_id=target_id, focus=False)
+		patcher = DOMTreePatcher(self, cached_tree, self._cached_nodes_by_id, cdp_session)
+		patched_tree = await patcher.patch(mutations, self._changed_backend_node_ids)
+		timing_info['incremental_patch_ms'] = (time.time() - start_patch) * 1000
+		self._changed_backend_node_ids = set()
+		if patched_tree is None:
+			self._cached_enhanced_tree = None
+			self._cached_nodes_by_id = None
+			return None, viewport_key
+
+		self.mutation_tracker.mark_captured(target_id, version)
+		self._captured_target_versions[target_id] = version
+		self._cached_enhanced_tree = patched_tree
+		return patched_tree, viewport_key
+
+	def mark_nodes_changed(self, backend_node_ids: Iterable[int]) -> None:
+		"""Have the next incremental capture re-fetch elements whose state may have changed without a DOM mutation."""
+		self._changed_backend_node_ids.update(backend_node_ids)
+
+	def invalidate_incremental_cache(self) -> None:
+		"""Drop the reusable enhanced tree so the next call does a full capture."""
+		self._cached_enhanced_tree = None
+		self._cached_viewport_key = None
+		self._cached_viewport_scope = None
+		self._cached_nodes_by_id = None
+		self._changed_backend_node_ids = set()
+		if self.mutation_tracker is not None:
+			self.mutation_tracker.invalidate()
+
 	@observe_debug(ignore_input=True, ignore_output=True, name='get_serialized_dom_tree')
 	async def get_serialized_dom_tree(
-		self, previous_cached_state: SerializedDOMState | None = None
+		self, previous_cached_state: SerializedDOMState | None = None, viewport_margin: float | None = None
 	) -> tuple[SerializedDOMState, EnhancedDOMTreeNode, dict[str, float]]:
 		"""Get the serialized DOM tree representation for LLM consumption.
 
+		Args:
+			previous_cached_state: Previous serialized state, used to mark new elements
+			viewport_margin: Viewport-scoped mode. If set, only elements within this many viewport heights above and
+				below the visible viewport are extracted, subtrees outside that band are skipped while building and
+				serializing the tree and only counted (`SerializedDOMState.elements_above_scope/elements_below_scope`).
+
 		Returns:
 			Tuple of (serialized_dom_state, enhanced_dom_tree_root, timing_info)
 		"""
@@ -771,22 +1063,87 @@ class DomService:
 
 		session_id = self.browser_session.id
 
-		# Build DOM tree (includes CDP calls for snapshot, DOM, AX tree)
-		# Note: all_frames is fetched lazily inside get_dom_tree only if cross-origin iframes need it
-		enhanced_dom_tree, dom_tree_timing = await self.get_dom_tree(
-			target_id=self.browser_session.agent_focus_target_id,
-			all_frames=None,  # Lazy - will fetch if needed
-		)
+		target_id = self.browser_session.agent_focus_target_id
+
+		# Incremental mode: skip the full CDP capture if nothing changed since the last step, or only what the recorded
+		# mutations touched (patching is not done on a tree pruned to a viewport band)
+		enhanced_dom_tree: EnhancedDOMTreeNode | None = None
+		viewport_key: tuple[float, ...] | None = None
+		if self.mutation_tracker is not None:
+			start_reuse_check = time.time()
+			enhanced_dom_tree, viewport_key = await self._get_reusable_dom_tree(
+				target_id, timing_info, allow_patch=viewport_margin is None
+			)
+			timing_info['incremental_reuse_check_ms'] = (time.time() - start_reuse_check) * 1000
+
+		viewport_scope: ViewportScope | None = None
+		if viewport_margin is not None:
+			scroll_and_size = viewport_key or await self._get_viewport_key(target_id)
+			if scroll_and_size is not None and scroll_and_size[3] > 0:
+				viewport_scope = ViewportScope.around_viewport(
+					scroll_y=scroll_and_size[1], viewport_height=scroll_and_size[3], margin=viewport_margin
+				)
 
-		# Add sub-timings from DOM tree construction
-		timing_info.update(dom_tree_timing)
+		if enhanced_dom_tree is not None:
+			cached_scope = self._cached_viewport_scope
+			if (cached_scope is None) != (viewport_scope is None) or (
+				cached_scope is not None
+				and viewport_scope is not None
+				and (cached_scope.top, cached_scope.bottom) != (viewport_scope.top, viewport_scope.bottom)
+			):
+				# The cached tree was pruned to a different band (or not at all)
+				enhanced_dom_tree = None
+			else:
+				self.logger.debug('🔍 Incremental DOM: reusing the enhanced DOM tree of the last capture')
+				if cached_scope is not None and viewport_scope is not None:
+					viewport_scope.elements_above = cached_scope.elements_above
+					viewport_scope.elements_below = cached_scope.elements_below
+
+		if enhanced_dom_tree is None:
+			self._captured_target_versions = {}
+			self._changed_backend_node_ids = set()
+			nodes_by_id: dict[int, EnhancedDOMTreeNode] = {}
+
+			# Build DOM tree (includes CDP calls for snapshot, DOM, AX tree)
+			# Note: all_frames is fetched lazily inside get_dom_tree only if cross-origin iframes need it
+			enhanced_dom_tree, dom_tree_timing = await self.get_dom_tree(
+				target_id=target_id,
+				all_frames=None,  # Lazy - will fetch if needed
+				viewport_scope=viewport_scope,
+				node_lookup=nodes_by_id,
+			)
+
+			# Add sub-timings from DOM tree construction
+			timing_info.update(dom_tree_timing)
+
+			if self.mutation_tracker is not None:
+				for captured_target_id, version in self._captured_target_versions.items():
+					self.mutation_tracker.mark_captured(captured_target_id, version)
+				self._cached_enhanced_tree = enhanced_dom_tree
+				self._cached_nodes_by_id = nodes_by_id
+				self._cached_viewport_key = viewport_key
+				self._cached_viewport_scope = (
+					ViewportScope(
+						top=viewport_scope.top,
+						bottom=viewport_scope.bottom,
+						elements_above=viewport_scope.elements_above,
+						elements_below=viewport_scope.elements_below,
+					)
+					if viewport_scope is not None
+					else None
+				)
 
 		# Serialize DOM tree for LLM
 		start_serialize = time.time()
 
 		serialized_dom_state, serializer_timing = DOMTreeSerializer(
-			enhanced_dom_tree, previous_cached_state, paint_order_filtering=self.paint_order_filtering, session_id=session_id
+			enhanced_dom_tree,
+			previous_cached_state,
+			paint_order_filtering=self.paint_order_filtering,
+			session_id=session_id,
+			viewport_scope=viewport_scope,
 		).serialize_accessible_elements()
+		serialized_dom_state._subtree_cache = self.subtree_cache
 		total_serialization_ms = (time.time() - start_serialize) * 1000
 
 		# Add serializer sub-timings (convert to ms)
@@ -804,7 +1161,11 @@ class DomService:
 		timing_info['get_serialized_dom_tree_total_ms'] = total_get_serialized_dom_tree_ms
 
 		# Calculate overhead in get_serialized_dom_tree (time not accounted for)
-		tracked_major_operations_ms = timing_info.get('get_dom_tree_total_ms', 0) + total_serialization_ms
+		tracked_major_operations_ms = (
+			timing_info.get('incremental_reuse_check_ms', 0)
+			+ timing_info.get('get_dom_tree_total_ms', 0)
+			+ total_serialization_ms
+		)
 		get_serialized_overhead_ms = total_get_serialized_dom_tree_ms - tracked_major_operations_ms
 		if get_serialized_overhead_ms > 0.1:
 			timing_info['get_serialized_dom_tree_overhead_ms'] = get_serialized_overhead_ms
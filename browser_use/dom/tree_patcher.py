@@ -0,0 +1,492 @@
+"""
+Incremental updates of a previously captured enhanced DOM tree.
+
+Between two captures of a page, `DOMTreePatcher` applies the DOM mutation events recorded by DOMMutationTracker
+(childNodeInserted, childNodeRemoved, attributeModified, characterDataModified, ...) to the EnhancedDOMTreeNode tree of
+the last capture and re-fetches layout, computed styles and accessibility data only for the nodes they touched, instead
+of a full DOMSnapshot.captureSnapshot + DOM.getDocument + accessibility tree capture:
+
+- boxes with DOM.getBoxModel (elements) and DOM.getContentQuads (text nodes)
+- computed styles, client and scroll rects of all touched elements with a single Runtime.callFunctionOn
+- click listeners of inserted elements with DOMDebugger.getEventListeners
+- accessibility data with Accessibility.getPartialAXTree, which includes the ancestors whose names derive from content
+
+Inserted subtrees and the subtrees of elements whose attributes or inline style changed are re-fetched as a whole, text
+changes only re-fetch the text node. The layout of untouched nodes is not re-fetched, so the patch is only kept if the
+boxes of the parents and siblings of touched subtrees did not change. Otherwise, or when a patch touches more than
+`MAX_PATCHED_NODES` nodes, involves iframes or shadow roots, or references nodes the tree doesn't know, `patch()` returns
+None and the caller captures the page in full.
+
+Inserted nodes get no paint order, they are not part of paint order occlusion until the next full capture.
+"""
+
+import asyncio
+from collections.abc import Iterable
+from dataclasses import replace
+from typing import TYPE_CHECKING, Any
+
+from cdp_use.cdp.dom.types import Node
+
+from browser_use.dom.enhanced_snapshot import REQUIRED_COMPUTED_STYLES
+from browser_use.dom.views import DOMRect, EnhancedDOMTreeNode, EnhancedSnapshotNode, NodeType
+
+if TYPE_CHECKING:
+	from browser_use.browser.session import CDPSession
+	from browser_use.dom.service import DomService
+
+# Patches touching more nodes (re-fetched, or probed for layout shifts) are left to a full capture
+MAX_PATCHED_NODES = 200
+
+# Concurrent CDP requests while re-fetching the touched nodes
+MAX_CONCURRENT_REQUESTS = 16
+
+# Boxes that moved or resized by less than this many CSS pixels count as unchanged
+LAYOUT_TOLERANCE = 1.0
+
+_OBJECT_GROUP = 'browser-use-dom-patch'
+
+# Listener types that make Chrome's DOMSnapshot report an element as clickable
+_CLICK_EVENT_TYPES = frozenset({'click', 'mousedown', 'mouseup', 'pointerdown', 'pointerup'})
+
+# Computed styles, client rect and scroll rect of each element passed after the style names
+_READ_ELEMENTS_JS = """
+function(names, ...elements) {
+	return elements.map(element => {
+		const style = getComputedStyle(element);
+		return {
+			styles: names.map(name => style.getPropertyValue(name)),
+			client: [element.clientLeft, element.clientTop, element.clientWidth, element.clientHeight],
+			scroll: [element.scrollLeft, element.scrollTop, element.scrollWidth, element.scrollHeight],
+		};
+	});
+}
+"""
+
+
+class _PatchAbandoned(Exception):
+	"""The recorded mutations cannot be applied to the cached tree, the page needs a full capture."""
+
+
+def _quads_rect(quads: list[list[float]]) -> DOMRect | None:
+	xs = [x for quad in quads for x in quad[0::2]]
+	ys = [y for quad in quads for y in quad[1::2]]
+	if not xs or not ys:
+		return None
+	return DOMRect(x=min(xs), y=min(ys), width=max(xs) - min(xs), height=max(ys) - min(ys))
+
+
+def _same_rect(a: DOMRect | None, b: DOMRect | None) -> bool:
+	if a is None or b is None:
+		return a is b
+	return (
+		abs(a.x - b.x) < LAYOUT_TOLERANCE
+		and abs(a.y - b.y) < LAYOUT_TOLERANCE
+		and abs(a.width - b.width) < LAYOUT_TOLERANCE
+		and abs(a.height - b.height) < LAYOUT_TOLERANCE
+	)
+
+
+def _has_layout(node: EnhancedDOMTreeNode) -> bool:
+	return node.node_type in (NodeType.ELEMENT_NODE, NodeType.TEXT_NODE)
+
+
+class DOMTreePatcher:
+	"""Applies recorded DOM mutations to the enhanced tree of a target's main document, see the module docstring.
+
+	`nodes_by_id` (nodeId -> node of the cached tree) is updated in place, drop the tree and the map if `patch()`
+	returns None.
+	"""
+
+	def __init__(
+		self,
+		dom_service: 'DomService',
+		root: EnhancedDOMTreeNode,
+		nodes_by_id: dict[int, EnhancedDOMTreeNode],
+		cdp_session: 'CDPSession',
+	):
+		self.dom_service = dom_service
+		self.root = root
+		self.nodes_by_id = nodes_by_id
+		self.cdp_session = cdp_session
+		self.logger = dom_service.logger
+
+		# nodeId -> node, by what has to be re-fetched
+		self._inserted: dict[int, EnhancedDOMTreeNode] = {}
+		self._changed: dict[int, EnhancedDOMTreeNode] = {}
+		self._probed: dict[int, EnhancedDOMTreeNode] = {}
+		self._semaphore = asyncio.Semaphore(MAX_CONCURRENT_REQUESTS)
+		self._has_object_group = False
+
+	async def patch(
+		self, mutations: Iterable[tuple[str, Any]], changed_backend_node_ids: Iterable[int] = ()
+	) -> EnhancedDOMTreeNode | None:
+		"""Apply `mutations` and re-fetch the touched nodes.
+
+		Args:
+			mutations: (event name, event) of the recorded mutations, in order
+			changed_backend_node_ids: Elements whose state may have changed without a mutation event (typed into, selected)
+
+		Returns:
+			The patched tree under a new root node object (so it counts as a new version of the page), or None if the
+			page has to be captured in full
+		"""
+		try:
+			html = self._main_html()
+			for event_name, event in mutations:
+				await self._apply(event_name, event)
+			changed_backend_node_ids = set(changed_backend_node_ids)
+			if changed_backend_node_ids:
+				for node in list(self.nodes_by_id.values()):
+					# Hinted nodes missing from the tree were removed, or pruned from it
+					if node.backend_node_id in changed_backend_node_ids and node.node_type == NodeType.ELEMENT_NODE:
+						self._mark_subtree_changed(self._checked(node))
+
+			for node_id in self._inserted.keys() | self._changed.keys():
+				self._probed.pop(node_id, None)
+			touched = len(self._inserted) + len(self._changed) + len(self._probed)
+			if touched > MAX_PATCHED_NODES:
+				raise _PatchAbandoned(f'{touched} touched nodes')
+			if touched:
+				await self._refresh(html)
+		except Exception as e:
+			# _PatchAbandoned, or a CDP command failed (e.g. the page navigated meanwhile)
+			self.logger.debug(f'🔍 Incremental DOM: cannot patch the cached tree ({e}), doing a full capture')
+			return None
+		finally:
+			if self._has_object_group:
+				try:
+					await self.cdp_session.cdp_client.send.Runtime.releaseObjectGroup(
+						params={'objectGroup': _OBJECT_GROUP}, session_id=self.cdp_session.session_id
+					)
+				except Exception:
+					pass
+
+		self.logger.debug(
+			f'🔍 Incremental DOM: patched the cached tree ({len(self._inserted)} inserted, {len(self._changed)} changed nodes)'
+		)
+		return self._new_root()
+
+	# region - applying mutations
+
+	def _main_html(self) -> EnhancedDOMTreeNode:
+		for child in self.root.children_nodes or []:
+			if child.node_type == NodeType.ELEMENT_NODE and child.node_name == 'HTML':
+				return child
+		raise _PatchAbandoned('no HTML element in the cached tree')
+
+	def _checked(self, node: EnhancedDOMTreeNode) -> EnhancedDOMTreeNode:
+		"""`node` if it belongs to the main document (not to an iframe or a shadow root)."""
+		current: EnhancedDOMTreeNode | None = node
+		while current is not None and current is not self.root:
+			if current.node_type in (NodeType.DOCUMENT_NODE, NodeType.DOCUMENT_FRAGMENT_NODE):
+				raise _PatchAbandoned(f'mutation inside a {current.node_name} node')
+			current = current.parent_node
+		if current is None:
+			raise _PatchAbandoned(f'node {node.node_id} is detached')
+		return node
+
+	def _node(self, node_id: int) -> EnhancedDOMTreeNode:
+		node = self.nodes_by_id.get(node_id)
+		if node is None:
+			raise _PatchAbandoned(f'unknown node {node_id}')
+		return self._checked(node)
+
+	async def _apply(self, event_name: str, event: Any) -> None:
+		if event_name == 'childNodeInserted':
+			parent = self._node(event['parentNodeId'])
+			children = parent.children_nodes if parent.children_nodes is not None else []
+			index = 0
+			if event['previousNodeId']:
+				previous = self._node(event['previousNodeId'])
+				if previous not in children:
+					raise _PatchAbandoned(f'node {previous.node_id} is not a child of node {parent.node_id}')
+				index = children.index(previous) + 1
+			node = await self._build(event['node'], parent)
+			children.insert(index, node)
+			parent.children_nodes = children
+			self._probe_around(node)
+		elif event_name == 'childNodeRemoved':
+			parent = self._node(event['parentNodeId'])
+			node = self._node(event['nodeId'])
+			if parent.children_nodes is None or node not in parent.children_nodes:
+				raise _PatchAbandoned(f'node {node.node_id} is not a child of node {parent.node_id}')
+			self._probe_around(node)
+			parent.children_nodes.remove(node)
+			self._forget(node)
+		elif event_name in ('attributeModified', 'attributeRemoved'):
+			node = self._node(event['nodeId'])
+			if event_name == 'attributeModified':
+				node.attributes[event['name']] = event['value']
+			else:
+				node.attributes.pop(event['name'], None)
+			node._element_hash = None
+			self._mark_subtree_changed(node)
+		elif event_name == 'inlineStyleInvalidated':
+			for node_id in event['nodeIds']:
+				self._mark_subtree_changed(self._node(node_id))
+		elif event_name == 'characterDataModified':
+			node = self._node(event['nodeId'])
+			node.node_value = event['characterData']
+			self._mark_changed(node)
+		elif event_name == 'childNodeCountUpdated':
+			# Only sent for nodes whose children were never requested, i.e. inserted ones
+			node = self._node(event['nodeId'])
+			if node.node_id not in self._inserted:
+				raise _PatchAbandoned(f'children of node {node.node_id} unknown')
+			if event['childNodeCount'] != len(node.children_nodes or []):
+				for child in node.children_nodes or []:
+					self._forget(child)
+				await self._build_children(node, None, event['childNodeCount'])
+		elif event_name in ('pseudoElementAdded', 'pseudoElementRemoved'):
+			pass  # pseudo elements are not part of the enhanced tree
+		else:
+			raise _PatchAbandoned(event_name)
+
+	async def _build(self, raw: Node, parent: EnhancedDOMTreeNode) -> EnhancedDOMTreeNode:
+		"""Enhanced node (and subtree) of a node inserted under `parent`, without layout and AX data yet."""
+		if raw.get('contentDocument') or raw['nodeName'].upper() in ('IFRAME', 'FRAME'):
+			raise _PatchAbandoned('inserted frame')
+		if raw.get('shadowRoots'):
+			raise _PatchAbandoned('inserted shadow host')
+
+		attributes: dict[str, str] = {}
+		raw_attributes = raw.get('attributes') or []
+		for i in range(0, len(raw_attributes), 2):
+			attributes[raw_attributes[i]] = raw_attributes[i + 1]
+
+		node = EnhancedDOMTreeNode(
+			node_id=raw['nodeId'],
+			backend_node_id=raw['backendNodeId'],
+			node_type=NodeType(raw['nodeType']),
+			node_name=raw['nodeName'],
+			node_value=raw['nodeValue'],
+			attributes=attributes,
+			is_scrollable=raw.get('isScrollable', None),
+			frame_id=raw.get('frameId', None),
+			session_id=parent.session_id,
+			target_id=parent.target_id,
+			content_document=None,
+			shadow_root_type=None,
+			shadow_roots=None,
+			parent_node=parent,
+			children_nodes=None,
+			ax_node=None,
+			snapshot_node=None,
+			is_visible=None,
+			absolute_position=None,
+		)
+		self.nodes_by_id[node.node_id] = node
+		self._inserted[node.node_id] = node
+
+		await self._build_children(node, raw.get('children'), raw.get('childNodeCount', 0))
+		return node
+
+	async def _build_children(self, node: EnhancedDOMTreeNode, children: list[Any] | None, child_count: int) -> None:
+		if child_count > len(children or []):
+			# Mutation events carry inserted nodes without their children, these have to be requested
+			tracker = self.dom_service.mutation_tracker
+			assert tracker is not None
+			children = await tracker.request_child_nodes(self.cdp_session, node.node_id)
+			if children is None:
+				raise _PatchAbandoned(f'children of node {node.node_id} unavailable')
+		node.children_nodes = [await self._build(child, node) for child in children] if children else None
+
+	def _forget(self, node: EnhancedDOMTreeNode) -> None:
+		for descendant in node.children_and_shadow_roots:
+			self._forget(descendant)
+		if node.content_document is not None:
+			self._forget(node.content_document)
+		for nodes in (self.nodes_by_id, self._inserted, self._changed, self._probed):
+			nodes.pop(node.node_id, None)
+
+	def _mark_changed(self, node: EnhancedDOMTreeNode) -> None:
+		if node.node_id not in self._inserted:
+			self._changed[node.node_id] = node
+		self._probe_around(node)
+
+	def _mark_subtree_changed(self, node: EnhancedDOMTreeNode) -> None:
+		self._mark_changed(node)
+		stack = list(node.children_and_shadow_roots)
+		while stack:
+			descendant = stack.pop()
+			if descendant.content_document is not None or descendant.shadow_roots:
+				raise _PatchAbandoned(f'frame or shadow root under changed node {node.node_id}')
+			if descendant.node_id not in self._inserted:
+				self._changed[descendant.node_id] = descendant
+			stack.extend(descendant.children_nodes or [])
+
+	def _probe_around(self, node: EnhancedDOMTreeNode) -> None:
+		"""Check the parent and the siblings of a touched node for layout shifts, which would affect untouched nodes."""
+		parent = node.parent_node
+		if parent is None or parent.node_type != NodeType.ELEMENT_NODE:
+			return
+		self._probed.setdefault(parent.node_id, parent)
+		siblings = [child for child in parent.children_nodes or [] if _has_layout(child)]
+		if node in siblings:
+			index = siblings.index(node)
+			for sibling in siblings[max(index - 1, 0) : index] + siblings[index + 1 : index + 2]:
+				self._probed.setdefault(sibling.node_id, sibling)
+
+	# endregion - applying mutations
+
+	# region - re-fetching touched nodes
+
+	async def _refresh(self, html: EnhancedDOMTreeNode) -> None:
+		send = self.cdp_session.cdp_client.send
+		session_id = self.cdp_session.session_id
+		probed = [node for node in self._probed.values() if _has_layout(node)]
+		# Elements first, text nodes are laid out with their parent's refreshed styles
+		refreshed = sorted(
+			(node for node in [*self._inserted.values(), *self._changed.values()] if _has_layout(node)),
+			key=lambda node: node.node_type != NodeType.ELEMENT_NODE,
+		)
+
+		boxes = await asyncio.gather(*(self._get_box(node) for node in probed + refreshed))
+		for node, box in zip(probed, boxes):
+			if not _same_rect(box, self._viewport_rect(node, html)):
+				raise _PatchAbandoned(f'layout of node {node.node_id} shifted')
+		refreshed_boxes = dict(zip((node.node_id for node in refreshed), boxes[len(probed) :]))
+
+		elements = [node for node in refreshed if node.node_type == NodeType.ELEMENT_NODE]
+		object_ids = await asyncio.gather(*(self._resolve(node) for node in elements))
+		element_data: dict[int, dict[str, Any]] = {}
+		if elements:
+			result = await send.Runtime.callFunctionOn(
+				params={
+					'functionDeclaration': _READ_ELEMENTS_JS,
+					'objectId': object_ids[0],
+					'arguments': [{'value': REQUIRED_COMPUTED_STYLES}, *({'objectId': object_id} for object_id in object_ids)],
+					'returnByValue': True,
+				},
+				session_id=session_id,
+			)
+			if 'exceptionDetails' in result:
+				raise _PatchAbandoned('reading computed styles failed')
+			element_data = dict(zip((node.node_id for node in elements), result['result']['value']))
+
+		inserted_elements = [(node, object_id) for node, object_id in zip(elements, object_ids) if node.node_id in self._inserted]
+		clickable = await asyncio.gather(*(self._has_click_listener(object_id) for _, object_id in inserted_elements))
+		clickable_by_id = dict(zip((node.node_id for node, _ in inserted_elements), clickable))
+
+		scroll_x = html.snapshot_node.scrollRects.x if html.snapshot_node and html.snapshot_node.scrollRects else 0.0
+		scroll_y = html.snapshot_node.scrollRects.y if html.snapshot_node and html.snapshot_node.scrollRects else 0.0
+		for node in refreshed:
+			box = refreshed_boxes[node.node_id]
+			data = element_data.get(node.node_id)
+			if data is not None:
+				styles: dict[str, str] | None = dict(zip(REQUIRED_COMPUTED_STYLES, data['styles']))
+				client_rects: DOMRect | None = DOMRect(*data['client'])
+				scroll_rects: DOMRect | None = DOMRect(*data['scroll'])
+			else:
+				parent_snapshot = node.parent_node.snapshot_node if node.parent_node else None
+				styles = parent_snapshot.computed_styles if parent_snapshot else None
+				client_rects = scroll_rects = None
+
+			previous = node.snapshot_node
+			is_clickable = clickable_by_id.get(node.node_id, previous.is_clickable if previous else None)
+			node.snapshot_node = EnhancedSnapshotNode(
+				is_clickable=is_clickable,
+				cursor_style=styles.get('cursor') if styles else None,
+				# Snapshot bounds are in document coordinates, box model quads in viewport coordinates
+				bounds=DOMRect(box.x + scroll_x, box.y + scroll_y, box.width, box.height) if box else None,
+				clientRects=client_rects,
+				scrollRects=scroll_rects,
+				computed_styles=styles,
+				paint_order=previous.paint_order if previous else None,
+				stacking_contexts=previous.stacking_contexts if previous else None,
+			)
+			node.absolute_position = DOMRect(box.x, box.y, box.width, box.height) if box else None
+
+		for node in refreshed:
+			node.is_visible = self.dom_service.is_element_visible_according_to_all_parents(node, [html])
+
+		await self._refresh_ax(refreshed)
+
+	def _viewport_rect(self, node: EnhancedDOMTreeNode, html: EnhancedDOMTreeNode) -> DOMRect | None:
+		"""Box of an untouched node as of the last capture, in viewport coordinates like box model quads."""
+		if node is not html:
+			return node.absolute_position  # main document nodes are shifted by the document scroll when constructed
+		if html.snapshot_node is None or html.snapshot_node.bounds is None:
+			return None
+		bounds = html.snapshot_node.bounds
+		scroll = html.snapshot_node.scrollRects or DOMRect(0.0, 0.0, 0.0, 0.0)
+		return DOMRect(bounds.x - scroll.x, bounds.y - scroll.y, bounds.width, bounds.height)
+
+	async def _get_box(self, node: EnhancedDOMTreeNode) -> DOMRect | None:
+		"""Border box (elements) or text box union (text nodes) in viewport coordinates, None if not rendered."""
+		send = self.cdp_session.cdp_client.send
+		async with self._semaphore:
+			try:
+				if node.node_type == NodeType.ELEMENT_NODE:
+					model = await send.DOM.getBoxModel(params={'nodeId': node.node_id}, session_id=self.cdp_session.session_id)
+					return _quads_rect([model['model']['border']])
+				result = await send.DOM.getContentQuads(params={'nodeId': node.node_id}, session_id=self.cdp_session.session_id)
+				return _quads_rect(result['quads'])
+			except Exception:
+				return None
+
+	async def _resolve(self, node: EnhancedDOMTreeNode) -> str:
+		self._has_object_group = True
+		async with self._semaphore:
+			try:
+				result = await self.cdp_session.cdp_client.send.DOM.resolveNode(
+					params={'nodeId': node.node_id, 'objectGroup': _OBJECT_GROUP}, session_id=self.cdp_session.session_id
+				)
+			except Exception as e:
+				raise _PatchAbandoned(f'node {node.node_id} cannot be resolved: {e}')
+		object_id = result['object'].get('objectId')
+		if object_id is None:
+			raise _PatchAbandoned(f'node {node.node_id} cannot be resolved')
+		return object_id
+
+	async def _has_click_listener(self, object_id: str) -> bool:
+		async with self._semaphore:
+			try:
+				result = await self.cdp_session.cdp_client.send.DOMDebugger.getEventListeners(
+					params={'objectId': object_id, 'depth': 0}, session_id=self.cdp_session.session_id
+				)
+			except Exception:
+				return False
+		return any(listener['type'] in _CLICK_EVENT_TYPES for listener in result['listeners'])
+
+	async def _refresh_ax(self, refreshed: list[EnhancedDOMTreeNode]) -> None:
+		"""Re-fetch the AX nodes of the refreshed elements, their relatives and the elements of refreshed texts."""
+		elements: dict[int, EnhancedDOMTreeNode] = {}
+		for node in refreshed:
+			element = node if node.node_type == NodeType.ELEMENT_NODE else node.parent_node
+			if element is not None and element.node_type == NodeType.ELEMENT_NODE:
+				elements[element.node_id] = element
+
+		async def get_partial_ax_tree(node: EnhancedDOMTreeNode) -> list[Any]:
+			async with self._semaphore:
+				try:
+					result = await self.cdp_session.cdp_client.send.Accessibility.getPartialAXTree(
+						params={'backendNodeId': node.backend_node_id, 'fetchRelatives': True},
+						session_id=self.cdp_session.session_id,
+					)
+				except Exception as e:
+					self.logger.debug(f'Failed to get the accessibility data of node {node.node_id}: {e}')
+					return []
+			return list(result['nodes'])
+
+		ax_nodes = {
+			ax_node['backendDOMNodeId']: ax_node
+			for nodes in await asyncio.gather(*(get_partial_ax_tree(element) for element in elements.values()))
+			for ax_node in nodes
+			if 'backendDOMNodeId' in ax_node
+		}
+		if not ax_nodes:
+			return
+		for node in self.nodes_by_id.values():
+			ax_node = ax_nodes.get(node.backend_node_id)
+			if ax_node is not None:
+				node.ax_node = self.dom_service._build_enhanced_ax_node(ax_node)
+
+	# endregion - re-fetching touched nodes
+
+	def _new_root(self) -> EnhancedDOMTreeNode:
+		root = replace(self.root)
+		for child in root.children_and_shadow_roots:
+			child.parent_node = root
+		self.nodes_by_id[root.node_id] = root
+		return root
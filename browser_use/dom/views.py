@@ -1,7 +1,8 @@
 import hashlib
+from collections.abc import Iterable
 from dataclasses import asdict, dataclass, field
 from enum import Enum
-from typing import Any
+from typing import TYPE_CHECKING, Any
 
 from cdp_use.cdp.accessibility.commands import GetFullAXTreeReturns
 from cdp_use.cdp.accessibility.types import AXPropertyName
@@ -14,6 +15,9 @@ from uuid_extensions import uuid7str
 from browser_use.dom.utils import cap_text_length
 from browser_use.observability import observe_debug
 
+if TYPE_CHECKING:
+	from browser_use.dom.serializer.subtree_cache import SubtreeTextCache
+
 # Serializer types
 DEFAULT_INCLUDE_ATTRIBUTES = [
 	'title',
@@ -240,6 +244,81 @@ class DOMRect:
 		return self.to_dict()
 
 
+# Elements with these `position` styles can be painted far away from where their ancestors are laid out
+_UNPRUNABLE_POSITIONS = frozenset({'fixed', 'sticky'})
+
+
+@dataclass(slots=True)
+class ViewportScope:
+	"""Vertical band of the page (document coordinates, CSS pixels) kept by viewport-scoped DOM extraction.
+
+	Element subtrees laid out entirely above or below the band are skipped, the number of elements skipped
+	on each side is counted so the LLM can be told how much content it is not seeing.
+	"""
+
+	top: float
+	bottom: float
+	elements_above: int = 0
+	elements_below: int = 0
+
+	@classmethod
+	def around_viewport(cls, scroll_y: float, viewport_height: float, margin: float) -> 'ViewportScope':
+		"""Band covering the visible viewport plus `margin` viewport heights above and below it."""
+		return cls(top=scroll_y - margin * viewport_height, bottom=scroll_y + (1 + margin) * viewport_height)
+
+	@staticmethod
+	def is_out_of_flow(computed_styles: dict[str, str] | None) -> bool:
+		"""Whether an element is fixed/sticky, i.e. can paint outside the boxes of all its ancestors."""
+		return computed_styles is not None and computed_styles.get('position') in _UNPRUNABLE_POSITIONS
+
+	@classmethod
+	def escape_depth(
+		cls, computed_styles: dict[str, str] | None, depth: int, containing_block_depth: int
+	) -> tuple[int | None, int]:
+		"""Which ancestors an element at `depth` of its document can paint outside of.
+
+		Fixed/sticky elements can paint outside all their ancestors. Absolutely positioned ones are placed relative to
+		their containing block, the nearest positioned ancestor (at `containing_block_depth`, -1 for the initial
+		containing block), so they only escape the ancestors below it.
+
+		Returns:
+			The depth of the deepest ancestor the element can't escape (ancestors below it can be left), None if
+			the element is in the flow; and the containing block depth for the element's descendants
+		"""
+		position = computed_styles.get('position') if computed_styles is not None else None
+		if position in _UNPRUNABLE_POSITIONS:
+			return -1, depth
+		if position == 'absolute':
+			return containing_block_depth, depth
+		if position and position != 'static':
+			return None, depth
+		return None, containing_block_depth
+
+	def side_of(self, bounds: 'DOMRect | None', computed_styles: dict[str, str] | None) -> int:
+		"""-1 if an element and its whole subtree can be skipped as above the band, 1 if below, 0 to keep it.
+
+		Only elements with a real layout box count: zero-sized wrappers and fixed/sticky elements are always kept,
+		since they can paint outside the boxes of their ancestors. Callers must also keep the ancestors that such
+		elements, and absolutely positioned ones, can escape (see `escape_depth`), their descendants are checked
+		against their own bounds.
+		"""
+		if bounds is None or bounds.width <= 0 or bounds.height <= 0:
+			return 0
+		if self.is_out_of_flow(computed_styles):
+			return 0
+		if bounds.y + bounds.height < self.top:
+			return -1
+		if bounds.y > self.bottom:
+			return 1
+		return 0
+
+	def record_skipped(self, side: int, element_count: int) -> None:
+		if side < 0:
+			self.elements_above += element_count
+		elif side > 0:
+			self.elements_below += element_count
+
+
 @dataclass(slots=True)
 class EnhancedAXProperty:
 	"""we don't need `sources` and `related_nodes` for now (not sure how to use them)
@@ -391,6 +470,10 @@ class EnhancedDOMTreeNode:
 
 	uuid: str = field(default_factory=uuid7str)
 
+	# Memoized hashes, filled lazily or in bulk by `compute_element_hashes()`
+	_element_hash: int | None = field(default=None, compare=False, repr=False)
+	_parent_branch_hash: int | None = field(default=None, compare=False, repr=False)
+
 	@property
 	def parent(self) -> 'EnhancedDOMTreeNode | None':
 		return self.parent_node
@@ -760,33 +843,26 @@ class EnhancedDOMTreeNode:
 		"""
 		Hash the element based on its parent branch path and attributes.
 
+		The value is computed once and memoized on the node (see `compute_element_hashes()`).
+
 		TODO: migrate this to use only backendNodeId + current SessionId
 		"""
-
-		# Get parent branch path
-		parent_branch_path = self._get_parent_branch_path()
-		parent_branch_path_string = '/'.join(parent_branch_path)
-
-		attributes_string = ''.join(
-			f'{k}={v}' for k, v in sorted((k, v) for k, v in self.attributes.items() if k in STATIC_ATTRIBUTES)
-		)
-
-		# Combine both for final hash
-		combined_string = f'{parent_branch_path_string}|{attributes_string}'
-		element_hash = hashlib.sha256(combined_string.encode()).hexdigest()
-
-		# Convert to int for __hash__ return type - use first 16 chars and convert from hex to int
-		return int(element_hash[:16], 16)
+		if self._element_hash is None:
+			compute_element_hashes((self,))
+		assert self._element_hash is not None
+		return self._element_hash
 
 	def parent_branch_hash(self) -> int:
 		"""
-		Hash the element based on its parent branch path and attributes.
+		Hash the element based on its parent branch path.
 		"""
-		parent_branch_path = self._get_parent_branch_path()
-		parent_branch_path_string = '/'.join(parent_branch_path)
-		element_hash = hashlib.sha256(parent_branch_path_string.encode()).hexdigest()
+		if self._parent_branch_hash is None:
+			compute_element_hashes((self,))
+		assert self._parent_branch_hash is not None
+		return self._parent_branch_hash
 
-		return int(element_hash[:16], 16)
+	def _get_static_attributes_string(self) -> str:
+		return ''.join(f'{k}={v}' for k, v in sorted((k, v) for k, v in self.attributes.items() if k in STATIC_ATTRIBUTES))
 
 	def _get_parent_branch_path(self) -> list[str]:
 		"""Get the parent branch path as a list of tag names from root to current element."""
@@ -802,6 +878,48 @@ class EnhancedDOMTreeNode:
 		return [parent.tag_name for parent in parents]
 
 
+def _digest_to_int(hasher: Any) -> int:
+	# Use the first 16 hex chars of the sha256 digest as the int hash
+	return int(hasher.hexdigest()[:16], 16)
+
+
+def compute_element_hashes(nodes: Iterable[EnhancedDOMTreeNode]) -> None:
+	"""
+	Compute and memoize `element_hash` / `parent_branch_hash` for many nodes at once.
+
+	The values are identical to hashing '<tag>/<tag>/...|<static attributes>' from scratch, but the sha256
+	state of each ancestor's branch path is computed once and extended with `hasher.copy()`, so nodes that
+	share ancestors (e.g. everything in a selector map) don't re-walk and re-hash the same path.
+	"""
+	# id(node) -> (sha256 state over the branch path up to and including node, whether that path is non-empty)
+	prefixes: dict[int, tuple[Any, bool]] = {}
+
+	for node in nodes:
+		if node._element_hash is not None and node._parent_branch_hash is not None:
+			continue
+
+		# Walk up until we reach an ancestor whose prefix is already known (or the root)
+		chain: list[EnhancedDOMTreeNode] = []
+		current: EnhancedDOMTreeNode | None = node
+		while current is not None and id(current) not in prefixes:
+			chain.append(current)
+			current = current.parent_node
+		hasher, non_empty = prefixes[id(current)] if current is not None else (hashlib.sha256(), False)
+
+		# Extend the prefix top-down; non-element nodes share their parent's state
+		for chain_node in reversed(chain):
+			if chain_node.node_type == NodeType.ELEMENT_NODE:
+				hasher = hasher.copy()
+				hasher.update((f'/{chain_node.tag_name}' if non_empty else chain_node.tag_name).encode())
+				non_empty = True
+			prefixes[id(chain_node)] = (hasher, non_empty)
+
+		node._parent_branch_hash = _digest_to_int(hasher)
+		element_hasher = hasher.copy()
+		element_hasher.update(f'|{node._get_static_attributes_string()}'.encode())
+		node._element_hash = _digest_to_int(element_hasher)
+
+
 DOMSelectorMap = dict[int, EnhancedDOMTreeNode]
 
 
@@ -812,6 +930,13 @@ class SerializedDOMState:
 
 	selector_map: DOMSelectorMap
 
+	elements_above_scope: int = 0
+	"""Elements skipped above the extracted band in viewport-scoped mode"""
+	elements_below_scope: int = 0
+	"""Elements skipped below the extracted band in viewport-scoped mode"""
+	_subtree_cache: 'SubtreeTextCache | None' = field(default=None, repr=False, compare=False)
+	"""Rendered subtree text of the browser session this state was captured in, reused by the representations"""
+
 	@observe_debug(ignore_input=True, ignore_output=True, name='llm_representation')
 	def llm_representation(
 		self,
@@ -825,7 +950,7 @@ class SerializedDOMState:
 
 		include_attributes = include_attributes or DEFAULT_INCLUDE_ATTRIBUTES
 
-		return DOMTreeSerializer.serialize_tree(self._root, include_attributes)
+		return DOMTreeSerializer.serialize_tree(self._root, include_attributes, subtree_cache=self._subtree_cache)
 
 	@observe_debug(ignore_input=True, ignore_output=True, name='eval_representation')
 	def eval_representation(
@@ -848,7 +973,7 @@ class SerializedDOMState:
 
 		include_attributes = include_attributes or DEFAULT_INCLUDE_ATTRIBUTES
 
-		return DOMEvalSerializer.serialize_tree(self._root, include_attributes)
+		return DOMEvalSerializer.serialize_tree(self._root, include_attributes, subtree_cache=self._subtree_cache)
 
 
 @dataclass
@@ -875,6 +1000,9 @@ class DOMInteractedElement:
 
 	element_hash: int
 
+	archive_node_index: int | None = None
+	"""Index of this element in the step's DOM archive (see `BrowserStateHistory.dom_archive_path`), if one was saved"""
+
 	def to_dict(self) -> dict[str, Any]:
 		return {
 			'node_id': self.node_id,
@@ -887,6 +1015,7 @@ class DOMInteractedElement:
 			'x_path': self.x_path,
 			'element_hash': self.element_hash,
 			'bounds': self.bounds.to_dict() if self.bounds else None,
+			'archive_node_index': self.archive_node_index,
 		}
 
 	@classmethod
@@ -901,5 +1030,5 @@ class DOMInteractedElement:
 			attributes=enhanced_dom_tree.attributes,
 			bounds=enhanced_dom_tree.snapshot_node.bounds if enhanced_dom_tree.snapshot_node else None,
 			x_path=enhanced_dom_tree.xpath,
-			element_hash=hash(enhanced_dom_tree),
+			element_hash=enhanced_dom_tree.element_hash,
 		)
@@ -4,17 +4,30 @@ import os
 import re
 import shutil
 from abc import ABC, abstractmethod
+from collections.abc import Callable, Iterable
 from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Any
+from typing import Any, ClassVar, Self
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, PrivateAttr, computed_field
 from reportlab.lib.pagesizes import letter
 from reportlab.lib.styles import getSampleStyleSheet
 from reportlab.platypus import Paragraph, SimpleDocTemplate, Spacer
 
 INVALID_FILENAME_ERROR_MESSAGE = 'Error: Invalid filename format. Must be alphanumeric with supported extension.'
 DEFAULT_FILE_SYSTEM_PATH = 'browseruse_agent_data'
+# Characters of a file shown by FileSystem.describe(), larger files are shown as start and end previews
+DESCRIBE_DISPLAY_CHARS = 400
+# Characters str.splitlines() splits on
+LINE_BREAKS = frozenset('\n\r\v\f\x1c\x1d\x1e\x85\u2028\u2029')
+
+
+# Disk writes of all files go through one thread, so they happen in the order they were issued
+_DISK_IO_EXECUTOR = ThreadPoolExecutor(max_workers=1, thread_name_prefix='file_system_io')
+
+
+async def _run_disk_io(func: Callable[[], None]) -> None:
+	await asyncio.get_running_loop().run_in_executor(_DISK_IO_EXECUTOR, func)
 
 
 class FileSystemError(Exception):
@@ -27,7 +40,29 @@ class BaseFile(BaseModel, ABC):
 	"""Base class for all file types"""
 
 	name: str
-	content: str = ''
+	# Constructor (and state) argument `content`, moved into _chunks once the file is created. Reading and writing the
+	# content goes through the `content` property
+	initial_content: str = Field(default='', alias='content', exclude=True, repr=False)
+	# Content as a list of chunks: appends add a chunk, they are only joined when the content is read
+	_chunks: list[str] = PrivateAttr(default_factory=list)
+	# Kept up to date on every change, so describing the file doesn't need to read its content
+	_size: int = PrivateAttr(default=0)
+	_line_count: int = PrivateAttr(default=0)
+	_version: int = PrivateAttr(default=0)
+	_description: tuple[int, str] | None = PrivateAttr(default=None)
+
+	# Written to disk in full after every append, for formats rendered from the whole content
+	rewrite_on_append: ClassVar[bool] = False
+
+	def model_post_init(self, __context: Any) -> None:
+		self.update_content(self.initial_content)
+		self.initial_content = ''
+
+	def __copy__(self) -> Self:
+		copied = super().__copy__()
+		# Appends to the copy must not show up in the original
+		copied._chunks = list(self._chunks)
+		return copied
 
 	# --- Subclass must define this ---
 	@property
@@ -42,21 +77,51 @@ class BaseFile(BaseModel, ABC):
 
 	def append_file_content(self, content: str) -> None:
 		"""Append content to internal content"""
-		self.update_content(self.content + content)
+		if not content:
+			return
+		if self._chunks:
+			# Lines counted separately are one line if the content doesn't end with a line break, or if \r\n is split
+			last_char = self._chunks[-1][-1]
+			self._line_count -= last_char not in LINE_BREAKS or (last_char == '\r' and content[0] == '\n')
+		self._chunks.append(content)
+		self._size += len(content)
+		self._line_count += len(content.splitlines())
+		self._version += 1
 
 	# --- These are shared and implemented here ---
 
+	@computed_field
+	@property
+	def content(self) -> str:
+		if len(self._chunks) > 1:
+			self._chunks = [''.join(self._chunks)]
+		return self._chunks[0] if self._chunks else ''
+
+	@content.setter
+	def content(self, content: str) -> None:
+		self.update_content(content)
+
 	def update_content(self, content: str) -> None:
-		self.content = content
+		self._chunks = [content] if content else []
+		self._size = len(content)
+		self._line_count = len(content.splitlines())
+		self._version += 1
 
-	def sync_to_disk_sync(self, path: Path) -> None:
+	def sync_to_disk_sync(self, path: Path, content: str | None = None) -> None:
+		"""Write the file, `content` is a snapshot of the content taken by the caller (the current content if None)"""
 		file_path = path / self.full_name
-		file_path.write_text(self.content)
+		file_path.write_text(self.content if content is None else content)
 
-	async def sync_to_disk(self, path: Path) -> None:
+	def append_to_disk_sync(self, content: str, path: Path) -> None:
+		"""Write only the appended content to the end of the file, the file on disk must be in sync"""
 		file_path = path / self.full_name
-		with ThreadPoolExecutor() as executor:
-			await asyncio.get_event_loop().run_in_executor(executor, lambda: file_path.write_text(self.content))
+		with file_path.open('a') as f:
+			f.write(content)
+
+	async def sync_to_disk(self, path: Path) -> None:
+		# Snapshot the content here, the IO thread must not touch the chunks
+		content = self.content
+		await _run_disk_io(lambda: self.sync_to_disk_sync(path, content))
 
 	async def write(self, content: str, path: Path) -> None:
 		self.write_file_content(content)
@@ -64,22 +129,116 @@ class BaseFile(BaseModel, ABC):
 
 	async def append(self, content: str, path: Path) -> None:
 		self.append_file_content(content)
-		await self.sync_to_disk(path)
+		if self.rewrite_on_append:
+			await self.sync_to_disk(path)
+		else:
+			await _run_disk_io(lambda: self.append_to_disk_sync(content, path))
 
 	def read(self) -> str:
 		return self.content
 
+	def describe(self) -> str:
+		"""Description of the file for the LLM: its whole content if it is small, start and end previews otherwise"""
+		if self._description is not None and self._description[0] == self._version:
+			return self._description[1]
+
+		if not self._size:
+			description = f'<file>\n{self.full_name} - [empty file]\n</file>\n'
+		elif self._size < int(1.5 * DESCRIBE_DISPLAY_CHARS):
+			description = self._describe_whole_file()
+		else:
+			description = self._describe_previews()
+
+		self._description = (self._version, description)
+		return description
+
+	def _describe_whole_file(self) -> str:
+		return f'<file>\n{self.full_name} - {self._line_count} lines\n<content>\n{self.content}\n</content>\n</file>\n'
+
+	def _describe_previews(self) -> str:
+		half_display_chars = DESCRIBE_DISPLAY_CHARS // 2
+		# The previews only use lines within half_display_chars of either end, so a sample of twice the display chars is
+		# enough. Lines cut by the sample are dropped, they are too long to be part of a preview anyway
+		sample_chars = 2 * DESCRIBE_DISPLAY_CHARS
+
+		start_lines = self._start_sample(sample_chars).splitlines()
+		if self._size > sample_chars:
+			start_lines = start_lines[:-1]
+		start_preview_lines = _preview_lines(start_lines, half_display_chars)
+
+		end_lines = self._end_sample(sample_chars).splitlines()
+		if self._size > sample_chars:
+			end_lines = end_lines[1:]
+		end_preview_lines = _preview_lines(reversed(end_lines), half_display_chars)[::-1]
+
+		# Calculate lines in between
+		middle_line_count = self._line_count - len(start_preview_lines) - len(end_preview_lines)
+		if middle_line_count <= 0:
+			return self._describe_whole_file()
+
+		start_preview = '\n'.join(start_preview_lines).strip('\n').rstrip()
+		end_preview = '\n'.join(end_preview_lines).strip('\n').rstrip()
+
+		# Format output
+		if not (start_preview or end_preview):
+			return f'<file>\n{self.full_name} - {self._line_count} lines\n<content>\n{middle_line_count} lines...\n</content>\n</file>\n'
+		return (
+			f'<file>\n{self.full_name} - {self._line_count} lines\n<content>\n{start_preview}\n'
+			f'... {middle_line_count} more lines ...\n'
+			f'{end_preview}\n'
+			'</content>\n</file>\n'
+		)
+
+	def _start_sample(self, chars: int) -> str:
+		"""The first `chars` characters of the content, joining only the chunks needed"""
+		sample: list[str] = []
+		length = 0
+		for chunk in self._chunks:
+			if length >= chars:
+				break
+			sample.append(chunk)
+			length += len(chunk)
+		return ''.join(sample)[:chars]
+
+	def _end_sample(self, chars: int) -> str:
+		"""The last `chars` characters of the content, joining only the chunks needed"""
+		sample: list[str] = []
+		length = 0
+		for chunk in reversed(self._chunks):
+			if length >= chars:
+				break
+			sample.append(chunk)
+			length += len(chunk)
+		return ''.join(reversed(sample))[-chars:]
+
+	@property
+	def version(self) -> int:
+		"""Incremented on every change of the content"""
+		return self._version
+
 	@property
 	def full_name(self) -> str:
 		return f'{self.name}.{self.extension}'
 
 	@property
 	def get_size(self) -> int:
-		return len(self.content)
+		return self._size
 
 	@property
 	def get_line_count(self) -> int:
-		return len(self.content.splitlines())
+		return self._line_count
+
+
+def _preview_lines(lines: Iterable[str], max_chars: int) -> list[str]:
+	"""Take lines while they (and a line break after each) fit into max_chars"""
+	preview: list[str] = []
+	chars_count = 0
+	for line in lines:
+		if chars_count + len(line) + 1 > max_chars:
+			break
+		preview.append(line)
+		chars_count += len(line) + 1
+	return preview
 
 
 class MarkdownFile(BaseFile):
@@ -125,11 +284,14 @@ class JsonlFile(BaseFile):
 class PdfFile(BaseFile):
 	"""PDF file implementation"""
 
+	# The document is rendered from the whole content, it can't be appended to
+	rewrite_on_append: ClassVar[bool] = True
+
 	@property
 	def extension(self) -> str:
 		return 'pdf'
 
-	def sync_to_disk_sync(self, path: Path) -> None:
+	def sync_to_disk_sync(self, path: Path, content: str | None = None) -> None:
 		file_path = path / self.full_name
 		try:
 			# Create PDF document
@@ -140,7 +302,7 @@ class PdfFile(BaseFile):
 			# Convert markdown content to simple text and add to PDF
 			# For basic implementation, we'll treat content as plain text
 			# This avoids the AGPL license issue while maintaining functionality
-			content_lines = self.content.split('\n')
+			content_lines = (self.content if content is None else content).split('\n')
 
 			for line in content_lines:
 				if line.strip():
@@ -161,19 +323,18 @@ class PdfFile(BaseFile):
 		except Exception as e:
 			raise FileSystemError(f"Error: Could not write to file '{self.full_name}'. {str(e)}")
 
-	async def sync_to_disk(self, path: Path) -> None:
-		with ThreadPoolExecutor() as executor:
-			await asyncio.get_event_loop().run_in_executor(executor, lambda: self.sync_to_disk_sync(path))
-
 
 class DocxFile(BaseFile):
 	"""DOCX file implementation"""
 
+	# The document is rendered from the whole content, it can't be appended to
+	rewrite_on_append: ClassVar[bool] = True
+
 	@property
 	def extension(self) -> str:
 		return 'docx'
 
-	def sync_to_disk_sync(self, path: Path) -> None:
+	def sync_to_disk_sync(self, path: Path, content: str | None = None) -> None:
 		file_path = path / self.full_name
 		try:
 			from docx import Document
@@ -181,7 +342,7 @@ class DocxFile(BaseFile):
 			doc = Document()
 
 			# Convert content to DOCX paragraphs
-			content_lines = self.content.split('\n')
+			content_lines = (self.content if content is None else content).split('\n')
 
 			for line in content_lines:
 				if line.strip():
@@ -201,10 +362,6 @@ class DocxFile(BaseFile):
 		except Exception as e:
 			raise FileSystemError(f"Error: Could not write to file '{self.full_name}'. {str(e)}")
 
-	async def sync_to_disk(self, path: Path) -> None:
-		with ThreadPoolExecutor() as executor:
-			await asyncio.get_event_loop().run_in_executor(executor, lambda: self.sync_to_disk_sync(path))
-
 
 class FileSystemState(BaseModel):
 	"""Serializable state of the file system"""
@@ -245,6 +402,7 @@ class FileSystem:
 			self._create_default_files()
 
 		self.extracted_content_count = 0
+		self._description: tuple[int, str] | None = None
 
 	def get_allowed_extensions(self) -> list[str]:
 		"""Get allowed extensions"""
@@ -483,84 +641,30 @@ class FileSystem:
 		"""Save extracted content to a numbered file"""
 		initial_filename = f'extracted_content_{self.extracted_content_count}'
 		extracted_filename = f'{initial_filename}.md'
+		# Claim the number before writing, concurrent extractions must not pick the same file
+		self.extracted_content_count += 1
 		file_obj = MarkdownFile(name=initial_filename)
 		await file_obj.write(content, self.data_dir)
 		self.files[extracted_filename] = file_obj
-		self.extracted_content_count += 1
 		return extracted_filename
 
 	def describe(self) -> str:
 		"""List all files with their content information using file-specific display methods"""
-		DISPLAY_CHARS = 400
-		description = ''
+		# Files cache their descriptions, unchanged files are not read again
+		version = self.version
+		if self._description is not None and self._description[0] == version:
+			return self._description[1]
 
-		for file_obj in self.files.values():
-			# Skip todo.md from description
-			if file_obj.full_name == 'todo.md':
-				continue
+		description = ''.join(file_obj.describe() for file_obj in self.files.values() if file_obj.full_name != 'todo.md')
+		description = description.strip('\n')
+		self._description = (version, description)
+		return description
 
-			content = file_obj.read()
-
-			# Handle empty files
-			if not content:
-				description += f'<file>\n{file_obj.full_name} - [empty file]\n</file>\n'
-				continue
-
-			lines = content.splitlines()
-			line_count = len(lines)
-
-			# For small files, display the entire content
-			whole_file_description = (
-				f'<file>\n{file_obj.full_name} - {line_count} lines\n<content>\n{content}\n</content>\n</file>\n'
-			)
-			if len(content) < int(1.5 * DISPLAY_CHARS):
-				description += whole_file_description
-				continue
-
-			# For larger files, display start and end previews
-			half_display_chars = DISPLAY_CHARS // 2
-
-			# Get start preview
-			start_preview = ''
-			start_line_count = 0
-			chars_count = 0
-			for line in lines:
-				if chars_count + len(line) + 1 > half_display_chars:
-					break
-				start_preview += line + '\n'
-				chars_count += len(line) + 1
-				start_line_count += 1
-
-			# Get end preview
-			end_preview = ''
-			end_line_count = 0
-			chars_count = 0
-			for line in reversed(lines):
-				if chars_count + len(line) + 1 > half_display_chars:
-					break
-				end_preview = line + '\n' + end_preview
-				chars_count += len(line) + 1
-				end_line_count += 1
-
-			# Calculate lines in between
-			middle_line_count = line_count - start_line_count - end_line_count
-			if middle_line_count <= 0:
-				description += whole_file_description
-				continue
-
-			start_preview = start_preview.strip('\n').rstrip()
-			end_preview = end_preview.strip('\n').rstrip()
-
-			# Format output
-			if not (start_preview or end_preview):
-				description += f'<file>\n{file_obj.full_name} - {line_count} lines\n<content>\n{middle_line_count} lines...\n</content>\n</file>\n'
-			else:
-				description += f'<file>\n{file_obj.full_name} - {line_count} lines\n<content>\n{start_preview}\n'
-				description += f'... {middle_line_count} more lines ...\n'
-				description += f'{end_preview}\n'
-				description += '</content>\n</file>\n'
-
-		return description.strip('\n')
+	@property
+	def version(self) -> int:
+		"""Changes whenever a file is added or changed, e.g. to skip re-rendering the file descriptions"""
+		# Files are never removed and their versions only grow, so the sum grows with every change
+		return sum(file_obj.version for file_obj in self.files.values())
 
 	def get_todo_contents(self) -> str:
 		"""Get todo file contents"""
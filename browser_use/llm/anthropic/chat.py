@@ -1,5 +1,5 @@
 import json
-from collections.abc import Mapping
+from collections.abc import AsyncIterator, Mapping
 from dataclasses import dataclass
 from typing import Any, TypeVar, overload
 
@@ -21,10 +21,11 @@ from pydantic import BaseModel
 
 from browser_use.llm.anthropic.serializer import AnthropicMessageSerializer
 from browser_use.llm.base import BaseChatModel
+from browser_use.llm.client_pool import get_shared_client
 from browser_use.llm.exceptions import ModelProviderError, ModelRateLimitError
 from browser_use.llm.messages import BaseMessage
 from browser_use.llm.schema import SchemaOptimizer
-from browser_use.llm.views import ChatInvokeCompletion, ChatInvokeUsage
+from browser_use.llm.views import ChatInvokeCompletion, ChatInvokeStreamChunk, ChatInvokeUsage
 
 T = TypeVar('T', bound=BaseModel)
 
@@ -100,13 +101,13 @@ class ChatAnthropic(BaseChatModel):
 
 	def get_client(self) -> AsyncAnthropic:
 		"""
-		Returns an AsyncAnthropic client.
+		Returns an AsyncAnthropic client, shared by all instances with the same client params.
 
 		Returns:
 			AsyncAnthropic: An instance of the AsyncAnthropic client.
 		"""
 		client_params = self._get_client_params()
-		return AsyncAnthropic(**client_params)
+		return get_shared_client(AsyncAnthropic, **client_params)
 
 	@property
 	def name(self) -> str:
@@ -126,6 +127,90 @@ class ChatAnthropic(BaseChatModel):
 		)
 		return usage
 
+	def _get_structured_output_tool(self, output_format: type[BaseModel]) -> ToolParam:
+		"""Create a tool that represents the output format, the model is forced to call it."""
+		tool_name = output_format.__name__
+		schema = SchemaOptimizer.create_optimized_json_schema(output_format)
+
+		# Remove title from schema if present (Anthropic doesn't like it in parameters)
+		if 'title' in schema:
+			del schema['title']
+
+		return ToolParam(
+			name=tool_name,
+			description=f'Extract information in the format of {tool_name}',
+			input_schema=schema,
+			cache_control=CacheControlEphemeralParam(type='ephemeral'),
+		)
+
+	def _get_request_params(self, messages: list[BaseMessage], output_format: type[BaseModel] | None) -> dict[str, Any]:
+		anthropic_messages, system_prompt = AnthropicMessageSerializer.serialize_messages(messages)
+		request_params: dict[str, Any] = {
+			'model': self.model,
+			'messages': anthropic_messages,
+			'system': system_prompt or omit,
+			**self._get_client_params_for_invoke(),
+		}
+		if output_format is not None:
+			# Use tool calling for structured output
+			tool = self._get_structured_output_tool(output_format)
+			request_params['tools'] = [tool]
+			# Force the model to use this tool
+			request_params['tool_choice'] = ToolChoiceToolParam(type='tool', name=tool['name'])
+		return request_params
+
+	def _parse_response(
+		self, response: Any, output_format: type[T] | None
+	) -> ChatInvokeCompletion[T] | ChatInvokeCompletion[str]:
+		# Ensure we have a valid Message object before accessing attributes
+		if not isinstance(response, Message):
+			raise ModelProviderError(
+				message=f'Unexpected response type from Anthropic API: {type(response).__name__}. Response: {str(response)[:200]}',
+				status_code=502,
+				model=self.name,
+			)
+
+		usage = self._get_usage(response)
+
+		if output_format is None:
+			# Extract text from the first content block
+			first_content = response.content[0]
+			if isinstance(first_content, TextBlock):
+				response_text = first_content.text
+			else:
+				# If it's not a text block, convert to string
+				response_text = str(first_content)
+
+			return ChatInvokeCompletion(
+				completion=response_text,
+				usage=usage,
+				stop_reason=response.stop_reason,
+			)
+
+		# Extract the tool use block
+		for content_block in response.content:
+			if hasattr(content_block, 'type') and content_block.type == 'tool_use':
+				# Parse the tool input as the structured output
+				try:
+					return ChatInvokeCompletion(
+						completion=output_format.model_validate(content_block.input),
+						usage=usage,
+						stop_reason=response.stop_reason,
+					)
+				except Exception as e:
+					# If validation fails, try to parse it as JSON first
+					if isinstance(content_block.input, str):
+						data = json.loads(content_block.input)
+						return ChatInvokeCompletion(
+							completion=output_format.model_validate(data),
+							usage=usage,
+							stop_reason=response.stop_reason,
+						)
+					raise e
+
+		# If no tool use block found, raise an error
+		raise ValueError('Expected tool use in response but none found')
+
 	@overload
 	async def ainvoke(self, messages: list[BaseMessage], output_format: None = None) -> ChatInvokeCompletion[str]: ...
 
@@ -135,104 +220,53 @@ class ChatAnthropic(BaseChatModel):
 	async def ainvoke(
 		self, messages: list[BaseMessage], output_format: type[T] | None = None
 	) -> ChatInvokeCompletion[T] | ChatInvokeCompletion[str]:
-		anthropic_messages, system_prompt = AnthropicMessageSerializer.serialize_messages(messages)
+		request_params = self._get_request_params(messages, output_format)
 
 		try:
-			if output_format is None:
-				# Normal completion without structured output
-				response = await self.get_client().messages.create(
-					model=self.model,
-					messages=anthropic_messages,
-					system=system_prompt or omit,
-					**self._get_client_params_for_invoke(),
-				)
-
-				# Ensure we have a valid Message object before accessing attributes
-				if not isinstance(response, Message):
-					raise ModelProviderError(
-						message=f'Unexpected response type from Anthropic API: {type(response).__name__}. Response: {str(response)[:200]}',
-						status_code=502,
-						model=self.name,
-					)
+			response = await self.get_client().messages.create(**request_params)
+			return self._parse_response(response, output_format)
 
-				usage = self._get_usage(response)
+		except APIConnectionError as e:
+			raise ModelProviderError(message=e.message, model=self.name) from e
+		except RateLimitError as e:
+			raise ModelRateLimitError(message=e.message, model=self.name) from e
+		except APIStatusError as e:
+			raise ModelProviderError(message=e.message, status_code=e.status_code, model=self.name) from e
+		except ModelProviderError:
+			raise
+		except Exception as e:
+			raise ModelProviderError(message=str(e), model=self.name) from e
 
-				# Extract text from the first content block
-				first_content = response.content[0]
-				if isinstance(first_content, TextBlock):
-					response_text = first_content.text
-				else:
-					# If it's not a text block, convert to string
-					response_text = str(first_content)
+	@overload
+	def astream(self, messages: list[BaseMessage], output_format: None = None) -> AsyncIterator[ChatInvokeStreamChunk[str]]: ...
 
-				return ChatInvokeCompletion(
-					completion=response_text,
-					usage=usage,
-					stop_reason=response.stop_reason,
-				)
+	@overload
+	def astream(self, messages: list[BaseMessage], output_format: type[T]) -> AsyncIterator[ChatInvokeStreamChunk[T]]: ...
 
-			else:
-				# Use tool calling for structured output
-				# Create a tool that represents the output format
-				tool_name = output_format.__name__
-				schema = SchemaOptimizer.create_optimized_json_schema(output_format)
-
-				# Remove title from schema if present (Anthropic doesn't like it in parameters)
-				if 'title' in schema:
-					del schema['title']
-
-				tool = ToolParam(
-					name=tool_name,
-					description=f'Extract information in the format of {tool_name}',
-					input_schema=schema,
-					cache_control=CacheControlEphemeralParam(type='ephemeral'),
-				)
-
-				# Force the model to use this tool
-				tool_choice = ToolChoiceToolParam(type='tool', name=tool_name)
-
-				response = await self.get_client().messages.create(
-					model=self.model,
-					messages=anthropic_messages,
-					tools=[tool],
-					system=system_prompt or omit,
-					tool_choice=tool_choice,
-					**self._get_client_params_for_invoke(),
-				)
-
-				# Ensure we have a valid Message object before accessing attributes
-				if not isinstance(response, Message):
-					raise ModelProviderError(
-						message=f'Unexpected response type from Anthropic API: {type(response).__name__}. Response: {str(response)[:200]}',
-						status_code=502,
-						model=self.name,
-					)
+	async def astream(
+		self, messages: list[BaseMessage], output_format: type[T] | None = None
+	) -> AsyncIterator[ChatInvokeStreamChunk[Any]]:
+		"""
+		Stream the model response, same request as `ainvoke`.
+
+		Yields the generated text (the raw tool input JSON for structured output) as it arrives,
+		the last chunk carries the parsed completion and usage.
+		"""
+		request_params = self._get_request_params(messages, output_format)
+
+		try:
+			async with self.get_client().messages.stream(**request_params) as stream:
+				async for event in stream:
+					if event.type != 'content_block_delta':
+						continue
+					if event.delta.type == 'input_json_delta' and event.delta.partial_json:
+						yield ChatInvokeStreamChunk(delta=event.delta.partial_json)
+					elif event.delta.type == 'text_delta' and output_format is None:
+						yield ChatInvokeStreamChunk(delta=event.delta.text)
+
+				response = await stream.get_final_message()
 
-				usage = self._get_usage(response)
-
-				# Extract the tool use block
-				for content_block in response.content:
-					if hasattr(content_block, 'type') and content_block.type == 'tool_use':
-						# Parse the tool input as the structured output
-						try:
-							return ChatInvokeCompletion(
-								completion=output_format.model_validate(content_block.input),
-								usage=usage,
-								stop_reason=response.stop_reason,
-							)
-						except Exception as e:
-							# If validation fails, try to parse it as JSON first
-							if isinstance(content_block.input, str):
-								data = json.loads(content_block.input)
-								return ChatInvokeCompletion(
-									completion=output_format.model_validate(data),
-									usage=usage,
-									stop_reason=response.stop_reason,
-								)
-							raise e
-
-				# If no tool use block found, raise an error
-				raise ValueError('Expected tool use in response but none found')
+			yield ChatInvokeStreamChunk(completion=self._parse_response(response, output_format))
 
 		except APIConnectionError as e:
 			raise ModelProviderError(message=e.message, model=self.name) from e
@@ -240,5 +274,7 @@ class ChatAnthropic(BaseChatModel):
 			raise ModelRateLimitError(message=e.message, model=self.name) from e
 		except APIStatusError as e:
 			raise ModelProviderError(message=e.message, status_code=e.status_code, model=self.name) from e
+		except ModelProviderError:
+			raise
 		except Exception as e:
 			raise ModelProviderError(message=str(e), model=self.name) from e
@@ -2,10 +2,10 @@ import os
 from dataclasses import dataclass
 from typing import Any
 
-import httpx
 from openai import AsyncAzureOpenAI as AsyncAzureOpenAIClient
 from openai.types.shared import ChatModel
 
+from browser_use.llm.client_pool import get_shared_client
 from browser_use.llm.openai.like import ChatOpenAILike
 
 
@@ -76,16 +76,7 @@ class ChatAzureOpenAI(ChatOpenAILike):
 		if self.client:
 			return self.client
 
+		# Uses self.http_client if set, otherwise the shared LLM connection pool
 		_client_params: dict[str, Any] = self._get_client_params()
 
-		if self.http_client:
-			_client_params['http_client'] = self.http_client
-		else:
-			# Create a new async HTTP client with custom limits
-			_client_params['http_client'] = httpx.AsyncClient(
-				limits=httpx.Limits(max_connections=20, max_keepalive_connections=6)
-			)
-
-		self.client = AsyncAzureOpenAIClient(**_client_params)
-
-		return self.client
+		return get_shared_client(AsyncAzureOpenAIClient, **_client_params)
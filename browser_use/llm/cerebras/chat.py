@@ -17,6 +17,7 @@ from pydantic import BaseModel
 
 from browser_use.llm.base import BaseChatModel
 from browser_use.llm.cerebras.serializer import CerebrasMessageSerializer
+from browser_use.llm.client_pool import get_shared_client
 from browser_use.llm.exceptions import ModelProviderError, ModelRateLimitError
 from browser_use.llm.messages import BaseMessage
 from browser_use.llm.views import ChatInvokeCompletion, ChatInvokeUsage
@@ -47,7 +48,8 @@ class ChatCerebras(BaseChatModel):
 		return 'cerebras'
 
 	def _client(self) -> AsyncOpenAI:
-		return AsyncOpenAI(
+		return get_shared_client(
+			AsyncOpenAI,
 			api_key=self.api_key,
 			base_url=self.base_url,
 			timeout=self.timeout,
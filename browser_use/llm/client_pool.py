@@ -0,0 +1,195 @@
+"""
+Process-wide registry of HTTP and provider SDK clients shared by all chat model wrappers.
+
+Creating an `AsyncOpenAI` / `AsyncAnthropic` / `httpx.AsyncClient` per call means a new connection pool, and therefore
+a new TCP + TLS handshake, on nearly every LLM request. Wrappers get their clients from here instead:
+
+- `get_shared_http_client()` returns one pooled `httpx.AsyncClient` (HTTP/2 if the `h2` package is installed,
+	keep-alive, limits from `BROWSER_USE_LLM_MAX_CONNECTIONS` / `BROWSER_USE_LLM_MAX_KEEPALIVE_CONNECTIONS` /
+	`BROWSER_USE_LLM_KEEPALIVE_EXPIRY`), which pools connections to every provider host.
+- `get_shared_client(factory, **params)` returns one SDK client per factory and client params (base URL,
+	credentials, timeout, headers...), backed by the shared HTTP client.
+
+httpx connection pools are bound to the event loop they were first used on, so clients are kept per running event
+loop and dropped together with their loop. Outside of a running loop a fresh, unshared client is returned.
+
+Long-lived users (agents) call `acquire_shared_clients()` when they start and `release_shared_clients()` when they
+close, the pooled connections of a loop are closed when its last user releases them. `aclose_shared_clients()` closes
+them right away, e.g. before shutting the event loop down.
+"""
+
+import asyncio
+import importlib.util
+import inspect
+import logging
+import threading
+import weakref
+from collections.abc import Callable, Mapping
+from dataclasses import dataclass, field
+from typing import Any, TypeVar
+
+import httpx
+
+from browser_use.config import CONFIG
+
+logger = logging.getLogger(__name__)
+
+C = TypeVar('C')
+
+HTTP2_AVAILABLE = importlib.util.find_spec('h2') is not None
+
+
+@dataclass
+class _LoopClients:
+	http_clients: dict[int, httpx.AsyncClient] = field(default_factory=dict)
+	"""Shared HTTP clients keyed by transport retries"""
+	sdk_clients: dict[tuple, Any] = field(default_factory=dict)
+	owning_sdk_clients: list[Any] = field(default_factory=list)
+	"""SDK clients not built on the shared HTTP client, they own their transport and are closed with the pool"""
+	users: int = 0
+	"""Number of acquire_shared_clients() calls not released yet"""
+
+
+_clients_by_loop: 'weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, _LoopClients]' = weakref.WeakKeyDictionary()
+_lock = threading.Lock()
+
+
+def _running_loop() -> asyncio.AbstractEventLoop | None:
+	try:
+		return asyncio.get_running_loop()
+	except RuntimeError:
+		return None
+
+
+def _loop_clients(loop: asyncio.AbstractEventLoop) -> _LoopClients:
+	with _lock:
+		clients = _clients_by_loop.get(loop)
+		if clients is None:
+			clients = _clients_by_loop[loop] = _LoopClients()
+		return clients
+
+
+def _freeze(value: Any) -> Any:
+	"""Hashable representation of a client parameter, used as part of the registry key."""
+	if isinstance(value, Mapping):
+		return tuple(sorted((str(k), _freeze(v)) for k, v in value.items()))
+	if isinstance(value, (list, tuple)):
+		return tuple(_freeze(v) for v in value)
+	try:
+		hash(value)
+		return value
+	except TypeError:
+		# e.g. httpx.Timeout, compared by value
+		return repr(value)
+
+
+def _new_http_client(retries: int = 0) -> httpx.AsyncClient:
+	limits = httpx.Limits(
+		max_connections=CONFIG.BROWSER_USE_LLM_MAX_CONNECTIONS,
+		max_keepalive_connections=CONFIG.BROWSER_USE_LLM_MAX_KEEPALIVE_CONNECTIONS,
+		keepalive_expiry=CONFIG.BROWSER_USE_LLM_KEEPALIVE_EXPIRY,
+	)
+	http2 = HTTP2_AVAILABLE and CONFIG.BROWSER_USE_LLM_HTTP2
+	# Pool limits and HTTP/2 are transport settings, httpx ignores them on the client when a transport is given
+	transport = httpx.AsyncHTTPTransport(retries=retries, limits=limits, http2=http2)
+	return httpx.AsyncClient(transport=transport)
+
+
+def get_shared_http_client(retries: int = 0) -> httpx.AsyncClient:
+	"""Pooled HTTP client shared by every LLM wrapper on the current event loop.
+
+	Timeouts and headers should be passed per request, the client carries httpx defaults.
+
+	Args:
+		retries: Connection retries of the transport (connect errors only), clients are shared per value
+	"""
+	loop = _running_loop()
+	if loop is None:
+		return _new_http_client(retries)
+
+	clients = _loop_clients(loop)
+	with _lock:
+		client = clients.http_clients.get(retries)
+		if client is None or client.is_closed:
+			client = clients.http_clients[retries] = _new_http_client(retries)
+		return client
+
+
+def get_shared_client(factory: Callable[..., C], share_http_client: bool = True, **params: Any) -> C:
+	"""Provider SDK client for the given params, created once per event loop and reused.
+
+	Args:
+		factory: SDK client class, e.g. AsyncOpenAI
+		share_http_client: Pass the shared HTTP client as `http_client` unless the params already contain one. SDK
+			clients created without it own their HTTP client and are closed together with the pooled clients
+		**params: Client params (base URL, credentials, timeout...), part of the registry key
+	"""
+	if share_http_client and params.get('http_client') is None:
+		params['http_client'] = get_shared_http_client()
+
+	loop = _running_loop()
+	if loop is None:
+		return factory(**params)
+
+	key = (factory, _freeze(params))
+	clients = _loop_clients(loop)
+	with _lock:
+		client = clients.sdk_clients.get(key)
+		if client is None:
+			client = clients.sdk_clients[key] = factory(**params)
+			if not share_http_client:
+				clients.owning_sdk_clients.append(client)
+		return client
+
+
+def acquire_shared_clients() -> None:
+	"""Register a user of the pooled clients of the current event loop, release it with `release_shared_clients()`."""
+	loop = _running_loop()
+	if loop is None:
+		return
+	clients = _loop_clients(loop)
+	with _lock:
+		clients.users += 1
+
+
+async def release_shared_clients() -> None:
+	"""Release a user registered with `acquire_shared_clients()`, closing the pooled clients once none is left."""
+	loop = _running_loop()
+	if loop is None:
+		return
+	with _lock:
+		clients = _clients_by_loop.get(loop)
+		if clients is None or clients.users == 0:
+			return
+		clients.users -= 1
+		if clients.users > 0:
+			return
+	await aclose_shared_clients()
+
+
+async def aclose_shared_clients() -> None:
+	"""Close the pooled clients of the current event loop, e.g. before shutting it down."""
+	loop = _running_loop()
+	if loop is None:
+		return
+	with _lock:
+		clients = _clients_by_loop.pop(loop, None)
+	if clients is None:
+		return
+
+	for client in clients.http_clients.values():
+		try:
+			await client.aclose()
+		except Exception as e:
+			logger.debug(f'Failed to close shared LLM HTTP client: {type(e).__name__}: {e}')
+
+	for client in clients.owning_sdk_clients:
+		close = getattr(client, 'aclose', None) or getattr(client, 'close', None)
+		if close is None:
+			continue
+		try:
+			result = close()
+			if inspect.isawaitable(result):
+				await result
+		except Exception as e:
+			logger.debug(f'Failed to close shared LLM SDK client: {type(e).__name__}: {e}')
@@ -16,6 +16,7 @@ from openai import (
 from pydantic import BaseModel
 
 from browser_use.llm.base import BaseChatModel
+from browser_use.llm.client_pool import get_shared_client
 from browser_use.llm.deepseek.serializer import DeepSeekMessageSerializer
 from browser_use.llm.exceptions import ModelProviderError, ModelRateLimitError
 from browser_use.llm.messages import BaseMessage
@@ -48,7 +49,8 @@ class ChatDeepSeek(BaseChatModel):
 		return 'deepseek'
 
 	def _client(self) -> AsyncOpenAI:
-		return AsyncOpenAI(
+		return get_shared_client(
+			AsyncOpenAI,
 			api_key=self.api_key,
 			base_url=self.base_url,
 			timeout=self.timeout,
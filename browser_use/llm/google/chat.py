@@ -3,6 +3,7 @@ import json
 import logging
 import random
 import time
+from collections.abc import AsyncIterator
 from dataclasses import dataclass, field
 from typing import Any, Literal, TypeVar, overload
 
@@ -17,7 +18,7 @@ from browser_use.llm.exceptions import ModelProviderError
 from browser_use.llm.google.serializer import GoogleMessageSerializer
 from browser_use.llm.messages import BaseMessage
 from browser_use.llm.schema import SchemaOptimizer
-from browser_use.llm.views import ChatInvokeCompletion, ChatInvokeUsage
+from browser_use.llm.views import ChatInvokeCompletion, ChatInvokeStreamChunk, ChatInvokeUsage
 
 T = TypeVar('T', bound=BaseModel)
 
@@ -182,32 +183,8 @@ class ChatGoogle(BaseChatModel):
 
 		return usage
 
-	@overload
-	async def ainvoke(self, messages: list[BaseMessage], output_format: None = None) -> ChatInvokeCompletion[str]: ...
-
-	@overload
-	async def ainvoke(self, messages: list[BaseMessage], output_format: type[T]) -> ChatInvokeCompletion[T]: ...
-
-	async def ainvoke(
-		self, messages: list[BaseMessage], output_format: type[T] | None = None
-	) -> ChatInvokeCompletion[T] | ChatInvokeCompletion[str]:
-		"""
-		Invoke the model with the given messages.
-
-		Args:
-			messages: List of chat messages
-			output_format: Optional Pydantic model class for structured output
-
-		Returns:
-			Either a string response or an instance of output_format
-		"""
-
-		# Serialize messages to Google format with the include_system_in_user flag
-		contents, system_instruction = GoogleMessageSerializer.serialize_messages(
-			messages, include_system_in_user=self.include_system_in_user
-		)
-
-		# Build config dictionary starting with user-provided config
+	def _get_config(self, system_instruction: Any) -> types.GenerateContentConfigDict:
+		"""Build the generation config, starting with the user-provided config."""
 		config: types.GenerateContentConfigDict = {}
 		if self.config:
 			config = self.config.copy()
@@ -237,6 +214,78 @@ class ChatGoogle(BaseChatModel):
 		if self.max_output_tokens is not None:
 			config['max_output_tokens'] = self.max_output_tokens
 
+		return config
+
+	def _set_response_schema(self, config: types.GenerateContentConfigDict, output_format: type[BaseModel]) -> None:
+		"""Use native JSON mode with a Gemini-compatible schema of the output format."""
+		config['response_mime_type'] = 'application/json'
+		# Convert Pydantic model to Gemini-compatible schema
+		optimized_schema = SchemaOptimizer.create_gemini_optimized_schema(output_format)
+		config['response_schema'] = self._fix_gemini_schema(optimized_schema)
+
+	def _to_provider_error(self, e: Exception) -> ModelProviderError:
+		"""Map an SDK / network exception to a ModelProviderError with a best-effort status code."""
+		error_message = str(e)
+		status_code: int | None = None
+
+		# Try to extract status code if available
+		if hasattr(e, 'response'):
+			response_obj = getattr(e, 'response', None)
+			if response_obj and hasattr(response_obj, 'status_code'):
+				status_code = getattr(response_obj, 'status_code', None)
+
+		# Enhanced timeout error handling
+		if 'timeout' in error_message.lower() or 'cancelled' in error_message.lower():
+			if isinstance(e, asyncio.CancelledError) or 'CancelledError' in str(type(e)):
+				error_message = 'Gemini API request was cancelled (likely timeout). Consider: 1) Reducing input size, 2) Using a different model, 3) Checking network connectivity.'
+				status_code = 504
+			else:
+				status_code = 408
+		elif any(indicator in error_message.lower() for indicator in ['forbidden', '403']):
+			status_code = 403
+		elif any(
+			indicator in error_message.lower()
+			for indicator in ['rate limit', 'resource exhausted', 'quota exceeded', 'too many requests', '429']
+		):
+			status_code = 429
+		elif any(
+			indicator in error_message.lower()
+			for indicator in ['service unavailable', 'internal server error', 'bad gateway', '503', '502', '500']
+		):
+			status_code = 503
+
+		return ModelProviderError(
+			message=error_message,
+			status_code=status_code or 502,
+			model=self.name,
+		)
+
+	@overload
+	async def ainvoke(self, messages: list[BaseMessage], output_format: None = None) -> ChatInvokeCompletion[str]: ...
+
+	@overload
+	async def ainvoke(self, messages: list[BaseMessage], output_format: type[T]) -> ChatInvokeCompletion[T]: ...
+
+	async def ainvoke(
+		self, messages: list[BaseMessage], output_format: type[T] | None = None
+	) -> ChatInvokeCompletion[T] | ChatInvokeCompletion[str]:
+		"""
+		Invoke the model with the given messages.
+
+		Args:
+			messages: List of chat messages
+			output_format: Optional Pydantic model class for structured output
+
+		Returns:
+			Either a string response or an instance of output_format
+		"""
+
+		# Serialize messages to Google format with the include_system_in_user flag
+		contents, system_instruction = GoogleMessageSerializer.serialize_messages(
+			messages, include_system_in_user=self.include_system_in_user
+		)
+		config = self._get_config(system_instruction)
+
 		async def _make_api_call():
 			start_time = time.time()
 			self.logger.debug(f'🚀 Starting API call to {self.model}')
@@ -273,12 +322,7 @@ class ChatGoogle(BaseChatModel):
 					if self.supports_structured_output:
 						# Use native JSON mode
 						self.logger.debug(f'🔧 Requesting structured output for {output_format.__name__}')
-						config['response_mime_type'] = 'application/json'
-						# Convert Pydantic model to Gemini-compatible schema
-						optimized_schema = SchemaOptimizer.create_gemini_optimized_schema(output_format)
-
-						gemini_schema = self._fix_gemini_schema(optimized_schema)
-						config['response_schema'] = gemini_schema
+						self._set_response_schema(config, output_format)
 
 						response = await self.get_client().aio.models.generate_content(
 							model=self.model,
@@ -437,42 +481,84 @@ class ChatGoogle(BaseChatModel):
 				raise
 			except Exception as e:
 				# For non-ModelProviderError, wrap and raise
-				error_message = str(e)
-				status_code: int | None = None
-
-				# Try to extract status code if available
-				if hasattr(e, 'response'):
-					response_obj = getattr(e, 'response', None)
-					if response_obj and hasattr(response_obj, 'status_code'):
-						status_code = getattr(response_obj, 'status_code', None)
-
-				# Enhanced timeout error handling
-				if 'timeout' in error_message.lower() or 'cancelled' in error_message.lower():
-					if isinstance(e, asyncio.CancelledError) or 'CancelledError' in str(type(e)):
-						error_message = 'Gemini API request was cancelled (likely timeout). Consider: 1) Reducing input size, 2) Using a different model, 3) Checking network connectivity.'
-						status_code = 504
-					else:
-						status_code = 408
-				elif any(indicator in error_message.lower() for indicator in ['forbidden', '403']):
-					status_code = 403
-				elif any(
-					indicator in error_message.lower()
-					for indicator in ['rate limit', 'resource exhausted', 'quota exceeded', 'too many requests', '429']
-				):
-					status_code = 429
-				elif any(
-					indicator in error_message.lower()
-					for indicator in ['service unavailable', 'internal server error', 'bad gateway', '503', '502', '500']
-				):
-					status_code = 503
+				raise self._to_provider_error(e) from e
 
+		raise RuntimeError('Retry loop completed without return or exception')
+
+	@overload
+	def astream(self, messages: list[BaseMessage], output_format: None = None) -> AsyncIterator[ChatInvokeStreamChunk[str]]: ...
+
+	@overload
+	def astream(self, messages: list[BaseMessage], output_format: type[T]) -> AsyncIterator[ChatInvokeStreamChunk[T]]: ...
+
+	async def astream(
+		self, messages: list[BaseMessage], output_format: type[T] | None = None
+	) -> AsyncIterator[ChatInvokeStreamChunk[Any]]:
+		"""
+		Stream the model response, same request as `ainvoke` but without retries.
+
+		Yields the generated text (raw JSON for structured output) as it arrives,
+		the last chunk carries the parsed completion and usage.
+		Models without native JSON mode (`supports_structured_output=False`) are not streamed.
+		"""
+		if output_format is not None and not self.supports_structured_output:
+			# class-level call: usage is reported with the final chunk, not by an instance-level tracking wrapper of ainvoke
+			yield ChatInvokeStreamChunk(completion=await ChatGoogle.ainvoke(self, messages, output_format))
+			return
+
+		contents, system_instruction = GoogleMessageSerializer.serialize_messages(
+			messages, include_system_in_user=self.include_system_in_user
+		)
+		config = self._get_config(system_instruction)
+		if output_format is not None:
+			self._set_response_schema(config, output_format)
+
+		try:
+			text_parts: list[str] = []
+			last_chunk: types.GenerateContentResponse | None = None
+			async for chunk in await self.get_client().aio.models.generate_content_stream(
+				model=self.model,
+				contents=contents,  # type: ignore
+				config=config,
+			):
+				last_chunk = chunk
+				if chunk.text:
+					text_parts.append(chunk.text)
+					yield ChatInvokeStreamChunk(delta=chunk.text)
+
+			text = ''.join(text_parts)
+			usage = self._get_usage(last_chunk) if last_chunk else None
+			stop_reason = self._get_stop_reason(last_chunk) if last_chunk else None
+
+			if output_format is None:
+				yield ChatInvokeStreamChunk(
+					completion=ChatInvokeCompletion(completion=text, usage=usage, stop_reason=stop_reason)
+				)
+				return
+
+			# Handle JSON wrapped in markdown code blocks (common Gemini behavior)
+			text = text.strip()
+			if text.startswith('```json') and text.endswith('```'):
+				text = text[7:-3].strip()
+			elif text.startswith('```') and text.endswith('```'):
+				text = text[3:-3].strip()
+			if not text:
+				raise ModelProviderError(message='No response from model', status_code=500, model=self.model)
+
+			try:
+				parsed = output_format.model_validate(json.loads(text))
+			except (json.JSONDecodeError, ValueError) as e:
 				raise ModelProviderError(
-					message=error_message,
-					status_code=status_code or 502,
-					model=self.name,
+					message=f'Failed to parse or validate streamed response: {str(e)}',
+					status_code=500,
+					model=self.model,
 				) from e
+			yield ChatInvokeStreamChunk(completion=ChatInvokeCompletion(completion=parsed, usage=usage, stop_reason=stop_reason))
 
-		raise RuntimeError('Retry loop completed without return or exception')
+		except ModelProviderError:
+			raise
+		except Exception as e:
+			raise self._to_provider_error(e) from e
 
 	def _fix_gemini_schema(self, schema: dict[str, Any]) -> dict[str, Any]:
 		"""
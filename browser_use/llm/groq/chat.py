@@ -20,6 +20,7 @@ from httpx import URL
 from pydantic import BaseModel
 
 from browser_use.llm.base import BaseChatModel, ChatInvokeCompletion
+from browser_use.llm.client_pool import get_shared_client
 from browser_use.llm.exceptions import ModelProviderError, ModelRateLimitError
 from browser_use.llm.groq.parser import try_parse_groq_failed_generation
 from browser_use.llm.groq.serializer import GroqMessageSerializer
@@ -74,7 +75,9 @@ class ChatGroq(BaseChatModel):
 	max_retries: int = 10  # Increase default retries for automation reliability
 
 	def get_client(self) -> AsyncGroq:
-		return AsyncGroq(api_key=self.api_key, base_url=self.base_url, timeout=self.timeout, max_retries=self.max_retries)
+		return get_shared_client(
+			AsyncGroq, api_key=self.api_key, base_url=self.base_url, timeout=self.timeout, max_retries=self.max_retries
+		)
 
 	@property
 	def provider(self) -> str:
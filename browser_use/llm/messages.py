@@ -6,6 +6,7 @@ This implementation is based on the OpenAI types, while removing all the parts t
 from typing import Literal, Union
 
 from openai import BaseModel
+from pydantic import Field
 
 
 def _truncate(text: str, max_length: int = 50) -> str:
@@ -30,6 +31,9 @@ class ContentPartTextParam(BaseModel):
 	text: str
 	type: Literal['text'] = 'text'
 
+	cache: bool = Field(default=False, exclude=True)
+	"""Place a cache breakpoint after this part, to cache a stable prefix of a message. Only used by Anthropic."""
+
 	def __str__(self) -> str:
 		return f'Text: {_truncate(self.text)}'
 
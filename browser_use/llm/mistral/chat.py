@@ -11,6 +11,7 @@ import httpx
 from pydantic import BaseModel
 
 from browser_use.llm.base import BaseChatModel
+from browser_use.llm.client_pool import get_shared_http_client
 from browser_use.llm.exceptions import ModelProviderError, ModelRateLimitError
 from browser_use.llm.messages import BaseMessage
 from browser_use.llm.mistral.schema import MistralSchemaOptimizer
@@ -72,14 +73,7 @@ class ChatMistral(BaseChatModel):
 	def _client(self) -> httpx.AsyncClient:
 		if self.http_client:
 			return self.http_client
-
-		if not hasattr(self, '_cached_client'):
-			transport = httpx.AsyncHTTPTransport(retries=self.max_retries)
-			client_args: dict[str, Any] = {'transport': transport}
-			if self.timeout is not None:
-				client_args['timeout'] = self.timeout
-			self._cached_client = httpx.AsyncClient(**client_args)
-		return self._cached_client
+		return get_shared_http_client(retries=self.max_retries)
 
 	def _serialize_messages(self, messages: list[BaseMessage]) -> list[dict[str, Any]]:
 		raw_messages: list[dict[str, Any]] = []
@@ -145,7 +139,13 @@ class ChatMistral(BaseChatModel):
 	async def _post(self, payload: dict[str, Any]) -> dict[str, Any]:
 		url = f'{self._get_base_url()}/chat/completions'
 		client = self._client()
-		response = await client.post(url, headers=self._auth_headers(), json=payload, params=self._query_params())
+		response = await client.post(
+			url,
+			headers=self._auth_headers(),
+			json=payload,
+			params=self._query_params(),
+			timeout=self.timeout if self.timeout is not None else httpx.USE_CLIENT_DEFAULT,
+		)
 
 		if response.status_code >= 400:
 			message = self._parse_error(response)
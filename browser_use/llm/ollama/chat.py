@@ -8,6 +8,7 @@ from ollama import Options
 from pydantic import BaseModel
 
 from browser_use.llm.base import BaseChatModel
+from browser_use.llm.client_pool import get_shared_client
 from browser_use.llm.exceptions import ModelProviderError
 from browser_use.llm.messages import BaseMessage
 from browser_use.llm.ollama.serializer import OllamaMessageSerializer
@@ -49,9 +50,13 @@ class ChatOllama(BaseChatModel):
 
 	def get_client(self) -> OllamaAsyncClient:
 		"""
-		Returns an OllamaAsyncClient client.
+		Returns an OllamaAsyncClient client, shared by all instances with the same client params.
 		"""
-		return OllamaAsyncClient(host=self.host, timeout=self.timeout, **self.client_params or {})
+		# The Ollama client builds its own httpx client from the params, it is still pooled per host and closed with the
+		# other pooled clients
+		return get_shared_client(
+			OllamaAsyncClient, share_http_client=False, host=self.host, timeout=self.timeout, **self.client_params or {}
+		)
 
 	@property
 	def name(self) -> str:
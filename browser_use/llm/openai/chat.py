@@ -1,4 +1,4 @@
-from collections.abc import Iterable, Mapping
+from collections.abc import AsyncIterator, Iterable, Mapping
 from dataclasses import dataclass, field
 from typing import Any, Literal, TypeVar, overload
 
@@ -6,17 +6,19 @@ import httpx
 from openai import APIConnectionError, APIStatusError, AsyncOpenAI, RateLimitError
 from openai.types.chat import ChatCompletionContentPartTextParam
 from openai.types.chat.chat_completion import ChatCompletion
+from openai.types.chat.chat_completion_chunk import ChatCompletionChunk
 from openai.types.shared.chat_model import ChatModel
 from openai.types.shared_params.reasoning_effort import ReasoningEffort
 from openai.types.shared_params.response_format_json_schema import JSONSchema, ResponseFormatJSONSchema
 from pydantic import BaseModel
 
 from browser_use.llm.base import BaseChatModel
+from browser_use.llm.client_pool import get_shared_client
 from browser_use.llm.exceptions import ModelProviderError, ModelRateLimitError
 from browser_use.llm.messages import BaseMessage
 from browser_use.llm.openai.serializer import OpenAIMessageSerializer
 from browser_use.llm.schema import SchemaOptimizer
-from browser_use.llm.views import ChatInvokeCompletion, ChatInvokeUsage
+from browser_use.llm.views import ChatInvokeCompletion, ChatInvokeStreamChunk, ChatInvokeUsage
 
 T = TypeVar('T', bound=BaseModel)
 
@@ -108,19 +110,19 @@ class ChatOpenAI(BaseChatModel):
 
 	def get_client(self) -> AsyncOpenAI:
 		"""
-		Returns an AsyncOpenAI client.
+		Returns an AsyncOpenAI client, shared by all instances with the same client params.
 
 		Returns:
 			AsyncOpenAI: An instance of the AsyncOpenAI client.
 		"""
 		client_params = self._get_client_params()
-		return AsyncOpenAI(**client_params)
+		return get_shared_client(AsyncOpenAI, **client_params)
 
 	@property
 	def name(self) -> str:
 		return str(self.model)
 
-	def _get_usage(self, response: ChatCompletion) -> ChatInvokeUsage | None:
+	def _get_usage(self, response: ChatCompletion | ChatCompletionChunk) -> ChatInvokeUsage | None:
 		if response.usage is not None:
 			completion_tokens = response.usage.completion_tokens
 			completion_token_details = response.usage.completion_tokens_details
@@ -145,6 +147,59 @@ class ChatOpenAI(BaseChatModel):
 
 		return usage
 
+	def _get_model_params(self) -> dict[str, Any]:
+		"""Prepare the sampling / reasoning params of a chat completion request."""
+		model_params: dict[str, Any] = {}
+
+		if self.temperature is not None:
+			model_params['temperature'] = self.temperature
+
+		if self.frequency_penalty is not None:
+			model_params['frequency_penalty'] = self.frequency_penalty
+
+		if self.max_completion_tokens is not None:
+			model_params['max_completion_tokens'] = self.max_completion_tokens
+
+		if self.top_p is not None:
+			model_params['top_p'] = self.top_p
+
+		if self.seed is not None:
+			model_params['seed'] = self.seed
+
+		if self.service_tier is not None:
+			model_params['service_tier'] = self.service_tier
+
+		if self.reasoning_models and any(str(m).lower() in str(self.model).lower() for m in self.reasoning_models):
+			model_params['reasoning_effort'] = self.reasoning_effort
+			model_params.pop('temperature', None)
+			model_params.pop('frequency_penalty', None)
+
+		return model_params
+
+	def _get_response_format(self, output_format: type[BaseModel], openai_messages: list) -> JSONSchema:
+		"""Build the JSON schema response format, adding it to the system prompt too if requested."""
+		response_format: JSONSchema = {
+			'name': 'agent_output',
+			'strict': True,
+			'schema': SchemaOptimizer.create_optimized_json_schema(
+				output_format,
+				remove_min_items=self.remove_min_items_from_schema,
+				remove_defaults=self.remove_defaults_from_schema,
+			),
+		}
+
+		# Add JSON schema to system prompt if requested
+		if self.add_schema_to_system_prompt and openai_messages and openai_messages[0]['role'] == 'system':
+			schema_text = f'\n<json_schema>\n{response_format}\n</json_schema>'
+			if isinstance(openai_messages[0]['content'], str):
+				openai_messages[0]['content'] += schema_text
+			elif isinstance(openai_messages[0]['content'], Iterable):
+				openai_messages[0]['content'] = list(openai_messages[0]['content']) + [
+					ChatCompletionContentPartTextParam(text=schema_text, type='text')
+				]
+
+		return response_format
+
 	@overload
 	async def ainvoke(self, messages: list[BaseMessage], output_format: None = None) -> ChatInvokeCompletion[str]: ...
 
@@ -168,30 +223,7 @@ class ChatOpenAI(BaseChatModel):
 		openai_messages = OpenAIMessageSerializer.serialize_messages(messages)
 
 		try:
-			model_params: dict[str, Any] = {}
-
-			if self.temperature is not None:
-				model_params['temperature'] = self.temperature
-
-			if self.frequency_penalty is not None:
-				model_params['frequency_penalty'] = self.frequency_penalty
-
-			if self.max_completion_tokens is not None:
-				model_params['max_completion_tokens'] = self.max_completion_tokens
-
-			if self.top_p is not None:
-				model_params['top_p'] = self.top_p
-
-			if self.seed is not None:
-				model_params['seed'] = self.seed
-
-			if self.service_tier is not None:
-				model_params['service_tier'] = self.service_tier
-
-			if self.reasoning_models and any(str(m).lower() in str(self.model).lower() for m in self.reasoning_models):
-				model_params['reasoning_effort'] = self.reasoning_effort
-				model_params.pop('temperature', None)
-				model_params.pop('frequency_penalty', None)
+			model_params = self._get_model_params()
 
 			if output_format is None:
 				# Return string response
@@ -209,25 +241,7 @@ class ChatOpenAI(BaseChatModel):
 				)
 
 			else:
-				response_format: JSONSchema = {
-					'name': 'agent_output',
-					'strict': True,
-					'schema': SchemaOptimizer.create_optimized_json_schema(
-						output_format,
-						remove_min_items=self.remove_min_items_from_schema,
-						remove_defaults=self.remove_defaults_from_schema,
-					),
-				}
-
-				# Add JSON schema to system prompt if requested
-				if self.add_schema_to_system_prompt and openai_messages and openai_messages[0]['role'] == 'system':
-					schema_text = f'\n<json_schema>\n{response_format}\n</json_schema>'
-					if isinstance(openai_messages[0]['content'], str):
-						openai_messages[0]['content'] += schema_text
-					elif isinstance(openai_messages[0]['content'], Iterable):
-						openai_messages[0]['content'] = list(openai_messages[0]['content']) + [
-							ChatCompletionContentPartTextParam(text=schema_text, type='text')
-						]
+				response_format = self._get_response_format(output_format, openai_messages)
 
 				if self.dont_force_structured_output:
 					response = await self.get_client().chat.completions.create(
@@ -272,3 +286,81 @@ class ChatOpenAI(BaseChatModel):
 
 		except Exception as e:
 			raise ModelProviderError(message=str(e), model=self.name) from e
+
+	@overload
+	def astream(self, messages: list[BaseMessage], output_format: None = None) -> AsyncIterator[ChatInvokeStreamChunk[str]]: ...
+
+	@overload
+	def astream(self, messages: list[BaseMessage], output_format: type[T]) -> AsyncIterator[ChatInvokeStreamChunk[T]]: ...
+
+	async def astream(
+		self, messages: list[BaseMessage], output_format: type[T] | None = None
+	) -> AsyncIterator[ChatInvokeStreamChunk[Any]]:
+		"""
+		Stream the model response, same request as `ainvoke`.
+
+		Yields the generated text (raw JSON for structured output) as it arrives,
+		the last chunk carries the parsed completion and usage.
+		"""
+		openai_messages = OpenAIMessageSerializer.serialize_messages(messages)
+
+		try:
+			model_params = self._get_model_params()
+			if output_format is not None:
+				response_format = self._get_response_format(output_format, openai_messages)
+				if not self.dont_force_structured_output:
+					model_params['response_format'] = ResponseFormatJSONSchema(json_schema=response_format, type='json_schema')
+
+			stream = await self.get_client().chat.completions.create(
+				model=self.model,
+				messages=openai_messages,
+				stream=True,
+				stream_options={'include_usage': True},
+				**model_params,
+			)
+
+			content_parts: list[str] = []
+			usage: ChatInvokeUsage | None = None
+			stop_reason: str | None = None
+			async for chunk in stream:
+				if chunk.usage is not None:
+					usage = self._get_usage(chunk)
+				if not chunk.choices:
+					continue
+				if chunk.choices[0].finish_reason is not None:
+					stop_reason = chunk.choices[0].finish_reason
+				delta = chunk.choices[0].delta.content
+				if delta:
+					content_parts.append(delta)
+					yield ChatInvokeStreamChunk(delta=delta)
+
+			content = ''.join(content_parts)
+			if output_format is None:
+				yield ChatInvokeStreamChunk(
+					completion=ChatInvokeCompletion(completion=content, usage=usage, stop_reason=stop_reason)
+				)
+				return
+
+			if not content:
+				raise ModelProviderError(
+					message='Failed to parse structured output from model response',
+					status_code=500,
+					model=self.name,
+				)
+			parsed = output_format.model_validate_json(content)
+			yield ChatInvokeStreamChunk(completion=ChatInvokeCompletion(completion=parsed, usage=usage, stop_reason=stop_reason))
+
+		except RateLimitError as e:
+			raise ModelRateLimitError(message=e.message, model=self.name) from e
+
+		except APIConnectionError as e:
+			raise ModelProviderError(message=str(e), model=self.name) from e
+
+		except APIStatusError as e:
+			raise ModelProviderError(message=e.message, status_code=e.status_code, model=self.name) from e
+
+		except ModelProviderError:
+			raise
+
+		except Exception as e:
+			raise ModelProviderError(message=str(e), model=self.name) from e
@@ -2,10 +2,15 @@
 Utilities for creating optimized Pydantic schemas for LLM usage.
 """
 
+import copy
 from typing import Any
+from weakref import WeakKeyDictionary
 
 from pydantic import BaseModel
 
+# Optimized schemas per model and options, dropped together with the model
+_optimized_schemas: WeakKeyDictionary[type[BaseModel], dict[tuple[bool, bool], dict[str, Any]]] = WeakKeyDictionary()
+
 
 class SchemaOptimizer:
 	@staticmethod
@@ -27,6 +32,23 @@ class SchemaOptimizer:
 		Returns:
 			Optimized schema with all $refs resolved and strict mode compatibility
 		"""
+		# Output models are reused across steps (see Registry.create_action_model), so the schema is built once per model.
+		# Callers may modify the schema, each gets its own copy
+		schemas = _optimized_schemas.setdefault(model, {})
+		key = (remove_min_items, remove_defaults)
+		if key not in schemas:
+			schemas[key] = SchemaOptimizer._create_optimized_json_schema(
+				model, remove_min_items=remove_min_items, remove_defaults=remove_defaults
+			)
+		return copy.deepcopy(schemas[key])
+
+	@staticmethod
+	def _create_optimized_json_schema(
+		model: type[BaseModel],
+		*,
+		remove_min_items: bool,
+		remove_defaults: bool,
+	) -> dict[str, Any]:
 		# Generate original schema
 		original_schema = model.model_json_schema()
 
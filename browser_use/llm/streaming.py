@@ -0,0 +1,115 @@
+"""
+Incremental parsing of streamed structured output.
+
+Chat models with an `astream` method yield the raw JSON of a structured output while it is being generated.
+`StreamingJSONArrayParser` scans that text as it arrives and hands out the items of one top-level array (the agent's
+`action` list) as soon as each item is complete, so they can be acted upon before the rest of the response arrives.
+"""
+
+import json
+from collections.abc import AsyncIterator
+from typing import Any, Protocol, TypeGuard
+
+from pydantic import BaseModel
+
+from browser_use.llm.base import BaseChatModel
+from browser_use.llm.messages import BaseMessage
+from browser_use.llm.views import ChatInvokeStreamChunk
+
+
+class SupportsStreaming(BaseChatModel, Protocol):
+	"""A chat model that can also stream its response."""
+
+	def astream(
+		self, messages: list[BaseMessage], output_format: type[BaseModel] | None = None
+	) -> AsyncIterator[ChatInvokeStreamChunk[Any]]: ...
+
+
+def supports_streaming(llm: BaseChatModel) -> TypeGuard[SupportsStreaming]:
+	"""Whether the chat model implements `astream` (streaming is optional, `ainvoke` is the only required method)."""
+	return callable(getattr(llm, 'astream', None))
+
+
+class StreamingJSONArrayParser:
+	"""Returns the items of the array under `key` of a streamed JSON object as soon as each item is complete.
+
+	Only object and array items are reported (which is what action lists contain). Text before the opening brace, like
+	a markdown code fence, is ignored.
+	"""
+
+	def __init__(self, key: str = 'action'):
+		self.key = key
+		self.items: list[Any] = []
+		self.array_closed = False
+		self._text = ''
+		self._pos = 0
+		self._depth = 0
+		self._in_string = False
+		self._escape = False
+		self._string_start = 0
+		self._last_string: str | None = None
+		self._current_key: str | None = None
+		self._object_start: int | None = None
+		self._array_start: int | None = None
+		self._item_start: int | None = None
+		self._last_item_end: int | None = None
+
+	def feed(self, delta: str) -> list[Any]:
+		"""Consume the next chunk of text, returns the array items completed by it."""
+		self._text += delta
+		completed: list[Any] = []
+		text = self._text
+
+		for pos in range(self._pos, len(text)):
+			char = text[pos]
+			if self._in_string:
+				if self._escape:
+					self._escape = False
+				elif char == '\\':
+					self._escape = True
+				elif char == '"':
+					self._in_string = False
+					if self._depth == 1:
+						self._last_string = text[self._string_start + 1 : pos]
+				continue
+
+			if char == '"':
+				self._in_string = True
+				self._string_start = pos
+			elif char == ':' and self._depth == 1:
+				self._current_key = self._last_string
+			elif char in '{[':
+				if self._depth == 0 and char == '{' and self._object_start is None:
+					self._object_start = pos
+				elif self._depth == 1 and char == '[' and self._current_key == self.key and self._array_start is None:
+					self._array_start = pos
+				elif self._depth == 2 and self._in_array():
+					self._item_start = pos
+				self._depth += 1
+			elif char in '}]':
+				self._depth -= 1
+				if self._depth == 2 and self._in_array() and self._item_start is not None:
+					item = json.loads(text[self._item_start : pos + 1])
+					self.items.append(item)
+					completed.append(item)
+					self._item_start = None
+					self._last_item_end = pos + 1
+				elif self._depth == 1 and char == ']' and self._in_array():
+					self.array_closed = True
+
+		self._pos = len(text)
+		return completed
+
+	def _in_array(self) -> bool:
+		return self._array_start is not None and not self.array_closed
+
+	def repaired_text(self) -> str | None:
+		"""The object truncated after the last complete array item and closed, or None if the array never started.
+
+		Used to salvage a response that was cut off (or is otherwise invalid) after some items were already acted upon.
+		Assumes the array is the last field of the object, like `action` in the agent output.
+		"""
+		if self._object_start is None or self._array_start is None:
+			return None
+		end = self._last_item_end if self._last_item_end is not None else self._array_start + 1
+		return self._text[self._object_start : end] + ']}'
@@ -13,6 +13,7 @@ from openai.types.shared_params.response_format_json_schema import (
 from pydantic import BaseModel
 
 from browser_use.llm.base import BaseChatModel
+from browser_use.llm.client_pool import get_shared_client
 from browser_use.llm.exceptions import ModelProviderError, ModelRateLimitError
 from browser_use.llm.messages import BaseMessage, ContentPartTextParam, SystemMessage
 from browser_use.llm.schema import SchemaOptimizer
@@ -253,10 +254,8 @@ class ChatVercel(BaseChatModel):
 		Returns:
 		    AsyncOpenAI: An instance of the AsyncOpenAI client with Vercel base URL.
 		"""
-		if not hasattr(self, '_client'):
-			client_params = self._get_client_params()
-			self._client = AsyncOpenAI(**client_params)
-		return self._client
+		client_params = self._get_client_params()
+		return get_shared_client(AsyncOpenAI, **client_params)
 
 	@property
 	def name(self) -> str:
@@ -46,3 +46,15 @@ class ChatInvokeCompletion(BaseModel, Generic[T]):
 
 	stop_reason: str | None = None
 	"""The reason the model stopped generating. Common values: 'end_turn', 'max_tokens', 'stop_sequence'."""
+
+
+class ChatInvokeStreamChunk(BaseModel, Generic[T]):
+	"""
+	One event of a streamed chat model invocation (see `astream` on the OpenAI, Anthropic and Google chat models).
+	"""
+
+	delta: str = ''
+	"""Newly generated output text. Raw JSON text when a structured output was requested."""
+
+	completion: ChatInvokeCompletion[T] | None = None
+	"""The final, fully parsed response. Only set on the last chunk of the stream."""
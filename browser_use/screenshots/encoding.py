@@ -0,0 +1,63 @@
+"""
+Image format helpers for screenshots.
+
+Screenshots travel through the agent as the base64 string CDP returned, in whatever format the browser profile asked
+for (`screenshot_format`). These helpers derive the format from the first base64 characters, so consumers can build
+data URLs and file names without decoding the image.
+"""
+
+import base64
+from io import BytesIO
+from typing import Literal
+
+ScreenshotFormat = Literal['png', 'jpeg', 'webp']
+
+# Base64 prefixes of the file signatures (PNG: \x89PNG\r\n\x1a\n, JPEG: \xff\xd8\xff, WebP: RIFF)
+_BASE64_SIGNATURES: dict[str, ScreenshotFormat] = {'iVBORw0KGgo': 'png', '/9j/': 'jpeg', 'UklGR': 'webp'}
+
+_FILE_EXTENSIONS: dict[ScreenshotFormat, str] = {'png': 'png', 'jpeg': 'jpg', 'webp': 'webp'}
+
+
+def detect_screenshot_format(screenshot_b64: str) -> ScreenshotFormat:
+	"""Image format of a base64 encoded screenshot, PNG if it is not recognized."""
+	for prefix, image_format in _BASE64_SIGNATURES.items():
+		if screenshot_b64.startswith(prefix):
+			return image_format
+	return 'png'
+
+
+def screenshot_media_type(screenshot_b64: str) -> Literal['image/png', 'image/jpeg', 'image/webp']:
+	return f'image/{detect_screenshot_format(screenshot_b64)}'  # type: ignore[return-value]
+
+
+def screenshot_data_url(screenshot_b64: str) -> str:
+	return f'data:{screenshot_media_type(screenshot_b64)};base64,{screenshot_b64}'
+
+
+def screenshot_file_extension(screenshot_b64: str) -> str:
+	return _FILE_EXTENSIONS[detect_screenshot_format(screenshot_b64)]
+
+
+def resize_screenshot(screenshot_b64: str, size: tuple[int, int], quality: int | None = None) -> str:
+	"""Resize a base64 encoded screenshot to exactly `size`, keeping its image format.
+
+	Returns the input unchanged if it already has that size (give or take a pixel of rounding), e.g. because the
+	browser downscaled it while capturing. `quality` is the jpeg/webp compression quality (0-100) to re-encode with, the
+	one the browser captured with (`BrowserProfile.screenshot_quality`), None for Pillow's default.
+	"""
+	from PIL import Image
+
+	image = Image.open(BytesIO(base64.b64decode(screenshot_b64)))
+	if abs(image.size[0] - size[0]) <= 1 and abs(image.size[1] - size[1]) <= 1:
+		return screenshot_b64
+
+	image_format = detect_screenshot_format(screenshot_b64)
+	resized = image.resize(size, Image.Resampling.LANCZOS)
+	if image_format == 'jpeg' and resized.mode != 'RGB':
+		resized = resized.convert('RGB')
+	buffer = BytesIO()
+	if quality is not None and image_format != 'png':
+		resized.save(buffer, format=image_format.upper(), quality=quality)
+	else:
+		resized.save(buffer, format=image_format.upper())
+	return base64.b64encode(buffer.getvalue()).decode('utf-8')
@@ -2,5 +2,6 @@
 
 from browser_use.sync.auth import CloudAuthConfig, DeviceAuthClient
 from browser_use.sync.service import CloudSync
+from browser_use.sync.uploader import EventUploader
 
-__all__ = ['CloudAuthConfig', 'DeviceAuthClient', 'CloudSync']
+__all__ = ['CloudAuthConfig', 'DeviceAuthClient', 'CloudSync', 'EventUploader']
@@ -4,11 +4,11 @@ Cloud sync service for sending events to the Browser Use cloud.
 
 import logging
 
-import httpx
 from bubus import BaseEvent
 
 from browser_use.config import CONFIG
 from browser_use.sync.auth import TEMP_USER_ID, DeviceAuthClient
+from browser_use.sync.uploader import EventUploader
 
 logger = logging.getLogger(__name__)
 
@@ -16,7 +16,12 @@ logger = logging.getLogger(__name__)
 class CloudSync:
 	"""Service for syncing events to the Browser Use cloud"""
 
-	def __init__(self, base_url: str | None = None, allow_session_events_for_auth: bool = False):
+	def __init__(
+		self,
+		base_url: str | None = None,
+		allow_session_events_for_auth: bool = False,
+		uploader: EventUploader | None = None,
+	):
 		# Backend API URL for all API requests - can be passed directly or defaults to env var
 		self.base_url = base_url or CONFIG.BROWSER_USE_CLOUD_API_URL
 		self.auth_client = DeviceAuthClient(base_url=self.base_url)
@@ -25,6 +30,12 @@ class CloudSync:
 		self.auth_flow_active = False  # Flag to indicate auth flow is running
 		# Check if cloud sync is actually enabled - if not, we should remain silent
 		self.enabled = CONFIG.BROWSER_USE_CLOUD_SYNC
+		# Events are uploaded in batches by a background task, with a write-ahead log of unsent events
+		self.uploader = uploader or EventUploader(
+			endpoint=f'{self.base_url.rstrip("/")}/api/v1/events',
+			get_headers=self._get_headers,
+			wal_dir=CONFIG.BROWSER_USE_CONFIG_DIR / 'events',
+		)
 
 	async def handle_event(self, event: BaseEvent) -> None:
 		"""Handle an event by sending it to the cloud"""
@@ -55,10 +66,8 @@ class CloudSync:
 			logger.error(f'Failed to handle {event.event_type} event: {type(e).__name__}: {e}', exc_info=True)
 
 	async def _send_event(self, event: BaseEvent) -> None:
-		"""Send event to cloud API"""
+		"""Queue an event for upload to the cloud API, without waiting for the upload"""
 		try:
-			headers = {}
-
 			# Override user_id only if it's not already set to a specific value
 			# This allows CLI and other code to explicitly set temp user_id when needed
 			if self.auth_client and self.auth_client.is_authenticated:
@@ -71,72 +80,26 @@ class CloudSync:
 				if not hasattr(event, 'user_id') or not getattr(event, 'user_id', None):
 					setattr(event, 'user_id', TEMP_USER_ID)
 
-			# Add auth headers if available
-			if self.auth_client:
-				headers.update(self.auth_client.get_headers())
-
-			# Send event (batch format with direct BaseEvent serialization)
-			async with httpx.AsyncClient() as client:
-				# Serialize event and add device_id to all events
-				event_data = event.model_dump(mode='json')
-				if self.auth_client and self.auth_client.device_id:
-					event_data['device_id'] = self.auth_client.device_id
-
-				response = await client.post(
-					f'{self.base_url.rstrip("/")}/api/v1/events',
-					json={'events': [event_data]},
-					headers=headers,
-					timeout=10.0,
-				)
-
-				if response.status_code >= 400:
-					# Log error but don't raise - we want to fail silently
-					logger.debug(
-						f'Failed to send sync event: POST {response.request.url} {response.status_code} - {response.text}'
-					)
-		except httpx.TimeoutException:
-			logger.debug(f'Event send timed out after 10 seconds: {event}')
-		except httpx.ConnectError as e:
-			# logger.warning(f'⚠️ Failed to connect to cloud service at {self.base_url}: {e}')
-			pass
-		except httpx.HTTPError as e:
-			logger.debug(f'HTTP error sending event {event}: {type(e).__name__}: {e}')
+			# Serialize event and add device_id to all events
+			event_data = event.model_dump(mode='json')
+			if self.auth_client and self.auth_client.device_id:
+				event_data['device_id'] = self.auth_client.device_id
+
+			self.uploader.enqueue(event_data)
 		except Exception as e:
 			logger.debug(f'Unexpected error sending event {event}: {type(e).__name__}: {e}')
 
-	# async def _update_wal_user_ids(self, session_id: str) -> None:
-	# 	"""Update user IDs in WAL file after authentication"""
-	# 	try:
-	# 		assert self.auth_client, 'Cloud sync must be authenticated to update WAL user ID'
-
-	# 		wal_path = CONFIG.BROWSER_USE_CONFIG_DIR / 'events' / f'{session_id}.jsonl'
-	# 		if not await anyio.Path(wal_path).exists():
-	# 			raise FileNotFoundError(
-	# 				f'CloudSync failed to update saved event user_ids after auth: Agent EventBus WAL file not found: {wal_path}'
-	# 			)
-
-	# 		# Read all events
-	# 		events = []
-	# 		content = await anyio.Path(wal_path).read_text()
-	# 		for line in content.splitlines():
-	# 			if line.strip():
-	# 				events.append(json.loads(line))
-
-	# 		# Update user_id and device_id
-	# 		user_id = self.auth_client.user_id
-	# 		device_id = self.auth_client.device_id
-	# 		for event in events:
-	# 			if 'user_id' in event:
-	# 				event['user_id'] = user_id
-	# 			# Add device_id to all events
-	# 			event['device_id'] = device_id
-
-	# 		# Write back
-	# 		updated_content = '\n'.join(json.dumps(event) for event in events) + '\n'
-	# 		await anyio.Path(wal_path).write_text(updated_content)
-
-	# 	except Exception as e:
-	# 		logger.warning(f'Failed to update WAL user IDs: {e}')
+	def _get_headers(self) -> dict[str, str]:
+		# Looked up on every request, the CLI auth flow swaps the auth client while events are queued
+		return self.auth_client.get_headers() if self.auth_client else {}
+
+	async def flush(self, timeout: float | None = None) -> bool:
+		"""Wait until all handled events were uploaded, returns whether that happened within `timeout`"""
+		return await self.uploader.flush(timeout)
+
+	async def close(self, timeout: float = 5.0) -> None:
+		"""Upload the remaining events and stop the uploader, events that could not be sent are kept for the next run"""
+		await self.uploader.close(timeout)
 
 	def set_auth_flow_active(self) -> None:
 		"""Mark auth flow as active to allow all events"""
@@ -0,0 +1,334 @@
+"""
+Background uploader for cloud sync events.
+
+Events are queued in memory and uploaded by a single background task, so agent steps never wait on the network. The
+task batches events by count, size and time, gzips each batch and posts it with one pooled HTTP client, retrying with
+exponential backoff. Every batch is appended to a JSONL write-ahead log before it is posted, next to the offset up to
+which the API acknowledged it. Logs left behind by a process that exited before all of its events were uploaded are
+replayed by the next uploader.
+"""
+
+import asyncio
+import gzip
+import json
+import logging
+import time
+from collections.abc import Callable, Iterator
+from pathlib import Path
+
+import httpx
+from uuid_extensions import uuid7str
+
+from browser_use.utils import create_task_with_error_handling
+
+logger = logging.getLogger(__name__)
+
+# Write-ahead logs not modified for this long belong to a process that is gone, their events are replayed
+STALE_WAL_SECONDS = 10 * 60
+
+
+class EventUploader:
+	"""Queues serialized events and uploads them in batches from a background task, see the module docstring."""
+
+	def __init__(
+		self,
+		endpoint: str,
+		get_headers: Callable[[], dict[str, str]],
+		wal_dir: Path | None = None,
+		max_queue_size: int = 1000,
+		max_batch_events: int = 100,
+		max_batch_bytes: int = 4_000_000,
+		flush_interval: float = 1.0,
+		max_retries: int = 5,
+		retry_backoff: float = 0.5,
+		compress: bool = True,
+		timeout: float = 10.0,
+		http_client: httpx.AsyncClient | None = None,
+	):
+		"""
+		Args:
+			endpoint: URL the batches are posted to, as {"events": [...]}
+			get_headers: Returns the headers of a request, called for every request so auth changes are picked up
+			wal_dir: Directory of the write-ahead logs, no log is kept if None
+			max_queue_size: Events waiting to be uploaded, newer events are dropped while the queue is full
+			max_batch_events: Maximum number of events in a batch
+			max_batch_bytes: A batch is sent once its serialized events reach this size
+			flush_interval: Seconds to wait for more events before a batch that is not full is sent
+			max_retries: Retries of a failed batch before the uploader goes offline and only writes the log
+			retry_backoff: Seconds before the first retry, doubled for every further retry
+			compress: Gzip the request bodies
+			timeout: Timeout of a request in seconds
+			http_client: Client to send the requests with, a pooled one is created (and closed) by the uploader if None
+		"""
+		self.endpoint = endpoint
+		self.get_headers = get_headers
+		self.max_batch_events = max_batch_events
+		self.max_batch_bytes = max_batch_bytes
+		self.flush_interval = flush_interval
+		self.max_retries = max_retries
+		self.retry_backoff = retry_backoff
+		self.compress = compress
+		self.timeout = timeout
+
+		self.wal_dir = wal_dir
+		self.wal_path = wal_dir / f'{uuid7str()}.jsonl' if wal_dir else None
+		self._wal_offset = 0
+		"""Bytes written to the write-ahead log"""
+		self._acked_offset = 0
+		"""Bytes of the write-ahead log that were uploaded"""
+
+		self._queue: asyncio.Queue[str] = asyncio.Queue(maxsize=max_queue_size)
+		self._worker: asyncio.Task[None] | None = None
+		self._client = http_client
+		self._owns_client = http_client is None
+		self._offline = False
+		self._closed = False
+		self.dropped_events = 0
+
+	def enqueue(self, event_data: dict) -> None:
+		"""Queue an event for upload without waiting, it must be JSON serializable"""
+		if self._closed:
+			return
+		try:
+			self._queue.put_nowait(json.dumps(event_data, separators=(',', ':')))
+		except asyncio.QueueFull:
+			self.dropped_events += 1
+			logger.debug(f'Dropped sync event {event_data.get("event_type")}, the upload queue is full')
+			return
+		if self._worker is None or self._worker.done():
+			self._worker = create_task_with_error_handling(self._run(), name='cloud_sync_uploader', suppress_exceptions=True)
+
+	async def flush(self, timeout: float | None = None) -> bool:
+		"""Wait until every queued event was uploaded (or written to the log while offline).
+
+		Returns:
+			Whether the queue was drained within `timeout`
+		"""
+		if self._worker is None or self._worker.done():
+			return self._queue.empty()
+		try:
+			await asyncio.wait_for(self._queue.join(), timeout)
+			return True
+		except TimeoutError:
+			return False
+
+	async def close(self, timeout: float = 5.0) -> None:
+		"""Flush, stop the background task and close the HTTP client.
+
+		Events that could not be uploaded stay in the write-ahead log for the next uploader, the log is deleted otherwise.
+		"""
+		if self._closed:
+			return
+		drained = await self.flush(timeout)
+		self._closed = True
+		if self._worker is not None and not self._worker.done():
+			self._worker.cancel()
+			try:
+				await self._worker
+			except asyncio.CancelledError:
+				pass
+
+		# Keep whatever is still queued for the next run
+		remaining: list[str] = []
+		while not self._queue.empty():
+			remaining.append(self._queue.get_nowait())
+			self._queue.task_done()
+		if remaining:
+			await self._write_ahead(remaining)
+
+		if self.wal_path is not None:
+			if drained and self._acked_offset == self._wal_offset:
+				await asyncio.to_thread(self._delete_log, self.wal_path)
+			else:
+				logger.debug(f'{self._wal_offset - self._acked_offset} bytes of sync events are left in {self.wal_path}')
+
+		if self._owns_client and self._client is not None:
+			await self._client.aclose()
+		self._client = None
+
+	async def _run(self) -> None:
+		await self._replay_stale_logs()
+		while True:
+			lines = await self._next_batch()
+			try:
+				await self._write_ahead(lines)
+				if not self._offline and await self._upload(lines):
+					await self._ack(self._wal_offset)
+			finally:
+				for _ in lines:
+					self._queue.task_done()
+
+	async def _next_batch(self) -> list[str]:
+		"""Wait for an event, then collect more until the batch is full or `flush_interval` has passed"""
+		lines = [await self._queue.get()]
+		size = len(lines[0])
+		loop = asyncio.get_running_loop()
+		deadline = loop.time() + self.flush_interval
+		while len(lines) < self.max_batch_events and size < self.max_batch_bytes:
+			try:
+				line = self._queue.get_nowait()
+			except asyncio.QueueEmpty:
+				remaining = deadline - loop.time()
+				if remaining <= 0:
+					break
+				try:
+					line = await asyncio.wait_for(self._queue.get(), remaining)
+				except TimeoutError:
+					break
+			lines.append(line)
+			size += len(line)
+		return lines
+
+	async def _upload(self, lines: list[str]) -> bool:
+		"""Post a batch, retrying with backoff.
+
+		Returns:
+			Whether the batch is done with: uploaded, or rejected by the API as invalid and dropped.
+			If it still fails after all retries, the uploader goes offline and False is returned.
+		"""
+		body = ('{"events":[' + ','.join(lines) + ']}').encode()
+		compressed = await asyncio.to_thread(gzip.compress, body, compresslevel=6) if self.compress else None
+		if self._client is None:
+			self._client = httpx.AsyncClient()
+
+		error = ''
+		for attempt in range(self.max_retries + 1):
+			if attempt:
+				await asyncio.sleep(min(self.retry_backoff * 2 ** (attempt - 1), 30.0))
+			headers = {**self.get_headers(), 'Content-Type': 'application/json'}
+			if compressed is not None:
+				headers['Content-Encoding'] = 'gzip'
+			try:
+				response = await self._client.post(
+					self.endpoint, content=compressed or body, headers=headers, timeout=self.timeout
+				)
+			except httpx.HTTPError as e:
+				error = f'{type(e).__name__}: {e}'
+				continue
+
+			if response.status_code == 415 and compressed is not None:
+				# The API does not accept gzip bodies, send them as they are from now on
+				self.compress = False
+				compressed = None
+				continue
+			if response.status_code < 400:
+				return True
+			if response.status_code != 429 and response.status_code < 500:
+				# Retrying a request the API rejects won't help, drop it
+				logger.debug(
+					f'Failed to send {len(lines)} sync events: POST {response.request.url} {response.status_code} - {response.text}'
+				)
+				return True
+			error = f'{response.status_code} - {response.text}'
+
+		logger.debug(
+			f'Failed to send {len(lines)} sync events after {self.max_retries + 1} attempts ({error}), '
+			f'keeping further events in {self.wal_path} for the next run'
+		)
+		self._offline = True
+		return False
+
+	async def _write_ahead(self, lines: list[str]) -> None:
+		if self.wal_path is None:
+			return
+		data = ''.join(line + '\n' for line in lines).encode()
+		try:
+			await asyncio.to_thread(self._append_to_log, self.wal_path, data)
+		except OSError as e:
+			logger.debug(f'Failed to write sync events to {self.wal_path}, continuing without a log: {e}')
+			self.wal_path = None
+			return
+		self._wal_offset += len(data)
+
+	async def _ack(self, offset: int) -> None:
+		self._acked_offset = offset
+		if self.wal_path is not None:
+			try:
+				await asyncio.to_thread(self._offset_path(self.wal_path).write_text, str(offset))
+			except OSError as e:
+				logger.debug(f'Failed to save the upload offset of {self.wal_path}: {e}')
+
+	async def _replay_stale_logs(self) -> None:
+		"""Upload the events left in the logs of processes that exited before uploading them"""
+		if self.wal_dir is None:
+			return
+		try:
+			paths = await asyncio.to_thread(self._find_stale_logs)
+		except OSError:
+			return
+		for path in paths:
+			if self._offline:
+				return
+			# Claim the log so that another process doesn't replay it too
+			replaying_path = path.with_suffix('.replaying')
+			try:
+				await asyncio.to_thread(path.rename, replaying_path)
+			except OSError:
+				continue
+			offset_path = self._offset_path(path)
+			try:
+				offset = int(await asyncio.to_thread(offset_path.read_text)) if offset_path.exists() else 0
+				data = await asyncio.to_thread(replaying_path.read_bytes)
+			except (OSError, ValueError) as e:
+				logger.debug(f'Failed to read the sync event log {path}, leaving it for the next run: {e}')
+				await self._release_log(replaying_path, path)
+				continue
+			logger.debug(f'Replaying {len(data) - offset} bytes of sync events from {path}')
+
+			for lines, end in self._batches(data, offset):
+				if not await self._upload(lines):
+					break
+				await asyncio.to_thread(offset_path.write_text, str(end))
+			else:
+				await asyncio.to_thread(self._delete_log, replaying_path, offset_path)
+				continue
+			# Still offline, leave the rest for the next run
+			await self._release_log(replaying_path, path)
+
+	async def _release_log(self, replaying_path: Path, path: Path) -> None:
+		"""Give up a claimed log, so that the next uploader replays it"""
+		try:
+			await asyncio.to_thread(replaying_path.rename, path)
+		except OSError as e:
+			logger.debug(f'Failed to release the sync event log {replaying_path}: {e}')
+
+	def _batches(self, data: bytes, offset: int) -> Iterator[tuple[list[str], int]]:
+		"""Split log data after `offset` into batches, yielding each with the offset of its end"""
+		lines: list[str] = []
+		size = 0
+		for raw_line in data[offset:].splitlines(keepends=True):
+			offset += len(raw_line)
+			line = raw_line.decode().strip()
+			if line:
+				lines.append(line)
+				size += len(line)
+			if len(lines) >= self.max_batch_events or size >= self.max_batch_bytes:
+				yield lines, offset
+				lines, size = [], 0
+		if lines:
+			yield lines, offset
+
+	def _find_stale_logs(self) -> list[Path]:
+		assert self.wal_dir is not None
+		if not self.wal_dir.exists():
+			return []
+		now = time.time()
+		return sorted(
+			path
+			for path in self.wal_dir.glob('*.jsonl')
+			if path != self.wal_path and now - path.stat().st_mtime > STALE_WAL_SECONDS
+		)
+
+	@staticmethod
+	def _offset_path(wal_path: Path) -> Path:
+		return wal_path.with_suffix('.offset')
+
+	@staticmethod
+	def _append_to_log(path: Path, data: bytes) -> None:
+		path.parent.mkdir(parents=True, exist_ok=True)
+		with path.open('ab') as f:
+			f.write(data)
+
+	def _delete_log(self, path: Path, offset_path: Path | None = None) -> None:
+		path.unlink(missing_ok=True)
+		(offset_path or self._offset_path(path)).unlink(missing_ok=True)
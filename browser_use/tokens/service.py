@@ -3,10 +3,17 @@ Token cost service that tracks LLM token usage and costs.
 
 Fetches pricing data from LiteLLM repository and caches it for 1 day.
 Automatically tracks token usage when LLMs are registered and invoked.
+
+Usage is aggregated as it is added: per model, running token counters are kept per time bucket together with
+cumulative totals, so summaries (also over `since=` windows) are answered from the counters instead of rescanning the
+usage history. Costs are linear in the token counts of a model, they are computed from the aggregated counters with
+the model's (memoized) pricing.
 """
 
+import bisect
 import logging
 import os
+from dataclasses import dataclass, fields
 from datetime import datetime, timedelta
 from pathlib import Path
 from typing import Any
@@ -16,6 +23,7 @@ import httpx
 from dotenv import load_dotenv
 
 from browser_use.llm.base import BaseChatModel
+from browser_use.llm.streaming import supports_streaming
 from browser_use.llm.views import ChatInvokeUsage
 from browser_use.tokens.custom_pricing import CUSTOM_MODEL_PRICING
 from browser_use.tokens.mappings import MODEL_TO_LITELLM
@@ -45,19 +53,91 @@ def xdg_cache_home() -> Path:
 	return default
 
 
+@dataclass
+class _UsageCounters:
+	"""Summed token counts of a set of usage entries"""
+
+	prompt_tokens: int = 0
+	prompt_cached_tokens: int = 0
+	prompt_cache_creation_tokens: int = 0
+	completion_tokens: int = 0
+	invocations: int = 0
+
+	def add(self, usage: ChatInvokeUsage, sign: int = 1) -> None:
+		self.prompt_tokens += sign * usage.prompt_tokens
+		self.prompt_cached_tokens += sign * (usage.prompt_cached_tokens or 0)
+		self.prompt_cache_creation_tokens += sign * (usage.prompt_cache_creation_tokens or 0)
+		self.completion_tokens += sign * usage.completion_tokens
+		self.invocations += sign
+
+	def __sub__(self, other: '_UsageCounters') -> '_UsageCounters':
+		return _UsageCounters(*(getattr(self, f.name) - getattr(other, f.name) for f in fields(self)))
+
+	def __iadd__(self, other: '_UsageCounters') -> '_UsageCounters':
+		for f in fields(self):
+			setattr(self, f.name, getattr(self, f.name) + getattr(other, f.name))
+		return self
+
+	def copy(self) -> '_UsageCounters':
+		return _UsageCounters(*(getattr(self, f.name) for f in fields(self)))
+
+
+@dataclass
+class _ModelUsageBuckets:
+	"""Usage of one model per time bucket, stored as cumulative counters so any window is a single subtraction"""
+
+	bucket_keys: list[int]
+	"""Bucket numbers (timestamp // bucket width), ascending"""
+	cumulative: list[_UsageCounters]
+	"""Totals of all usage up to and including the bucket at the same position"""
+
+	@property
+	def totals(self) -> _UsageCounters:
+		return self.cumulative[-1]
+
+	def add(self, bucket_key: int, usage: ChatInvokeUsage) -> None:
+		# Usage reported with an earlier timestamp (clock adjustments) is counted in the latest bucket
+		if bucket_key > self.bucket_keys[-1]:
+			self.bucket_keys.append(bucket_key)
+			self.cumulative.append(self.cumulative[-1].copy())
+		self.cumulative[-1].add(usage)
+
+	def before(self, bucket_key: int) -> _UsageCounters:
+		"""Totals of all buckets before `bucket_key`"""
+		index = bisect.bisect_left(self.bucket_keys, bucket_key)
+		return self.cumulative[index - 1].copy() if index > 0 else _UsageCounters()
+
+
 class TokenCost:
 	"""Service for tracking token usage and calculating costs"""
 
 	CACHE_DIR_NAME = 'browser_use/token_cost'
 	CACHE_DURATION = timedelta(days=1)
 	PRICING_URL = 'https://raw.githubusercontent.com/BerriAI/litellm/main/model_prices_and_context_window.json'
-
-	def __init__(self, include_cost: bool = False):
+	USAGE_BUCKET_SECONDS = 60
+
+	def __init__(
+		self,
+		include_cost: bool = False,
+		max_history_entries: int | None = None,
+		history_spill_path: str | Path | None = None,
+	):
+		"""
+		Args:
+			include_cost: Calculate costs from LiteLLM pricing data (also enabled by BROWSER_USE_CALCULATE_COST=true)
+			max_history_entries: Keep only about this many recent entries in `usage_history` (up to 10% more before
+				older ones are dropped in a batch). Summaries stay exact, they are answered from aggregated counters.
+			history_spill_path: Append entries dropped from `usage_history` to this JSONL file instead of discarding them
+		"""
 		self.include_cost = include_cost or os.getenv('BROWSER_USE_CALCULATE_COST', 'false').lower() == 'true'
 
 		self.usage_history: list[TokenUsageEntry] = []
+		self.max_history_entries = max_history_entries
+		self.history_spill_path = Path(history_spill_path) if history_spill_path else None
 		self.registered_llms: dict[str, BaseChatModel] = {}
+		self._usage_by_model: dict[str, _ModelUsageBuckets] = {}
 		self._pricing_data: dict[str, Any] | None = None
+		self._pricing_by_model: dict[str, ModelPricing | None] = {}
 		self._initialized = False
 		self._cache_dir = xdg_cache_home() / self.CACHE_DIR_NAME
 
@@ -128,6 +208,7 @@ class TokenCost:
 			content = await anyio.Path(cache_file).read_text()
 			cached = CachedPricingData.model_validate_json(content)
 			self._pricing_data = cached.data
+			self._pricing_by_model.clear()
 		except Exception as e:
 			logger.debug(f'Error loading cached pricing data from {cache_file}: {e}')
 			# Fall back to fetching
@@ -141,6 +222,7 @@ class TokenCost:
 				response.raise_for_status()
 
 				self._pricing_data = response.json()
+				self._pricing_by_model.clear()
 
 			# Create cache object with timestamp
 			cached = CachedPricingData(timestamp=datetime.now(), data=self._pricing_data or {})
@@ -157,6 +239,7 @@ class TokenCost:
 			logger.debug(f'Error fetching pricing data: {e}')
 			# Fall back to empty pricing data
 			self._pricing_data = {}
+			self._pricing_by_model.clear()
 
 	async def get_model_pricing(self, model_name: str) -> ModelPricing | None:
 		"""Get pricing information for a specific model"""
@@ -164,6 +247,11 @@ class TokenCost:
 		if not self._initialized:
 			await self.initialize()
 
+		if model_name not in self._pricing_by_model:
+			self._pricing_by_model[model_name] = self._lookup_model_pricing(model_name)
+		return self._pricing_by_model[model_name]
+
+	def _lookup_model_pricing(self, model_name: str) -> ModelPricing | None:
 		# Check custom pricing first
 		if model_name in CUSTOM_MODEL_PRICING:
 			data = CUSTOM_MODEL_PRICING[model_name]
@@ -204,28 +292,61 @@ class TokenCost:
 		if data is None:
 			return None
 
-		uncached_prompt_tokens = usage.prompt_tokens - (usage.prompt_cached_tokens or 0)
+		return self._cost_from_tokens(
+			data,
+			prompt_tokens=usage.prompt_tokens,
+			prompt_cached_tokens=usage.prompt_cached_tokens,
+			prompt_cache_creation_tokens=usage.prompt_cache_creation_tokens,
+			completion_tokens=usage.completion_tokens,
+		)
+
+	@staticmethod
+	def _cost_from_tokens(
+		data: ModelPricing,
+		prompt_tokens: int,
+		prompt_cached_tokens: int | None,
+		prompt_cache_creation_tokens: int | None,
+		completion_tokens: int,
+	) -> TokenCostCalculated:
+		"""Cost of a token count, works for single calls and for summed counters alike (costs are linear)"""
+		uncached_prompt_tokens = prompt_tokens - (prompt_cached_tokens or 0)
 
 		return TokenCostCalculated(
-			new_prompt_tokens=usage.prompt_tokens,
+			new_prompt_tokens=prompt_tokens,
 			new_prompt_cost=uncached_prompt_tokens * (data.input_cost_per_token or 0),
 			# Cached tokens
-			prompt_read_cached_tokens=usage.prompt_cached_tokens,
-			prompt_read_cached_cost=usage.prompt_cached_tokens * data.cache_read_input_token_cost
-			if usage.prompt_cached_tokens and data.cache_read_input_token_cost
+			prompt_read_cached_tokens=prompt_cached_tokens,
+			prompt_read_cached_cost=prompt_cached_tokens * data.cache_read_input_token_cost
+			if prompt_cached_tokens and data.cache_read_input_token_cost
 			else None,
 			# Cache creation tokens
-			prompt_cached_creation_tokens=usage.prompt_cache_creation_tokens,
-			prompt_cache_creation_cost=usage.prompt_cache_creation_tokens * data.cache_creation_input_token_cost
-			if data.cache_creation_input_token_cost and usage.prompt_cache_creation_tokens
+			prompt_cached_creation_tokens=prompt_cache_creation_tokens,
+			prompt_cache_creation_cost=prompt_cache_creation_tokens * data.cache_creation_input_token_cost
+			if data.cache_creation_input_token_cost and prompt_cache_creation_tokens
 			else None,
 			# Completion tokens
-			completion_tokens=usage.completion_tokens,
-			completion_cost=usage.completion_tokens * float(data.output_cost_per_token or 0),
+			completion_tokens=completion_tokens,
+			completion_cost=completion_tokens * float(data.output_cost_per_token or 0),
+		)
+
+	async def _calculate_counters_cost(self, model: str, counters: _UsageCounters) -> TokenCostCalculated | None:
+		if not self.include_cost or counters.invocations == 0:
+			return None
+
+		data = await self.get_model_pricing(model)
+		if data is None:
+			return None
+
+		return self._cost_from_tokens(
+			data,
+			prompt_tokens=counters.prompt_tokens,
+			prompt_cached_tokens=counters.prompt_cached_tokens,
+			prompt_cache_creation_tokens=counters.prompt_cache_creation_tokens,
+			completion_tokens=counters.completion_tokens,
 		)
 
 	def add_usage(self, model: str, usage: ChatInvokeUsage) -> TokenUsageEntry:
-		"""Add token usage entry to history (without calculating cost)"""
+		"""Add token usage entry to history and to the aggregated counters (without calculating cost)"""
 		entry = TokenUsageEntry(
 			model=model,
 			timestamp=datetime.now(),
@@ -234,8 +355,61 @@ class TokenCost:
 
 		self.usage_history.append(entry)
 
+		bucket_key = self._bucket_key(entry.timestamp)
+		model_usage = self._usage_by_model.get(model)
+		if model_usage is None:
+			model_usage = self._usage_by_model[model] = _ModelUsageBuckets(
+				bucket_keys=[bucket_key], cumulative=[_UsageCounters()]
+			)
+		model_usage.add(bucket_key, usage)
+
+		if self.max_history_entries is not None:
+			overflow = len(self.usage_history) - self.max_history_entries
+			# Dropped in batches, removing one entry per call would shift the whole list every time
+			if overflow > max(self.max_history_entries // 10, 0):
+				self._evict_history(overflow)
+
 		return entry
 
+	def _evict_history(self, count: int) -> None:
+		evicted = self.usage_history[:count]
+		del self.usage_history[:count]
+		if self.history_spill_path is None:
+			return
+		try:
+			self.history_spill_path.parent.mkdir(parents=True, exist_ok=True)
+			with open(self.history_spill_path, 'a', encoding='utf-8') as f:
+				f.writelines(entry.model_dump_json() + '\n' for entry in evicted)
+		except Exception as e:
+			logger.debug(f'Failed to spill {len(evicted)} token usage entries to {self.history_spill_path}: {e}')
+
+	def _bucket_key(self, timestamp: datetime) -> int:
+		return int(timestamp.timestamp() // self.USAGE_BUCKET_SECONDS)
+
+	def _get_counters(self, model: str, since: datetime | None = None) -> _UsageCounters:
+		"""Usage counters of a model, optionally only for usage at or after `since`.
+
+		Whole buckets are answered from the cumulative counters. Entries of the bucket `since` falls into that are
+		older than `since` are subtracted using the retained history, if they were already evicted the window is
+		exact to the bucket.
+		"""
+		model_usage = self._usage_by_model.get(model)
+		if model_usage is None:
+			return _UsageCounters()
+		if since is None:
+			return model_usage.totals.copy()
+
+		since_bucket = self._bucket_key(since)
+		counters = model_usage.totals - model_usage.before(since_bucket)
+
+		bucket_start = datetime.fromtimestamp(since_bucket * self.USAGE_BUCKET_SECONDS)
+		start = bisect.bisect_left(self.usage_history, bucket_start, key=lambda e: e.timestamp)
+		end = bisect.bisect_left(self.usage_history, since, lo=start, key=lambda e: e.timestamp)
+		for entry in self.usage_history[start:end]:
+			if entry.model == model:
+				counters.add(entry.usage, sign=-1)
+		return counters
+
 	# async def _log_non_usage_llm(self, llm: BaseChatModel) -> None:
 	# 	"""Log non-usage to the logger"""
 	# 	C_CYAN = '\033[96m'
@@ -291,7 +465,9 @@ class TokenCost:
 					parts.append(f'🆕 {C_YELLOW}{new_tokens_fmt}{C_RESET}')
 
 			if usage.prompt_cached_tokens:
-				cached_tokens_fmt = self._format_tokens(usage.prompt_cached_tokens)
+				cached_tokens_fmt = (
+					f'{self._format_tokens(usage.prompt_cached_tokens)} {usage.prompt_cached_tokens / usage.prompt_tokens:.0%}'
+				)
 				if self.include_cost and cost and cost.prompt_read_cached_cost:
 					parts.append(f'💾 {C_BLUE}{cached_tokens_fmt} (${cost.prompt_read_cached_cost:.4f}){C_RESET}')
 				else:
@@ -360,31 +536,45 @@ class TokenCost:
 		# Using setattr to avoid type checking issues with overloaded methods
 		setattr(llm, 'ainvoke', tracked_ainvoke)
 
+		# Streaming is optional, usage arrives with the final chunk of the stream
+		if supports_streaming(llm):
+			original_astream = llm.astream
+
+			async def tracked_astream(messages, output_format=None):
+				async for chunk in original_astream(messages, output_format):
+					if chunk.completion is not None and chunk.completion.usage:
+						usage = token_cost_service.add_usage(llm.model, chunk.completion.usage)
+
+						logger.debug(f'Token cost service: {usage}')
+
+						create_task_with_error_handling(
+							token_cost_service._log_usage(llm.model, usage), name='log_token_usage', suppress_exceptions=True
+						)
+					yield chunk
+
+			setattr(llm, 'astream', tracked_astream)
+
 		return llm
 
 	def get_usage_tokens_for_model(self, model: str) -> ModelUsageTokens:
 		"""Get usage tokens for a specific model"""
-		filtered_usage = [u for u in self.usage_history if u.model == model]
+		counters = self._get_counters(model)
 
 		return ModelUsageTokens(
 			model=model,
-			prompt_tokens=sum(u.usage.prompt_tokens for u in filtered_usage),
-			prompt_cached_tokens=sum(u.usage.prompt_cached_tokens or 0 for u in filtered_usage),
-			completion_tokens=sum(u.usage.completion_tokens for u in filtered_usage),
-			total_tokens=sum(u.usage.prompt_tokens + u.usage.completion_tokens for u in filtered_usage),
+			prompt_tokens=counters.prompt_tokens,
+			prompt_cached_tokens=counters.prompt_cached_tokens,
+			completion_tokens=counters.completion_tokens,
+			total_tokens=counters.prompt_tokens + counters.completion_tokens,
 		)
 
 	async def get_usage_summary(self, model: str | None = None, since: datetime | None = None) -> UsageSummary:
-		"""Get summary of token usage and costs (costs calculated on-the-fly)"""
-		filtered_usage = self.usage_history
-
-		if model:
-			filtered_usage = [u for u in filtered_usage if u.model == model]
+		"""Get summary of token usage and costs, computed from the aggregated counters"""
+		models = [model] if model else list(self._usage_by_model)
+		counters_by_model = {m: self._get_counters(m, since) for m in models}
+		counters_by_model = {m: counters for m, counters in counters_by_model.items() if counters.invocations > 0}
 
-		if since:
-			filtered_usage = [u for u in filtered_usage if u.timestamp >= since]
-
-		if not filtered_usage:
+		if not counters_by_model:
 			return UsageSummary(
 				total_prompt_tokens=0,
 				total_prompt_cost=0.0,
@@ -398,41 +588,37 @@ class TokenCost:
 			)
 
 		# Calculate totals
-		total_prompt = sum(u.usage.prompt_tokens for u in filtered_usage)
-		total_completion = sum(u.usage.completion_tokens for u in filtered_usage)
+		all_counters = _UsageCounters()
+		for counters in counters_by_model.values():
+			all_counters += counters
+		total_prompt = all_counters.prompt_tokens
+		total_completion = all_counters.completion_tokens
 		total_tokens = total_prompt + total_completion
-		total_prompt_cached = sum(u.usage.prompt_cached_tokens or 0 for u in filtered_usage)
-		models = list({u.model for u in filtered_usage})
+		total_prompt_cached = all_counters.prompt_cached_tokens
 
-		# Calculate per-model stats with record-by-record cost calculation
+		# Calculate per-model stats, costs are linear in the token counts so they are computed once per model
 		model_stats: dict[str, ModelUsageStats] = {}
 		total_prompt_cost = 0.0
 		total_completion_cost = 0.0
 		total_prompt_cached_cost = 0.0
 
-		for entry in filtered_usage:
-			if entry.model not in model_stats:
-				model_stats[entry.model] = ModelUsageStats(model=entry.model)
-
-			stats = model_stats[entry.model]
-			stats.prompt_tokens += entry.usage.prompt_tokens
-			stats.completion_tokens += entry.usage.completion_tokens
-			stats.total_tokens += entry.usage.prompt_tokens + entry.usage.completion_tokens
-			stats.invocations += 1
+		for model_name, counters in counters_by_model.items():
+			stats = model_stats[model_name] = ModelUsageStats(
+				model=model_name,
+				prompt_tokens=counters.prompt_tokens,
+				prompt_cached_tokens=counters.prompt_cached_tokens,
+				completion_tokens=counters.completion_tokens,
+				total_tokens=counters.prompt_tokens + counters.completion_tokens,
+				invocations=counters.invocations,
+			)
+			stats.average_tokens_per_invocation = stats.total_tokens / stats.invocations
 
-			if self.include_cost:
-				# Calculate cost record by record using the updated calculate_cost function
-				cost = await self.calculate_cost(entry.model, entry.usage)
-				if cost:
-					stats.cost += cost.total_cost
-					total_prompt_cost += cost.prompt_cost
-					total_completion_cost += cost.completion_cost
-					total_prompt_cached_cost += cost.prompt_read_cached_cost or 0
-
-		# Calculate averages
-		for stats in model_stats.values():
-			if stats.invocations > 0:
-				stats.average_tokens_per_invocation = stats.total_tokens / stats.invocations
+			cost = await self._calculate_counters_cost(model_name, counters)
+			if cost:
+				stats.cost = cost.total_cost
+				total_prompt_cost += cost.prompt_cost
+				total_completion_cost += cost.completion_cost
+				total_prompt_cached_cost += cost.prompt_read_cached_cost or 0
 
 		return UsageSummary(
 			total_prompt_tokens=total_prompt,
@@ -443,7 +629,7 @@ class TokenCost:
 			total_completion_cost=total_completion_cost,
 			total_tokens=total_tokens,
 			total_cost=total_prompt_cost + total_completion_cost + total_prompt_cached_cost,
-			entry_count=len(filtered_usage),
+			entry_count=all_counters.invocations,
 			by_model=model_stats,
 		)
 
@@ -459,7 +645,7 @@ class TokenCost:
 
 	async def log_usage_summary(self) -> None:
 		"""Log a comprehensive usage summary per model with colors and nice formatting"""
-		if not self.usage_history:
+		if not self._usage_by_model:
 			return
 
 		summary = await self.get_usage_summary()
@@ -506,19 +692,10 @@ class TokenCost:
 
 			# Format cost display (only if cost tracking is enabled)
 			if self.include_cost:
-				# Calculate per-model costs on-the-fly
-				total_model_cost = 0.0
-				model_prompt_cost = 0.0
-				model_completion_cost = 0.0
-
-				# Calculate costs for this model
-				for entry in self.usage_history:
-					if entry.model == model:
-						cost = await self.calculate_cost(entry.model, entry.usage)
-						if cost:
-							model_prompt_cost += cost.prompt_cost
-							model_completion_cost += cost.completion_cost
-
+				# Per-model prompt/completion split of the cost
+				cost = await self._calculate_counters_cost(model, self._get_counters(model))
+				model_prompt_cost = cost.prompt_cost if cost else 0.0
+				model_completion_cost = cost.completion_cost if cost else 0.0
 				total_model_cost = model_prompt_cost + model_completion_cost
 
 				if total_model_cost > 0:
@@ -533,6 +710,8 @@ class TokenCost:
 				cost_part = ''
 				prompt_part = f'{C_YELLOW}{model_prompt_fmt}{C_RESET}'
 				completion_part = f'{C_GREEN}{model_completion_fmt}{C_RESET}'
+			if stats.prompt_cached_tokens:
+				prompt_part += f' 💾 {stats.cached_prompt_ratio:.0%}'
 
 			cost_logger.debug(
 				f'  🤖 {C_CYAN}{model}{C_RESET}: {C_BLUE}{model_total_fmt} tokens{C_RESET}{cost_part} | '
@@ -546,8 +725,9 @@ class TokenCost:
 		return summary.by_model
 
 	def clear_history(self) -> None:
-		"""Clear usage history"""
+		"""Clear usage history and the aggregated counters"""
 		self.usage_history = []
+		self._usage_by_model = {}
 
 	async def refresh_pricing_data(self) -> None:
 		"""Force refresh of pricing data from GitHub"""
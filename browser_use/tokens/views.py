@@ -15,6 +15,13 @@ class TokenUsageEntry(BaseModel):
 	timestamp: datetime
 	usage: ChatInvokeUsage
 
+	@property
+	def cached_prompt_ratio(self) -> float:
+		"""Share of the prompt tokens that were read from the provider's prompt cache"""
+		if not self.usage.prompt_tokens:
+			return 0.0
+		return (self.usage.prompt_cached_tokens or 0) / self.usage.prompt_tokens
+
 
 class TokenCostCalculated(BaseModel):
 	"""Token cost"""
@@ -73,12 +80,18 @@ class ModelUsageStats(BaseModel):
 
 	model: str
 	prompt_tokens: int = 0
+	prompt_cached_tokens: int = 0
 	completion_tokens: int = 0
 	total_tokens: int = 0
 	cost: float = 0.0
 	invocations: int = 0
 	average_tokens_per_invocation: float = 0.0
 
+	@property
+	def cached_prompt_ratio(self) -> float:
+		"""Share of the prompt tokens that were read from the provider's prompt cache"""
+		return self.prompt_cached_tokens / self.prompt_tokens if self.prompt_tokens else 0.0
+
 
 class ModelUsageTokens(BaseModel):
 	"""Usage tokens for a single model"""
@@ -106,3 +119,8 @@ class UsageSummary(BaseModel):
 	entry_count: int
 
 	by_model: dict[str, ModelUsageStats] = Field(default_factory=dict)
+
+	@property
+	def cached_prompt_ratio(self) -> float:
+		"""Share of the prompt tokens that were read from the provider's prompt cache"""
+		return self.total_prompt_cached_tokens / self.total_prompt_tokens if self.total_prompt_tokens else 0.0
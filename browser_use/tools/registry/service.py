@@ -25,6 +25,7 @@ from browser_use.tools.registry.views import (
 from browser_use.utils import is_new_tab_page, match_url_with_domain_pattern, time_execution_async
 
 Context = TypeVar('Context')
+T = TypeVar('T')
 
 logger = logging.getLogger(__name__)
 
@@ -37,6 +38,8 @@ class Registry(Generic[Context]):
 		self.telemetry = ProductTelemetry()
 		# Create a new list to avoid mutable default argument issues
 		self.exclude_actions = list(exclude_actions) if exclude_actions is not None else []
+		# Action models and prompt descriptions, memoized per set of available actions, see _cached()
+		self._cache: dict[tuple, tuple[tuple[RegisteredAction, ...], Any]] = {}
 
 	def exclude_action(self, action_name: str) -> None:
 		"""Exclude an action from the registry after initialization.
@@ -51,8 +54,24 @@ class Registry(Generic[Context]):
 		# Remove from registry if already registered
 		if action_name in self.registry.actions:
 			del self.registry.actions[action_name]
+			self._cache.clear()
 			logger.debug(f'Excluded action "{action_name}" from registry')
 
+	def _cached(self, kind: str, actions: dict[str, RegisteredAction], build: Callable[[], T]) -> T:
+		"""Build something from a set of actions once, e.g. the action model for the actions available on a page.
+
+		The cache is keyed by the names and identities of the actions, so registering or replacing an action (even
+		directly in `self.registry.actions`) leads to a new entry. It is also cleared when actions are registered or
+		excluded through the registry.
+		"""
+		key = (kind, *((name, id(action)) for name, action in actions.items()))
+		cached = self._cache.get(key)
+		if cached is None:
+			# The actions are kept with the result so their ids can't be reused while it is cached
+			cached = (tuple(actions.values()), build())
+			self._cache[key] = cached
+		return cached[1]
+
 	def _get_special_param_types(self) -> dict[str, type | UnionType | None]:
 		"""Get the expected types for special parameters from SpecialActionParameters"""
 		# Manually define the expected types to avoid issues with Optional handling.
@@ -292,8 +311,13 @@ class Registry(Generic[Context]):
 		param_model: type[BaseModel] | None = None,
 		domains: list[str] | None = None,
 		allowed_domains: list[str] | None = None,
+		mutates_page: bool = True,
 	):
-		"""Decorator for registering actions"""
+		"""Decorator for registering actions
+
+		Set `mutates_page=False` for actions that never change the page (e.g. reading it or writing files), so the
+		agent can run them concurrently with each other and skip the wait between actions for them.
+		"""
 		# Handle aliases: domains and allowed_domains are the same parameter
 		if allowed_domains is not None and domains is not None:
 			raise ValueError("Cannot specify both 'domains' and 'allowed_domains' - they are aliases for the same parameter")
@@ -314,8 +338,10 @@ class Registry(Generic[Context]):
 				function=normalized_func,
 				param_model=actual_param_model,
 				domains=final_domains,
+				mutates_page=mutates_page,
 			)
 			self.registry.actions[func.__name__] = action
+			self._cache.clear()
 
 			# Return the normalized function so it can be called with kwargs
 			return normalized_func
@@ -495,9 +521,10 @@ class Registry(Generic[Context]):
 
 		Each action model contains only the specific action being used,
 		rather than all actions with most set to None.
-		"""
-		from typing import Union
 
+		Models are memoized per set of available actions, so the same class is returned on every page with the same
+		actions (and e.g. output models and JSON schemas built from it can be cached by the caller).
+		"""
 		# Filter actions based on page_url if provided:
 		#   if page_url is None, only include actions with no filters
 		#   if page_url is provided, only include actions that match the URL
@@ -520,6 +547,11 @@ class Registry(Generic[Context]):
 			if domain_is_allowed:
 				available_actions[name] = action
 
+		return self._cached('action_model', available_actions, lambda: self._build_action_model(available_actions))
+
+	def _build_action_model(self, available_actions: dict[str, RegisteredAction]) -> type[ActionModel]:
+		from typing import Union
+
 		# Create individual action models for each action
 		individual_action_models: list[type[BaseModel]] = []
 
@@ -583,4 +615,26 @@ class Registry(Generic[Context]):
 		If page_url is provided, only include actions that are available for that URL
 		based on their domain filters
 		"""
-		return self.registry.get_prompt_description(page_url=page_url)
+		if page_url is None:
+			actions = {name: action for name, action in self.registry.actions.items() if action.domains is None}
+		else:
+			# Actions without domain filters are already in the system prompt
+			actions = {
+				name: action
+				for name, action in self.registry.actions.items()
+				if action.domains and self.registry._match_domains(action.domains, page_url)
+			}
+		return self._cached(
+			'prompt_description', actions, lambda: '\n'.join(action.prompt_description() for action in actions.values())
+		)
+
+	def action_mutates_page(self, action: ActionModel) -> bool:
+		"""Whether executing `action` can change the page, True for unknown actions"""
+		action_names = action.model_dump(exclude_unset=True).keys()
+		if not action_names:
+			return True
+		for action_name in action_names:
+			registered_action = self.registry.actions.get(action_name)
+			if registered_action is None or registered_action.mutates_page:
+				return True
+		return False
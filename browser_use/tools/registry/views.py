@@ -22,6 +22,9 @@ class RegisteredAction(BaseModel):
 	# filters: provide specific domains to determine whether the action should be available on the given URL or not
 	domains: list[str] | None = None  # e.g. ['*.google.com', 'www.bing.com', 'yahoo.*]
 
+	# False for actions that only read the page or touch the agent's file system, they may run concurrently
+	mutates_page: bool = True
+
 	model_config = ConfigDict(arbitrary_types_allowed=True)
 
 	def prompt_description(self) -> str:
@@ -107,9 +107,14 @@ class Tools(Generic[Context]):
 		exclude_actions: list[str] | None = None,
 		output_model: type[T] | None = None,
 		display_files_in_done_text: bool = True,
+		extract_max_chunks: int = 1,
+		extract_concurrency: int = 4,
 	):
 		self.registry = Registry[Context](exclude_actions if exclude_actions is not None else [])
 		self.display_files_in_done_text = display_files_in_done_text
+		# Chunks of up to 30k chars of page markdown the extract action reads in parallel, the rest needs start_from_char
+		self.extract_max_chunks = max(1, extract_max_chunks)
+		self.extract_concurrency = max(1, extract_concurrency)
 
 		"""Register all default browser actions"""
 
@@ -659,6 +664,7 @@ class Tools(Generic[Context]):
 		@self.registry.action(
 			"""LLM extracts structured data from page markdown. Use when: on right page, know what to extract, haven't called before on same page+query. Can't get interactive elements. Set extract_links=True for URLs. Use start_from_char if previous extraction was truncated to extract data further down the page.""",
 			param_model=ExtractAction,
+			mutates_page=False,
 		)
 		async def extract(
 			params: ExtractAction,
@@ -674,7 +680,7 @@ class Tools(Generic[Context]):
 
 			# Extract clean markdown using the unified method
 			try:
-				from browser_use.dom.markdown_extractor import extract_clean_markdown
+				from browser_use.dom.markdown_extractor import extract_clean_markdown, split_markdown
 
 				content, content_stats = await extract_clean_markdown(
 					browser_session=browser_session, extract_links=extract_links
@@ -693,27 +699,16 @@ class Tools(Generic[Context]):
 				content = content[start_from_char:]
 				content_stats['started_from_char'] = start_from_char
 
-			# Smart truncation with context preservation
-			truncated = False
-			if len(content) > MAX_CHAR_LIMIT:
-				# Try to truncate at a natural break point (paragraph, sentence)
-				truncate_at = MAX_CHAR_LIMIT
-
-				# Look for paragraph break within last 500 chars of limit
-				paragraph_break = content.rfind('\n\n', MAX_CHAR_LIMIT - 500, MAX_CHAR_LIMIT)
-				if paragraph_break > 0:
-					truncate_at = paragraph_break
-				else:
-					# Look for sentence break within last 200 chars of limit
-					sentence_break = content.rfind('.', MAX_CHAR_LIMIT - 200, MAX_CHAR_LIMIT)
-					if sentence_break > 0:
-						truncate_at = sentence_break + 1
-
-				content = content[:truncate_at]
-				truncated = True
-				next_start = (start_from_char or 0) + truncate_at
+			# Split at structural boundaries into chunks the extraction LLM reads in one call each, the rest is left for
+			# another call with start_from_char. A single chunk keeps as much of the page as before, instead of ending
+			# early before a heading
+			chunks = split_markdown(content, MAX_CHAR_LIMIT, cut_before_headings=self.extract_max_chunks > 1)
+			truncated = len(chunks) > self.extract_max_chunks
+			if truncated:
+				chunks = chunks[: self.extract_max_chunks]
+				truncate_at = sum(len(chunk) for chunk in chunks)
 				content_stats['truncated_at_char'] = truncate_at
-				content_stats['next_start_char'] = next_start
+				content_stats['next_start_char'] = (start_from_char or 0) + truncate_at
 
 			# Add content statistics to the result
 			original_html_length = content_stats['original_html_chars']
@@ -723,8 +718,10 @@ class Tools(Generic[Context]):
 			stats_summary = f"""Content processed: {original_html_length:,} HTML chars → {initial_markdown_length:,} initial markdown → {final_filtered_length:,} filtered markdown"""
 			if start_from_char > 0:
 				stats_summary += f' (started from char {start_from_char:,})'
+			if len(chunks) > 1:
+				stats_summary += f' (split into {len(chunks)} parts)'
 			if truncated:
-				stats_summary += f' → {len(content):,} final chars (truncated, use start_from_char={content_stats["next_start_char"]} to continue)'
+				stats_summary += f' → {content_stats["truncated_at_char"]:,} final chars (truncated, use start_from_char={content_stats["next_start_char"]} to continue)'
 			elif chars_filtered > 0:
 				stats_summary += f' (filtered {chars_filtered:,} chars of noise)'
 
@@ -750,21 +747,22 @@ You will be given a query and the markdown of a webpage that has been filtered t
 """.strip()
 
 			# Sanitize surrogates from content to prevent UTF-8 encoding errors
-			content = sanitize_surrogates(content)
+			chunks = [sanitize_surrogates(chunk) for chunk in chunks]
 			query = sanitize_surrogates(query)
 
-			prompt = f'<query>\n{query}\n</query>\n\n<content_stats>\n{stats_summary}\n</content_stats>\n\n<webpage_content>\n{content}\n</webpage_content>'
-
 			try:
-				response = await asyncio.wait_for(
-					page_extraction_llm.ainvoke([SystemMessage(content=system_prompt), UserMessage(content=prompt)]),
-					timeout=120.0,
-				)
+				if len(chunks) == 1:
+					prompt = f'<query>\n{query}\n</query>\n\n<content_stats>\n{stats_summary}\n</content_stats>\n\n<webpage_content>\n{chunks[0]}\n</webpage_content>'
+					response = await asyncio.wait_for(
+						page_extraction_llm.ainvoke([SystemMessage(content=system_prompt), UserMessage(content=prompt)]),
+						timeout=120.0,
+					)
+					result = response.completion
+				else:
+					result = await self._extract_from_chunks(page_extraction_llm, system_prompt, query, stats_summary, chunks)
 
 				current_url = await browser_session.get_current_page_url()
-				extracted_content = (
-					f'<url>\n{current_url}\n</url>\n<query>\n{query}\n</query>\n<result>\n{response.completion}\n</result>'
-				)
+				extracted_content = f'<url>\n{current_url}\n</url>\n<query>\n{query}\n</query>\n<result>\n{result}\n</result>'
 
 				# Simple memory handling
 				MAX_MEMORY_LENGTH = 1000
@@ -934,6 +932,7 @@ You will be given a query and the markdown of a webpage that has been filtered t
 		@self.registry.action(
 			'Get a screenshot of the current viewport. Use when: visual inspection needed, layout unclear, element positions uncertain, debugging UI issues, or verifying page state. Screenshot is included in the next browser_state No parameters are needed.',
 			param_model=NoParamsAction,
+			mutates_page=False,
 		)
 		async def screenshot(_: NoParamsAction):
 			"""Request that a screenshot be included in the next observation"""
@@ -952,6 +951,7 @@ You will be given a query and the markdown of a webpage that has been filtered t
 		@self.registry.action(
 			'',
 			param_model=GetDropdownOptionsAction,
+			mutates_page=False,
 		)
 		async def dropdown_options(params: GetDropdownOptionsAction, browser_session: BrowserSession):
 			"""Get all options from a native dropdown or ARIA menu"""
@@ -1025,7 +1025,8 @@ You will be given a query and the markdown of a webpage that has been filtered t
 		# File System Actions
 
 		@self.registry.action(
-			'Write content to a file in the local file system. Use this to create new files or overwrite entire file contents. For targeted edits within existing files, use replace_file instead. Supports alphanumeric filename and file extension formats: .txt, .md, .json, .jsonl, .csv, .pdf. For PDF files, write content in markdown format and it will be automatically converted to a properly formatted PDF document.'
+			'Write content to a file in the local file system. Use this to create new files or overwrite entire file contents. For targeted edits within existing files, use replace_file instead. Supports alphanumeric filename and file extension formats: .txt, .md, .json, .jsonl, .csv, .pdf. For PDF files, write content in markdown format and it will be automatically converted to a properly formatted PDF document.',
+			mutates_page=False,
 		)
 		async def write_file(
 			file_name: str,
@@ -1051,7 +1052,8 @@ You will be given a query and the markdown of a webpage that has been filtered t
 			return ActionResult(extracted_content=result, long_term_memory=result)
 
 		@self.registry.action(
-			'Replace specific text within a file by searching for old_str and replacing with new_str. Use this for targeted edits like updating todo checkboxes or modifying specific lines without rewriting the entire file.'
+			'Replace specific text within a file by searching for old_str and replacing with new_str. Use this for targeted edits like updating todo checkboxes or modifying specific lines without rewriting the entire file.',
+			mutates_page=False,
 		)
 		async def replace_file(file_name: str, old_str: str, new_str: str, file_system: FileSystem):
 			result = await file_system.replace_file_str(file_name, old_str, new_str)
@@ -1059,7 +1061,8 @@ You will be given a query and the markdown of a webpage that has been filtered t
 			return ActionResult(extracted_content=result, long_term_memory=result)
 
 		@self.registry.action(
-			'Read the complete content of a file. Use this to view file contents before editing or to retrieve data from files. Supports text files (txt, md, json, csv, jsonl), documents (pdf, docx), and images (jpg, png).'
+			'Read the complete content of a file. Use this to view file contents before editing or to retrieve data from files. Supports text files (txt, md, json, csv, jsonl), documents (pdf, docx), and images (jpg, png).',
+			mutates_page=False,
 		)
 		async def read_file(file_name: str, available_file_paths: list[str], file_system: FileSystem):
 			if available_file_paths and file_name in available_file_paths:
@@ -1113,6 +1116,9 @@ You will be given a query and the markdown of a webpage that has been filtered t
 					params={'expression': validated_code, 'returnByValue': True, 'awaitPromise': True},
 					session_id=cdp_session.session_id,
 				)
+				# Scripts change values and scroll positions without DOM mutation events, don't reuse the previous capture
+				if browser_session._dom_watchdog is not None:
+					browser_session._dom_watchdog.invalidate_page_caches()
 
 				# Check for JavaScript execution errors
 				if result.get('exceptionDetails'):
@@ -1270,6 +1276,55 @@ Validated Code (after quote fixing):
 
 		return fixed_code
 
+	async def _extract_from_chunks(
+		self,
+		page_extraction_llm: BaseChatModel,
+		system_prompt: str,
+		query: str,
+		stats_summary: str,
+		chunks: list[str],
+	) -> str:
+		"""Extract from each chunk of the page in parallel, then merge the partial results with one more call"""
+		semaphore = asyncio.Semaphore(self.extract_concurrency)
+
+		async def extract_part(index: int, chunk: str) -> str:
+			prompt = (
+				f'<query>\n{query}\n</query>\n\n<content_stats>\n{stats_summary}\n</content_stats>\n\n'
+				f'<webpage_content part="{index + 1}" of="{len(chunks)}">\n{chunk}\n</webpage_content>\n\n'
+				'This is only one part of the page. Extract what is relevant to the query from this part, '
+				'or answer that this part contains nothing relevant.'
+			)
+			async with semaphore:
+				response = await asyncio.wait_for(
+					page_extraction_llm.ainvoke([SystemMessage(content=system_prompt), UserMessage(content=prompt)]),
+					timeout=120.0,
+				)
+			return response.completion
+
+		partial_results = await asyncio.gather(*(extract_part(index, chunk) for index, chunk in enumerate(chunks)))
+
+		merge_prompt = """
+You merge information extracted from consecutive parts of the same webpage into one answer to a query.
+
+<instructions>
+- Combine the partial results in page order into one answer to the query.
+- Keep ALL relevant information, e.g. every item when the query asks for all items, and remove duplicates.
+- Ignore parts that contain nothing relevant. Do not add information that is not in the partial results.
+- If no part contains relevant information, answer that the information is not available on the page.
+</instructions>
+
+<output>
+- Do not answer in conversational format - directly output the relevant information or that the information is unavailable.
+</output>
+""".strip()
+		parts = '\n\n'.join(f'<part index="{index + 1}">\n{result}\n</part>' for index, result in enumerate(partial_results))
+		prompt = f'<query>\n{query}\n</query>\n\n<content_stats>\n{stats_summary}\n</content_stats>\n\n<partial_results>\n{parts}\n</partial_results>'
+		response = await asyncio.wait_for(
+			page_extraction_llm.ainvoke([SystemMessage(content=merge_prompt), UserMessage(content=prompt)]),
+			timeout=120.0,
+		)
+		return response.completion
+
 	def _register_done_action(self, output_model: type[T] | None, display_files_in_done_text: bool = True):
 		if output_model is not None:
 			self.display_files_in_done_text = display_files_in_done_text
@@ -0,0 +1,162 @@
+"""
+Round-trip tests for the binary DOM archive format (browser_use/dom/binary_format.py).
+"""
+
+import json
+from typing import Any
+
+import pytest
+
+from browser_use.dom.binary_format import DOMArchive, DOMArchiveError, DOMArchiveWriter
+from browser_use.dom.views import (
+	DOMRect,
+	EnhancedAXNode,
+	EnhancedAXProperty,
+	EnhancedDOMTreeNode,
+	EnhancedSnapshotNode,
+	NodeType,
+	SerializedDOMState,
+	SimplifiedNode,
+)
+
+
+def _node(node_id: int, node_type: NodeType, node_name: str, parent: EnhancedDOMTreeNode | None, **kwargs) -> EnhancedDOMTreeNode:
+	fields: dict[str, Any] = dict(
+		node_id=node_id,
+		backend_node_id=node_id + 1000,
+		node_type=node_type,
+		node_name=node_name,
+		node_value='',
+		attributes={},
+		is_scrollable=None,
+		is_visible=None,
+		absolute_position=None,
+		target_id='target-1',
+		frame_id=None,
+		session_id=None,
+		content_document=None,
+		shadow_root_type=None,
+		shadow_roots=None,
+		parent_node=parent,
+		children_nodes=[],
+		ax_node=None,
+		snapshot_node=None,
+	)
+	fields.update(kwargs)
+	node = EnhancedDOMTreeNode(**fields)
+	if parent is not None and node_type != NodeType.DOCUMENT_FRAGMENT_NODE and node_name != '#document':
+		assert parent.children_nodes is not None
+		parent.children_nodes.append(node)
+	return node
+
+
+def _build_dom_state() -> tuple[SerializedDOMState, EnhancedDOMTreeNode]:
+	document = _node(1, NodeType.DOCUMENT_NODE, '#document', None)
+	html = _node(2, NodeType.ELEMENT_NODE, 'HTML', document)
+	body = _node(3, NodeType.ELEMENT_NODE, 'BODY', html, is_visible=True, is_scrollable=False)
+	button = _node(
+		4,
+		NodeType.ELEMENT_NODE,
+		'BUTTON',
+		body,
+		attributes={'class': 'primary', 'aria-label': 'Submit ✓'},
+		is_visible=True,
+		absolute_position=DOMRect(x=10.5, y=20.0, width=100.0, height=30.25),
+		snapshot_node=EnhancedSnapshotNode(
+			is_clickable=True,
+			cursor_style='pointer',
+			bounds=DOMRect(x=10.5, y=20.0, width=100.0, height=30.25),
+			clientRects=None,
+			scrollRects=DOMRect(x=0.0, y=0.0, width=100.0, height=30.0),
+			computed_styles={'display': 'block', 'cursor': 'pointer'},
+			paint_order=-3,
+			stacking_contexts=None,
+		),
+		ax_node=EnhancedAXNode(
+			ax_node_id='ax-4',
+			ignored=False,
+			role='button',
+			name='Submit',
+			description=None,
+			properties=[EnhancedAXProperty(name='focusable', value=True), EnhancedAXProperty(name='level', value='2')],  # type: ignore[arg-type]
+			child_ids=['ax-5'],
+		),
+		_compound_children=[{'role': 'button', 'name': 'Open', 'valuemin': None, 'valuemax': None, 'valuenow': None}],
+	)
+	_node(5, NodeType.TEXT_NODE, '#text', button, node_value='Submit ✓')
+
+	host = _node(6, NodeType.ELEMENT_NODE, 'MY-WIDGET', body)
+	shadow = _node(7, NodeType.DOCUMENT_FRAGMENT_NODE, '#document-fragment', host, shadow_root_type='open')
+	host.shadow_roots = [shadow]
+	_node(8, NodeType.ELEMENT_NODE, 'INPUT', shadow, attributes={'type': 'text'})
+
+	iframe = _node(9, NodeType.ELEMENT_NODE, 'IFRAME', body, attributes={'src': 'https://example.com'})
+	iframe_document = _node(10, NodeType.DOCUMENT_NODE, '#document', iframe, frame_id='frame-2', session_id='session-2')
+	iframe.content_document = iframe_document
+	_node(11, NodeType.ELEMENT_NODE, 'A', iframe_document, attributes={'href': '/x'})
+
+	simplified_button = SimplifiedNode(original_node=button, children=[], is_interactive=True, is_new=True)
+	simplified_root = SimplifiedNode(
+		original_node=body, children=[simplified_button, SimplifiedNode(original_node=host, children=[], is_shadow_host=True)]
+	)
+	dom_state = SerializedDOMState(_root=simplified_root, selector_map={button.backend_node_id: button})
+	return dom_state, document
+
+
+def _flatten(node: EnhancedDOMTreeNode) -> list[dict]:
+	"""__json__ of every node in pre-order, with the uuid (not archived) removed."""
+	result = []
+	stack = [node]
+	while stack:
+		current = stack.pop()
+		data = current.__json__()
+		data.pop('children_nodes')
+		data.pop('shadow_roots')
+		data.pop('content_document')
+		data['compound'] = current._compound_children
+		data['parent'] = current.parent_node.node_id if current.parent_node else None
+		result.append(data)
+		related = list(current.children_nodes or []) + list(current.shadow_roots or [])
+		if current.content_document:
+			related.append(current.content_document)
+		stack.extend(reversed(related))
+	return result
+
+
+def test_enhanced_tree_round_trip():
+	_, document = _build_dom_state()
+	archive = DOMArchive.from_bytes(DOMArchiveWriter(document).to_bytes())
+
+	assert len(archive) == 11
+	restored = archive.to_enhanced_tree()
+	assert json.dumps(_flatten(restored), default=str) == json.dumps(_flatten(document), default=str)
+	# Hashes are computed from the tree, so they survive the round trip too
+	assert restored.children[0].children[0].children[0].element_hash == document.children[0].children[0].children[0].element_hash
+
+
+def test_serialized_dom_state_round_trip_and_history_pointers(tmp_path):
+	dom_state, document = _build_dom_state()
+	writer = DOMArchiveWriter.from_serialized_dom_state(dom_state)
+	button = dom_state.selector_map[1004]
+	button_index = writer.index_of(button)
+	assert button_index is not None
+	path = writer.write(tmp_path / 'step_1.budom')
+
+	with DOMArchive.open(path) as archive:
+		assert archive.find_backend_node_id(1004) == button_index
+		assert archive.load_node(button_index).attributes == button.attributes
+		assert archive.string(0) == '#document'
+		parent_index = archive.parent_index(button_index)
+		assert parent_index is not None and archive.load_node(parent_index).node_name == 'BODY'
+
+		restored = archive.to_serialized_dom_state()
+		assert restored._root is not None and dom_state._root is not None
+		assert restored._root.__json__() == dom_state._root.__json__()
+		assert list(restored.selector_map) == [1004]
+		assert restored.selector_map[1004] is restored._root.children[0].original_node
+		assert restored.llm_representation() == dom_state.llm_representation()
+
+
+def test_invalid_buffer():
+	with pytest.raises(DOMArchiveError):
+		DOMArchive.from_bytes(b'not a dom archive at all, definitely not' * 2)
@@ -0,0 +1,365 @@
+"""
+Tests for DOMMutationTracker, the CDP DOM mutation bookkeeping behind incremental DOM snapshots, and for
+DOMTreePatcher, which applies the recorded mutations to the cached enhanced tree.
+
+Both only consume CDP event payloads and command results, so these tests drive them with a minimal fake CDP client
+instead of a real browser.
+"""
+
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+from browser_use.dom.enhanced_snapshot import REQUIRED_COMPUTED_STYLES
+from browser_use.dom.mutation_tracker import DOM_MUTATION_EVENTS, MAX_RECORDED_MUTATIONS, DOMMutationTracker
+from browser_use.dom.service import DomService
+from browser_use.dom.tree_patcher import MAX_PATCHED_NODES, DOMTreePatcher
+from browser_use.dom.views import DOMRect, EnhancedDOMTreeNode, EnhancedSnapshotNode, NodeType
+from browser_use.tools.service import Tools
+
+
+class _FakeDOMRegistration:
+	def __init__(self):
+		self.handlers = {}
+
+	def __getattr__(self, event_name):
+		def register(callback):
+			self.handlers[event_name] = callback
+
+		return register
+
+
+class _FakeDOMSend:
+	def __init__(self):
+		self.enabled_sessions = []
+
+	async def enable(self, session_id=None):
+		self.enabled_sessions.append(session_id)
+
+
+def _make_tracker():
+	session_manager = SimpleNamespace(get_target_id_from_session_id=lambda session_id: {'session-1': 'target-1'}.get(session_id))
+	browser_session = SimpleNamespace(session_manager=session_manager, logger=None)
+	tracker = DOMMutationTracker(browser_session, logger=SimpleNamespace(debug=lambda *args, **kwargs: None))  # type: ignore[arg-type]
+
+	registration = _FakeDOMRegistration()
+	send = _FakeDOMSend()
+	cdp_client = SimpleNamespace(register=SimpleNamespace(DOM=registration), send=SimpleNamespace(DOM=send))
+	cdp_session = SimpleNamespace(cdp_client=cdp_client, session_id='session-1', target_id='target-1')
+	return tracker, cdp_session, registration, send
+
+
+async def test_attach_registers_handlers_and_enables_dom_once():
+	tracker, cdp_session, registration, send = _make_tracker()
+
+	await tracker.attach(cdp_session)  # type: ignore[arg-type]
+	await tracker.attach(cdp_session)  # type: ignore[arg-type]
+
+	assert set(DOM_MUTATION_EVENTS) | {'documentUpdated', 'setChildNodes'} == set(registration.handlers)
+	assert send.enabled_sessions == ['session-1']
+
+
+async def test_mutations_mark_target_dirty_until_captured():
+	tracker, cdp_session, registration, _ = _make_tracker()
+	await tracker.attach(cdp_session)  # type: ignore[arg-type]
+
+	# Never captured -> dirty
+	assert tracker.is_dirty('target-1')
+
+	version = tracker.get_version('target-1')
+	tracker.mark_captured('target-1', version)
+	assert not tracker.is_dirty('target-1')
+
+	registration.handlers['childNodeInserted']({'parentNodeId': 42, 'previousNodeId': 0, 'node': {}}, 'session-1')
+	registration.handlers['attributeModified']({'nodeId': 7, 'name': 'class', 'value': 'x'}, 'session-1')
+	assert tracker.is_dirty('target-1')
+	assert tracker.get_version('target-1') == version + 2
+
+	tracker.mark_captured('target-1', tracker.get_version('target-1'))
+	assert not tracker.is_dirty('target-1')
+
+
+async def test_mutation_during_capture_keeps_target_dirty():
+	tracker, cdp_session, registration, _ = _make_tracker()
+	await tracker.attach(cdp_session)  # type: ignore[arg-type]
+
+	version_before_capture = tracker.get_version('target-1')
+	registration.handlers['childNodeRemoved']({'parentNodeId': 1, 'nodeId': 2}, 'session-1')
+	tracker.mark_captured('target-1', version_before_capture)
+
+	assert tracker.is_dirty('target-1')
+
+
+async def test_mutations_are_recorded_until_captured():
+	tracker, cdp_session, registration, _ = _make_tracker()
+	await tracker.attach(cdp_session)  # type: ignore[arg-type]
+	version = tracker.get_version('target-1')
+	tracker.mark_captured('target-1', version)
+
+	registration.handlers['attributeModified']({'nodeId': 7, 'name': 'class', 'value': 'x'}, 'session-1')
+	registration.handlers['characterDataModified']({'nodeId': 8, 'characterData': 'y'}, 'session-1')
+	assert tracker.get_mutations('target-1', version) == [
+		('attributeModified', {'nodeId': 7, 'name': 'class', 'value': 'x'}),
+		('characterDataModified', {'nodeId': 8, 'characterData': 'y'}),
+	]
+
+	tracker.mark_captured('target-1', version + 1)
+	assert tracker.get_mutations('target-1', version + 1) == [('characterDataModified', {'nodeId': 8, 'characterData': 'y'})]
+
+	# Mutations that were dropped or invalidated cannot be replayed
+	for _ in range(MAX_RECORDED_MUTATIONS + 1):
+		registration.handlers['attributeRemoved']({'nodeId': 7, 'name': 'class'}, 'session-1')
+	assert tracker.get_mutations('target-1', version + 1) is None
+	tracker.invalidate('target-1')
+	assert tracker.get_mutations('target-1', tracker.get_version('target-1') - 1) is None
+	assert tracker.get_mutations('target-1', tracker.get_version('target-1')) == []
+
+
+async def test_document_updated_and_unknown_sessions():
+	tracker, cdp_session, registration, _ = _make_tracker()
+	await tracker.attach(cdp_session)  # type: ignore[arg-type]
+	tracker.mark_captured('target-1', tracker.get_version('target-1'))
+
+	# Events from sessions we don't know about are ignored
+	registration.handlers['attributeModified']({'nodeId': 3, 'name': 'id', 'value': 'y'}, 'unknown-session')
+	assert not tracker.is_dirty('target-1')
+
+	registration.handlers['documentUpdated']({}, 'session-1')
+	assert tracker.is_dirty('target-1')
+
+
+async def test_invalidate_all_targets():
+	tracker, cdp_session, _, _ = _make_tracker()
+	await tracker.attach(cdp_session)  # type: ignore[arg-type]
+	tracker.mark_captured('target-1', tracker.get_version('target-1'))
+	tracker.mark_captured('target-2', tracker.get_version('target-2'))
+
+	tracker.invalidate()
+
+	assert tracker.is_dirty('target-1')
+	assert tracker.is_dirty('target-2')
+
+
+async def test_evaluate_action_invalidates_the_captured_dom():
+	evaluate_result = {'result': {'type': 'number', 'value': 1}}
+	cdp_session = SimpleNamespace(
+		cdp_client=SimpleNamespace(
+			send=SimpleNamespace(Runtime=SimpleNamespace(evaluate=AsyncMock(return_value=evaluate_result)))
+		),
+		session_id='session-1',
+	)
+	dom_watchdog = MagicMock()
+	browser_session = SimpleNamespace(get_or_create_cdp_session=AsyncMock(return_value=cdp_session), _dom_watchdog=dom_watchdog)
+
+	# scripts can change input values and scroll positions without firing DOM mutation events
+	evaluate = Tools().registry.registry.actions['evaluate'].function
+	result = await evaluate(code='document.querySelector("input").value = "x"; 1', browser_session=browser_session)
+
+	assert result.error is None
+	dom_watchdog.invalidate_page_caches.assert_called_once()
+
+
+def _quad(rect: DOMRect) -> list[float]:
+	return [rect.x, rect.y, rect.x + rect.width, rect.y, rect.x + rect.width, rect.y + rect.height, rect.x, rect.y + rect.height]
+
+
+class _FakePage:
+	"""CDP commands the patcher sends, answered from `boxes` (nodeId -> viewport rect) and `pushed_children`."""
+
+	def __init__(self, tracker: DOMMutationTracker, registration: _FakeDOMRegistration):
+		self.boxes: dict[int, DOMRect] = {}
+		self.pushed_children: dict[int, list] = {}
+		self.clickable_node_ids: set[int] = set()
+		self.registration = registration
+		self.tracker = tracker
+
+	async def getBoxModel(self, params, session_id=None):
+		return {'model': {'border': _quad(self.boxes[params['nodeId']])}}
+
+	async def getContentQuads(self, params, session_id=None):
+		return {'quads': [_quad(self.boxes[params['nodeId']])]}
+
+	async def resolveNode(self, params, session_id=None):
+		return {'object': {'type': 'object', 'objectId': f'object-{params["nodeId"]}'}}
+
+	async def requestChildNodes(self, params, session_id=None):
+		nodes = self.pushed_children[params['nodeId']]
+		self.registration.handlers['setChildNodes']({'parentId': params['nodeId'], 'nodes': nodes}, session_id)
+
+	async def callFunctionOn(self, params, session_id=None):
+		values = []
+		for argument in params['arguments'][1:]:
+			box = self.boxes[int(argument['objectId'].removeprefix('object-'))]
+			styles = {'display': 'block', 'visibility': 'visible', 'opacity': '1'}
+			values.append(
+				{
+					'styles': [styles.get(name, '') for name in REQUIRED_COMPUTED_STYLES],
+					'client': [0, 0, box.width, box.height],
+					'scroll': [0, 0, box.width, box.height],
+				}
+			)
+		return {'result': {'type': 'object', 'value': values}}
+
+	async def releaseObjectGroup(self, params, session_id=None):
+		pass
+
+	async def getEventListeners(self, params, session_id=None):
+		node_id = int(params['objectId'].removeprefix('object-'))
+		return {'listeners': [{'type': 'click'}] if node_id in self.clickable_node_ids else []}
+
+	async def getPartialAXTree(self, params, session_id=None):
+		return {
+			'nodes': [
+				{'nodeId': 'ax', 'ignored': False, 'role': {'value': 'generic'}, 'backendDOMNodeId': params['backendNodeId']}
+			]
+		}
+
+
+def _enhanced_node(
+	node_id: int, node_type: NodeType, name: str, parent: EnhancedDOMTreeNode | None, bounds: DOMRect | None = None, value=''
+) -> EnhancedDOMTreeNode:
+	snapshot = None
+	if bounds is not None:
+		rects = DOMRect(0, 0, bounds.width, bounds.height)
+		snapshot = EnhancedSnapshotNode(
+			is_clickable=None,
+			cursor_style=None,
+			bounds=bounds,
+			clientRects=rects if node_type == NodeType.ELEMENT_NODE else None,
+			scrollRects=DOMRect(0, 0, bounds.width, bounds.height) if node_type == NodeType.ELEMENT_NODE else None,
+			computed_styles={'display': 'block', 'visibility': 'visible', 'opacity': '1'},
+			paint_order=1,
+			stacking_contexts=None,
+		)
+	node = EnhancedDOMTreeNode(
+		node_id=node_id,
+		backend_node_id=node_id + 100,
+		node_type=node_type,
+		node_name=name,
+		node_value=value,
+		attributes={},
+		is_scrollable=None,
+		is_visible=True,
+		absolute_position=bounds,
+		target_id='target-1',
+		frame_id=None,
+		session_id='session-1',
+		content_document=None,
+		shadow_root_type=None,
+		shadow_roots=None,
+		parent_node=parent,
+		children_nodes=None,
+		ax_node=None,
+		snapshot_node=snapshot,
+	)
+	if parent is not None:
+		parent.children_nodes = [*(parent.children_nodes or []), node]
+	return node
+
+
+async def _make_patcher():
+	"""Patcher over document(1) > HTML(2) > BODY(3) > [DIV(4) > "Total: 1"(5), DIV(6) > "Footer"(7)], unscrolled."""
+	tracker, cdp_session, registration, _ = _make_tracker()
+	await tracker.attach(cdp_session)  # type: ignore[arg-type]
+	dom_service = DomService(browser_session=tracker.browser_session, logger=tracker.logger)  # type: ignore[arg-type]
+	dom_service.mutation_tracker = tracker
+
+	page = _FakePage(tracker, registration)
+	page.boxes = {
+		2: DOMRect(0, 0, 800, 600),
+		3: DOMRect(0, 0, 800, 600),
+		4: DOMRect(10, 10, 200, 20),
+		5: DOMRect(10, 12, 60, 16),
+		6: DOMRect(10, 40, 200, 20),
+		7: DOMRect(10, 42, 50, 16),
+	}
+	root = _enhanced_node(1, NodeType.DOCUMENT_NODE, '#document', None)
+	html = _enhanced_node(2, NodeType.ELEMENT_NODE, 'HTML', root, page.boxes[2])
+	body = _enhanced_node(3, NodeType.ELEMENT_NODE, 'BODY', html, page.boxes[3])
+	cell = _enhanced_node(4, NodeType.ELEMENT_NODE, 'DIV', body, page.boxes[4])
+	_enhanced_node(5, NodeType.TEXT_NODE, '#text', cell, page.boxes[5], value='Total: 1')
+	footer = _enhanced_node(6, NodeType.ELEMENT_NODE, 'DIV', body, page.boxes[6])
+	_enhanced_node(7, NodeType.TEXT_NODE, '#text', footer, page.boxes[7], value='Footer')
+
+	nodes_by_id = {}
+	stack = [root]
+	while stack:
+		node = stack.pop()
+		nodes_by_id[node.node_id] = node
+		stack.extend(node.children_nodes or [])
+
+	send = SimpleNamespace(DOM=page, Runtime=page, DOMDebugger=page, Accessibility=page)
+	patch_session = SimpleNamespace(cdp_client=SimpleNamespace(send=send), session_id='session-1', target_id='target-1')
+	patcher = DOMTreePatcher(dom_service, root, nodes_by_id, patch_session)  # type: ignore[arg-type]
+	return patcher, page, root, nodes_by_id
+
+
+async def test_text_change_in_a_fixed_size_cell_is_patched():
+	patcher, page, root, nodes_by_id = await _make_patcher()
+	page.boxes[5] = DOMRect(10, 12, 75, 16)
+
+	patched = await patcher.patch([('characterDataModified', {'nodeId': 5, 'characterData': 'Total: 1024'})])
+
+	assert patched is not None
+	# A new root object, so caches keyed by the tree see a new page version
+	assert patched is not root and nodes_by_id[1] is patched
+	assert all(child.parent_node is patched for child in patched.children_nodes or [])
+	text = nodes_by_id[5]
+	assert text.node_value == 'Total: 1024'
+	assert text.absolute_position == DOMRect(10, 12, 75, 16)
+	assert text.snapshot_node is not None and text.snapshot_node.bounds == DOMRect(10, 12, 75, 16)
+	assert text.is_visible
+	assert nodes_by_id[4].ax_node is not None
+
+
+async def test_inserted_subtree_is_built_with_its_unrequested_children():
+	patcher, page, _, nodes_by_id = await _make_patcher()
+	page.boxes[8] = DOMRect(80, 12, 40, 16)
+	page.boxes[9] = DOMRect(82, 12, 30, 16)
+	page.clickable_node_ids.add(8)
+	page.pushed_children[8] = [{'nodeId': 9, 'backendNodeId': 109, 'nodeType': 3, 'nodeName': '#text', 'nodeValue': 'Edit'}]
+	inserted = {
+		'nodeId': 8,
+		'backendNodeId': 108,
+		'nodeType': 1,
+		'nodeName': 'BUTTON',
+		'nodeValue': '',
+		'attributes': ['class', 'edit'],
+		'childNodeCount': 1,
+	}
+
+	patched = await patcher.patch([('childNodeInserted', {'parentNodeId': 4, 'previousNodeId': 5, 'node': inserted})])
+
+	assert patched is not None
+	button = nodes_by_id[8]
+	assert [child.node_id for child in nodes_by_id[4].children_nodes or []] == [5, 8]
+	assert button.attributes == {'class': 'edit'}
+	assert [child.node_value for child in button.children_nodes or []] == ['Edit']
+	assert button.snapshot_node is not None and button.snapshot_node.is_clickable
+	assert button.snapshot_node.paint_order is None
+	assert button.is_visible and nodes_by_id[9].is_visible
+
+
+async def test_layout_shift_of_untouched_nodes_falls_back_to_a_full_capture():
+	patcher, page, _, _ = await _make_patcher()
+	# The inserted row pushes the footer down
+	page.boxes[8] = DOMRect(10, 40, 200, 20)
+	page.boxes[6] = DOMRect(10, 70, 200, 20)
+	inserted = {'nodeId': 8, 'backendNodeId': 108, 'nodeType': 1, 'nodeName': 'DIV', 'nodeValue': '', 'childNodeCount': 0}
+
+	patched = await patcher.patch([('childNodeInserted', {'parentNodeId': 3, 'previousNodeId': 4, 'node': inserted})])
+
+	assert patched is None
+
+
+async def test_unknown_nodes_and_large_patches_fall_back_to_a_full_capture():
+	patcher, _, _, _ = await _make_patcher()
+	assert await patcher.patch([('attributeModified', {'nodeId': 99, 'name': 'class', 'value': 'x'})]) is None
+
+	patcher, page, _, _ = await _make_patcher()
+	rows = [
+		{'nodeId': 100 + i, 'backendNodeId': 1000 + i, 'nodeType': 3, 'nodeName': '#text', 'nodeValue': str(i)}
+		for i in range(MAX_PATCHED_NODES)
+	]
+	inserted = {'nodeId': 8, 'backendNodeId': 108, 'nodeType': 1, 'nodeName': 'UL', 'nodeValue': '', 'childNodeCount': len(rows)}
+	page.pushed_children[8] = rows
+	assert await patcher.patch([('childNodeInserted', {'parentNodeId': 4, 'previousNodeId': 5, 'node': inserted})]) is None
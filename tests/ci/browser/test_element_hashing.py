@@ -0,0 +1,78 @@
+"""
+Tests that memoized element hashing produces the same values as hashing the full branch path from scratch.
+
+Element hashes are persisted in agent history (DOMInteractedElement.element_hash), so the values must not change.
+"""
+
+import hashlib
+
+from browser_use.dom.views import STATIC_ATTRIBUTES, EnhancedDOMTreeNode, NodeType, compute_element_hashes
+
+
+def _node(node_type: NodeType, node_name: str, parent: EnhancedDOMTreeNode | None, attributes=None) -> EnhancedDOMTreeNode:
+	node = EnhancedDOMTreeNode(
+		node_id=0,
+		backend_node_id=0,
+		node_type=node_type,
+		node_name=node_name,
+		node_value='',
+		attributes=attributes or {},
+		is_scrollable=None,
+		is_visible=None,
+		absolute_position=None,
+		target_id='target',
+		frame_id=None,
+		session_id=None,
+		content_document=None,
+		shadow_root_type=None,
+		shadow_roots=None,
+		parent_node=parent,
+		children_nodes=[],
+		ax_node=None,
+		snapshot_node=None,
+	)
+	if parent is not None:
+		assert parent.children_nodes is not None
+		parent.children_nodes.append(node)
+	return node
+
+
+def _reference_hashes(node: EnhancedDOMTreeNode) -> tuple[int, int]:
+	"""The original (non-memoized) element hash and parent branch hash."""
+	path = '/'.join(node._get_parent_branch_path())
+	attributes = ''.join(f'{k}={v}' for k, v in sorted((k, v) for k, v in node.attributes.items() if k in STATIC_ATTRIBUTES))
+	element_hash = int(hashlib.sha256(f'{path}|{attributes}'.encode()).hexdigest()[:16], 16)
+	branch_hash = int(hashlib.sha256(path.encode()).hexdigest()[:16], 16)
+	return element_hash, branch_hash
+
+
+def _build_tree() -> list[EnhancedDOMTreeNode]:
+	document = _node(NodeType.DOCUMENT_NODE, '#document', None)
+	html = _node(NodeType.ELEMENT_NODE, 'HTML', document)
+	body = _node(NodeType.ELEMENT_NODE, 'BODY', html)
+	form = _node(NodeType.ELEMENT_NODE, 'FORM', body, {'id': 'login', 'style': 'color: red'})
+	shadow = _node(NodeType.DOCUMENT_FRAGMENT_NODE, '#document-fragment', form)
+	button = _node(NodeType.ELEMENT_NODE, 'BUTTON', shadow, {'type': 'submit', 'class': 'primary', 'aria-label': 'Log in'})
+	text = _node(NodeType.TEXT_NODE, '#text', button)
+	inputs = [_node(NodeType.ELEMENT_NODE, 'INPUT', form, {'name': f'field-{i}', 'data-testid': str(i)}) for i in range(5)]
+	return [document, html, body, form, shadow, button, text, *inputs]
+
+
+def test_lazy_hashes_match_reference():
+	for node in _build_tree():
+		element_hash, branch_hash = _reference_hashes(node)
+		assert node.__hash__() == element_hash
+		assert node.parent_branch_hash() == branch_hash
+
+
+def test_bulk_hashes_match_reference_and_are_memoized():
+	nodes = _build_tree()
+	# Deepest nodes first so the shared prefixes are built while walking up from them
+	compute_element_hashes(reversed(nodes))
+
+	for node in nodes:
+		assert (node._element_hash, node._parent_branch_hash) == _reference_hashes(node)
+
+	# Memoized: changing the tree afterwards does not change the hash of an already hashed node
+	nodes[5].attributes['id'] = 'changed'
+	assert nodes[5].__hash__() == _reference_hashes(_build_tree()[5])[0]
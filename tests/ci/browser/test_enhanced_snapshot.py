@@ -0,0 +1,74 @@
+"""
+Tests for the columnar snapshot lookup built from CDP DOMSnapshot.captureSnapshot output.
+"""
+
+from browser_use.dom.enhanced_snapshot import REQUIRED_COMPUTED_STYLES, build_snapshot_lookup
+from browser_use.dom.views import DOMRect
+
+STRINGS = ['block', 'none', 'visible', '1', 'auto', 'pointer', 'static', 'rgba(0, 0, 0, 0)']
+STYLE_A = [0, 2, 3, 4, 4, 4, 5, 4, 6, 7]
+STYLE_B = [1, 2, 3, 4, 4, 4, 4, 4, 6, 7]
+
+
+def _make_snapshot():
+	return {
+		'strings': STRINGS,
+		'documents': [
+			{
+				'nodes': {'backendNodeId': [10, 11, 12, 13], 'isClickable': {'index': [1, 3]}},
+				'layout': {
+					# node 1 appears twice: the FIRST layout entry must win
+					'nodeIndex': [0, 1, 2, 1],
+					'bounds': [[0, 0, 200, 100], [20, 40, 60, 80], [], [999, 999, 1, 1]],
+					'styles': [STYLE_A, STYLE_B, STYLE_A, STYLE_B],
+					'paintOrders': [1, 5, 3, 7],
+					'clientRects': [[0, 0, 100, 50], [], [], []],
+					'scrollRects': [[0, 30, 100, 500], [], [], []],
+					'stackingContexts': {'index': [0]},
+				},
+			}
+		],
+	}
+
+
+def test_snapshot_lookup_values():
+	lookup = build_snapshot_lookup(_make_snapshot(), device_pixel_ratio=2.0)  # type: ignore[arg-type]
+
+	assert len(lookup) == 4
+	assert set(lookup) == {10, 11, 12, 13}
+	assert 99 not in lookup
+	assert lookup.get(99) is None
+
+	root = lookup[10]
+	assert root.is_clickable is False
+	assert root.bounds == DOMRect(x=0, y=0, width=100, height=50)  # divided by device pixel ratio
+	assert root.clientRects == DOMRect(x=0, y=0, width=100, height=50)
+	assert root.scrollRects == DOMRect(x=0, y=30, width=100, height=500)
+	assert root.paint_order == 1
+	assert root.computed_styles == dict(zip(REQUIRED_COMPUTED_STYLES, [STRINGS[i] for i in STYLE_A]))
+	assert root.cursor_style == 'pointer'
+
+	button = lookup[11]
+	assert button.is_clickable is True
+	assert button.bounds == DOMRect(x=10, y=20, width=30, height=40)
+	assert button.paint_order == 5
+	assert button.cursor_style == 'auto'
+
+	# Malformed bounds are skipped, no layout node at all -> only clickability is known
+	assert lookup[12].bounds is None
+	assert lookup[12].paint_order == 3
+	assert lookup[13].bounds is None and lookup[13].computed_styles is None and lookup[13].is_clickable is True
+
+
+def test_snapshot_lookup_views_are_memoized_and_styles_interned():
+	lookup = build_snapshot_lookup(_make_snapshot())  # type: ignore[arg-type]
+
+	assert lookup[10] is lookup[10]
+	# Identical style index combinations share one dict
+	assert lookup[10].computed_styles is lookup[12].computed_styles
+	assert len(lookup.interned_styles) == 2
+
+
+def test_snapshot_lookup_empty():
+	lookup = build_snapshot_lookup({'documents': [], 'strings': []})  # type: ignore[arg-type]
+	assert len(lookup) == 0
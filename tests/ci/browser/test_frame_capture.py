@@ -0,0 +1,113 @@
+"""
+Tests for the frame-parallel cross-origin iframe capture scheduler.
+"""
+
+import asyncio
+
+from browser_use.dom.enhanced_snapshot import build_snapshot_lookup
+from browser_use.dom.frame_capture import FrameCaptureScheduler, find_cross_origin_iframe_frame_ids
+from browser_use.dom.views import TargetAllTrees
+
+
+def _fake_trees() -> TargetAllTrees:
+	return TargetAllTrees(
+		snapshot={'documents': [], 'strings': []},
+		dom_tree={'root': {}},  # type: ignore[typeddict-item]
+		ax_tree={'nodes': []},
+		device_pixel_ratio=1.0,
+		cdp_timing={},
+	)
+
+
+async def test_scheduler_bounds_concurrency_and_captures_each_target_once():
+	in_flight = 0
+	max_in_flight = 0
+	captured = []
+
+	async def capture(target_id):
+		nonlocal in_flight, max_in_flight
+		captured.append(target_id)
+		in_flight += 1
+		max_in_flight = max(max_in_flight, in_flight)
+		await asyncio.sleep(0.01)
+		in_flight -= 1
+		return _fake_trees()
+
+	scheduler = FrameCaptureScheduler(capture, max_concurrency=3)
+	targets = [f'target-{i:04d}' for i in range(10)]
+	for target_id in targets:
+		scheduler.schedule(target_id)
+	scheduler.schedule(targets[0])  # duplicate
+
+	results = await asyncio.gather(*(scheduler.get(target_id) for target_id in targets))
+
+	assert len(results) == 10
+	assert sorted(captured) == targets
+	assert max_in_flight == 3
+	timings = scheduler.timing_info()
+	assert timings['frame_captures'] == 10
+	assert timings['frame_capture_0003_ms'] > 0
+
+
+async def test_scheduler_cancels_unconsumed_captures():
+	started = asyncio.Event()
+
+	async def capture(target_id):
+		started.set()
+		await asyncio.sleep(10)
+		return _fake_trees()
+
+	scheduler = FrameCaptureScheduler(capture, max_concurrency=1)
+	scheduler.schedule('target-a')
+	scheduler.schedule('target-b')
+	await started.wait()
+
+	scheduler.cancel_pending()
+	await asyncio.sleep(0)
+	assert all(task.cancelled() for task in scheduler._tasks.values())
+
+
+def test_find_cross_origin_iframe_frame_ids():
+	def iframe(backend_node_id, frame_id, content_document=None):
+		node = {
+			'nodeId': backend_node_id,
+			'backendNodeId': backend_node_id,
+			'nodeType': 1,
+			'nodeName': 'IFRAME',
+			'frameId': frame_id,
+		}
+		if content_document:
+			node['contentDocument'] = content_document
+		return node
+
+	same_origin_document = {
+		'nodeId': 50,
+		'backendNodeId': 50,
+		'nodeType': 9,
+		'nodeName': '#document',
+		'children': [iframe(4, 'nested')],
+	}
+	root = {
+		'nodeId': 1,
+		'backendNodeId': 1,
+		'nodeType': 9,
+		'nodeName': '#document',
+		'children': [iframe(2, 'big'), iframe(3, 'tiny'), iframe(5, 'same-origin', same_origin_document)],
+	}
+	snapshot = {
+		'strings': [],
+		'documents': [
+			{
+				'nodes': {'backendNodeId': [2, 3, 4, 5]},
+				'layout': {
+					'nodeIndex': [0, 1, 2, 3],
+					'bounds': [[0, 0, 300, 250], [0, 0, 1, 1], [0, 0, 728, 90], [0, 0, 500, 500]],
+					'styles': [[], [], [], []],
+				},
+			}
+		],
+	}
+	lookup = build_snapshot_lookup(snapshot)  # type: ignore[arg-type]
+
+	assert sorted(find_cross_origin_iframe_frame_ids(root, lookup, limit=10)) == ['big', 'nested']  # type: ignore[arg-type]
+	assert len(find_cross_origin_iframe_frame_ids(root, lookup, limit=1)) == 1  # type: ignore[arg-type]
@@ -0,0 +1,137 @@
+"""
+Tests for PageMetadataProbe, the single-evaluation page metadata probe shared by DOMWatchdog and DomService.
+
+Driven with a minimal fake CDP client, the probe only sends one Runtime.evaluate and one Page.getLayoutMetrics per
+target.
+"""
+
+import asyncio
+from types import SimpleNamespace
+
+from browser_use.browser.page_metadata import PageMetadata, PageMetadataProbe
+
+PAGE_VALUE = {
+	'url': 'https://example.com/',
+	'title': 'Example',
+	'ready_state': 'complete',
+	'device_pixel_ratio': 2.5,
+	'layout_width': 1265,
+	'layout_height': 720,
+	'visual_width': 1280,
+	'visual_height': 720,
+	'scroll_x': 0,
+	'scroll_y': 350.5,
+	'page_width': 1265,
+	'page_height': 4000,
+	'iframe_scroll_positions': {'0': {'scrollTop': 10, 'scrollLeft': 0}},
+	'pending_resources': [{'url': 'https://example.com/app.js', 'loading_duration_ms': 120, 'resource_type': 'script'}],
+}
+
+
+class _FakeRuntime:
+	def __init__(self, delay: float = 0.05):
+		self.delay = delay
+		self.calls = 0
+
+	async def evaluate(self, params=None, session_id=None):
+		self.calls += 1
+		await asyncio.sleep(self.delay)
+		return {'result': {'type': 'object', 'value': PAGE_VALUE}}
+
+
+# Browser zoom of 125% on a 2x display: window.devicePixelRatio reports 2.5 while the device-to-CSS ratio CDP uses
+# for screenshots and coordinates stays 2, and the document scrolls inside a container taller than documentElement
+LAYOUT_METRICS = {
+	'visualViewport': {'clientWidth': 2560, 'clientHeight': 1440, 'pageX': 0, 'pageY': 701, 'scale': 1},
+	'cssVisualViewport': {'clientWidth': 1280, 'clientHeight': 720, 'pageX': 0, 'pageY': 350.5, 'scale': 1},
+	'cssLayoutViewport': {'clientWidth': 1265, 'clientHeight': 720, 'pageX': 0, 'pageY': 350},
+	'cssContentSize': {'x': 0, 'y': 0, 'width': 1265, 'height': 9000},
+}
+
+
+class _FakePage:
+	def __init__(self, metrics: dict | None = None):
+		self.metrics = metrics
+		self.calls = 0
+
+	async def getLayoutMetrics(self, session_id=None):
+		self.calls += 1
+		if self.metrics is None:
+			raise RuntimeError('Page domain unavailable')
+		return self.metrics
+
+
+def _make_probe(runtime: _FakeRuntime, page: _FakePage | None = None) -> PageMetadataProbe:
+	send = SimpleNamespace(Runtime=runtime, Page=page or _FakePage())
+	cdp_session = SimpleNamespace(cdp_client=SimpleNamespace(send=send), session_id='session-1')
+
+	async def get_or_create_cdp_session(target_id=None, focus=False):
+		return cdp_session
+
+	browser_session = SimpleNamespace(get_or_create_cdp_session=get_or_create_cdp_session, logger=None)
+	return PageMetadataProbe(browser_session, logger=SimpleNamespace(debug=lambda *args, **kwargs: None))  # type: ignore[arg-type]
+
+
+async def test_concurrent_consumers_share_one_evaluation():
+	runtime = _FakeRuntime()
+	probe = _make_probe(runtime)
+
+	results = await asyncio.gather(*(probe.get('target-1') for _ in range(4)))
+	assert runtime.calls == 1
+	assert all(result is results[0] for result in results)
+
+	# later consumers within the same state request hit the cache
+	assert await probe.get('target-1') is results[0]
+	assert runtime.calls == 1 and probe.cache_hits == 1
+
+	probe.invalidate('target-1')
+	await probe.get('target-1')
+	assert runtime.calls == 2
+
+
+async def test_invalidation_during_probe_discards_result():
+	runtime = _FakeRuntime(delay=0.1)
+	probe = _make_probe(runtime)
+
+	task = asyncio.create_task(probe.get('target-1'))
+	await asyncio.sleep(0.02)
+	probe.invalidate()
+	await task
+
+	# the probe started before the invalidation, its result must not be served afterwards
+	assert probe.cached('target-1') is None
+	await probe.get('target-1')
+	assert runtime.calls == 2
+
+
+def test_from_js_parses_metadata():
+	metadata = PageMetadata.from_js(PAGE_VALUE, captured_at=123.0)
+
+	assert metadata.device_pixel_ratio == 2.5
+	assert metadata.viewport_key == (0.0, 350.5, 1280.0, 720.0)
+	assert metadata.iframe_scroll_positions['0']['scrollTop'] == 10
+	assert metadata.pending_resources[0]['resource_type'] == 'script'
+
+	empty = PageMetadata.from_js({}, captured_at=0.0)
+	assert empty.device_pixel_ratio == 1.0 and empty.page_height == 0.0
+
+
+async def test_sizes_come_from_layout_metrics():
+	page = _FakePage(LAYOUT_METRICS)
+	probe = _make_probe(_FakeRuntime(), page)
+
+	metadata = await probe.get('target-1')
+	assert page.calls == 1
+	assert metadata.device_pixel_ratio == 2.0
+	assert (metadata.page_width, metadata.page_height) == (1265.0, 9000.0)
+	assert (metadata.layout_width, metadata.layout_height) == (1265.0, 720.0)
+	assert metadata.viewport_key == (0.0, 350.5, 1280.0, 720.0)
+	# everything else still comes from the evaluation
+	assert metadata.title == 'Example' and metadata.iframe_scroll_positions['0']['scrollTop'] == 10
+
+
+async def test_js_sizes_are_used_without_layout_metrics():
+	probe = _make_probe(_FakeRuntime(), _FakePage(None))
+
+	metadata = await probe.get('target-1')
+	assert metadata.device_pixel_ratio == 2.5 and metadata.page_height == 4000.0
@@ -0,0 +1,197 @@
+"""
+Tests for PageStabilityTracker, the event-driven network idle / DOM quiescence detection used by DOMWatchdog.
+
+Driven with a minimal fake CDP client, the tracker only consumes CDP Network event payloads.
+"""
+
+import asyncio
+import time
+from types import SimpleNamespace
+
+from browser_use.browser.page_stability import PageStabilityTracker, is_document_loading, is_ignored_request
+
+
+class _FakeRegistration:
+	def __init__(self):
+		self.handlers = {}
+
+	def __getattr__(self, event_name):
+		def register(callback):
+			self.handlers[event_name] = callback
+
+		return register
+
+
+class _FakeNetworkSend:
+	def __init__(self):
+		self.enabled_sessions = []
+
+	async def enable(self, session_id=None):
+		self.enabled_sessions.append(session_id)
+
+
+async def _make_tracker():
+	session_manager = SimpleNamespace(
+		get_target_id_from_session_id=lambda session_id: {'session-1': 'target-1', 'session-2': 'target-2'}.get(session_id)
+	)
+	browser_session = SimpleNamespace(session_manager=session_manager, logger=None)
+	tracker = PageStabilityTracker(browser_session, logger=SimpleNamespace(debug=lambda *args, **kwargs: None))  # type: ignore[arg-type]
+
+	registration = _FakeRegistration()
+	send = _FakeNetworkSend()
+	cdp_client = SimpleNamespace(register=SimpleNamespace(Network=registration), send=SimpleNamespace(Network=send))
+	cdp_session = SimpleNamespace(cdp_client=cdp_client, session_id='session-1', target_id='target-1')
+	await tracker.attach(cdp_session)  # type: ignore[arg-type]
+	await tracker.attach(cdp_session)  # type: ignore[arg-type]
+	assert send.enabled_sessions == ['session-1']
+	return tracker, registration.handlers, cdp_client
+
+
+def _request(handlers, request_id, url='https://example.com/api', resource_type='XHR', session_id='session-1'):
+	handlers['requestWillBeSent'](
+		{'requestId': request_id, 'type': resource_type, 'request': {'url': url, 'method': 'GET'}}, session_id=session_id
+	)
+
+
+async def test_quiet_page_returns_immediately():
+	tracker, _, _ = await _make_tracker()
+	await asyncio.sleep(0.02)
+
+	result = await tracker.wait_until_stable('target-1', network_idle=0.01, dom_idle=0.01, timeout=2)
+
+	assert result.stable and result.waited_ms < 50
+
+
+async def test_returns_as_soon_as_pending_request_finishes():
+	tracker, handlers, _ = await _make_tracker()
+	_request(handlers, 'req-1')
+	_request(handlers, 'req-ads', url='https://doubleclick.net/pixel')  # ignored, never blocks
+	_request(handlers, 'req-ws', resource_type='WebSocket')  # ignored, never blocks
+	assert [request.url for request in tracker.pending_requests('target-1')] == ['https://example.com/api']
+
+	async def finish_later():
+		await asyncio.sleep(0.1)
+		handlers['loadingFinished']({'requestId': 'req-1'}, session_id='session-1')
+
+	start = time.monotonic()
+	task = asyncio.create_task(finish_later())
+	result = await tracker.wait_until_stable('target-1', network_idle=0.05, dom_idle=0.05, timeout=5)
+	await task
+
+	assert result.stable
+	# request finished after 0.1s + 0.05s idle window, far below the timeout
+	assert 0.14 <= time.monotonic() - start < 1
+
+
+async def test_times_out_and_reports_pending_requests():
+	tracker, handlers, _ = await _make_tracker()
+	_request(handlers, 'req-slow')
+
+	result = await tracker.wait_until_stable('target-1', network_idle=0.05, dom_idle=0.05, timeout=0.1)
+
+	assert not result.stable
+	assert [request.url for request in result.pending_requests] == ['https://example.com/api']
+	assert result.waited_ms >= 100
+
+
+async def test_waits_for_dom_quiescence():
+	tracker, _, _ = await _make_tracker()
+	mutation_tracker = SimpleNamespace(get_last_mutation_time=lambda target_id: time.monotonic() - 0.02)
+
+	# mutations keep coming in: never quiet for 0.05s
+	result = await tracker.wait_until_stable(
+		'target-1',
+		network_idle=0,
+		dom_idle=0.05,
+		timeout=0.2,
+		mutation_tracker=mutation_tracker,  # type: ignore[arg-type]
+	)
+	assert not result.stable
+
+	last_mutation = time.monotonic()
+	mutation_tracker = SimpleNamespace(get_last_mutation_time=lambda target_id: last_mutation)
+	result = await tracker.wait_until_stable(
+		'target-1',
+		network_idle=0,
+		dom_idle=0.05,
+		timeout=1,
+		mutation_tracker=mutation_tracker,  # type: ignore[arg-type]
+	)
+	assert result.stable and result.waited_ms >= 40
+
+
+async def test_concurrent_waiters_are_all_woken_up():
+	tracker, handlers, _ = await _make_tracker()
+	_request(handlers, 'req-1')
+
+	async def finish_later():
+		await asyncio.sleep(0.1)
+		handlers['loadingFinished']({'requestId': 'req-1'}, session_id='session-1')
+
+	start = time.monotonic()
+	task = asyncio.create_task(finish_later())
+	results = await asyncio.gather(
+		*(tracker.wait_until_stable('target-1', network_idle=0.05, dom_idle=0.05, timeout=5) for _ in range(3))
+	)
+	await task
+
+	assert all(result.stable for result in results)
+	assert time.monotonic() - start < 1
+
+
+async def test_only_the_focused_target_is_tracked():
+	tracker, handlers, cdp_client = await _make_tracker()
+	_request(handlers, 'req-1')
+	waiter = asyncio.create_task(tracker.wait_until_stable('target-1', network_idle=0.05, dom_idle=0.05, timeout=5))
+	await asyncio.sleep(0.02)
+
+	# focusing another tab stops tracking the first one and releases its waiters
+	await tracker.attach(SimpleNamespace(cdp_client=cdp_client, session_id='session-2', target_id='target-2'))  # type: ignore[arg-type]
+	result = await asyncio.wait_for(waiter, timeout=1)
+	assert result.stable
+	assert not tracker.is_attached('target-1') and tracker.is_attached('target-2')
+
+	_request(handlers, 'req-2', session_id='session-1')
+	_request(handlers, 'req-3', session_id='session-2')
+	assert tracker.pending_requests('target-1') == []
+	assert [request.url for request in tracker.pending_requests('target-2')] == ['https://example.com/api']
+
+
+def test_request_filters_and_lifecycle_log():
+	assert is_ignored_request('data:image/png;base64,xx', 'Image')
+	assert is_ignored_request('https://www.google-analytics.com/collect', 'XHR')
+	assert is_ignored_request('https://stats.g.doubleclick.net/j/collect', 'XHR')
+	assert is_ignored_request('https://ads.example.com/banner.js', 'Script')
+	assert is_ignored_request('https://example.com/api/telemetry/batch', 'XHR')
+	assert is_ignored_request('https://example.com/static/analytics.js', 'Script')
+	assert not is_ignored_request('https://example.com/app.js', 'Script')
+	# substrings of ordinary URLs are not ad or tracking endpoints
+	assert not is_ignored_request('https://example.com/uploads/report.pdf', 'XHR')
+	assert not is_ignored_request('https://example.com/downloads/', 'Document')
+	assert not is_ignored_request('https://roads.example.com/catalog', 'Fetch')
+	assert not is_ignored_request('https://notdoubleclick.net/api', 'XHR')
+
+	assert is_document_loading([{'name': 'init', 'loaderId': 'a'}])
+	assert not is_document_loading([{'name': 'init', 'loaderId': 'a'}, {'name': 'DOMContentLoaded', 'loaderId': 'a'}])
+	assert is_document_loading(
+		[{'name': 'init', 'loaderId': 'a'}, {'name': 'DOMContentLoaded', 'loaderId': 'a'}, {'name': 'init', 'loaderId': 'b'}]
+	)
+	assert not is_document_loading(None)
+
+
+async def test_stale_document_loads_do_not_block():
+	now = asyncio.get_running_loop().time()
+	assert is_document_loading([{'name': 'init', 'loaderId': 'a', 'timestamp': now - 1}])
+	# an aborted navigation never reaches DOMContentLoaded, it must not hold every later wait until the timeout
+	assert not is_document_loading([{'name': 'init', 'loaderId': 'a', 'timestamp': now - 60}])
+
+	tracker, _, _ = await _make_tracker()
+	await asyncio.sleep(0.02)
+	result = await tracker.wait_until_stable(
+		'target-1',
+		network_idle=0.01,
+		dom_idle=0.01,
+		timeout=2,
+		lifecycle_events=[{'name': 'init', 'loaderId': 'a', 'timestamp': now - 60}],
+	)
+	assert result.stable and result.waited_ms < 50
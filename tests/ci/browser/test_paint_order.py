@@ -0,0 +1,73 @@
+"""
+Tests that the spatially indexed paint order occlusion engines agree with the plain RectUnionPure scan.
+"""
+
+import random
+
+import pytest
+
+from browser_use.dom.serializer.paint_order import (
+	NUMPY_AVAILABLE,
+	PaintedRect,
+	Rect,
+	RectUnionGrid,
+	RectUnionNumpy,
+	RectUnionPure,
+	compute_paint_order_occlusion,
+)
+
+ENGINES = [RectUnionGrid, pytest.param(RectUnionNumpy, marks=pytest.mark.skipif(not NUMPY_AVAILABLE, reason='numpy missing'))]
+
+
+def _random_layout(n: int, seed: int) -> list[PaintedRect]:
+	rng = random.Random(seed)
+	painted = []
+	for _ in range(n):
+		# Snap half of the coordinates to a 10px grid so shared edges and exact containment are common
+		def coord(scale: float) -> float:
+			value = rng.random() * scale
+			return round(value / 10) * 10 if rng.random() < 0.5 else value
+
+		x, y = coord(1200), coord(4000)
+		# Some zero-sized rects: they can only be hidden by a single rect containing them
+		w = coord(300) if rng.random() < 0.9 else 0
+		h = coord(200) if rng.random() < 0.9 else 0
+		if rng.random() < 0.02:
+			x, y, w, h = 0, 0, 1280, 4000  # full-page backdrop
+		painted.append(
+			PaintedRect(paint_order=rng.randrange(n // 3 + 1), rect=Rect(x, y, x + w, y + h), occludes=rng.random() < 0.6)
+		)
+	return painted
+
+
+@pytest.mark.parametrize('engine', ENGINES)
+@pytest.mark.parametrize('seed', range(10))
+def test_indexed_engines_match_pure_scan(engine, seed):
+	painted = _random_layout(300, seed)
+	assert compute_paint_order_occlusion(painted, engine) == compute_paint_order_occlusion(painted, RectUnionPure)
+
+
+@pytest.mark.parametrize('engine', [RectUnionPure] + ENGINES)
+def test_rect_union_contains_and_add(engine):
+	union = engine()
+	assert not union.contains(Rect(0, 0, 10, 10))
+
+	assert union.add(Rect(0, 0, 10, 10))
+	assert union.add(Rect(10, 0, 20, 10))
+	# Covered by the two halves together, but by neither alone
+	assert union.contains(Rect(5, 2, 15, 8))
+	assert not union.add(Rect(5, 2, 15, 8))
+	# Sticks out at the bottom
+	assert not union.contains(Rect(5, 5, 15, 15))
+	# Zero-width rect on the shared edge is contained by a single stored rect
+	assert union.contains(Rect(10, 0, 10, 10))
+
+
+def test_same_paint_order_does_not_occlude():
+	painted = [
+		PaintedRect(paint_order=1, rect=Rect(0, 0, 100, 100), occludes=True),
+		PaintedRect(paint_order=1, rect=Rect(10, 10, 20, 20), occludes=True),
+		PaintedRect(paint_order=0, rect=Rect(30, 30, 40, 40), occludes=True),
+		PaintedRect(paint_order=0, rect=Rect(90, 90, 110, 110), occludes=True),
+	]
+	assert compute_paint_order_occlusion(painted) == [False, False, True, False]
@@ -0,0 +1,162 @@
+"""
+Tests for the LLM screenshot pipeline: image format detection, capture-side downscaling and reuse of unchanged frames.
+
+Driven with a fake browser session and CDP-free DOM watchdog internals, no browser is started.
+"""
+
+import base64
+import logging
+from io import BytesIO
+from types import SimpleNamespace
+
+from bubus import EventBus
+from PIL import Image
+
+from browser_use.browser.events import ScreenshotEvent
+from browser_use.browser.page_metadata import PageMetadata
+from browser_use.browser.profile import BrowserProfile
+from browser_use.browser.watchdogs.dom_watchdog import DOMWatchdog
+from browser_use.screenshots.encoding import (
+	detect_screenshot_format,
+	resize_screenshot,
+	screenshot_data_url,
+	screenshot_file_extension,
+)
+
+
+def _image_b64(image_format: str, size: tuple[int, int] = (64, 40)) -> str:
+	buffer = BytesIO()
+	Image.new('RGB', size, color=(200, 30, 30)).save(buffer, format=image_format)
+	return base64.b64encode(buffer.getvalue()).decode('utf-8')
+
+
+def _metadata(**overrides) -> PageMetadata:
+	values = {
+		'url': 'https://example.com/',
+		'title': 'Example',
+		'ready_state': 'complete',
+		'device_pixel_ratio': 2.0,
+		'layout_width': 1265,
+		'layout_height': 900,
+		'visual_width': 1265,
+		'visual_height': 900,
+		'window_width': 1280,
+		'window_height': 900,
+		'visual_scale': 1.0,
+		'scroll_x': 0,
+		'scroll_y': 300,
+		'page_width': 1265,
+		'page_height': 5000,
+	}
+	values.update(overrides)
+	return PageMetadata(**values)  # type: ignore[arg-type]
+
+
+def test_screenshot_format_is_detected_without_decoding():
+	for image_format, media_type, extension in (
+		('PNG', 'image/png', 'png'),
+		('JPEG', 'image/jpeg', 'jpg'),
+		('WEBP', 'image/webp', 'webp'),
+	):
+		screenshot_b64 = _image_b64(image_format)
+		assert detect_screenshot_format(screenshot_b64) == image_format.lower()
+		assert screenshot_data_url(screenshot_b64).startswith(f'data:{media_type};base64,')
+		assert screenshot_file_extension(screenshot_b64) == extension
+
+
+def test_resize_keeps_format_and_skips_images_that_already_fit():
+	jpeg_b64 = _image_b64('JPEG', size=(1401, 850))
+	# the browser already downscaled it, off by a pixel of rounding
+	assert resize_screenshot(jpeg_b64, (1400, 850)) is jpeg_b64
+
+	resized = resize_screenshot(_image_b64('JPEG', size=(1600, 900)), (1400, 850))
+	assert detect_screenshot_format(resized) == 'jpeg'
+	assert Image.open(BytesIO(base64.b64decode(resized))).size == (1400, 850)
+
+
+def test_resize_keeps_the_profile_quality():
+	buffer = BytesIO()
+	Image.effect_noise((400, 300), 64).convert('RGB').save(buffer, format='JPEG', quality=95)
+	noisy_b64 = base64.b64encode(buffer.getvalue()).decode('utf-8')
+
+	low = resize_screenshot(noisy_b64, (300, 225), quality=20)
+	high = resize_screenshot(noisy_b64, (300, 225), quality=95)
+	assert len(low) < len(high)
+	assert len(resize_screenshot(noisy_b64, (300, 225))) < len(high)
+
+
+def test_llm_screenshot_clip_downscales_in_the_browser():
+	watchdog = SimpleNamespace(browser_session=SimpleNamespace(llm_screenshot_size=(1280, 900)))
+
+	clip = DOMWatchdog._get_llm_screenshot_clip(watchdog, _metadata())  # type: ignore[arg-type]
+	assert clip == {'x': 0, 'y': 300, 'width': 1280, 'height': 900, 'scale': 0.5}
+
+	# no upscaling, and no clip on pinch-zoomed pages
+	assert DOMWatchdog._get_llm_screenshot_clip(watchdog, _metadata(device_pixel_ratio=1.0)) is None  # type: ignore[arg-type]
+	assert DOMWatchdog._get_llm_screenshot_clip(watchdog, _metadata(visual_scale=1.5)) is None  # type: ignore[arg-type]
+	watchdog.browser_session.llm_screenshot_size = None
+	assert DOMWatchdog._get_llm_screenshot_clip(watchdog, _metadata()) is None  # type: ignore[arg-type]
+
+
+class _FakeMutationTracker:
+	def __init__(self):
+		self.version = 3
+
+	def is_tracked(self, target_id):
+		return True
+
+	def get_version(self, target_id):
+		return self.version
+
+
+def _make_watchdog(metadata: PageMetadata):
+	event_bus = EventBus()
+	captured: list[ScreenshotEvent] = []
+
+	async def on_ScreenshotEvent(event: ScreenshotEvent) -> str:
+		captured.append(event)
+		return _image_b64('PNG')
+
+	event_bus.on(ScreenshotEvent, on_ScreenshotEvent)
+
+	async def get_or_create_cdp_session(target_id=None, focus=True):
+		return SimpleNamespace(target_id='target-1')
+
+	async def get_page_metadata(target_id):
+		return metadata
+
+	browser_session = SimpleNamespace(
+		agent_focus_target_id='target-1',
+		logger=logging.getLogger(__name__),
+		llm_screenshot_size=(1280, 900),
+		browser_profile=BrowserProfile(screenshot_format='png'),
+		event_bus=event_bus,
+		get_or_create_cdp_session=get_or_create_cdp_session,
+	)
+	watchdog = DOMWatchdog.model_construct(event_bus=event_bus, browser_session=browser_session)
+	watchdog._page_metadata = SimpleNamespace(get=get_page_metadata)  # type: ignore[assignment]
+	watchdog._dom_service = SimpleNamespace(mutation_tracker=_FakeMutationTracker())  # type: ignore[assignment]
+	return watchdog, captured, event_bus
+
+
+async def test_unchanged_page_reuses_the_last_screenshot():
+	metadata = _metadata()
+	watchdog, captured, event_bus = _make_watchdog(metadata)
+
+	first = await watchdog._capture_clean_screenshot()
+	assert len(captured) == 1
+	assert captured[0].clip is not None and captured[0].clip['scale'] == 0.5
+
+	assert await watchdog._capture_clean_screenshot() is first
+	assert len(captured) == 1
+
+	# a DOM mutation invalidates the frame
+	watchdog._dom_service.mutation_tracker.version += 1  # type: ignore[union-attr]
+	await watchdog._capture_clean_screenshot()
+	assert len(captured) == 2
+
+	# so does scrolling
+	metadata.scroll_y = 900
+	await watchdog._capture_clean_screenshot()
+	assert len(captured) == 3
+	await event_bus.stop(clear=True)
@@ -0,0 +1,137 @@
+"""
+Tests for the subtree serialization memo cache (browser_use/dom/serializer/subtree_cache.py).
+"""
+
+from browser_use.dom.serializer.code_use_serializer import DOMCodeAgentSerializer
+from browser_use.dom.serializer.eval_serializer import DOMEvalSerializer
+from browser_use.dom.serializer.serializer import DOMTreeSerializer
+from browser_use.dom.serializer.subtree_cache import SubtreeRenderPass, SubtreeTextCache
+from browser_use.dom.views import (
+	DEFAULT_INCLUDE_ATTRIBUTES,
+	EnhancedDOMTreeNode,
+	EnhancedSnapshotNode,
+	NodeType,
+	SerializedDOMState,
+	SimplifiedNode,
+)
+
+SERIALIZERS = [DOMTreeSerializer, DOMEvalSerializer, DOMCodeAgentSerializer]
+
+
+def _node(backend_node_id: int, node_name: str, node_value: str = '', **attributes: str) -> EnhancedDOMTreeNode:
+	return EnhancedDOMTreeNode(
+		node_id=backend_node_id,
+		backend_node_id=backend_node_id,
+		node_type=NodeType.TEXT_NODE if node_name == '#text' else NodeType.ELEMENT_NODE,
+		node_name=node_name,
+		node_value=node_value,
+		attributes=attributes,
+		is_scrollable=False,
+		is_visible=True,
+		absolute_position=None,
+		target_id='target-1',
+		frame_id=None,
+		session_id=None,
+		content_document=None,
+		shadow_root_type=None,
+		shadow_roots=None,
+		parent_node=None,
+		children_nodes=[],
+		ax_node=None,
+		snapshot_node=EnhancedSnapshotNode(
+			is_clickable=None,
+			cursor_style=None,
+			bounds=None,
+			clientRects=None,
+			scrollRects=None,
+			computed_styles=None,
+			paint_order=None,
+			stacking_contexts=None,
+		),
+	)
+
+
+def _build_page(first_id: int, item_labels: list[str], new_ids: set[int] = set()) -> SimplifiedNode:
+	"""A list of buttons, element ids start at `first_id` (re-rendered pages get fresh backend node ids)."""
+	next_id = first_id
+	items = []
+	for label in item_labels:
+		button = _node(next_id + 1, 'BUTTON', type='submit', **{'aria-label': label})
+		text = SimplifiedNode(original_node=_node(next_id + 2, '#text', label), children=[])
+		items.append(
+			SimplifiedNode(
+				original_node=_node(next_id, 'LI', **{'class': 'item'}),
+				children=[
+					SimplifiedNode(original_node=button, children=[text], is_interactive=True, is_new=next_id + 1 in new_ids)
+				],
+			)
+		)
+		next_id += 3
+	return SimplifiedNode(
+		original_node=_node(1, 'BODY'),
+		children=[SimplifiedNode(original_node=_node(2, 'UL'), children=items)],
+	)
+
+
+def _uncached(serializer, root: SimplifiedNode) -> str:
+	return SubtreeRenderPass(root, DEFAULT_INCLUDE_ATTRIBUTES, serializer._serialize_node).run()
+
+
+def test_cached_output_matches_uncached_render():
+	labels = [f'Item {i}' for i in range(30)]
+	cache = SubtreeTextCache()
+	for serializer in SERIALIZERS:
+		first = serializer.serialize_tree(_build_page(100, labels), DEFAULT_INCLUDE_ATTRIBUTES, subtree_cache=cache)
+		assert first == _uncached(serializer, _build_page(100, labels))
+
+		# Same structure, new backend node ids and one changed item: unchanged items are reused with patched indices
+		changed = labels.copy()
+		changed[5] = 'Changed'
+		page = _build_page(5000, changed, new_ids={5001})
+		hits_before = cache.hits
+		assert serializer.serialize_tree(page, DEFAULT_INCLUDE_ATTRIBUTES, subtree_cache=cache) == _uncached(serializer, page)
+		assert cache.hits > hits_before
+
+
+def test_interactive_indices_are_patched_into_cached_templates():
+	cache = SubtreeTextCache()
+	DOMTreeSerializer.serialize_tree(_build_page(100, ['Buy']), DEFAULT_INCLUDE_ATTRIBUTES, subtree_cache=cache)
+	text = DOMTreeSerializer.serialize_tree(
+		_build_page(700, ['Buy'], new_ids={701}), DEFAULT_INCLUDE_ATTRIBUTES, subtree_cache=cache
+	)
+
+	assert '*[701]<button' in text and '[101]' not in text
+	assert cache.hit_rate > 0
+
+
+def test_placeholder_characters_in_page_text_fall_back_to_uncached_render():
+	page = _build_page(100, ['Buy\x00 now'])
+	text = DOMTreeSerializer.serialize_tree(page, DEFAULT_INCLUDE_ATTRIBUTES, subtree_cache=SubtreeTextCache())
+	assert text == _uncached(DOMTreeSerializer, page)
+
+
+def test_dom_states_render_with_the_cache_of_their_session():
+	cache = SubtreeTextCache()
+	state = SerializedDOMState(_root=_build_page(100, ['Buy']), selector_map={}, _subtree_cache=cache)
+	state.llm_representation()
+	state.eval_representation()
+	assert cache.misses > 0 and cache.hits == 0  # the two serializers don't reuse each other's templates
+	assert state.llm_representation() == _uncached(DOMTreeSerializer, _build_page(100, ['Buy']))
+	assert cache.hits > 0
+
+	# states of other sessions don't see this cache
+	other = SerializedDOMState(_root=_build_page(100, ['Buy']), selector_map={})
+	assert other.llm_representation() == state.llm_representation()
+
+
+def test_cache_evicts_least_recently_used_entries():
+	cache = SubtreeTextCache(max_entries=2, max_chars=100)
+	cache.put(('a',), 'x' * 10, ())
+	cache.put(('b',), 'y' * 10, ())
+	cache.get(('a',))
+	cache.put(('c',), 'z' * 10, ())
+	assert cache.get(('b',)) is None
+	assert cache.get(('a',)) is not None
+
+	cache.put(('d',), 'w' * 95, ())
+	assert cache.stats()['chars'] <= 100
@@ -0,0 +1,70 @@
+"""
+Tests for VideoRecorderService frame handling: in-process resize/pad and the non-blocking frame queue.
+
+The encoder itself is replaced by a fake writer, so no video file is produced.
+"""
+
+import base64
+import io
+import threading
+import time
+
+import pytest
+from PIL import Image
+
+pytest.importorskip('imageio')
+
+from browser_use.browser import video_recorder  # noqa: E402
+from browser_use.browser.profile import ViewportSize  # noqa: E402
+from browser_use.browser.video_recorder import VideoRecorderService, _fit_frame  # noqa: E402
+
+
+def _png_b64(width: int, height: int, color=(255, 0, 0)) -> str:
+	buffer = io.BytesIO()
+	Image.new('RGB', (width, height), color).save(buffer, 'PNG')
+	return base64.b64encode(buffer.getvalue()).decode()
+
+
+class _SlowWriter:
+	def __init__(self):
+		self.frames = []
+		self.closed = False
+		self.release = threading.Event()
+
+	def append_data(self, frame):
+		self.release.wait(timeout=5)
+		self.frames.append(frame)
+
+	def close(self):
+		self.closed = True
+
+
+def test_fit_frame_resizes_and_pads_centered():
+	frame = _fit_frame(
+		base64.b64decode(_png_b64(200, 100)), ViewportSize(width=100, height=50), ViewportSize(width=112, height=64)
+	)
+
+	assert frame.shape == (64, 112, 3)
+	assert tuple(frame[0, 0]) == (0, 0, 0)  # padding
+	assert tuple(frame[7, 6]) == (255, 0, 0)  # content starts at the centered offset
+	assert tuple(frame[6, 6]) == (0, 0, 0)
+
+
+def test_add_frame_never_blocks_and_drops_oldest_frames(tmp_path, monkeypatch):
+	writer = _SlowWriter()
+	monkeypatch.setattr(video_recorder.iio, 'get_writer', lambda *args, **kwargs: writer)
+	recorder = VideoRecorderService(tmp_path / 'video.mp4', ViewportSize(width=64, height=48), framerate=30, max_queued_frames=3)
+	recorder.start()
+
+	start = time.monotonic()
+	for _ in range(20):
+		recorder.add_frame(_png_b64(64, 48))
+	assert time.monotonic() - start < 0.5
+	assert recorder.frames_dropped >= 16
+
+	writer.release.set()
+	recorder.stop_and_save()
+
+	# queued frames are flushed before the writer is closed
+	assert writer.closed
+	assert recorder.frames_written == len(writer.frames) == 20 - recorder.frames_dropped
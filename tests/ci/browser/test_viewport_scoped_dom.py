@@ -0,0 +1,191 @@
+"""
+Tests for viewport-scoped DOM extraction (ViewportScope pruning in DomService and DOMTreeSerializer).
+"""
+
+from typing import cast
+
+from browser_use.dom.enhanced_snapshot import SnapshotLookup
+from browser_use.dom.serializer.serializer import DOMTreeSerializer
+from browser_use.dom.service import _collect_out_of_flow_containers, _count_raw_elements
+from browser_use.dom.views import DOMRect, EnhancedDOMTreeNode, EnhancedSnapshotNode, NodeType, ViewportScope
+
+ITEM_HEIGHT = 100.0
+
+
+def _node(
+	node_id: int,
+	node_type: NodeType,
+	node_name: str,
+	parent: EnhancedDOMTreeNode | None,
+	bounds: DOMRect | None = None,
+	position: str = 'static',
+	node_value: str = '',
+) -> EnhancedDOMTreeNode:
+	snapshot = EnhancedSnapshotNode(
+		is_clickable=node_name == 'BUTTON',
+		cursor_style=None,
+		bounds=bounds,
+		clientRects=bounds,
+		scrollRects=None,
+		computed_styles={'position': position, 'display': 'block', 'visibility': 'visible', 'opacity': '1'},
+		paint_order=None,
+		stacking_contexts=None,
+	)
+	node = EnhancedDOMTreeNode(
+		node_id=node_id,
+		backend_node_id=node_id,
+		node_type=node_type,
+		node_name=node_name,
+		node_value=node_value,
+		attributes={},
+		is_scrollable=False,
+		is_visible=True,
+		absolute_position=bounds,
+		target_id='target-1',
+		frame_id=None,
+		session_id=None,
+		content_document=None,
+		shadow_root_type=None,
+		shadow_roots=None,
+		parent_node=parent,
+		children_nodes=[],
+		ax_node=None,
+		snapshot_node=snapshot,
+	)
+	if parent is not None:
+		assert parent.children_nodes is not None
+		parent.children_nodes.append(node)
+	return node
+
+
+def _build_feed(n_items: int) -> EnhancedDOMTreeNode:
+	"""A feed of cards stacked vertically, each card holding a button, plus a fixed header at the bottom of the DOM."""
+	page = DOMRect(x=0, y=0, width=1000, height=n_items * ITEM_HEIGHT)
+	document = _node(1, NodeType.DOCUMENT_NODE, '#document', None)
+	html = _node(2, NodeType.ELEMENT_NODE, 'HTML', document, page)
+	body = _node(3, NodeType.ELEMENT_NODE, 'BODY', html, page)
+	next_id = 10
+	for i in range(n_items):
+		card_bounds = DOMRect(x=0, y=i * ITEM_HEIGHT, width=1000, height=ITEM_HEIGHT)
+		card = _node(next_id, NodeType.ELEMENT_NODE, 'DIV', body, card_bounds)
+		button = _node(next_id + 1, NodeType.ELEMENT_NODE, 'BUTTON', card, card_bounds)
+		_node(next_id + 2, NodeType.TEXT_NODE, '#text', button, card_bounds, node_value=f'Item {i}')
+		next_id += 3
+	# Fixed elements can be painted anywhere, they are never skipped
+	_node(
+		next_id, NodeType.ELEMENT_NODE, 'BUTTON', body, DOMRect(x=0, y=n_items * ITEM_HEIGHT - 50, width=100, height=50), 'fixed'
+	)
+	return document
+
+
+def test_viewport_scope_side_of():
+	scope = ViewportScope.around_viewport(scroll_y=1000, viewport_height=500, margin=1)
+	assert (scope.top, scope.bottom) == (500, 2000)
+
+	assert scope.side_of(DOMRect(x=0, y=0, width=10, height=100), None) == -1
+	assert scope.side_of(DOMRect(x=0, y=2100, width=10, height=100), None) == 1
+	assert scope.side_of(DOMRect(x=0, y=450, width=10, height=100), None) == 0  # overlaps the band
+	assert scope.side_of(DOMRect(x=0, y=2100, width=10, height=100), {'position': 'sticky'}) == 0
+	assert scope.side_of(DOMRect(x=0, y=2100, width=0, height=0), None) == 0  # no layout box of its own
+	assert scope.side_of(None, None) == 0
+
+
+def test_serializer_skips_and_counts_offscreen_subtrees():
+	full_state, _ = DOMTreeSerializer(_build_feed(200), paint_order_filtering=False).serialize_accessible_elements()
+	assert len(full_state.selector_map) == 201
+	assert full_state.elements_below_scope == 0
+
+	scope = ViewportScope.around_viewport(scroll_y=2000, viewport_height=500, margin=1)
+	scoped_state, _ = DOMTreeSerializer(
+		_build_feed(200), paint_order_filtering=False, viewport_scope=scope
+	).serialize_accessible_elements()
+
+	# Band is y=1500..3000: cards 14..30 overlap it, plus the fixed button
+	kept_items = [i for i in range(200) if i * ITEM_HEIGHT + ITEM_HEIGHT >= 1500 and i * ITEM_HEIGHT <= 3000]
+	assert len(scoped_state.selector_map) == len(kept_items) + 1
+	# Every skipped card counts as 2 elements (card + button)
+	assert scoped_state.elements_above_scope == 2 * kept_items[0]
+	assert scoped_state.elements_below_scope == 2 * (199 - kept_items[-1])
+
+	text = scoped_state.llm_representation()
+	assert 'Item 20' in text and 'Item 5' not in text and 'Item 100' not in text
+
+
+def test_count_raw_elements():
+	raw = {
+		'nodeId': 1,
+		'backendNodeId': 1,
+		'nodeType': 1,
+		'nodeName': 'DIV',
+		'children': [
+			{'nodeId': 2, 'backendNodeId': 2, 'nodeType': 3, 'nodeName': '#text'},
+			{'nodeId': 3, 'backendNodeId': 3, 'nodeType': 1, 'nodeName': 'SPAN'},
+		],
+		'shadowRoots': [
+			{
+				'nodeId': 4,
+				'backendNodeId': 4,
+				'nodeType': 11,
+				'nodeName': '#document-fragment',
+				'children': [{'nodeId': 5, 'backendNodeId': 5, 'nodeType': 1, 'nodeName': 'B'}],
+			}
+		],
+	}
+	assert _count_raw_elements(raw) == 3  # type: ignore[arg-type]
+
+
+def test_offscreen_ancestors_of_fixed_elements_are_kept():
+	document = _build_feed(200)
+	body = document.children_nodes[0].children_nodes[0]  # type: ignore[index]
+	# A fixed modal in a wrapper laid out far below the band, e.g. a portal container at the end of the body
+	wrapper = _node(5000, NodeType.ELEMENT_NODE, 'DIV', body, DOMRect(x=0, y=19000, width=1000, height=100))
+	# fixed elements are laid out relative to the viewport, scrolled to y=2000
+	modal = _node(5001, NodeType.ELEMENT_NODE, 'DIV', wrapper, DOMRect(x=0, y=2100, width=500, height=300), 'fixed')
+	_node(5002, NodeType.ELEMENT_NODE, 'BUTTON', modal, DOMRect(x=0, y=2100, width=100, height=50))
+	_node(5003, NodeType.ELEMENT_NODE, 'BUTTON', wrapper, DOMRect(x=0, y=19000, width=100, height=50))
+
+	scope = ViewportScope.around_viewport(scroll_y=2000, viewport_height=500, margin=1)
+	state, _ = DOMTreeSerializer(document, paint_order_filtering=False, viewport_scope=scope).serialize_accessible_elements()
+
+	backend_node_ids = {node.backend_node_id for node in state.selector_map.values()}
+	assert 5002 in backend_node_ids
+	# the in-flow sibling of the modal is still skipped
+	assert 5003 not in backend_node_ids
+
+
+def test_offscreen_cards_with_absolute_badges_are_skipped():
+	document = _build_feed(200)
+	body = document.children_nodes[0].children_nodes[0]  # type: ignore[index]
+	# An off-band card with an absolutely positioned badge, placed relative to the card
+	card = _node(5000, NodeType.ELEMENT_NODE, 'DIV', body, DOMRect(x=0, y=19000, width=1000, height=100), 'relative')
+	inner = _node(5001, NodeType.ELEMENT_NODE, 'DIV', card, DOMRect(x=0, y=19000, width=1000, height=100))
+	_node(5002, NodeType.ELEMENT_NODE, 'BUTTON', inner, DOMRect(x=900, y=19000, width=50, height=20), 'absolute')
+	# An absolutely positioned popup without positioned ancestors, laid out against the page inside the band
+	wrapper = _node(6000, NodeType.ELEMENT_NODE, 'DIV', body, DOMRect(x=0, y=19100, width=1000, height=100))
+	_node(6001, NodeType.ELEMENT_NODE, 'BUTTON', wrapper, DOMRect(x=0, y=2100, width=100, height=50), 'absolute')
+
+	scope = ViewportScope.around_viewport(scroll_y=2000, viewport_height=500, margin=1)
+	state, _ = DOMTreeSerializer(document, paint_order_filtering=False, viewport_scope=scope).serialize_accessible_elements()
+
+	backend_node_ids = {node.backend_node_id for node in state.selector_map.values()}
+	assert 5002 not in backend_node_ids
+	assert 6001 in backend_node_ids
+
+
+def test_collect_out_of_flow_containers_of_raw_nodes():
+	def element(node_id: int, children: list | None = None) -> dict:
+		return {'nodeId': node_id, 'backendNodeId': node_id, 'nodeType': 1, 'nodeName': 'DIV', 'children': children or []}
+
+	raw = element(1, [element(2, [element(3, [element(4)])]), element(5, [element(6)])])
+	styles = {4: {'position': 'fixed'}}
+	snapshot_lookup = cast(SnapshotLookup, type('FakeLookup', (), {'computed_styles_of': lambda self, i: styles.get(i)})())
+
+	containers: set[int] = set()
+	assert _collect_out_of_flow_containers(raw, snapshot_lookup, containers) == -1  # type: ignore[arg-type]
+	assert containers == {1, 2, 3}
+
+	# absolutely positioned elements only escape the ancestors below their containing block
+	styles = {2: {'position': 'relative'}, 4: {'position': 'absolute'}, 6: {'position': 'absolute'}}
+	containers = set()
+	assert _collect_out_of_flow_containers(raw, snapshot_lookup, containers) == -1  # type: ignore[arg-type]
+	assert containers == {1, 3, 5}
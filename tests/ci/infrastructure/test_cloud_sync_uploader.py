@@ -0,0 +1,121 @@
+"""
+Tests for the batched cloud sync uploader, against a local stub of the events API.
+
+Handling an event must not wait on the network, queued events must be sent in gzipped batches, and events that could
+not be uploaded must be kept in the write-ahead log and replayed by the next uploader.
+"""
+
+import gzip
+import json
+import os
+import time
+from pathlib import Path
+
+import anyio
+import pytest
+from bubus import BaseEvent
+from pytest_httpserver import HTTPServer
+from werkzeug import Request, Response
+
+from browser_use.sync.service import CloudSync
+from browser_use.sync.uploader import STALE_WAL_SECONDS, EventUploader
+
+
+class StepSyncedEvent(BaseEvent):
+	step: int
+
+
+@pytest.fixture
+def events_api(httpserver: HTTPServer):
+	"""Stub of the events API, records the received batches and answers with `api.status`"""
+
+	class EventsAPI:
+		status = 200
+		batches: list[list[dict]] = []
+		encodings: list[str | None] = []
+
+	api = EventsAPI()
+
+	def handler(request: Request) -> Response:
+		body = request.get_data()
+		if request.headers.get('Content-Encoding') == 'gzip':
+			body = gzip.decompress(body)
+		api.encodings.append(request.headers.get('Content-Encoding'))
+		if api.status < 400:
+			api.batches.append(json.loads(body)['events'])
+		return Response('{}', status=api.status, content_type='application/json')
+
+	httpserver.expect_request('/api/v1/events', method='POST').respond_with_handler(handler)
+	return api
+
+
+async def test_events_are_queued_and_sent_in_one_gzipped_batch(httpserver: HTTPServer, events_api, tmp_path: Path, monkeypatch):
+	monkeypatch.setenv('BROWSER_USE_CONFIG_DIR', str(tmp_path))
+	cloud_sync = CloudSync(base_url=httpserver.url_for(''), allow_session_events_for_auth=True)
+
+	for step in range(5):
+		await cloud_sync.handle_event(StepSyncedEvent(step=step))
+	# handling an event doesn't wait for the upload
+	assert events_api.batches == []
+
+	assert await cloud_sync.flush(timeout=5)
+	assert events_api.encodings == ['gzip']
+	assert [event['step'] for event in events_api.batches[0]] == [0, 1, 2, 3, 4]
+	assert all(event['device_id'] == cloud_sync.auth_client.device_id for event in events_api.batches[0])
+
+	await cloud_sync.close()
+	# everything was uploaded, the write-ahead log is gone
+	assert list((tmp_path / 'events').iterdir()) == []
+
+
+async def test_unsent_events_are_replayed_from_the_write_ahead_log(httpserver: HTTPServer, events_api, tmp_path: Path):
+	def create_uploader() -> EventUploader:
+		return EventUploader(
+			endpoint=httpserver.url_for('/api/v1/events'),
+			get_headers=dict,
+			wal_dir=tmp_path,
+			flush_interval=0.01,
+			max_retries=1,
+			retry_backoff=0,
+		)
+
+	# the API is down: the batch is retried, then the uploader only writes the log
+	events_api.status = 503
+	uploader = create_uploader()
+	for step in range(3):
+		uploader.enqueue({'event_type': 'StepSyncedEvent', 'step': step})
+	assert await uploader.flush(timeout=5)
+	uploader.enqueue({'event_type': 'StepSyncedEvent', 'step': 3})
+	await uploader.close()
+	assert len(events_api.encodings) == 2
+	assert uploader.wal_path is not None
+	assert len(uploader.wal_path.read_text().splitlines()) == 4
+
+	# the next run picks up the log once it is stale, before its own events
+	stale = time.time() - STALE_WAL_SECONDS - 1
+	os.utime(uploader.wal_path, (stale, stale))
+	events_api.status = 200
+	uploader = create_uploader()
+	uploader.enqueue({'event_type': 'StepSyncedEvent', 'step': 4})
+	assert await uploader.flush(timeout=5)
+	await uploader.close()
+
+	assert [event['step'] for batch in events_api.batches for event in batch] == [0, 1, 2, 3, 4]
+	assert [path async for path in anyio.Path(tmp_path).iterdir()] == []
+
+
+async def test_unreadable_logs_are_left_for_the_next_run(httpserver: HTTPServer, events_api, tmp_path: Path):
+	wal_path = tmp_path / 'old.jsonl'
+	wal_path.write_text('{"event_type":"StepSyncedEvent","step":0}\n')
+	wal_path.with_suffix('.offset').write_text('not an offset')
+	stale = time.time() - STALE_WAL_SECONDS - 1
+	os.utime(wal_path, (stale, stale))
+
+	uploader = EventUploader(endpoint=httpserver.url_for('/api/v1/events'), get_headers=dict, wal_dir=tmp_path)
+	uploader.enqueue({'event_type': 'StepSyncedEvent', 'step': 1})
+	assert await uploader.flush(timeout=5)
+	await uploader.close()
+
+	# the claimed log is released again instead of staying behind as .replaying
+	assert sorted([path.name async for path in anyio.Path(tmp_path).iterdir()]) == ['old.jsonl', 'old.offset']
+	assert [event['step'] for batch in events_api.batches for event in batch] == [1]
@@ -102,6 +102,19 @@ class TestBaseFile:
 		file_obj.update_content('New content')
 		assert file_obj.content == 'New content'
 
+	def test_copies_and_dumps_of_chunked_content(self):
+		"""Test that copies don't share appended chunks and that dumps hold the content."""
+		file_obj = TxtFile(name='test', content='First line')
+		file_obj.append_file_content('\nSecond line')
+
+		copied = file_obj.model_copy()
+		copied.append_file_content('\nThird line')
+		assert file_obj.content == 'First line\nSecond line'
+		assert copied.content == 'First line\nSecond line\nThird line'
+
+		assert file_obj.model_dump() == {'name': 'test', 'content': 'First line\nSecond line'}
+		assert TxtFile.model_validate(file_obj.model_dump()).content == file_obj.content
+
 	async def test_file_disk_operations(self):
 		"""Test file sync to disk operations."""
 		with tempfile.TemporaryDirectory() as tmp_dir:
@@ -542,6 +555,34 @@ class TestFileSystem:
 		)
 		assert file_obj.content == expected_content
 
+	async def test_many_appends_only_write_the_appended_content(self, temp_filesystem, monkeypatch):
+		"""Test that appends don't rewrite the file and keep their order when issued concurrently."""
+		fs = temp_filesystem
+		await fs.write_file('rows.csv', 'id,value')
+
+		rewrites = []
+		write_text = Path.write_text
+		monkeypatch.setattr(
+			Path, 'write_text', lambda path, *args, **kwargs: rewrites.append(path) or write_text(path, *args, **kwargs)
+		)
+
+		rows = [f'\n{i},{i * i}' for i in range(500)]
+		results = await asyncio.gather(*(fs.append_file('rows.csv', row) for row in rows))
+		assert all(result == 'Data appended to file rows.csv successfully.' for result in results)
+		assert rewrites == []
+
+		expected_content = 'id,value' + ''.join(rows)
+		assert (fs.data_dir / 'rows.csv').read_text() == expected_content
+		file_obj = fs.get_file('rows.csv')
+		assert file_obj is not None
+		assert file_obj.content == expected_content
+		assert file_obj.get_line_count == 501
+
+		# the appended chunks are restored as one content
+		fs2 = FileSystem.from_state(fs.get_state())
+		restored = fs2.get_file('rows.csv')
+		assert restored is not None and restored.content == expected_content
+
 	async def test_save_extracted_content(self, temp_filesystem):
 		"""Test saving extracted content with auto-numbering."""
 		fs = temp_filesystem
@@ -597,6 +638,36 @@ class TestFileSystem:
 		assert 'Line 0' in description  # Start should be shown
 		assert 'Line 99' in description  # End should be shown
 
+	async def test_describe_is_cached_and_updated_incrementally(self, temp_filesystem):
+		"""Test that describe() only re-renders changed files and doesn't join appended content."""
+		fs = temp_filesystem
+		await fs.write_file('notes.txt', 'Some notes.')
+		await fs.write_file('large.md', '\n'.join([f'Line {i}' for i in range(100)]))
+
+		version = fs.version
+		description = fs.describe()
+		assert fs.describe() is description
+		notes_description = fs.get_file('notes.txt').describe()
+
+		for i in range(100, 150):
+			await fs.append_file('large.md', f'\nLine {i}')
+		assert fs.version == version + 50
+
+		large_file = fs.get_file('large.md')
+		description = fs.describe()
+		assert 'large.md - 150 lines' in description
+		assert 'Line 0' in description and 'Line 149' in description
+		assert '... ' in description and 'Line 100\n' not in description
+		# the unchanged file was not re-rendered and the appended chunks were not joined
+		assert fs.get_file('notes.txt').describe() is notes_description
+		assert len(large_file._chunks) == 51
+		assert large_file.get_line_count == 150
+
+		# the todo file changes the version but is not described
+		fs.get_file('todo.md').update_content('- [ ] Task 1')
+		assert fs.version == version + 51
+		assert fs.describe() == description
+
 	def test_get_todo_contents(self, temp_filesystem):
 		"""Test getting todo file contents."""
 		fs = temp_filesystem
@@ -478,6 +478,42 @@ class TestRegistryEdgeCases:
 		assert 'Should execute: test' in result.extracted_content
 
 
+class TestActionModelCache:
+	"""Test that action models and prompt descriptions are built once per set of available actions"""
+
+	def test_models_and_descriptions_are_reused_per_action_set(self, registry):
+		@registry.action('Everywhere action')
+		async def everywhere_action(text: str):
+			return ActionResult(extracted_content=text)
+
+		@registry.action('Sheets action', domains=['https://docs.google.com'])
+		async def sheets_action(text: str):
+			return ActionResult(extracted_content=text)
+
+		model = registry.create_action_model(page_url='https://example.com/a')
+		description = registry.get_prompt_description('https://docs.google.com/spreadsheets/d/1')
+		assert 'sheets_action' in description
+
+		# pages with the same available actions get the same model and description
+		assert registry.create_action_model(page_url='https://example.org/b') is model
+		assert registry.get_prompt_description('https://docs.google.com/spreadsheets/d/2') is description
+		sheets_model = registry.create_action_model(page_url='https://docs.google.com/spreadsheets/d/1')
+		assert sheets_model is not model
+		assert set(sheets_model.model_json_schema()['$defs']) > set(model.model_json_schema()['$defs'])
+
+		# registering or excluding actions invalidates the cache
+		@registry.action('Another action')
+		async def another_action(text: str):
+			return ActionResult(extracted_content=text)
+
+		model_with_another = registry.create_action_model(page_url='https://example.com/a')
+		assert model_with_another is not model
+		assert 'another_action' in model_with_another.model_validate({'another_action': {'text': 'x'}}).model_dump()
+
+		registry.exclude_action('sheets_action')
+		assert registry.get_prompt_description('https://docs.google.com/spreadsheets/d/1') == ''
+
+
 class TestExistingToolsActions:
 	"""Test that existing tools actions continue to work"""
 
@@ -0,0 +1,137 @@
+"""
+Tests for URLInterner, the per-session table of shortened URLs used by the agent.
+
+URLs are shortened once when the state message is built, and restored only in the string parameters of actions.
+"""
+
+import json
+
+from pydantic import BaseModel
+
+from browser_use.agent.message_manager.service import MessageManager
+from browser_use.agent.message_manager.views import MessageManagerState
+from browser_use.agent.url_interning import URLInterner
+from browser_use.agent.views import AgentOutput
+from browser_use.browser.views import BrowserStateSummary, TabInfo
+from browser_use.dom.views import SerializedDOMState
+from browser_use.filesystem.file_system import FileSystem
+from browser_use.llm.messages import SystemMessage, UserMessage
+from browser_use.tools.service import Tools
+
+LONG_URL = 'https://shop.example.com/search?q=running+shoes&color=blue&size=44&sort=price_asc&page=3#results'
+OTHER_LONG_URL = 'https://shop.example.com/cart?session=4f1c2d9e8b7a6f5e4d3c2b1a&coupon=SPRING&ref=newsletter_march'
+
+
+def test_shortened_urls_round_trip():
+	interner = URLInterner(limit=25)
+	replaced: dict[str, str] = {}
+	text = interner.shorten(f'Compare {LONG_URL} then open {OTHER_LONG_URL} or https://example.com/?a=1', replaced)
+
+	short_url = interner.shorten_url(LONG_URL)
+	other_short_url = interner.shorten_url(OTHER_LONG_URL)
+	assert len(short_url) < len(LONG_URL)
+	assert replaced == {short_url: LONG_URL, other_short_url: OTHER_LONG_URL}
+	assert text == f'Compare {short_url} then open {other_short_url} or https://example.com/?a=1'
+	assert interner.restore(text) == f'Compare {LONG_URL} then open {OTHER_LONG_URL} or https://example.com/?a=1'
+
+	# texts without shortened URLs are returned as they are
+	plain = 'Nothing to restore here...'
+	assert interner.restore(plain) is plain
+
+
+def test_only_action_parameters_are_restored():
+	interner = URLInterner(limit=25)
+	short_url = interner.shorten_url(LONG_URL)
+
+	ActionModel = Tools().registry.create_action_model()
+	output = AgentOutput.type_with_custom_actions(ActionModel).model_validate_json(
+		json.dumps(
+			{
+				'evaluation_previous_goal': 'Search results are loaded',
+				'memory': f'Results at {short_url}',
+				'next_goal': 'Open the results page',
+				'action': [
+					{'navigate': {'url': short_url, 'new_tab': False}},
+					{'write_file': {'file_name': 'links.md', 'content': f'- {short_url}'}},
+				],
+			}
+		)
+	)
+	for action in output.action:
+		interner.restore_action(action)
+
+	assert output.action[0].model_dump()['navigate'] == {'url': LONG_URL, 'new_tab': False}
+	assert output.action[1].model_dump()['write_file']['content'] == f'- {LONG_URL}'
+	# memory stays shortened, it is only read back by the LLM
+	assert output.memory == f'Results at {short_url}'
+
+
+class Product(BaseModel):
+	name: str
+	url: str
+
+
+class SearchResults(BaseModel):
+	url: str
+	products: list[Product]
+	sources: dict[str, str]
+
+
+def test_nested_structured_output_is_restored():
+	interner = URLInterner(limit=25)
+	short_url = interner.shorten_url(LONG_URL)
+	other_short_url = interner.shorten_url(OTHER_LONG_URL)
+
+	ActionModel = Tools(output_model=SearchResults).registry.create_action_model()
+	action = ActionModel.model_validate(
+		{
+			'done': {
+				'success': True,
+				'data': {
+					'url': short_url,
+					'products': [{'name': 'Blue runner', 'url': other_short_url}],
+					'sources': {'cart': other_short_url},
+				},
+			}
+		}
+	)
+	interner.restore_action(action)
+
+	data = action.model_dump()['done']['data']
+	assert data == {
+		'url': LONG_URL,
+		'products': [{'name': 'Blue runner', 'url': OTHER_LONG_URL}],
+		'sources': {'cart': OTHER_LONG_URL},
+	}
+
+
+def test_state_message_is_shortened_when_built(tmp_path):
+	interner = URLInterner(limit=25)
+	mm = MessageManager(
+		task=f'Find the cheapest shoes on {LONG_URL}',
+		system_message=SystemMessage(content='system'),
+		file_system=FileSystem(tmp_path),
+		state=MessageManagerState(),
+		url_interner=interner,
+		stable_prompt_prefix=True,
+	)
+	for _ in range(2):
+		mm.create_state_messages(
+			browser_state_summary=BrowserStateSummary(
+				url=OTHER_LONG_URL,
+				title='Cart',
+				tabs=[TabInfo(target_id='test-0', url=OTHER_LONG_URL, title='Cart')],
+				screenshot=None,
+				dom_state=SerializedDOMState(_root=None, selector_map={}),
+			),
+			use_vision=False,
+		)
+		message = mm.get_messages()[-1]
+		assert isinstance(message, UserMessage)
+		assert LONG_URL not in message.text and OTHER_LONG_URL not in message.text
+		assert interner.shorten_url(LONG_URL) in message.text
+		assert interner.shorten_url(OTHER_LONG_URL) in message.text
+
+	# the unchanged task part was reused from the previous step
+	assert f'Find the cheapest shoes on {LONG_URL}' not in mm._shortened_state_texts.values()
+	assert any(LONG_URL in text for text in mm._shortened_state_texts)
@@ -25,7 +25,23 @@ def agent():
 	"""Create an agent instance for testing URL shortening functionality."""
 	from tests.ci.conftest import create_mock_llm
 
-	return Agent(task='Test URL shortening', llm=create_mock_llm(), url_shortening_limit=25)
+	return Agent(task='Test URL shortening', llm=create_mock_llm(), _url_shortening_limit=25)
+
+
+def shorten_messages(agent: Agent, messages: list[BaseMessage]) -> dict[str, str]:
+	"""Shorten the messages in place like the message manager does, returns {shortened_url: original_url}"""
+	url_mappings: dict[str, str] = {}
+	for message in messages:
+		for text in agent._url_interner.shorten_message(message):
+			agent._url_interner.shorten(text, url_mappings)
+	return url_mappings
+
+
+def create_agent_output(agent: Agent, output_json: dict) -> AgentOutput:
+	"""AgentOutput with the agent's actions, parsed from the LLM's JSON"""
+	ActionModel = agent.tools.registry.create_action_model()
+	AgentOutputWithActions = AgentOutput.type_with_custom_actions(ActionModel)
+	return AgentOutputWithActions.model_validate_json(json.dumps(output_json))
 
 
 class TestUrlShorteningInputProcessing:
@@ -38,7 +54,7 @@ class TestUrlShorteningInputProcessing:
 		messages: list[BaseMessage] = [UserMessage(content=original_content)]
 
 		# Process messages (modifies messages in-place and returns URL mappings)
-		url_mappings = agent._process_messsages_and_replace_long_urls_shorter_ones(messages)
+		url_mappings = shorten_messages(agent, messages)
 
 		# Verify URL was shortened in the message (modified in-place)
 		processed_content = messages[0].content or ''
@@ -59,7 +75,7 @@ class TestUrlShorteningInputProcessing:
 		messages: list[BaseMessage] = [UserMessage(content=user_content), AssistantMessage(content=assistant_content)]
 
 		# Process messages (modifies messages in-place and returns URL mappings)
-		url_mappings = agent._process_messsages_and_replace_long_urls_shorter_ones(messages)
+		url_mappings = shorten_messages(agent, messages)
 
 		# Verify URL was shortened in both messages
 		user_processed_content = messages[0].content or ''
@@ -82,34 +98,31 @@ class TestUrlShorteningOutputProcessing:
 	"""Test URL restoration for output processing with custom actions."""
 
 	def test_process_output_with_custom_actions_and_url_restoration(self, agent: Agent):
-		"""Test that shortened URLs in AgentOutput with custom actions are restored."""
-		# Set up URL mapping (simulating previous shortening)
-		shortened_url: str = agent._replace_urls_in_text(SUPER_LONG_URL)[0]
-		url_mappings = {shortened_url: SUPER_LONG_URL}
-
-		# Create AgentOutput with shortened URLs using JSON parsing
-		output_json = {
-			'thinking': f'I need to navigate to {shortened_url} for documentation',
-			'evaluation_previous_goal': 'Successfully processed the request',
-			'memory': f'Found useful info at {shortened_url}',
-			'next_goal': 'Complete the documentation review',
-			'action': [{'navigate': {'url': shortened_url, 'new_tab': False}}],
-		}
-
-		# Create properly typed AgentOutput with custom actions
-		tools = agent.tools
-		ActionModel = tools.registry.create_action_model()
-		AgentOutputWithActions = AgentOutput.type_with_custom_actions(ActionModel)
-		agent_output = AgentOutputWithActions.model_validate_json(json.dumps(output_json))
-
-		# Process the output to restore URLs (modifies agent_output in-place)
-		agent._recursive_process_all_strings_inside_pydantic_model(agent_output, url_mappings)
-
-		# Verify URLs were restored in all locations
-		assert SUPER_LONG_URL in (agent_output.thinking or '')
-		assert SUPER_LONG_URL in (agent_output.memory or '')
+		"""Test that shortened URLs in the actions of an AgentOutput are restored."""
+		# Shorten the URL (simulating a previous state message)
+		shortened_url = agent._url_interner.shorten(SUPER_LONG_URL)
+		assert shortened_url != SUPER_LONG_URL
+
+		agent_output = create_agent_output(
+			agent,
+			{
+				'thinking': f'I need to navigate to {shortened_url} for documentation',
+				'evaluation_previous_goal': 'Successfully processed the request',
+				'memory': f'Found useful info at {shortened_url}',
+				'next_goal': 'Complete the documentation review',
+				'action': [{'navigate': {'url': shortened_url, 'new_tab': False}}],
+			},
+		)
+
+		# Restore the URLs in the actions (modifies the actions in-place)
+		for action in agent_output.action:
+			agent._url_interner.restore_action(action)
+
+		# Only the action parameters are restored, the reasoning keeps the short form the LLM saw
 		action_data = agent_output.action[0].model_dump()
 		assert action_data['navigate']['url'] == SUPER_LONG_URL
+		assert shortened_url in (agent_output.thinking or '')
+		assert shortened_url in (agent_output.memory or '')
 
 
 class TestUrlShorteningEndToEnd:
@@ -123,7 +136,7 @@ class TestUrlShorteningEndToEnd:
 
 		messages: list[BaseMessage] = [UserMessage(content=original_content)]
 
-		url_mappings = agent._process_messsages_and_replace_long_urls_shorter_ones(messages)
+		url_mappings = shorten_messages(agent, messages)
 
 		# Verify URL was shortened in input
 		assert len(url_mappings) == 1
@@ -132,30 +145,23 @@ class TestUrlShorteningEndToEnd:
 		assert shortened_url in (messages[0].content or '')
 
 		# Step 2: Simulate agent output with shortened URL
-		output_json = {
-			'thinking': f'I will navigate to {shortened_url} to get the documentation',
-			'evaluation_previous_goal': 'Starting documentation extraction',
-			'memory': f'Target URL: {shortened_url}',
-			'next_goal': 'Extract API documentation',
-			'action': [{'navigate': {'url': shortened_url, 'new_tab': True}}],
-		}
-
-		# Create AgentOutput with custom actions
-		tools = agent.tools
-		ActionModel = tools.registry.create_action_model()
-		AgentOutputWithActions = AgentOutput.type_with_custom_actions(ActionModel)
-		agent_output = AgentOutputWithActions.model_validate_json(json.dumps(output_json))
-
-		# Step 3: Output processing with URL restoration (modifies agent_output in-place)
-		agent._recursive_process_all_strings_inside_pydantic_model(agent_output, url_mappings)
+		agent_output = create_agent_output(
+			agent,
+			{
+				'thinking': f'I will navigate to {shortened_url} to get the documentation',
+				'evaluation_previous_goal': 'Starting documentation extraction',
+				'memory': f'Target URL: {shortened_url}',
+				'next_goal': 'Extract API documentation',
+				'action': [{'navigate': {'url': shortened_url, 'new_tab': True}}],
+			},
+		)
+
+		# Step 3: Output processing with URL restoration (modifies the actions in-place)
+		for action in agent_output.action:
+			agent._url_interner.restore_action(action)
 
 		# Verify complete pipeline worked correctly
-		assert SUPER_LONG_URL in (agent_output.thinking or '')
-		assert SUPER_LONG_URL in (agent_output.memory or '')
 		action_data = agent_output.action[0].model_dump()
 		assert action_data['navigate']['url'] == SUPER_LONG_URL
 		assert action_data['navigate']['new_tab'] is True
-
-		# Verify original shortened content is no longer present
-		assert shortened_url not in (agent_output.thinking or '')
-		assert shortened_url not in (agent_output.memory or '')
+		assert shortened_url not in json.dumps(action_data)
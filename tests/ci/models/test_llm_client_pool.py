@@ -0,0 +1,84 @@
+"""Tests for the shared LLM client registry (browser_use/llm/client_pool.py)."""
+
+import asyncio
+
+import httpx
+
+from browser_use.llm.anthropic.chat import ChatAnthropic
+from browser_use.llm.client_pool import (
+	aclose_shared_clients,
+	acquire_shared_clients,
+	get_shared_client,
+	get_shared_http_client,
+	release_shared_clients,
+)
+from browser_use.llm.ollama.chat import ChatOllama
+from browser_use.llm.openai.chat import ChatOpenAI
+
+
+async def test_sdk_clients_are_shared_per_client_params():
+	first = ChatOpenAI(model='gpt-4.1-mini', api_key='key-a')
+	second = ChatOpenAI(model='gpt-4.1', api_key='key-a', timeout=httpx.Timeout(30.0))
+	third = ChatOpenAI(model='gpt-4.1', api_key='key-a', timeout=httpx.Timeout(30.0))
+	other_key = ChatOpenAI(model='gpt-4.1-mini', api_key='key-b')
+
+	assert first.get_client() is first.get_client()
+	assert second.get_client() is third.get_client()
+	assert first.get_client() is not second.get_client()
+	assert first.get_client() is not other_key.get_client()
+
+	# every provider SDK client sits on the same connection pool
+	shared_http_client = get_shared_http_client()
+	assert first.get_client()._client is shared_http_client
+	assert ChatAnthropic(model='claude-sonnet-4-0', api_key='key-a').get_client()._client is shared_http_client
+
+	await aclose_shared_clients()
+	assert shared_http_client.is_closed
+	assert get_shared_http_client() is not shared_http_client
+
+
+async def test_explicit_http_client_is_respected():
+	own_http_client = httpx.AsyncClient()
+	llm = ChatOpenAI(model='gpt-4.1-mini', api_key='key-a', http_client=own_http_client)
+
+	assert llm.get_client()._client is own_http_client
+	await own_http_client.aclose()
+	await aclose_shared_clients()
+
+
+async def test_pooled_clients_close_when_the_last_user_releases_them():
+	acquire_shared_clients()
+	acquire_shared_clients()
+	shared_http_client = get_shared_http_client()
+
+	await release_shared_clients()
+	assert not shared_http_client.is_closed
+	await release_shared_clients()
+	assert shared_http_client.is_closed
+
+	# releasing more often than acquired is a no-op
+	await release_shared_clients()
+	assert get_shared_http_client() is not shared_http_client
+	await aclose_shared_clients()
+
+
+async def test_sdk_clients_owning_their_http_client_are_closed_with_the_pool():
+	llm = ChatOllama(model='llama3', host='http://localhost:11434')
+	client = llm.get_client()
+	assert llm.get_client() is client
+
+	await aclose_shared_clients()
+	assert client._client.is_closed
+	assert llm.get_client() is not client
+	await aclose_shared_clients()
+
+
+def test_clients_are_not_shared_across_event_loops():
+	async def get_clients():
+		return get_shared_http_client(), get_shared_client(dict, share_http_client=False, a=1)
+
+	first_http, first_sdk = asyncio.run(get_clients())
+	second_http, second_sdk = asyncio.run(get_clients())
+
+	assert first_http is not second_http
+	assert first_sdk is not second_sdk
@@ -0,0 +1,121 @@
+"""
+Tests for the chunked extraction of large pages in the extract action.
+
+Page markdown must be split at structural boundaries, the parts must be extracted in parallel (up to the concurrency
+limit) and merged with one more call, and the markdown of a page must only be built once per DOM tree.
+"""
+
+import asyncio
+from types import SimpleNamespace
+from typing import Any, cast
+from unittest.mock import AsyncMock
+
+from browser_use.dom import markdown_extractor
+from browser_use.dom.markdown_extractor import extract_clean_markdown, split_markdown
+from browser_use.filesystem.file_system import FileSystem
+from browser_use.llm.views import ChatInvokeCompletion
+from browser_use.tools.service import Tools
+from browser_use.tools.views import ExtractAction
+
+PAGE_MARKDOWN = '\n'.join(f'## Product {i}\nPrice: ${i}.00. In stock.' for i in range(4000))
+
+
+def test_split_markdown_cuts_before_headings():
+	chunks = split_markdown(PAGE_MARKDOWN, 30000)
+
+	assert ''.join(chunks) == PAGE_MARKDOWN
+	assert all(len(chunk) <= 30000 for chunk in chunks)
+	assert all(chunk.startswith('## Product') for chunk in chunks)
+	assert split_markdown('short page', 30000) == ['short page']
+
+
+def test_split_markdown_without_heading_cuts_keeps_the_whole_window():
+	content = '## Intro\n' + 'word ' * 5000 + '\n## Details\n' + 'word ' * 3000
+
+	assert len(split_markdown(content, 30000)[0]) == content.index('## Details')
+	assert len(split_markdown(content, 30000, cut_before_headings=False)[0]) == 30000
+
+
+class RecordingLLM:
+	"""Answers every call after a short delay and records the prompts and the peak number of concurrent calls"""
+
+	model = 'mock-llm'
+	provider = 'mock'
+	name = 'mock-llm'
+
+	def __init__(self):
+		self.prompts: list[str] = []
+		self.running = 0
+		self.max_running = 0
+
+	async def ainvoke(self, messages, output_format=None, **kwargs):
+		self.prompts.append(messages[-1].content)
+		call = len(self.prompts)
+		self.running += 1
+		self.max_running = max(self.max_running, self.running)
+		await asyncio.sleep(0.01)
+		self.running -= 1
+		return ChatInvokeCompletion(completion=f'result {call}', usage=None)
+
+
+async def test_extract_reads_large_pages_in_parallel_chunks_and_merges_them(monkeypatch, tmp_path):
+	async def fake_extract_clean_markdown(browser_session=None, extract_links=False, **kwargs):
+		return PAGE_MARKDOWN, {
+			'method': 'enhanced_dom_tree',
+			'original_html_chars': len(PAGE_MARKDOWN),
+			'initial_markdown_chars': len(PAGE_MARKDOWN),
+			'filtered_chars_removed': 0,
+			'final_filtered_chars': len(PAGE_MARKDOWN),
+		}
+
+	monkeypatch.setattr(markdown_extractor, 'extract_clean_markdown', fake_extract_clean_markdown)
+	browser_session = SimpleNamespace(get_current_page_url=AsyncMock(return_value='https://example.com/products'))
+	extract = Tools(extract_max_chunks=3, extract_concurrency=2).registry.registry.actions['extract'].function
+	llm = RecordingLLM()
+
+	result = await extract(
+		params=ExtractAction(query='all prices'),
+		browser_session=browser_session,
+		page_extraction_llm=llm,
+		file_system=FileSystem(tmp_path),
+	)
+
+	# 3 parts, at most 2 at a time, then one call merging their results
+	assert len(llm.prompts) == 4
+	assert llm.max_running == 2
+	assert all('<webpage_content part=' in prompt for prompt in llm.prompts[:3])
+	assert '<partial_results>' in llm.prompts[3]
+	assert all(f'result {i}' in llm.prompts[3] for i in (1, 2, 3))
+	assert '<result>\nresult 4\n</result>' in result.extracted_content
+
+	# the rest of the page is left for another call
+	chunks = split_markdown(PAGE_MARKDOWN, 30000)
+	assert f'start_from_char={sum(len(chunk) for chunk in chunks[:3])}' in llm.prompts[0]
+
+
+async def test_markdown_is_cached_per_dom_tree(monkeypatch):
+	serializations = 0
+
+	def fake_serialize(*args, **kwargs):
+		nonlocal serializations
+		serializations += 1
+		return '<h1>Title</h1><p>Body</p>'
+
+	monkeypatch.setattr(markdown_extractor.HTMLSerializer, 'serialize', fake_serialize)
+	dom_watchdog = SimpleNamespace(enhanced_dom_tree=SimpleNamespace(), _markdown_cache=None)
+	browser_session = cast(
+		Any, SimpleNamespace(_dom_watchdog=dom_watchdog, get_current_page_url=AsyncMock(return_value='https://example.com'))
+	)
+
+	first = await extract_clean_markdown(browser_session=browser_session)
+	second = await extract_clean_markdown(browser_session=browser_session)
+	assert serializations == 1
+	assert first == second
+
+	# a new tree is a new version of the page
+	dom_watchdog.enhanced_dom_tree = SimpleNamespace()
+	await extract_clean_markdown(browser_session=browser_session)
+	assert serializations == 2
+
+	# the watchdog only keeps the markdown of its current tree
+	assert dom_watchdog._markdown_cache[0] is dom_watchdog.enhanced_dom_tree
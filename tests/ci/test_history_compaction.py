@@ -0,0 +1,118 @@
+"""
+Tests for the token-budgeted agent history compaction (Agent(max_history_tokens=...)).
+
+Old steps must be folded into a summary once the history is over budget while the most recent steps stay verbatim,
+and a background LLM summary must be swapped in without losing steps folded while it was generated.
+"""
+
+import asyncio
+from pathlib import Path
+from unittest.mock import AsyncMock
+
+from browser_use.agent.message_manager.history_compactor import (
+	MAX_SUMMARY_PART_CHARS,
+	HistoryCompactor,
+	estimate_tokens,
+	summarize_history_item,
+)
+from browser_use.agent.message_manager.service import MessageManager
+from browser_use.agent.message_manager.views import HistoryItem, MessageManagerState
+from browser_use.filesystem.file_system import FileSystem
+from browser_use.llm import BaseChatModel
+from browser_use.llm.messages import SystemMessage
+from browser_use.llm.views import ChatInvokeCompletion
+
+
+def _make_message_manager(tmp_path: Path, compactor: HistoryCompactor) -> MessageManager:
+	return MessageManager(
+		task='Enter all invoices',
+		system_message=SystemMessage(content='system'),
+		file_system=FileSystem(tmp_path),
+		state=MessageManagerState(),
+		history_compactor=compactor,
+	)
+
+
+def _add_steps(mm: MessageManager, first: int, count: int) -> None:
+	for step in range(first, first + count):
+		mm.state.agent_history_items.append(
+			HistoryItem(
+				step_number=step,
+				evaluation_previous_goal='Success. The form was submitted and the confirmation page is shown.',
+				memory=f'Entered invoice {step} of 100.',
+				next_goal=f'Open the form for invoice {step + 1} and fill in the amount and the date.',
+				action_results=f'Result\nTyped amount {step * 10} into element 12\nClicked submit button',
+			)
+		)
+
+
+async def test_old_steps_are_folded_into_an_extractive_summary(tmp_path: Path):
+	mm = _make_message_manager(tmp_path, HistoryCompactor(max_tokens=600, keep_recent_steps=3))
+	_add_steps(mm, 1, 40)
+
+	assert mm.history_compactor and mm.history_compactor.compact(mm.state, mm.agent_history_description)
+
+	blocks = mm.agent_history_blocks
+	assert blocks[0] == mm.state.agent_history_items[0].to_string()
+	assert blocks[1].startswith('<history_summary steps="37">')
+	# the most recent steps are kept verbatim
+	assert blocks[2:] == [item.to_string() for item in mm.state.agent_history_items[-3:]]
+	# the summary keeps one line per step, dropping the oldest ones to stay within half the budget
+	assert 'Step 37: Entered invoice 37 of 100.' in blocks[1]
+	assert estimate_tokens(mm.state.history_summary) <= 300
+	assert estimate_tokens(mm.agent_history_description) <= 600
+
+	# within budget again, nothing to fold
+	assert not mm.history_compactor.compact(mm.state, mm.agent_history_description)
+
+
+async def test_llm_summary_is_swapped_in_without_losing_newer_steps(tmp_path: Path):
+	release = asyncio.Event()
+	summary_llm = AsyncMock(spec=BaseChatModel)
+
+	async def mock_ainvoke(messages, output_format=None, **kwargs):
+		await release.wait()
+		return ChatInvokeCompletion(completion='Entered invoices 1 to 37.', usage=None)
+
+	summary_llm.ainvoke.side_effect = mock_ainvoke
+	compactor = HistoryCompactor(max_tokens=600, keep_recent_steps=3, summary_llm=summary_llm)
+	mm = _make_message_manager(tmp_path, compactor)
+
+	_add_steps(mm, 1, 40)
+	assert compactor.compact(mm.state, mm.agent_history_description)
+	await asyncio.sleep(0)
+	assert summary_llm.ainvoke.call_count == 1
+
+	# more steps are folded while the LLM is still summarizing
+	_add_steps(mm, 41, 10)
+	assert compactor.compact(mm.state, mm.agent_history_description)
+	await asyncio.sleep(0)
+	assert summary_llm.ainvoke.call_count == 1
+
+	release.set()
+	await asyncio.sleep(0.01)
+	compactor.compact(mm.state, mm.agent_history_description)
+
+	summary_lines = mm.state.history_summary.split('\n')
+	assert summary_lines[0] == 'Entered invoices 1 to 37.'
+	assert summary_lines[1].startswith('Step 38:')
+	assert summary_lines[-1].startswith('Step 47:')
+	assert mm.state.history_summary_item_count == 47
+	compactor.cancel()
+
+
+def test_summary_lines_keep_memory_error_and_action_results():
+	item = HistoryItem(
+		step_number=4,
+		memory='Found 3 invoices on the page.',
+		error='Element 12 not found',
+		action_results='Result\nExtracted invoice totals: 120, 80, ' + '9' * 500,
+	)
+
+	line = summarize_history_item(item)
+	assert line.startswith('Step 4: Found 3 invoices on the page. | Element 12 not found | Result Extracted invoice totals')
+	# each part is truncated on its own, a long result does not push out the others
+	assert line.endswith('...')
+	assert len(line) <= len('Step 4: ') + 3 * MAX_SUMMARY_PART_CHARS + 2 * len(' | ')
+
+	assert summarize_history_item(HistoryItem(step_number=5, next_goal='Open invoice 4.')) == 'Step 5: Open invoice 4.'
@@ -0,0 +1,128 @@
+"""
+Tests for the concurrent execution of page-inert actions in Agent.multi_act.
+
+Actions registered with mutates_page=False must run concurrently (in order per file), page-changing actions must wait
+for everything before them, and results must come back in action order.
+"""
+
+import asyncio
+from unittest.mock import AsyncMock
+
+import pytest
+
+from browser_use import Agent
+from browser_use.agent import service as agent_service
+from browser_use.agent.views import ActionResult
+from browser_use.llm import BaseChatModel
+
+WAIT_BETWEEN_ACTIONS = 0.123
+
+
+def _create_agent(errors: set[int] | None = None) -> tuple[Agent, list[str]]:
+	llm = AsyncMock(spec=BaseChatModel)
+	llm.model = 'mock-llm'
+	llm._verified_api_keys = True
+	llm.provider = 'mock'
+	llm.name = 'mock-llm'
+	llm.model_name = 'mock-llm'
+
+	agent = Agent(task='Test task', llm=llm, prefetch_browser_state=False)
+	agent.browser_profile.wait_between_actions = WAIT_BETWEEN_ACTIONS
+	events: list[str] = []
+	sleep = asyncio.sleep
+
+	async def mock_act(action, **kwargs):
+		action_name, params = next(iter(action.model_dump(exclude_unset=True).items()))
+		label = f'{action_name}:{params.get("file_name") or params.get("index") or params.get("query")}'
+		events.append(f'start {label}')
+		await sleep(0.05 if action_name == 'write_file' else 0.01)
+		events.append(f'end {label}')
+		if len(events) // 2 in (errors or set()):
+			return ActionResult(error=f'{label} failed')
+		return ActionResult(extracted_content=label)
+
+	agent.tools.act = mock_act  # type: ignore[method-assign]
+	return agent, events
+
+
+@pytest.fixture
+def sleeps(monkeypatch):
+	"""Records the waits between actions"""
+	recorded: list[float] = []
+	sleep = asyncio.sleep
+
+	async def fake_sleep(seconds, *args, **kwargs):
+		if seconds == WAIT_BETWEEN_ACTIONS:
+			recorded.append(seconds)
+			seconds = 0
+		return await sleep(seconds, *args, **kwargs)
+
+	monkeypatch.setattr(agent_service.asyncio, 'sleep', fake_sleep)
+	return recorded
+
+
+async def test_page_inert_actions_run_concurrently_and_results_stay_in_order(sleeps):
+	agent, events = _create_agent()
+	actions = [
+		agent.ActionModel.model_validate(action)
+		for action in (
+			{'write_file': {'file_name': 'a.md', 'content': 'one'}},
+			{'extract': {'query': 'prices'}},
+			{'write_file': {'file_name': 'a.md', 'content': 'two', 'append': True}},
+			{'click': {'index': 5}},
+			{'read_file': {'file_name': 'a.md'}},
+			{'click': {'index': 6}},
+		)
+	]
+
+	results = await agent.multi_act(actions)
+
+	assert [result.extracted_content for result in results] == [
+		'write_file:a.md',
+		'extract:prices',
+		'write_file:a.md',
+		'click:5',
+		'read_file:a.md',
+		'click:6',
+	]
+	# extract runs while the first write is still going, the second write to the same file waits for the first
+	assert events[:3] == ['start write_file:a.md', 'start extract:prices', 'end extract:prices']
+	assert events.index('start write_file:a.md', 1) > events.index('end write_file:a.md')
+	# the click waits for all of them
+	assert events.index('start click:5') == 6
+	# waits only after actions that can have changed the page: before read_file, not before the second click
+	assert sleeps == [WAIT_BETWEEN_ACTIONS]
+
+
+async def test_no_action_starts_after_an_error(sleeps):
+	agent, events = _create_agent(errors={2})
+	actions = [
+		agent.ActionModel.model_validate(action)
+		for action in (
+			{'write_file': {'file_name': 'a.md', 'content': 'one'}},
+			{'extract': {'query': 'prices'}},
+			{'click': {'index': 5}},
+		)
+	]
+
+	results = await agent.multi_act(actions)
+
+	assert len(results) == 2
+	assert results[0].error == 'write_file:a.md failed'
+	assert not any('click' in event for event in events)
+	assert sleeps == []
+
+
+async def test_no_page_inert_action_starts_after_an_earlier_one_failed(sleeps):
+	agent, events = _create_agent(errors={1})
+
+	async def stream_actions():
+		yield agent.ActionModel.model_validate({'extract': {'query': 'prices'}})
+		# generated after the extraction already failed
+		await asyncio.sleep(0.05)
+		yield agent.ActionModel.model_validate({'write_file': {'file_name': 'b.md', 'content': 'prices'}})
+
+	results = await agent.multi_act(stream_actions())
+
+	assert [result.error for result in results] == ['extract:prices failed']
+	assert events == ['start extract:prices', 'end extract:prices']
@@ -0,0 +1,110 @@
+"""
+Tests for the stable prompt prefix layout of the state message (Agent(stable_prompt_prefix=True)).
+
+The task and agent history must render to the same content parts on every step, ahead of the changing browser state,
+with the Anthropic cache breakpoint after the history. Cached prompt token ratios are reported through TokenCost.
+"""
+
+from pathlib import Path
+
+from browser_use.agent.message_manager.service import MessageManager
+from browser_use.agent.message_manager.views import MessageManagerState
+from browser_use.agent.views import ActionResult, AgentStepInfo
+from browser_use.browser.views import BrowserStateSummary, TabInfo
+from browser_use.dom.views import SerializedDOMState
+from browser_use.filesystem.file_system import FileSystem
+from browser_use.llm.anthropic.serializer import AnthropicMessageSerializer
+from browser_use.llm.messages import ContentPartTextParam, SystemMessage, UserMessage
+from browser_use.llm.views import ChatInvokeUsage
+from browser_use.tokens.service import TokenCost
+
+
+def _browser_state(url: str) -> BrowserStateSummary:
+	return BrowserStateSummary(
+		url=url,
+		title='Test',
+		tabs=[TabInfo(target_id='test-0', url=url, title='Test')],
+		screenshot=None,
+		dom_state=SerializedDOMState(_root=None, selector_map={}),
+	)
+
+
+def _state_message(mm: MessageManager, step: int) -> UserMessage:
+	mm.create_state_messages(
+		browser_state_summary=_browser_state(f'https://example.com/page-{step}'),
+		result=[ActionResult(extracted_content=f'Result of step {step}', long_term_memory=f'Did step {step}')]
+		if step > 1
+		else None,
+		step_info=AgentStepInfo(step_number=step, max_steps=10),
+		use_vision=False,
+	)
+	message = mm.get_messages()[-1]
+	assert isinstance(message, UserMessage) and isinstance(message.content, list)
+	return message
+
+
+def test_history_prefix_is_identical_across_steps(tmp_path: Path):
+	mm = MessageManager(
+		task='Find the price',
+		system_message=SystemMessage(content='system'),
+		file_system=FileSystem(tmp_path),
+		state=MessageManagerState(),
+		stable_prompt_prefix=True,
+	)
+
+	previous = _state_message(mm, 1)
+	for step in range(2, 5):
+		message = _state_message(mm, step)
+		# all of the previous step's prefix parts are repeated unchanged, only the state part after them changes
+		previous_prefix = [part.text for part in previous.content[:-1]]  # type: ignore[union-attr]
+		assert [part.text for part in message.content[: len(previous_prefix)]] == previous_prefix  # type: ignore[union-attr]
+		assert len(message.content) == len(previous.content) + 1  # type: ignore[arg-type]
+		assert f'page-{step}' in message.content[-1].text  # type: ignore[union-attr]
+		previous = message
+
+	text = ''.join(part.text for part in previous.content if isinstance(part, ContentPartTextParam))  # type: ignore[union-attr]
+	assert text.count('<user_request>') == 1
+	assert text.index('</user_request>') < text.index('<agent_history>') < text.index('</agent_history>')
+
+	# Anthropic: the breakpoint sits on the last history block, not on the changing state
+	serialized, _ = AnthropicMessageSerializer.serialize_messages([previous])
+	blocks = serialized[-1]['content']
+	assert [bool(block.get('cache_control')) for block in blocks] == [False] * (len(blocks) - 2) + [True, False]  # type: ignore[union-attr]
+
+
+def test_history_window_moves_in_chunks(tmp_path: Path):
+	mm = MessageManager(
+		task='Find the price',
+		system_message=SystemMessage(content='system'),
+		file_system=FileSystem(tmp_path),
+		state=MessageManagerState(),
+		max_history_items=6,
+		stable_prompt_prefix=True,
+	)
+	omitted_counts = []
+	for step in range(1, 13):
+		_state_message(mm, step)
+		blocks = mm.agent_history_blocks
+		assert len(blocks) <= 6 + 1
+		marker = next((block for block in blocks if 'omitted' in block), '[... 0 previous')
+		omitted_counts.append(int(marker.split('[... ')[1].split()[0]))
+
+	# the omitted count only changes every max_history_items // 2 steps
+	assert omitted_counts == [0] * 5 + [3] * 3 + [6] * 3 + [9]
+
+
+def test_cached_prompt_ratio_is_reported():
+	tc = TokenCost(include_cost=False)
+	entry = tc.add_usage(
+		'model-a',
+		ChatInvokeUsage(
+			prompt_tokens=1000,
+			prompt_cached_tokens=750,
+			prompt_cache_creation_tokens=None,
+			prompt_image_tokens=None,
+			completion_tokens=10,
+			total_tokens=1010,
+		),
+	)
+	assert entry.cached_prompt_ratio == 0.75
+	assert '75%' in tc._build_input_tokens_display(entry.usage, None)
@@ -0,0 +1,129 @@
+"""
+Tests for BrowserStatePrefetcher, the speculative capture of the next step's browser state during LLM inference.
+
+Driven with a fake browser session and DOM watchdog, no browser is started.
+"""
+
+import asyncio
+from types import SimpleNamespace
+from typing import Any, cast
+
+from browser_use.agent.state_prefetch import BrowserStatePrefetcher
+from browser_use.tools.service import Tools
+
+TOOLS = Tools()
+ActionModel = TOOLS.registry.create_action_model()
+EXTRACT = ActionModel.model_validate({'extract': {'query': 'prices'}})
+WRITE_FILE = ActionModel.model_validate({'write_file': {'file_name': 'notes.md', 'content': 'prices'}})
+CLICK = ActionModel.model_validate({'click': {'index': 5}})
+
+
+class _FakeDOMWatchdog:
+	def __init__(self):
+		self.idle = True
+		self.dom_version: int | None = 7
+		self.page_event: str | None = None
+		self.restored: list = []
+
+	def is_page_idle(self, target_id):
+		return self.idle
+
+	def get_dom_version(self, target_id):
+		return self.dom_version
+
+	def get_page_affecting_event_since(self, since):
+		return self.page_event
+
+	def restore_cached_state(self, state):
+		self.restored.append(state)
+
+
+def _make_session(capture_delay: float = 0.0):
+	target = SimpleNamespace(url='https://example.com/products')
+	session = SimpleNamespace(
+		agent_focus_target_id='target-1',
+		session_manager=SimpleNamespace(get_target=lambda target_id: target if target_id == 'target-1' else None),
+		_dom_watchdog=_FakeDOMWatchdog(),
+		_cached_browser_state_summary=None,
+		captures=0,
+	)
+
+	async def get_browser_state_summary(include_screenshot=True, include_recent_events=False):
+		session.captures += 1
+		await asyncio.sleep(capture_delay)
+		state = SimpleNamespace(url=target.url, capture=session.captures)
+		session._cached_browser_state_summary = state
+		return state
+
+	session.get_browser_state_summary = get_browser_state_summary
+	return session, target
+
+
+async def test_prefetched_state_is_reused_after_page_inert_actions():
+	session, _ = _make_session()
+	prefetcher = BrowserStatePrefetcher(session, TOOLS.registry.action_mutates_page)  # type: ignore[arg-type]
+	current_state = cast(Any, SimpleNamespace(url='https://example.com/products', capture=0))
+
+	assert prefetcher.start()
+	await prefetcher.settle(current_state)
+	# the step's actions resolve element indices against the state the LLM saw
+	assert session._dom_watchdog.restored == [current_state]
+
+	state = cast(Any, await prefetcher.take([EXTRACT, WRITE_FILE]))
+	assert state is not None and state.capture == 1
+	assert session._dom_watchdog.restored[-1] is state
+	assert prefetcher.hits == 1
+
+	# consumed, the next step captures as usual
+	assert await prefetcher.take([]) is None
+
+
+async def test_prefetched_state_is_dropped_when_the_page_may_have_changed():
+	session, target = _make_session()
+	prefetcher = BrowserStatePrefetcher(session, TOOLS.registry.action_mutates_page)  # type: ignore[arg-type]
+
+	prefetcher.start()
+	assert await prefetcher.take([EXTRACT, CLICK]) is None
+
+	prefetcher.start()
+	target.url = 'https://example.com/products?page=2'
+	assert await prefetcher.take([EXTRACT]) is None
+	target.url = 'https://example.com/products'
+
+	prefetcher.start()
+	session._dom_watchdog.dom_version += 1
+	assert await prefetcher.take([EXTRACT]) is None
+
+	prefetcher.start()
+	session._dom_watchdog.page_event = 'ScrollEvent'
+	assert await prefetcher.take([EXTRACT]) is None
+	assert prefetcher.misses == 4 and prefetcher.hits == 0
+
+
+async def test_prefetch_only_starts_on_idle_pages_or_after_page_inert_actions():
+	session, _ = _make_session(capture_delay=0.05)
+	prefetcher = BrowserStatePrefetcher(session, TOOLS.registry.action_mutates_page)  # type: ignore[arg-type]
+	session._dom_watchdog.idle = False
+
+	assert not prefetcher.start([CLICK])
+	assert prefetcher.start([EXTRACT])
+
+	# a pending capture is dropped without waiting for it
+	prefetcher.discard()
+	assert await prefetcher.take([EXTRACT]) is None
+	await asyncio.sleep(0.1)
+
+
+async def test_dom_changes_without_navigation_are_detected():
+	session, _ = _make_session()
+	prefetcher = BrowserStatePrefetcher(session, TOOLS.registry.action_mutates_page)  # type: ignore[arg-type]
+
+	# a script updates the page while the LLM is thinking: same URL, no browser event, only the DOM changed
+	assert prefetcher.start()
+	session._dom_watchdog.dom_version += 1
+	assert await prefetcher.take([EXTRACT]) is None
+
+	# without the DOM mutation counter such a change would go unnoticed, so nothing is prefetched
+	session._dom_watchdog.dom_version = None
+	assert not prefetcher.start()
+	assert await prefetcher.take([EXTRACT]) is None
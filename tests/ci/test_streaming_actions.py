@@ -0,0 +1,151 @@
+"""
+Tests for streamed LLM responses with early action dispatch (Agent(stream_actions=True)).
+
+The first action must start executing while the rest of the response is still streaming,
+and the agent must fall back to a regular LLM call when the stream fails before any action started.
+"""
+
+import asyncio
+import json
+from unittest.mock import AsyncMock
+
+import pytest
+
+from browser_use import Agent
+from browser_use.agent.views import ActionResult
+from browser_use.llm import BaseChatModel
+from browser_use.llm.exceptions import ModelProviderError
+from browser_use.llm.streaming import StreamingJSONArrayParser, supports_streaming
+from browser_use.llm.views import ChatInvokeCompletion, ChatInvokeStreamChunk
+
+RESPONSE = {
+	'thinking': 'Scroll, then wait for the {lazy} content ]',
+	'evaluation_previous_goal': 'Page loaded',
+	'memory': 'Nothing yet',
+	'next_goal': 'Load more content',
+	'action': [
+		{'scroll': {'down': True, 'pages': 1.0}},
+		{'wait': {'seconds': 1}},
+	],
+}
+
+
+def test_parser_yields_items_as_soon_as_they_are_complete():
+	text = '```json\n' + json.dumps(RESPONSE)
+	first_item_end = text.index('}}') + 2
+	parser = StreamingJSONArrayParser('action')
+
+	assert parser.feed(text[: first_item_end - 1]) == []
+	assert parser.feed(text[first_item_end - 1 : first_item_end]) == [RESPONSE['action'][0]]
+	assert parser.feed(text[first_item_end:]) == [RESPONSE['action'][1]]
+	assert parser.array_closed
+
+	# a response cut off after the first action is salvaged up to that action
+	truncated = StreamingJSONArrayParser('action')
+	truncated.feed(text[: first_item_end + 5])
+	repaired = json.loads(truncated.repaired_text() or '')
+	assert repaired['action'] == RESPONSE['action'][:1]
+	assert repaired['thinking'] == RESPONSE['thinking']
+
+
+def _create_streaming_agent(
+	stream_error: Exception | None = None, wait_for_first_action: bool = True, **agent_kwargs
+) -> tuple[Agent, list[str], asyncio.Event]:
+	"""Agent with a streaming mock LLM that only finishes its response after the first action started."""
+	events: list[str] = []
+	first_action_started = asyncio.Event()
+	response_text = json.dumps(RESPONSE)
+	split_at = response_text.index('}}') + 2
+
+	llm = AsyncMock(spec=BaseChatModel)
+	llm.model = 'mock-llm'
+	llm._verified_api_keys = True
+	llm.provider = 'mock'
+	llm.name = 'mock-llm'
+	llm.model_name = 'mock-llm'
+
+	async def mock_ainvoke(messages, output_format=None, **kwargs):
+		events.append('ainvoke')
+		assert output_format is not None
+		return ChatInvokeCompletion(completion=output_format.model_validate_json(response_text), usage=None)
+
+	async def mock_astream(messages, output_format=None, **kwargs):
+		if stream_error is not None:
+			raise stream_error
+		events.append('stream started')
+		yield ChatInvokeStreamChunk(delta=response_text[:split_at])
+		if wait_for_first_action:
+			await asyncio.wait_for(first_action_started.wait(), timeout=5)
+		yield ChatInvokeStreamChunk(delta=response_text[split_at:])
+		events.append('stream finished')
+		assert output_format is not None
+		yield ChatInvokeStreamChunk(
+			completion=ChatInvokeCompletion(completion=output_format.model_validate_json(response_text), usage=None)
+		)
+
+	llm.ainvoke.side_effect = mock_ainvoke
+	llm.astream = mock_astream
+
+	agent = Agent(task='Test task', llm=llm, stream_actions=True, **agent_kwargs)
+	agent.browser_profile.wait_between_actions = 0
+
+	async def mock_act(action, **kwargs):
+		action_name = next(iter(action.model_dump(exclude_unset=True)))
+		events.append(f'act {action_name}')
+		first_action_started.set()
+		return ActionResult(extracted_content=action_name)
+
+	agent.tools.act = mock_act  # type: ignore[method-assign]
+	return agent, events, first_action_started
+
+
+async def test_first_action_runs_while_response_is_streaming():
+	agent, events, _ = _create_streaming_agent()
+	assert supports_streaming(agent.llm)
+
+	await agent._stream_next_action_and_execute(None)  # type: ignore[arg-type]
+
+	assert events == ['stream started', 'act scroll', 'stream finished', 'act wait']
+	assert agent.state.last_model_output is not None
+	assert len(agent.state.last_model_output.action) == 2
+	assert [result.extracted_content for result in agent.state.last_result or []] == ['scroll', 'wait']
+
+
+async def test_falls_back_to_regular_call_when_stream_fails():
+	agent, events, _ = _create_streaming_agent(
+		stream_error=ModelProviderError(message='stream not supported', status_code=400, model='mock-llm')
+	)
+
+	await agent._stream_next_action_and_execute(None)  # type: ignore[arg-type]
+
+	assert events == ['ainvoke', 'act scroll', 'act wait']
+	assert len(agent.state.last_result or []) == 2
+
+
+async def test_step_callback_sees_the_response_before_any_action_runs():
+	seen_by_callback: list[tuple[int, list[str]]] = []
+
+	def on_new_step(browser_state_summary, model_output, n_steps):
+		seen_by_callback.append((len(model_output.action), list(events)))
+
+	agent, events, _ = _create_streaming_agent(wait_for_first_action=False, register_new_step_callback=on_new_step)
+	await agent._stream_next_action_and_execute(None)  # type: ignore[arg-type]
+
+	assert seen_by_callback == [(2, ['stream started', 'stream finished'])]
+	assert events == ['stream started', 'stream finished', 'act scroll', 'act wait']
+
+
+async def test_no_action_starts_after_the_agent_was_stopped():
+	agent, events, _ = _create_streaming_agent(wait_for_first_action=False)
+	act = agent.tools.act
+
+	async def stop_after_first_action(action, **kwargs):
+		result = await act(action, **kwargs)
+		agent.stop()
+		return result
+
+	agent.tools.act = stop_after_first_action  # type: ignore[method-assign]
+
+	with pytest.raises(InterruptedError):
+		await agent._stream_next_action_and_execute(None)  # type: ignore[arg-type]
+	assert 'act wait' not in events
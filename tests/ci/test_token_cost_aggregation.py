@@ -0,0 +1,127 @@
+"""
+Tests for the aggregated token usage counters of TokenCost.
+
+Summaries must match a per-entry computation over the full history, for `since=` windows too, and stay exact when
+`usage_history` is bounded.
+"""
+
+from datetime import datetime, timedelta
+
+import pytest
+
+from browser_use.llm.views import ChatInvokeUsage
+from browser_use.tokens import service as token_service
+from browser_use.tokens.service import TokenCost
+
+PRICING = {
+	'model-a': {
+		'input_cost_per_token': 2e-6,
+		'output_cost_per_token': 8e-6,
+		'cache_read_input_token_cost': 5e-7,
+		'cache_creation_input_token_cost': 2.5e-6,
+	},
+	'model-b': {'input_cost_per_token': 1e-6, 'output_cost_per_token': 4e-6},
+}
+
+
+class _Clock:
+	now_value = datetime(2025, 1, 1, 12, 0, 0)
+
+
+@pytest.fixture
+def clock(monkeypatch):
+	class FakeDatetime(datetime):
+		@classmethod
+		def now(cls, tz=None):
+			return _Clock.now_value
+
+	monkeypatch.setattr(token_service, 'datetime', FakeDatetime)
+	_Clock.now_value = datetime(2025, 1, 1, 12, 0, 0)
+	return _Clock
+
+
+def _make_token_cost(**kwargs) -> TokenCost:
+	tc = TokenCost(include_cost=True, **kwargs)
+	tc._pricing_data = PRICING
+	tc._initialized = True
+	return tc
+
+
+def _usage(i: int) -> ChatInvokeUsage:
+	return ChatInvokeUsage(
+		prompt_tokens=1000 + i,
+		prompt_cached_tokens=(i * 37) % 500 or None,
+		prompt_cache_creation_tokens=100 if i % 3 == 0 else None,
+		prompt_image_tokens=None,
+		completion_tokens=50 + i % 7,
+		total_tokens=1050 + i + i % 7,
+	)
+
+
+async def _expected_summary(tc: TokenCost, entries, model=None, since=None):
+	"""Reference: per-entry aggregation, like the summary used to be computed."""
+	entries = [e for e in entries if (model is None or e.model == model) and (since is None or e.timestamp >= since)]
+	total_cost = 0.0
+	for entry in entries:
+		cost = await tc.calculate_cost(entry.model, entry.usage)
+		total_cost += (cost.prompt_cost + cost.completion_cost + (cost.prompt_read_cached_cost or 0)) if cost else 0
+	return {
+		'entry_count': len(entries),
+		'total_prompt_tokens': sum(e.usage.prompt_tokens for e in entries),
+		'total_prompt_cached_tokens': sum(e.usage.prompt_cached_tokens or 0 for e in entries),
+		'total_completion_tokens': sum(e.usage.completion_tokens for e in entries),
+		'total_cost': total_cost,
+	}
+
+
+def _assert_matches(summary, expected):
+	for key, value in expected.items():
+		assert getattr(summary, key) == pytest.approx(value), key
+
+
+async def test_summary_and_windows_match_per_entry_computation(clock):
+	tc = _make_token_cost()
+	entries = []
+	for i in range(200):
+		clock.now_value += timedelta(seconds=7)
+		entries.append(tc.add_usage('model-a' if i % 4 else 'model-b', _usage(i)))
+
+	_assert_matches(await tc.get_usage_summary(), await _expected_summary(tc, entries))
+	_assert_matches(await tc.get_usage_summary(model='model-b'), await _expected_summary(tc, entries, model='model-b'))
+
+	# windows starting in the middle of a bucket are exact
+	for since in (
+		entries[0].timestamp,
+		entries[57].timestamp + timedelta(seconds=3),
+		entries[-1].timestamp,
+		clock.now_value + timedelta(1),
+	):
+		_assert_matches(await tc.get_usage_summary(since=since), await _expected_summary(tc, entries, since=since))
+
+	tokens = tc.get_usage_tokens_for_model('model-a')
+	assert tokens.prompt_tokens == sum(e.usage.prompt_tokens for e in entries if e.model == 'model-a')
+
+	# pricing lookups are memoized per model
+	assert set(tc._pricing_by_model) == {'model-a', 'model-b'}
+
+	tc.clear_history()
+	assert (await tc.get_usage_summary()).entry_count == 0
+
+
+async def test_bounded_history_keeps_exact_totals_and_spills_to_disk(clock, tmp_path):
+	spill_path = tmp_path / 'usage.jsonl'
+	tc = _make_token_cost(max_history_entries=20, history_spill_path=spill_path)
+	entries = []
+	for i in range(100):
+		clock.now_value += timedelta(seconds=30)
+		entries.append(tc.add_usage('model-a', _usage(i)))
+
+	assert 20 <= len(tc.usage_history) <= 22
+	assert tc.usage_history[-1] is entries[-1]
+	assert len(spill_path.read_text().splitlines()) == 100 - len(tc.usage_history)
+
+	_assert_matches(await tc.get_usage_summary(), await _expected_summary(tc, entries))
+	# evicted entries are still covered by the bucket counters (to bucket granularity)
+	since = entries[11].timestamp
+	assert since.second == 0
+	_assert_matches(await tc.get_usage_summary(since=since), await _expected_summary(tc, entries, since=since))